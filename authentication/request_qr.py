@@ -4,7 +4,7 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
-def request_qr():
+def request_qr(file_name="qr.png"):
     try:
         with requests.Session() as sess:
             reg = sess.post('https://georeport.ru/authorization/sign-in/',
@@ -28,9 +28,9 @@ def request_qr():
             }
             response = sess.post('https://georeport.ru/reports/report_and_qr', json=data)
             assert response.ok, "Не удалось сгенерировать код"
-            with open("qr.png", "wb") as file:
+            with open(file_name, "wb") as file:
                 file.write(response.content)
-            return "qr.png"
+            return file_name
     except Exception as err:
         assert True, f'Не удается подключиться к серверу georeport: {str(err)}'
 
@@ -0,0 +1,4 @@
+"""Сравнение скорости и результатов оптимизированных модулей с прежними реализациями.
+
+Прежние реализации, по которым тесты проверяют новые версии, хранятся в tests.legacy и импортируются оттуда.
+Запуск: python -m benchmarks.<модуль> [параметры]"""
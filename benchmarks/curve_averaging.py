@@ -0,0 +1,48 @@
+"""Сравнение осреднения кривых для PLAXIS (AveragedItemModel.approximate_average из plaxis_average.model
+и AveragedModel.approximate_average из static_loading) с прежней реализацией: точки всех опытов собирались
+в список кортежей, сортировались по ключу и разбивались на сектора словарем в цикле. Время считается для
+смены параметра аппроксимации (точки опытов уже объединены), как при движении ползунка.
+
+Запуск: python -m benchmarks.curve_averaging [число опытов] ..."""
+
+import sys
+import time
+
+import numpy as np
+
+from tests.legacy.curve_averaging import (legacy_plaxis_average, legacy_static_average, plaxis_model, static_model,
+                                          synthetic_tests)
+
+
+def _timeit(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        result = func()
+    return (time.perf_counter() - start) / count, result
+
+
+def run(count: int, repeat: int = 5):
+    test_set = synthetic_tests(count)
+    print(f"\n{count} опытов, время одного пересчета")
+    for approximate_type, param in [("sectors", 500), ("poly", 6)]:
+        model = plaxis_model(test_set, approximate_type, param)
+        model.approximate_average()
+        cases = [("plaxis_average", lambda: legacy_plaxis_average(model), model.approximate_average)]
+
+        model_static = static_model(test_set)
+        model_static.approximate_average(approximate_type, param)
+        cases.append(("static_loading", lambda: legacy_static_average(model_static, approximate_type, param),
+                      lambda: model_static.approximate_average(approximate_type, param)))
+
+        for name, legacy, new in cases:
+            legacy_time, (legacy_strain, legacy_deviator) = _timeit(legacy, repeat)
+            new_time, (new_strain, new_deviator) = _timeit(new, repeat)
+            deviation = max(np.max(np.abs(legacy_strain - new_strain)), np.max(np.abs(legacy_deviator - new_deviator)))
+            print(f"  {name:<15} {approximate_type:<8} было {legacy_time * 1000:8.1f} мс   "
+                  f"стало {new_time * 1000:7.2f} мс   ускорение {legacy_time / max(new_time, 1e-9):6.1f}   "
+                  f"отклонение {deviation:.1e}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [10]:
+        run(n)
@@ -0,0 +1,82 @@
+"""Сравнение скорости и результатов модуля curve_fitting с прежним расчетом (начальное приближение
+differential_evolution + curve_fit) на синтетических кривых резонансной колонки и виброползучести.
+
+Запуск: python -m benchmarks.curve_fitting [число кривых]"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from scipy.optimize import curve_fit, differential_evolution
+
+from general.curve_fitting import fit_hardin_drnevich, fit_log_creep, hardin_drnevich, log_creep
+
+
+def legacy_fit_hardin_drnevich(x, y):
+    def sumOfSquaredError(parameterTuple):
+        warnings.filterwarnings("ignore")
+        val = hardin_drnevich(x, *parameterTuple)
+        return np.sum((x - val) ** 2.0)
+
+    parameterBounds = [[np.min(x), np.max(x)], [np.min(y), np.max(y)]]
+    geneticParameters = differential_evolution(sumOfSquaredError, parameterBounds, seed=3).x
+    popt, pcov = curve_fit(hardin_drnevich, x, y, geneticParameters)
+    return tuple(popt)
+
+
+def legacy_fit_log_creep(t, strain):
+    def sumOfSquaredError(parameterTuple):
+        warnings.filterwarnings("ignore")
+        val = log_creep(t, *parameterTuple)
+        return np.sum((t - val) ** 2.0)
+
+    parameterBounds = [[np.min(t), np.max(t)], [np.min(strain), np.max(strain)]]
+    geneticParameters = differential_evolution(sumOfSquaredError, parameterBounds, seed=3).x
+    popt, pcov = curve_fit(log_creep, t, strain, geneticParameters)
+    return tuple(popt)
+
+
+def synthetic_curves(count: int, seed: int = 0):
+    """Кривые G(gam) резонансной колонки и кривые ползучести с шумом"""
+    rng = np.random.default_rng(seed)
+    curves = []
+    for _ in range(count):
+        gam = np.geomspace(1e-6, 5e-4, 30)
+        threshold = rng.uniform(0.5e-4, 3e-4)
+        G = hardin_drnevich(gam, 0.278 / (0.722 * threshold), rng.uniform(50, 300))
+        G *= 1 + rng.normal(0, 0.005, len(gam))
+
+        t = np.linspace(100, 10000, 2000)
+        strain = log_creep(t, rng.uniform(1e-4, 1e-3), rng.uniform(1e-3, 1e-2)) + rng.normal(0, 1e-5, len(t))
+        curves.append(((gam, G), (t, strain)))
+    return curves
+
+
+def _timeit(func, cases):
+    start = time.perf_counter()
+    results = [func(*case) for case in cases]
+    return time.perf_counter() - start, results
+
+
+def run(count: int):
+    curves = synthetic_curves(count)
+    cases = [
+        ("Гардин - Дрневич", legacy_fit_hardin_drnevich, fit_hardin_drnevich, [rc for rc, _ in curves]),
+        ("ползучесть", legacy_fit_log_creep, fit_log_creep, [creep for _, creep in curves]),
+    ]
+
+    print(f"\n{count} кривых")
+    for name, legacy, new, data in cases:
+        legacy_time, legacy_results = _timeit(legacy, data)
+        new_time, new_results = _timeit(new, data)
+        difference = max(np.max(np.abs(np.array(a) - np.array(b)) / np.abs(np.array(a)))
+                         for a, b in zip(legacy_results, new_results))
+        print(f"  {name:<18} было {legacy_time / count * 1000:9.2f} мс/кривая   "
+              f"стало {new_time / count * 1000:7.3f} мс/кривая   "
+              f"ускорение {legacy_time / max(new_time, 1e-9):8.1f}   отклонение параметров {difference:.1e}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [20]:
+        run(n)
@@ -0,0 +1,105 @@
+"""Сравнение скорости и результатов векторизованных функций general_functions с прежними реализациями.
+
+    find_line_area - синтетические кривые консолидации 500 / 5 000 / 50 000 точек в масштабах
+    квадратного корня и логарифма времени с параметрами define_sqrt_consolidation_points и
+    define_log_consolidation_points
+    discrete_array, array_discreate_noise, create_deviation_curve - эмуляция датчиков и кривые отклонений
+    на массивах 10^6 точек, результаты при одном seed сравниваются побитно
+
+Запуск: python -m benchmarks.general_functions [число точек ...]
+Прежняя реализация find_line_area квадратична по числу точек, на кривых длиннее LEGACY_LIMIT
+она не запускается.
+Запуск только эмуляции датчиков: python -m benchmarks.general_functions --noise [число точек ...]
+Подбор размеров блока подсчета точек find_line_area (LINE_ROWS_BLOCK, LINE_COLUMNS_BLOCK):
+python -m benchmarks.general_functions --blocks [число точек ...]"""
+
+import sys
+import time
+
+import numpy as np
+
+from general import general_functions
+from general.general_functions import find_line_area
+from tests.legacy.general_functions import consolidation_cases, legacy_find_line_area, noise_cases
+
+LEGACY_LIMIT = 5000
+
+
+def _timeit_seeded(func, args, seed: int = 0):
+    args = args()
+    np.random.seed(seed)
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, np.asarray(result)
+
+
+def _bitwise_equal(a, b) -> bool:
+    return a.shape == b.shape and np.array_equal(a.view(np.uint64), b.view(np.uint64))
+
+
+def run_noise(points: int):
+    print(f"\n{points} точек, эмуляция датчиков")
+    for name, legacy, new, args in noise_cases(points):
+        legacy_time, legacy_result = _timeit_seeded(legacy, args)
+        new_time, new_result = _timeit_seeded(new, args)
+        print(f"  {name:<32} было {legacy_time:8.3f} с   стало {new_time:8.3f} с   "
+              f"ускорение {legacy_time / max(new_time, 1e-9):7.1f}   "
+              f"побитно совпадает {_bitwise_equal(legacy_result, new_result)}")
+
+
+def _timeit(func, cases):
+    start = time.perf_counter()
+    results = [func(*case) for case in cases]
+    return time.perf_counter() - start, results
+
+
+def run(points: int):
+    cases = consolidation_cases(points)
+    new_time, new_results = _timeit(find_line_area, cases)
+
+    print(f"\n{points} точек, {len(cases)} вызова find_line_area")
+    if points > LEGACY_LIMIT:
+        print(f"  было           -          стало {new_time:8.3f} с")
+        return
+
+    legacy_time, legacy_results = _timeit(legacy_find_line_area, cases)
+    difference = max(abs(a - b) / abs(a) for legacy, new in zip(legacy_results, new_results)
+                     for a, b in zip(legacy, new))
+    print(f"  было {legacy_time:8.3f} с   стало {new_time:8.3f} с   "
+          f"ускорение {legacy_time / max(new_time, 1e-9):8.1f}   отклонение A, B {difference:.1e}")
+
+
+def run_blocks(points: int, rows_blocks=(64, 256, 1024), columns_blocks=(512, 2048, 8192)):
+    """Время подсчета точек find_line_area при разных размерах блока"""
+    cases = [_count_args(*case) for case in consolidation_cases(points)]
+    defaults = general_functions.LINE_ROWS_BLOCK, general_functions.LINE_COLUMNS_BLOCK
+    print(f"\n{points} точек, {len(cases)} вызова find_line_area, блок прямых x блок точек")
+    for rows_block in rows_blocks:
+        for columns_block in columns_blocks:
+            duration, _ = _timeit(lambda *args: general_functions._line_points_count(
+                *args, rows_block=rows_block, columns_block=columns_block), cases)
+            mark = " (по умолчанию)" if (rows_block, columns_block) == defaults else ""
+            print(f"  {rows_block:5d} x {columns_block:5d}   {duration:8.3f} с{mark}")
+
+
+def _count_args(x, y, d, step, Uslovie):
+    """Аргументы _line_points_count в find_line_area"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    A, B = general_functions._window_lines(x, y, step)
+    min_A = abs(np.min(A))
+    condition, = np.where((np.abs(A) >= Uslovie[0] * min_A) & (np.abs(A) <= Uslovie[1] * min_A))
+    return x, y, A[condition], B[condition], d, condition + step
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--noise"]:
+        for n in [int(arg) for arg in sys.argv[2:]] or [10 ** 6]:
+            run_noise(n)
+    elif sys.argv[1:2] == ["--blocks"]:
+        for n in [int(arg) for arg in sys.argv[2:]] or [5000, 50000]:
+            run_blocks(n)
+    else:
+        for n in [int(arg) for arg in sys.argv[1:]] or [500, 5000, 50000]:
+            run(n)
+        run_noise(10 ** 6)
@@ -0,0 +1,123 @@
+"""Сравнение скорости и результатов векторизованного модуля hysteresis с прежними поточечными реализациями
+методов ModelTriaxialCyclicLoading на синтетических записях 10 000 / 100 000 / 1 000 000 точек.
+
+Запуск: python -m benchmarks.hysteresis [число точек ...]
+Прежние реализации на 1 000 000 точек выполняются десятки секунд."""
+
+import sys
+import time
+
+import numpy as np
+
+from cyclic_loading import hysteresis
+
+
+def legacy_find_to_positive_zero_crossings(x):
+    zero_crossings_indexes = []
+    for i in range(1, len(x) - 1):
+        if (x[i] <= x[0]) and (x[i + 1] > x[0]):
+            zero_crossings_indexes.append(i + 1)
+    if x[-1] < 0:
+        zero_crossings_indexes.append(len(x) - 1)
+    return len(zero_crossings_indexes), zero_crossings_indexes
+
+
+def legacy_trend_decomposition(x, season, smooth_ending=True):
+    x = np.asarray(x)
+
+    def even_moving_average(_x, _season):
+        periods = int(_season / 2)
+        return [np.mean([_x[t + j] for j in range(-periods, periods)]) for t in
+                range(periods, len(_x) - periods + 1)]
+
+    def odd_moving_average(_x, _season):
+        periods = int((_season - 1) / 2)
+        return [np.mean([_x[t + j] for j in range(-periods, periods + 1)]) for t in
+                range(periods, len(_x) - periods)]
+
+    if season % 2 == 0:
+        _series = even_moving_average(x, season)
+        _series = even_moving_average(_series, 2)
+        left_values = x[-int(season):]
+    else:
+        _series = odd_moving_average(x, season)
+        left_values = x[-int(season) + 1:]
+
+    if smooth_ending:
+        while len(left_values) > season / 2:
+            _series.append(np.mean(left_values))
+            left_values = np.delete(left_values, 0)
+
+    return np.array(_series)
+
+
+def legacy_define_mean_loop(strain, deviator, loops_indexes):
+    loops_count = len(loops_indexes) - 1
+    deviator_loops = [deviator[loops_indexes[i]:loops_indexes[i + 1] + 1] for i in range(loops_count)]
+    strain_loops = [strain[loops_indexes[i]:loops_indexes[i + 1] + 1] for i in range(loops_count)]
+    min_loop_length = min([loops_indexes[i + 1] - loops_indexes[i] + 1 for i in range(loops_count)])
+    mean_deviator_loop = [np.mean([deviator_loops[i][j] for i in range(loops_count)]) for j in
+                          range(min_loop_length)]
+    mean_strain_loop = [np.mean([strain_loops[i][j] for i in range(loops_count)]) for j in range(min_loop_length)]
+    return np.array(mean_strain_loop), np.array(mean_deviator_loop)
+
+
+def legacy_square_under_line(x, y):
+    square = 0
+    for i in range(len(x) - 1):
+        a = (x[i + 1] - x[i])
+        low_side = min([y[i + 1], y[i]])
+        delta = abs(y[i + 1] - y[i])
+        square += a * (low_side + 0.5 * delta)
+    return square
+
+
+def synthetic_record(points: int, points_in_cycle: int = 40, seed: int = 0):
+    """Девиатор и деформации с петлями гистерезиса, накоплением пластических деформаций и шумом"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(points) / points_in_cycle * 2 * np.pi
+    deviator = 100 * np.sin(t) + rng.normal(0, 1, points)
+    strain = 0.01 * np.sin(t - 0.3) + 1e-6 * np.arange(points) + rng.normal(0, 1e-4, points)
+    return strain, deviator
+
+
+def _timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _same(legacy_result, new_result) -> bool:
+    if isinstance(legacy_result, tuple):
+        return all(_same(a, b) for a, b in zip(legacy_result, new_result))
+    return np.shape(legacy_result) == np.shape(new_result) and \
+        np.allclose(legacy_result, new_result, rtol=1e-9, atol=1e-12)
+
+
+def run(points: int, season: int = 40):
+    strain, deviator = synthetic_record(points, points_in_cycle=season)
+
+    cases = [
+        ("zero crossings", legacy_find_to_positive_zero_crossings, hysteresis.find_to_positive_zero_crossings,
+         (deviator,)),
+        ("trend (even)", legacy_trend_decomposition, hysteresis.trend_decomposition, (strain, season)),
+        ("trend (odd)", legacy_trend_decomposition, hysteresis.trend_decomposition, (strain, season - 1)),
+    ]
+
+    _, (_, loops_indexes) = _timeit(hysteresis.find_to_positive_zero_crossings, deviator)
+    cases.append(("mean loop", legacy_define_mean_loop, hysteresis.define_mean_loop,
+                  (strain, deviator, loops_indexes)))
+    cases.append(("square under line", legacy_square_under_line, hysteresis.square_under_line, (strain, deviator)))
+
+    print(f"\n{points} точек")
+    for name, legacy, vectorized, args in cases:
+        legacy_time, legacy_result = _timeit(legacy, *args)
+        new_time, new_result = _timeit(vectorized, *args)
+        equal = _same(legacy_result, new_result)
+        print(f"  {name:<18} было {legacy_time:9.4f} с   стало {new_time:9.5f} с   "
+              f"ускорение {legacy_time / max(new_time, 1e-9):9.1f}   совпадение {equal}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]:
+        run(n)
@@ -0,0 +1,50 @@
+"""Сравнение наложения шумов на прямолинейный участок K0 (ModelK0SoilTest.lse_faker_mc, lse_faker_hs)
+с прежней реализацией, где каждый вызов функции оптимизации выполнял полный define_k0 (curve_fit или МНК
+для каждого участка кривой), а ограничения строились списками. Для каждого набора кривых считается время
+и число результатов, для которых define_k0 не возвращает заданный K0nc.
+
+Запуск: python -m benchmarks.k0_noise [число кривых]"""
+
+import sys
+import time
+
+import numpy as np
+
+from k0_test.triaxial_k0_model import ModelK0, ModelK0SoilTest
+from tests.legacy.k0_noise import k0_curve, legacy_lse_faker_hs, legacy_lse_faker_mc
+
+
+def mc(faker, K0nc, sigma_1, sigma_3):
+    sigma_1, sigma_3 = faker(sigma_1, sigma_3, K0nc)
+    return ModelK0.define_k0(sigma_1, sigma_3)[0] != K0nc
+
+
+def hs(faker, K0nc, sigma_1_line, sigma_3_line, sigma_1_spl, sigma_3_spl):
+    sigma_1, sigma_3 = faker(sigma_1_line, sigma_3_line, sigma_1_spl, sigma_3_spl, K0nc)
+    return ModelK0.define_k0(sigma_1, sigma_3, is_hs_model=True)[0] != K0nc
+
+
+def _timeit(func, faker, curves):
+    np.random.seed(1)
+    start = time.perf_counter()
+    errors = sum(func(faker, *curve) for curve in curves)
+    return (time.perf_counter() - start) / len(curves), errors
+
+
+def run(count: int):
+    print(f"\n{count} кривых, время одной кривой")
+    for name, func, legacy, new, is_hs_model in [
+            ("МК", mc, legacy_lse_faker_mc, ModelK0SoilTest.lse_faker_mc, False),
+            ("HS", hs, legacy_lse_faker_hs, ModelK0SoilTest.lse_faker_hs, True)]:
+        np.random.seed(0)
+        curves = [k0_curve(is_hs_model) for _ in range(count)]
+        legacy_time, legacy_errors = _timeit(func, legacy, curves)
+        new_time, new_errors = _timeit(func, new, curves)
+        print(f"  {name:<3} было {legacy_time * 1000:8.1f} мс ({legacy_errors} с ошибкой K0)   "
+              f"стало {new_time * 1000:8.1f} мс ({new_errors} с ошибкой K0)   "
+              f"ускорение {legacy_time / max(new_time, 1e-9):5.1f}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [20]:
+        run(n)
@@ -0,0 +1,39 @@
+"""Сравнение формирования ступеней ступенчатого режима K0 (ModelK0SoilTest._form_step_data, _form_ur_data)
+с прежней реализацией: каждая ступень строилась отдельными массивами и присоединялась к накопленным через
+np.hstack, действия хранились строками. Опыты по 20 ступеней нагружения (K0) и с 20 ступенями разгрузки (K0-UR).
+Проверяется, что при одном зерне генератора результаты совпадают.
+
+Запуск: python -m benchmarks.k0_stages [число опытов]"""
+
+import sys
+import time as timer
+
+import numpy as np
+
+from tests.legacy.k0_stages import compare, k0_test, legacy_test, new_test
+
+
+def _timeit(func, count, points):
+    start = timer.perf_counter()
+    for _ in range(count):
+        func(*points)
+    return (timer.perf_counter() - start) / count
+
+
+def run(count: int):
+    print(f"\n{count} опытов, время одного опыта")
+    for ur in [False, True]:
+        np.random.seed(0)
+        points = k0_test(ur=ur)
+        legacy_time = _timeit(legacy_test, count, points)
+        new_time = _timeit(new_test, count, points)
+        s1, s3, time, action = compare(0, ur)
+        name = "K0-UR" if ur else "K0"
+        print(f"  {name:<6} было {legacy_time * 1000:7.1f} мс   стало {new_time * 1000:7.1f} мс   "
+              f"ускорение {legacy_time / max(new_time, 1e-9):5.1f}   "
+              f"отклонение сигма1 {s1:.1e} сигма3 {s3:.1e} время {time:.1e} действия {'совпадают' if action else 'различаются'}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [20]:
+        run(n)
@@ -0,0 +1,46 @@
+"""Сравнение генерации шума кругов мора ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles с прежней
+реализацией (SLSQP с численными производными, ограничения списками, пересчет c и fi через mohr_cf_stab).
+Для каждого набора кругов считается время, число отказов (исключение или ошибка подбора больше допустимой)
+и отклонение c и fi по зашумленным кругам от заданных.
+
+Запуск: python -m benchmarks.mohr_noise [число наборов кругов]"""
+
+import sys
+import time
+
+import numpy as np
+
+from static_loading.mohr_circles_test_model import ModelMohrCirclesSoilTest
+from tests.legacy.mohr_noise import deviation, legacy_new_noise_for_mohrs_circles, synthetic_circles
+
+
+def _timeit(func, circles, seed=0, **kwargs):
+    np.random.seed(seed)
+    failures = 0
+    deviations = []
+    start = time.perf_counter()
+    for sigma3, sigma1, fi, c in circles:
+        try:
+            qf = func(sigma3, sigma1, fi, c, **kwargs)
+        except (AssertionError, RuntimeWarning):
+            failures += 1
+            continue
+        deviations.append(deviation(sigma3, qf, fi, c))
+    return time.perf_counter() - start, failures, np.max(deviations, axis=0)
+
+
+def run(count: int):
+    circles = synthetic_circles(count)
+    print(f"\n{count} наборов кругов")
+    for name, func, kwargs in [("было", legacy_new_noise_for_mohrs_circles, {}),
+                               ("стало", ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles, {}),
+                               ("стало, 4 варианта", ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles,
+                                {"starts": 4})]:
+        duration, failures, (c_deviation, fi_deviation) = _timeit(func, circles, **kwargs)
+        print(f"  {name:<18} {duration:7.2f} с   отказов {failures:3d}   "
+              f"макс. отклонение c {c_deviation:6.2f} кПа, fi {fi_deviation:5.2f} град.")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [200]:
+        run(n)
@@ -0,0 +1,81 @@
+"""Время определения свойств проб по синтетической ведомости (по умолчанию 500 строк).
+
+Первый проход - с пустым кэшем таблиц (первое чтение ведомости), второй - повторное чтение той же ведомости
+с другим режимом опыта. Сравнение с прежней реализацией: запуск этого же скрипта на прежней версии
+properties_model (функция clear_properties_cache там отсутствует, кэш не сбрасывается).
+
+Запуск: python -m benchmarks.properties [число строк]"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from excel_statment import properties_model
+from excel_statment.position_configs import PhysicalPropertyPosition, c_fi_E_PropertyPosition
+from excel_statment.properties_model import PhysicalProperties, MechanicalProperties
+
+
+def synthetic_statment(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Ведомость с физическими свойствами и параметрами c, fi, E для трехосного сжатия"""
+    rng = np.random.default_rng(seed)
+    data = np.full((rows, 256), np.nan, dtype=object)
+
+    def column(name):
+        return PhysicalPropertyPosition[name][1]
+
+    for i in range(rows):
+        data[i, column("laboratory_number")] = f"{i + 1}-1"
+        data[i, column("borehole")] = str(i // 10 + 1)
+        data[i, column("depth")] = np.round(rng.uniform(1, 30), 1)
+        data[i, column("soil_name")] = "Суглинок"
+        data[i, column("ige")] = str(i % 7 + 1)
+        data[i, column("rs")] = 2.71
+        data[i, column("r")] = np.round(rng.uniform(1.8, 2.1), 2)
+        # Значения из сетки типовых ведомостей: свойства повторяются в пределах ИГЭ
+        data[i, column("e")] = np.round(rng.choice(np.linspace(0.45, 0.95, 11)), 3)
+        data[i, column("W")] = np.round(rng.uniform(15, 30), 1)
+        if rng.random() > 0.3:
+            data[i, column("Ip")] = np.round(rng.choice(np.linspace(3, 25, 12)), 1)
+            data[i, column("Il")] = np.round(rng.choice(np.linspace(-0.2, 1.1, 14)), 2)
+        else:
+            for name, value in [("granulometric_2", 5.), ("granulometric_1", 20.), ("granulometric_05", 40.),
+                                ("granulometric_025", 20.), ("granulometric_01", 15.)]:
+                data[i, column(name)] = value
+
+        for mode in ["Трёхосное сжатие (F, C, E)", "Трёхосное сжатие (E)"]:
+            c, fi, E = c_fi_E_PropertyPosition[mode][1]
+            data[i, c] = np.round(rng.uniform(0.01, 0.05), 3)
+            data[i, fi] = np.round(rng.uniform(15, 35), 1)
+            data[i, E] = np.round(rng.uniform(10, 40), 1)
+
+    return pd.DataFrame(data)
+
+
+def read_properties(data_frame: pd.DataFrame, test_mode: str):
+    np.random.seed(0)
+    for string in range(len(data_frame)):
+        physical_properties = PhysicalProperties()
+        physical_properties.defineProperties(data_frame, string)
+        MechanicalProperties().defineProperties(physical_properties, data_frame, string, test_mode=test_mode,
+                                                K0_mode="K0: По ГОСТ-56353-2022")
+
+
+def run(rows: int):
+    data_frame = synthetic_statment(rows)
+
+    if hasattr(properties_model, "clear_properties_cache"):
+        properties_model.clear_properties_cache()
+
+    print(f"\n{rows} строк")
+    for name, test_mode in [("первое чтение", "Трёхосное сжатие (F, C, E)"),
+                            ("повторное чтение", "Трёхосное сжатие (E)")]:
+        start = time.perf_counter()
+        read_properties(data_frame, test_mode)
+        print(f"  {name:<18} {time.perf_counter() - start:8.3f} с")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [500]:
+        run(n)
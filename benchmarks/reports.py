@@ -0,0 +1,36 @@
+"""Сравнение времени построения протоколов с прежним порядком работы general.reports: шрифты регистрируются
+и qr код лаборатории разбирается в каждом протоколе, рамка страницы строится на каждой странице заново.
+Прежний порядок воспроизводится сбросом кэша (clear_report_cache) перед каждым протоколом и построением
+неизменяемых элементов без Form XObject.
+
+Запуск: python -m benchmarks.reports [число протоколов]"""
+
+import sys
+import time
+
+from tests.legacy.reports import QR_CODE, legacy_report, report
+
+
+def _timeit(func, count, *args):
+    start = time.perf_counter()
+    sizes = [len(func(*args)) for _ in range(count)]
+    return (time.perf_counter() - start) / count, sum(sizes) / count
+
+
+def run(count: int):
+    # Первый протокол процесса в обоих случаях разбирает файлы оформления
+    report(1)
+    print(f"\n{count} протоколов, время одного протокола")
+    for pages in [1, 10]:
+        for qr_code in [None, QR_CODE]:
+            legacy_time, legacy_size = _timeit(legacy_report, count, pages, qr_code)
+            new_time, new_size = _timeit(report, count, pages, qr_code)
+            name = f"{pages} стр.{' с qr' if qr_code else ''}"
+            print(f"  {name:<12} было {legacy_time * 1000:8.1f} мс {legacy_size / 1024:7.0f} КБ   "
+                  f"стало {new_time * 1000:8.1f} мс {new_size / 1024:7.0f} КБ   "
+                  f"ускорение {legacy_time / max(new_time, 1e-9):5.1f}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [20]:
+        run(n)
@@ -0,0 +1,88 @@
+"""Сравнение передачи сообщений прогресса с прежним порядком работы thrd.socket_thd: новое TCP соединение
+на каждое сообщение и прием сообщений по одному на соединение.
+
+Запуск: python -m benchmarks.socket_thd [число сообщений]"""
+
+import pickle
+import socket
+import sys
+import threading
+import time
+
+from thrd.socket_thd import BUFFER_SIZE, ProgressServer, progress_channel, send_to_server
+
+
+def legacy_send_to_server(port, data):
+    if port:
+        sock = socket.socket()
+        sock.connect(('localhost', port))
+        sock.sendall(pickle.dumps(data))
+        sock.close()
+
+
+def legacy_server(sock, messages):
+    while True:
+        conn, addr = sock.accept()
+        all_data = bytearray()
+        while True:
+            data = conn.recv(BUFFER_SIZE)
+            if not data:
+                break
+            all_data += data
+        data = pickle.loads(all_data)
+        messages.append(data)
+        if data.get("break", None):
+            conn.close()
+            break
+
+
+def legacy(count: int):
+    sock = socket.socket()
+    sock.bind(('', 0))
+    sock.listen(10)
+    port = sock.getsockname()[1]
+    messages = []
+    thread = threading.Thread(target=legacy_server, args=(sock, messages))
+    thread.start()
+    for i in range(count):
+        legacy_send_to_server(port, {"value": i + 1})
+    legacy_send_to_server(port, {"break": True})
+    thread.join()
+    sock.close()
+    return messages
+
+
+def channel(count: int):
+    server = ProgressServer(0)
+    messages = []
+    thread = threading.Thread(target=server.serve, args=(lambda message: messages.append(message) or
+                                                         message.get("break", False),))
+    thread.start()
+    for i in range(count):
+        send_to_server(server.port, {"value": i + 1})
+    send_to_server(server.port, {"break": True})
+    thread.join()
+    server.close()
+    progress_channel(server.port).close()
+    return messages
+
+
+def _timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def run(count: int):
+    legacy_time, legacy_messages = _timeit(legacy, count)
+    new_time, new_messages = _timeit(channel, count)
+    last = [message.get("value") for message in new_messages if message.get("value")][-1]
+    print(f"\n{count} сообщений")
+    print(f"  было  {legacy_time * 1000:8.1f} мс, принято {len(legacy_messages)}")
+    print(f"  стало {new_time * 1000:8.1f} мс, принято {len(new_messages)}, последнее значение {last}")
+    print(f"  ускорение {legacy_time / max(new_time, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [100, 1000]:
+        run(n)
@@ -0,0 +1,40 @@
+"""Сравнение записи результатов проб в ведомость с прежним порядком работы set_cell_data: загрузка и
+сохранение всей книги на каждую ячейку. Записываются 16 ячеек на пробу (как при сохранении циклического опыта),
+файл сохраняется после каждой пробы.
+
+Запуск: python -m benchmarks.statment_writer [число строк ведомости]"""
+
+import os
+import sys
+import tempfile
+import time
+
+from tests.legacy.statment_writer import CELLS, legacy, session, synthetic_statment
+
+# Число записываемых проб
+SAMPLES = 5
+
+
+def _timeit(func, path, samples):
+    start = time.perf_counter()
+    func(path, samples)
+    return time.perf_counter() - start
+
+
+def run(rows: int):
+    print(f"\nВедомость {rows} строк, {SAMPLES} проб по {CELLS} ячеек")
+    samples = [7 + i * rows // SAMPLES for i in range(SAMPLES)]
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ["xlsx", "xls"]:
+            times = []
+            for func in [legacy, session]:
+                path = os.path.join(directory, f"{func.__name__}.{extension}")
+                synthetic_statment(path, rows)
+                times.append(_timeit(func, path, samples))
+            print(f"  {extension:<5} было {times[0]:7.2f} с   стало {times[1]:7.2f} с   "
+                  f"ускорение {times[0] / max(times[1], 1e-9):5.1f}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [300]:
+        run(n)
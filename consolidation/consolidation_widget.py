@@ -364,7 +364,7 @@ class ConsolidationSoilTestApp(AppMixin,QWidget):
             statment.save([Consolidation_models],
                           [f"{models}{statment.general_data.get_shipment_number()}.pickle"])
             Consolidation_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"))
+                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
@@ -504,7 +504,7 @@ class ConsolidationSoilTestApp(AppMixin,QWidget):
             statment.save([Consolidation_models],
                           [f"{models}{statment.general_data.get_shipment_number()}.pickle"])
             Consolidation_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"))
+                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
@@ -559,7 +559,7 @@ class ConsolidationSoilTestApp(AppMixin,QWidget):
             statment.save([Consolidation_models],
                           [f"{models}{statment.general_data.get_shipment_number()}.pickle"])
             Consolidation_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"))
+                                                   f"{models}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
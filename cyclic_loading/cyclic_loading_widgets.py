@@ -22,7 +22,7 @@ from excel_statment.initial_tables import LinePhysicalProperties
 from general.save_widget import Save_Dir
 from general.report_general_statment import save_report
 from excel_statment.initial_statment_widgets import CyclicStatment
-from excel_statment.functions import write_to_excel, set_cell_data
+from excel_statment.functions import write_to_excel, statment_writer
 from excel_statment.initial_tables import TableVertical
 from loggers.logger import app_logger, log_this, handler
 from singletons import Cyclic_models, statment
@@ -39,6 +39,7 @@ from authentication.request_qr import request_qr
 from authentication.control import control
 from metrics.session_writer import SessionWriter
 from general.movie_label import Loader
+from general.regeneration import ModelRegeneration, finish_all
 
 class CyclicProcessingWidget(QWidget):
     """Виджет для открытия и обработки файла прибора. Связывает классы ModelTriaxialCyclicLoading_FileOpenData и
@@ -142,6 +143,10 @@ class CyclicSoilTestWidget(TabMixin, QWidget):
         self.test_widget.sliders_widget.csr_button.clicked.connect(self._csr)
 #        self.screen_button.clicked.connect(self._screenshot)
 
+        self.regeneration = ModelRegeneration(self)
+        self.regeneration.ready.connect(self._model_regenerated)
+        self._cycles_count_changed = False
+
     def _create_Ui(self):
         self.layout = QHBoxLayout(self)
         self.layout_1 = QVBoxLayout()
@@ -176,32 +181,41 @@ class CyclicSoilTestWidget(TabMixin, QWidget):
     @log_this(app_logger, "debug")
     def _sliders_strain(self, param):
         try:
-            Cyclic_models[statment.current_test].set_strain_params(param)
-            self._plot()
-            self.signal.emit()
+            self.regeneration.submit(statment.current_test, Cyclic_models[statment.current_test], "strain",
+                                     lambda model: model.set_strain_params(param))
         except KeyError:
             pass
 
     @log_this(app_logger, "debug")
     def _sliders_PPR(self, param):
         try:
-            Cyclic_models[statment.current_test].set_PPR_params(param)
-            self._plot()
-            self.signal.emit()
+            self.regeneration.submit(statment.current_test, Cyclic_models[statment.current_test], "PPR",
+                                     lambda model: model.set_PPR_params(param))
         except KeyError:
             pass
 
     @log_this(app_logger, "debug")
     def _sliders_cycles_count(self, param):
         try:
-            Cyclic_models[statment.current_test].set_cycles_count(param["cycles_count"])
-            strain_params, ppr_params, cycles_count_params = Cyclic_models[statment.current_test].get_draw_params()
-            self.test_widget.sliders_widget.set_sliders_params(strain_params, ppr_params, cycles_count_params, True)
-            self._plot()
-            self.signal.emit()
+            self.regeneration.submit(statment.current_test, Cyclic_models[statment.current_test], "cycles_count",
+                                     lambda model: model.set_cycles_count(param["cycles_count"]))
+            self._cycles_count_changed = True
         except KeyError:
             pass
 
+    def _model_regenerated(self, key, model):
+        """Подстановка пересчитанной в фоновом потоке модели"""
+        Cyclic_models[key] = model
+        if key == statment.current_test:
+            if self._cycles_count_changed:
+                # Границы слайдеров зависят от числа циклов
+                strain_params, ppr_params, cycles_count_params = model.get_draw_params()
+                self.test_widget.sliders_widget.set_sliders_params(strain_params, ppr_params, cycles_count_params,
+                                                                   True)
+            self._plot()
+            self.signal.emit()
+        self._cycles_count_changed = False
+
     def _csr(self):
         try:
             model = GeneralLiquefactionModel()
@@ -224,6 +238,7 @@ class CyclicSoilTestWidget(TabMixin, QWidget):
         self._plot()
 
     def refresh(self):
+        self.regeneration.cancel(statment.current_test)
         Cyclic_models[statment.current_test].set_test_params()
         strain_params, ppr_params, cycles_count_params = Cyclic_models[statment.current_test].get_draw_params()
         self.test_widget.sliders_widget.set_sliders_params(strain_params, ppr_params, cycles_count_params, True)
@@ -616,12 +631,12 @@ class CyclicSoilTestApp(AppMixin, QWidget):
              "t_rel": "Отчет о снижении прочности при динамическом воздействии"
              },
             result_table_params={
-            "Макс. PPR": lambda lab: Cyclic_models[lab].get_test_results()['max_PPR'],
-            "Макс. деформ.": lambda lab: Cyclic_models[lab].get_test_results()['max_strain'],
-            "Цикл разрушения": lambda lab: Cyclic_models[lab].get_test_results()['fail_cycle'],
-            "t_max_dynamic/t_max_static": lambda lab: np.round(Cyclic_models[lab].get_test_results()['t_rel_dynamic'] / Cyclic_models[lab].get_test_results()['t_rel_static'], 2),
-            "Коэффициент демпфирования": lambda lab: Cyclic_models[lab].get_test_results()['damping_ratio'],
-            "Заключение": lambda lab: Cyclic_models[lab].get_test_results()['conclusion'],
+            "Макс. PPR": lambda lab: Cyclic_models.get_test_results(lab)['max_PPR'],
+            "Макс. деформ.": lambda lab: Cyclic_models.get_test_results(lab)['max_strain'],
+            "Цикл разрушения": lambda lab: Cyclic_models.get_test_results(lab)['fail_cycle'],
+            "t_max_dynamic/t_max_static": lambda lab: np.round(Cyclic_models.get_test_results(lab)['t_rel_dynamic'] / Cyclic_models.get_test_results(lab)['t_rel_static'], 2),
+            "Коэффициент демпфирования": lambda lab: Cyclic_models.get_test_results(lab)['damping_ratio'],
+            "Заключение": lambda lab: Cyclic_models.get_test_results(lab)['conclusion'],
         },  qr={"state": True})
 
         self.tab_3.popIn.connect(self.addTab)
@@ -675,6 +690,7 @@ class CyclicSoilTestApp(AppMixin, QWidget):
                              message_port=7787, parent=self)
 
     def keyPressEvent(self, event):
+        finish_all()
         if statment.current_test:
             list = [x for x in statment]
             index = list.index(statment.current_test)
@@ -696,10 +712,11 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             print(err)
 
     def save_pickle(self):
+        finish_all()
         try:
             statment.save([Cyclic_models], [f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"])
             Cyclic_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
@@ -712,10 +729,11 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             if dialog.exec() == QDialog.Accepted:
                 Cyclic_models.generateTests()
                 Cyclic_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"))
+                                                f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 app_logger.info("Новые параметры ведомости и модели сохранены")
 
     def save_report(self, save_all_mode = False):
+        finish_all()
 
         def check_none(s):
             if s:
@@ -891,43 +909,47 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             shutil.copy(file_name, statment.save_dir.report_directory + "/" + file_name[len(file_name) -
                                                                                  file_name[::-1].index("/"):])
 
-            set_cell_data(self.tab_1.path, ("HY5", (5, 232)), "Сигма1, кПа", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HZ5", (5, 233)), "Сигма3, кПа", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IA5", (5, 234)), "Тау, кПа", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IB5", (5, 235)), "K0", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IC5", (5, 236)), "Частота, Гц", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("ID5", (5, 237)), "Цикл разрушения", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IU5", (5, 254)), "t_max_static", sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IV5", (5, 255)), "t_max_dynamic", sheet="Лист1")
+            # Ячейки пробы записываются в ведомость одним сохранением
+            writer = statment_writer(self.tab_1.path)
+            writer.set_cell_data(("HY5", (5, 232)), "Сигма1, кПа", sheet="Лист1")
+            writer.set_cell_data(("HZ5", (5, 233)), "Сигма3, кПа", sheet="Лист1")
+            writer.set_cell_data(("IA5", (5, 234)), "Тау, кПа", sheet="Лист1")
+            writer.set_cell_data(("IB5", (5, 235)), "K0", sheet="Лист1")
+            writer.set_cell_data(("IC5", (5, 236)), "Частота, Гц", sheet="Лист1")
+            writer.set_cell_data(("ID5", (5, 237)), "Цикл разрушения", sheet="Лист1")
+            writer.set_cell_data(("IU5", (5, 254)), "t_max_static", sheet="Лист1")
+            writer.set_cell_data(("IV5", (5, 255)), "t_max_dynamic", sheet="Лист1")
 
 
             number = statment[statment.current_test].physical_properties.sample_number + 7
 
-            set_cell_data(self.tab_1.path, ("HW" + str(number), (number, 230)), round(test_result['max_strain'], 3),
-                          sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HX" + str(number), (number, 231)), round(test_result['max_PPR'], 3),
-                          sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HY" + str(number), (number, 232)),
-                          round(statment[statment.current_test].mechanical_properties.sigma_1, 3), sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HZ" + str(number), (number, 233)),
-                          round(float(statment[statment.current_test].mechanical_properties.sigma_3), 3), sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IA" + str(number), (number, 234)),
-                          round(statment[statment.current_test].mechanical_properties.t, 3), sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IB" + str(number), (number, 235)),
-                          round(statment[statment.current_test].mechanical_properties.K0, 3), sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IC" + str(number), (number, 236)),
-                          statment[statment.current_test].mechanical_properties.frequency, sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("ID" + str(number), (number, 237)), test_result["fail_cycle"],
-                          sheet="Лист1")
-
-            set_cell_data(self.tab_1.path, ("IE" + str(number), (number, 254)), results["t_max_static"],
-                          sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("IF" + str(number), (number, 255)), results["t_max_dynamic"],
-                          sheet="Лист1")
+            writer.set_cell_data(("HW" + str(number), (number, 230)), round(test_result['max_strain'], 3),
+                                 sheet="Лист1")
+            writer.set_cell_data(("HX" + str(number), (number, 231)), round(test_result['max_PPR'], 3),
+                                 sheet="Лист1")
+            writer.set_cell_data(("HY" + str(number), (number, 232)),
+                                 round(statment[statment.current_test].mechanical_properties.sigma_1, 3), sheet="Лист1")
+            writer.set_cell_data(("HZ" + str(number), (number, 233)),
+                                 round(float(statment[statment.current_test].mechanical_properties.sigma_3), 3), sheet="Лист1")
+            writer.set_cell_data(("IA" + str(number), (number, 234)),
+                                 round(statment[statment.current_test].mechanical_properties.t, 3), sheet="Лист1")
+            writer.set_cell_data(("IB" + str(number), (number, 235)),
+                                 round(statment[statment.current_test].mechanical_properties.K0, 3), sheet="Лист1")
+            writer.set_cell_data(("IC" + str(number), (number, 236)),
+                                 statment[statment.current_test].mechanical_properties.frequency, sheet="Лист1")
+            writer.set_cell_data(("ID" + str(number), (number, 237)), test_result["fail_cycle"],
+                                 sheet="Лист1")
+
+            writer.set_cell_data(("IE" + str(number), (number, 254)), results["t_max_static"],
+                                 sheet="Лист1")
+            writer.set_cell_data(("IF" + str(number), (number, 255)), results["t_max_dynamic"],
+                                 sheet="Лист1")
 
             if statment.general_parameters.test_mode == "Демпфирование":
-                set_cell_data(self.tab_1.path, ("HM" + str(number), (number, 220)), test_result["damping_ratio"],
-                              sheet="Лист1")
+                writer.set_cell_data(("HM" + str(number), (number, 220)), test_result["damping_ratio"],
+                                     sheet="Лист1")
+
+            writer.flush()
 
 
             if self.save_massage:
@@ -969,6 +991,7 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             return False, f'{str(error)}'
 
     def save_all_reports(self):
+        finish_all()
 
         if self.loader.is_running:
             QMessageBox.critical(self, "Ошибка", "Закройте окно сохранения")
@@ -980,7 +1003,7 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
         Cyclic_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
         try:
             statment.save_dir.clear_dirs()
@@ -1022,10 +1045,12 @@ class CyclicSoilTestApp(AppMixin, QWidget):
         SessionWriter.write_session(len(statment))
 
     def jornal(self):
+        finish_all()
         self.dialog = TestsLogWidget(dynamic, TestsLogCyclic, self.tab_1.path)
         self.dialog.show()
 
     def general_statment(self):
+        finish_all()
         try:
             s = statment.general_data.path
         except:
@@ -1061,7 +1086,7 @@ class CyclicSoilTestApp(AppMixin, QWidget):
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
         Cyclic_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"cyclic_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
         try:
             self.save_report()
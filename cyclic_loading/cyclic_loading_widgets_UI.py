@@ -17,10 +17,11 @@ from matplotlib.patches import Rectangle
 import os
 import numpy as np
 import sys
-from io import BytesIO
 
 from general.initial_tables import Table
 from general.general_widgets import Float_Slider
+from general.regeneration import debounce_timer
+from general.plotting import PersistentPlot, render_to_file
 from configs.plot_params import plotter_params
 from general.general_functions import read_json_file, create_json_file
 from configs.styles import style
@@ -123,6 +124,7 @@ class CyclicLoadingUI(QWidget):
         ax.set_xlabel(params["label_x"])
         ax.set_ylabel(params["label_y"])
         canvas.draw()
+        setattr(self, "{name_widget}_plot".format(name_widget=name), PersistentPlot(figure, canvas))
 
         chart_frame_layout.setSpacing(0)
         chart_frame_layout.addWidget(canvas)
@@ -163,38 +165,35 @@ class CyclicLoadingUI(QWidget):
     def plot(self, plot_data, results):
         """Построение графиков опыта"""
         try:
-            self.strain_ax.clear()
-            self.strain_ax.set_xlabel(self.strain_params["label_x"])
-            self.strain_ax.set_ylabel(self.strain_params["label_y"])
-
-            self.PPR_ax.clear()
-            self.PPR_ax.set_xlabel(self.PPR_params["label_x"])
-            self.PPR_ax.set_ylabel(self.PPR_params["label_y"])
-
-            self.stress_ax.clear()
-            self.stress_ax.set_xlabel(self.stress_params["label_x"])
-            self.stress_ax.set_ylabel(self.stress_params["label_y"])
+            for name in ["strain", "PPR", "stress"]:
+                if getattr(self, name + "_plot").begin(name):
+                    ax = getattr(self, name + "_ax")
+                    params = getattr(self, name + "_params")
+                    ax.clear()
+                    ax.set_xlabel(params["label_x"])
+                    ax.set_ylabel(params["label_y"])
 
             self.strain_ax.set_ylim(plot_data["strain_lim"])
             self.PPR_ax.set_ylim(plot_data["PPR_lim"])
 
-
-            self.strain_ax.plot(plot_data["cycles"], plot_data["strain"])
-            self.PPR_ax.plot(plot_data["cycles"], plot_data["PPR"])
-            self.stress_ax.plot(plot_data["mean_effective_stress"], plot_data["deviator"] / 2)
+            self.strain_plot.line(self.strain_ax, "strain", plot_data["cycles"], plot_data["strain"])
+            self.PPR_plot.line(self.PPR_ax, "PPR", plot_data["cycles"], plot_data["PPR"])
+            self.stress_plot.line(self.stress_ax, "stress", plot_data["mean_effective_stress"],
+                                  plot_data["deviator"] / 2)
 
             if hasattr(self, "deviator_canvas_frame"):
                 if self.deviator_canvas_frame is not None:
-                    self.deviator_ax.clear()
-                    self.deviator_ax.grid()
-                    self.deviator_ax.set_xlabel(self.deviator_params["label_x"])
-                    self.deviator_ax.set_ylabel(self.deviator_params["label_y"])
-                    self.deviator_ax.plot(plot_data["cycles"], plot_data["deviator"])
-                    self.deviator_canvas.draw()
-
-            self.strain_canvas.draw()
-            self.PPR_canvas.draw()
-            self.stress_canvas.draw()
+                    if self.deviator_plot.begin("deviator"):
+                        self.deviator_ax.clear()
+                        self.deviator_ax.grid()
+                        self.deviator_ax.set_xlabel(self.deviator_params["label_x"])
+                        self.deviator_ax.set_ylabel(self.deviator_params["label_y"])
+                    self.deviator_plot.line(self.deviator_ax, "deviator", plot_data["cycles"], plot_data["deviator"])
+                    self.deviator_plot.finish()
+
+            self.strain_plot.finish()
+            self.PPR_plot.finish()
+            self.stress_plot.finish()
 
             self._fill_result_table(results)
 
@@ -204,17 +203,7 @@ class CyclicLoadingUI(QWidget):
     def save_canvas(self, format_="svg"):
         """Сохранение графиков для передачи в отчет"""
         def save(figure, canvas, size_figure, file_type):
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
-            canvas.draw()
-            return path
+            return render_to_file(figure, size_figure, file_type)
 
         if format_ == "jpg":
             import matplotlib as mpl
@@ -299,30 +288,11 @@ class CyclicDampingUI(QWidget):
         def save(figure, canvas, size_figure, ax, file_type):
             try:
                 ax.get_legend().remove()
-                canvas.draw()
-
-                path = BytesIO()
-                size = figure.get_size_inches()
-                figure.set_size_inches(size_figure)
-                if file_type == "svg":
-                    figure.savefig(path, format='svg', transparent=True)
-                elif file_type == "jpg":
-                    figure.savefig(path, format='jpg', dpi=500, bbox_inches='tight')
-                path.seek(0)
-                figure.set_size_inches(size)
+                path = render_to_file(figure, size_figure, file_type, dpi=500)
                 ax.legend(loc='upper left')
                 canvas.draw()
             except AttributeError:
-                path = BytesIO()
-                size = figure.get_size_inches()
-                figure.set_size_inches(size_figure)
-                if file_type == "svg":
-                    figure.savefig(path, format='svg', transparent=True)
-                elif file_type == "jpg":
-                    figure.savefig(path, format='jpg', dpi=500, bbox_inches='tight')
-                path.seek(0)
-                figure.set_size_inches(size)
-                canvas.draw()
+                path = render_to_file(figure, size_figure, file_type, dpi=500)
             return path
 
         if format_ == "jpg":
@@ -465,14 +435,7 @@ class SeismicStrangthUI(QWidget):
 
     def save_canvas(self):
         """Сохранение графиков для передачи в отчет"""
-        path = BytesIO()
-        size = self.figure.get_size_inches()
-        self.figure.set_size_inches([7.5, 4.1])
-        self.figure.savefig(path, format='svg', transparent=True)
-        path.seek(0)
-        self.figure.set_size_inches(size)
-        self.canvas.draw()
-        return path
+        return render_to_file(self.figure, [7.5, 4.1], "svg")
 
 class CyclicLoadingOpenTestUI(QWidget):
     """Виджет для открытия файла прибора и определения параметров опыта"""
@@ -582,6 +545,10 @@ class ModelTriaxialCyclicLoading_Sliders(QWidget):
 
         self._activate = False
 
+        # Во время перемещения параметры отправляются после паузы в движении слайдера
+        self._debounce = {name: debounce_timer(self, getattr(self, "_{}_sliders_released".format(name)))
+                          for name in ["strain", "PPR", "cycles_count"]}
+
         self._createUI()
 
     def _create_UI_by_params(self, name, params):
@@ -629,6 +596,7 @@ class ModelTriaxialCyclicLoading_Sliders(QWidget):
                 sliders_frame_layout.addLayout(line)
                 func = getattr(self, "_{name_widget}_sliders_moove".format(name_widget=name, name_var=var))
                 slider.sliderMoved.connect(func)
+                slider.sliderMoved.connect(lambda value, timer=self._debounce[name]: timer.start())
                 release = getattr(self, "_{name_widget}_sliders_released".format(name_widget=name, name_var=var))
                 slider.sliderReleased.connect(release)
                 slider.setStyleSheet(style)
@@ -700,6 +668,7 @@ class ModelTriaxialCyclicLoading_Sliders(QWidget):
 
     def _strain_sliders_released(self):
         """Обработка окончания перемещения слайдеров деформации"""
+        self._debounce["strain"].stop()
         if self._activate:
             params = self._get_slider_params(self._strain_params)
             self._set_slider_labels_params(params)
@@ -707,6 +676,7 @@ class ModelTriaxialCyclicLoading_Sliders(QWidget):
 
     def _PPR_sliders_released(self):
         """Обработка окончания перемещения слайдеров PPR"""
+        self._debounce["PPR"].stop()
         if self._activate:
             self._check_fail()
             params = self._get_slider_params(self._PPR_params)
@@ -719,6 +689,7 @@ class ModelTriaxialCyclicLoading_Sliders(QWidget):
             self._set_slider_labels_params(params)
 
     def _cycles_count_sliders_released(self):
+        self._debounce["cycles_count"].stop()
         if self._activate:
             params = self._get_slider_params(self._cycles_count_params)
             self._set_slider_labels_params(params)
@@ -973,18 +944,7 @@ class CsrItemUI(QGroupBox):
         """Сохранение графиков для передачи в отчет"""
 
         def save(figure, canvas, size_figure, file_type):
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=500, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
-            canvas.draw()
-
-            return path
+            return render_to_file(figure, size_figure, file_type, dpi=500)
 
         return {
             'lineral': save(self.CSR_figure, self.CSR_canvas, [6.5, 3.2], "svg"),
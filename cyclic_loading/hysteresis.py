@@ -0,0 +1,127 @@
+"""Модуль анализа петель гистерезиса циклического нагружения.
+
+Векторизованные (numpy) реализации функций обработки петель, общие для моделей
+cyclic_loading_model.ModelTriaxialCyclicLoading и storms.ModelTriaxialCyclicLoading:
+    moving_average - скользящее среднее через накопленные суммы
+    find_to_positive_zero_crossings - индексы переходов массива через значение x[0] снизу вверх
+    trend_decomposition - выделение тренда методом скользящего среднего
+    define_mean_loop - осредненная петля по матрице петель
+    square_under_line, area - площадь под кривой и площадь петли
+
+Сравнение скорости с прежними реализациями: benchmarks/hysteresis.py"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+def moving_average(x: np.ndarray, window: int) -> np.ndarray:
+    """Скользящее среднее по всем окнам длины `window`. Возвращает массив длины len(x) - window + 1"""
+    x = np.asarray(x, dtype=np.float64)
+    window = int(window)
+    assert 0 < window <= len(x), "window should be in range [1, len(x)]"
+    cumsum = np.empty(len(x) + 1)
+    cumsum[0] = 0
+    np.cumsum(x, out=cumsum[1:])
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def find_to_positive_zero_crossings(x: np.ndarray) -> Tuple[int, list]:
+    """
+    Определяет сколько раз значения в массиве переходят со стороны
+    `value` < `x[0]` в сторону `value` > `x[0]`.
+
+    Возвращает число переходов и индексы точек До перехода
+    """
+    assert len(x) > 1, "x should have more than 1 point"
+    x = np.asarray(x)
+
+    # Переходы ищутся начиная со второй точки, как в поточечном алгоритме
+    zero_crossings_indexes = (np.flatnonzero((x[1:-1] <= x[0]) & (x[2:] > x[0])) + 2).tolist()
+
+    # add last loop if no crossing
+    if x[-1] < 0:
+        zero_crossings_indexes.append(len(x) - 1)
+
+    return len(zero_crossings_indexes), zero_crossings_indexes
+
+
+def trend_decomposition(x: np.ndarray, season: int, smooth_ending: Optional[bool] = True) -> np.ndarray:
+    """
+    Выделяет тренд из временного ряда `x` на основе цикличности (сезонности -- `season`)
+    методом скользящего среднего (moving averages).
+
+    Для четной цикличности применятся season-MA к которому применяется 2-MA
+    для обеспечения симметричности результата.
+
+    Returns
+    -------
+    np.ndarray
+        массив длины (len(x) - (season - 1)) для неченого порядка и (len(x) - season) для четного,
+        при smooth_ending=True массив расширается с конца средними значениями последнего цикла
+    """
+    assert len(x) > season, "lenght of x can't be smaller than season"
+
+    x = np.asarray(x, dtype=np.float64)
+    season = int(season)
+
+    if season % 2 == 0:
+        # Скользящее среднее четного порядка за которым следует скользящее среднее порядка 2 согласно алгоритму
+        series = moving_average(moving_average(x, season), 2)
+        left_values = x[-season:]
+    else:
+        series = moving_average(x, season)
+        left_values = x[-season + 1:]
+
+    if smooth_ending:
+        # Средние по хвостам left_values[-k:] для k от len(left_values) до season // 2 + 1
+        lengths = np.arange(len(left_values), season // 2, -1)
+        if len(lengths):
+            tail_sums = np.cumsum(left_values[::-1])
+            series = np.hstack((series, tail_sums[lengths - 1] / lengths))
+
+    return series
+
+
+def define_mean_loop(strain: np.ndarray, deviator: np.ndarray,
+                     loops_indexes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Строит осредненную петлю гистерезиса по заданным массивам деформаций (`strain`)
+    и девиатора (`deviator`) и индексам начала петель `loops_indexes`.
+    Петли обрезаются по длине самой короткой и осредняются по строкам матрицы петель.
+    """
+    strain = np.asarray(strain)
+    deviator = np.asarray(deviator)
+    loops_indexes = np.asarray(loops_indexes, dtype=np.int64)
+
+    loops_count = len(loops_indexes) - 1
+
+    if loops_count == 0:
+        return np.array(strain[loops_indexes[0]:]), np.array(strain[loops_indexes[0]:])
+
+    starts = loops_indexes[:-1]
+    min_loop_length = int(np.min(np.diff(loops_indexes))) + 1
+
+    loops_matrix_indexes = starts[:, np.newaxis] + np.arange(min_loop_length)
+
+    return strain[loops_matrix_indexes].mean(axis=0), deviator[loops_matrix_indexes].mean(axis=0)
+
+
+def square_under_line(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Функция определяет площадь под графиком методом трапеций. На вход подаются массивы точек по осям
+
+    Обход фукнции должен быть по часовой стрелке, иначе получается отрицательный результат
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return float(np.dot(np.diff(x), y[1:] + y[:-1]) / 2)
+
+
+def area(x: np.ndarray, y: np.ndarray) -> float:
+    """Вычисляет площадь области внутри кривой.
+
+    Для замкнутой петли совпадает с площадью многоугольника по формуле шнурования (shoelace),
+    для незамкнутой - замыкает петлю через ось абсцисс, как и прежний расчет"""
+    result_area = abs(square_under_line(x, y))
+    assert result_area > 0, "area is negative"
+    return result_area
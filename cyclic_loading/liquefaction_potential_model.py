@@ -25,7 +25,7 @@ class LiquefactionPotentialModel:
 
         for test in self.tests:
 
-            n_fail = Cyclic_models[test].get_test_results()["fail_cycle"]
+            n_fail = Cyclic_models.get_test_results(test)["fail_cycle"]
 
             if n_fail:
                 self.cycles.append(
@@ -0,0 +1,101 @@
+"""Граф этапов моделирования опыта с пересчетом только измененных этапов.
+
+Этап описывается именем, списком этапов, от которых он зависит, методом модели, возвращающим входные
+параметры этапа, и методом модели, вычисляющим этап. Результаты этапов хранятся в самой модели
+(массивы _test_data), граф хранит в модели только отпечатки входных параметров этапов. При запуске
+этап пересчитывается, если изменились его входные параметры или был пересчитан этап, от которого он
+зависит.
+
+Пример использования:
+    class Model:
+        _modeling_graph = ModelingGraph([
+            Stage("cycles", (), "_cycles_inputs", "_modeling_cycles"),
+            Stage("deviator", ("cycles",), "_deviator_inputs", "_modeling_deviator")])
+
+        def __init__(self):
+            self._stage_fingerprints = {}
+
+        def _test_modeling(self):
+            self._modeling_graph.run(self, self._stage_fingerprints)
+"""
+
+import hashlib
+import pickle
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Этап моделирования.
+
+    name - имя этапа
+    depends - имена этапов, результаты которых использует этап
+    inputs - имя метода модели, который возвращает кортеж входных параметров этапа
+    compute - имя метода модели, который вычисляет этап"""
+    name: str
+    depends: Tuple[str, ...]
+    inputs: str
+    compute: str
+
+
+def fingerprint(values) -> str:
+    """Отпечаток входных параметров этапа"""
+    return hashlib.sha1(pickle.dumps(values, protocol=4)).hexdigest()
+
+
+class ModelingGraph:
+    def __init__(self, stages: Sequence[Stage]):
+        self._stages = {}
+        for stage in stages:
+            for name in stage.depends:
+                if name not in self._stages:
+                    raise ValueError(f"Stage {stage.name} depends on {name}, which is not defined before it")
+            self._stages[stage.name] = stage
+
+    def downstream(self, name: str) -> List[str]:
+        """Этапы, которые зависят от этапа name напрямую или через другие этапы"""
+        dependent = {name}
+        for stage in self._stages.values():
+            if dependent.intersection(stage.depends):
+                dependent.add(stage.name)
+        dependent.discard(name)
+        return [stage for stage in self._stages if stage in dependent]
+
+    @property
+    def stages(self) -> List[str]:
+        return list(self._stages)
+
+    def upstream(self, names: Iterable[str]) -> List[str]:
+        """Этапы names и все этапы, от которых они зависят, в порядке вычисления"""
+        required = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(self._stages[name].depends)
+        return [name for name in self._stages if name in required]
+
+    def run(self, model, fingerprints: Dict[str, str], stages: Optional[Iterable[str]] = None) -> List[str]:
+        """Вычисление этапов stages (по умолчанию всех) и этапов, от которых они зависят.
+        Пересчитываются только этапы с измененными входными параметрами и этапы после них.
+        Возвращает имена пересчитанных этапов"""
+        names = self.upstream(stages) if stages is not None else self.stages
+        computed = []
+        for name in names:
+            stage = self._stages[name]
+            current = fingerprint(getattr(model, stage.inputs)())
+            if fingerprints.get(name) != current:
+                # Отпечатки удаляются до расчета: этап, прерванный ошибкой, и все этапы после него
+                # (в том числе не запрошенные сейчас) будут пересчитаны
+                self.invalidate(fingerprints, [name] + self.downstream(name))
+                getattr(model, stage.compute)()
+                fingerprints[name] = current
+                computed.append(name)
+        return computed
+
+    def invalidate(self, fingerprints: Dict[str, str], names: Optional[Iterable[str]] = None):
+        """Сброс отпечатков: этапы names (по умолчанию все) будут пересчитаны при следующем запуске"""
+        for name in (self.stages if names is None else names):
+            fingerprints.pop(name, None)
@@ -39,6 +39,10 @@ import scipy.ndimage as ndimage
 from general.general_functions import define_qf, create_deviation_curve, current_exponent, step_sin, logarithm, sigmoida,\
     create_acute_sine_array, AttrDict, mirrow_element, create_json_file, read_json_file
 from configs.plot_params import plotter_params
+from cyclic_loading import hysteresis
+from general.device_log import read_device_log
+from general.log_writer import write_log, wille_number_format, Constant
+from general.plotting import envelope_indices
 from datetime import timedelta
 from typing import Optional, Tuple
 from scipy.interpolate import interp1d
@@ -138,11 +142,13 @@ class ModelTriaxialCyclicLoading:
             else:
                 PPR_lim.append(1)
 
-            return {"cycles": self._test_data.cycles,
-                    "deviator": self._test_data.deviator,
-                    "strain": self._test_data.strain,
-                    "PPR": self._test_data.PPR,
-                    "mean_effective_stress": self._test_data.mean_effective_stress,
+            # Для построения передается огибающая записи, полные массивы остаются в _test_data
+            index = self._plot_index()
+            return {"cycles": self._test_data.cycles[index],
+                    "deviator": self._test_data.deviator[index],
+                    "strain": self._test_data.strain[index],
+                    "PPR": self._test_data.PPR[index],
+                    "mean_effective_stress": self._test_data.mean_effective_stress[index],
                     "strain_lim": strain_lim,
                     "PPR_lim": PPR_lim,
                     "damping_deviator": self._damping_deviator,
@@ -151,6 +157,14 @@ class ModelTriaxialCyclicLoading:
                     "index_new": self.i_cycles_new,
                     "cycles_right": self._test_data_2.cycles}
 
+    def _plot_index(self):
+        """Индексы точек для построения: огибающая кривых опыта и точки циклов разрушения"""
+        fail_cycles = [self._test_result.fail_cycle_criterion_strain, self._test_result.fail_cycle_criterion_stress,
+                       self._test_result.fail_cycle_criterion_PPR]
+        keep = [np.searchsorted(self._test_data.cycles, cycle) for cycle in fail_cycles if cycle]
+        return envelope_indices([self._test_data.deviator, self._test_data.strain, self._test_data.PPR,
+                                 self._test_data.mean_effective_stress], keep=keep)
+
     def plotter(self, save_path=None):
         """Построение графиков опыта. Если передать параметр save_path, то графики сохраняться туда"""
         plot_data = self.get_plot_data()
@@ -283,17 +297,8 @@ class ModelTriaxialCyclicLoading:
 
         columns_key = ["Time", 'Deviator', 'Piston position', 'Pore pressure', 'Cell pressure', "Sample height"]
 
-        # Считываем файл
-        f = open(file_path)
-        lines = f.readlines()
-        f.close()
-
-        # Словарь считанных данных по ключам колонок
-        read_data = {}
-
-        for key in columns_key:  # по нужным столбцам
-            index = (lines[0].split("\t").index(key)) #
-            read_data[key] = np.array(list(map(lambda x: float(x.split("\t")[index]), lines[2:])))
+        # Словарь считанных данных по ключам колонок. Вторая строка файла - единицы измерения
+        read_data = read_device_log(file_path, columns=columns_key, skip_rows=1, decimal=".")
 
         u_consolidations = read_data['Pore pressure'][0]
 
@@ -333,17 +338,8 @@ class ModelTriaxialCyclicLoading:
         columns_key = ["Test_Dyn_halfcycles", "Test_Dyn_time", "Test_DynVerticalPress_kPa_value",
                        "Test_DynPorePress_kPa_value", "Test_DynVerticalDeformation_mm_value",]
 
-        # Считываем файл
-        f = open(file_path)
-        lines = f.readlines()
-        f.close()
-
         # Словарь считанных данных по ключам колонок
-        read_data = {}
-
-        for key in columns_key:  # по нужным столбцам
-            index = (lines[0].split("\t").index(key))  #
-            read_data[key] = np.array(list(map(lambda x: float(x.split("\t")[index].replace(",", ".")), lines[1:])))
+        read_data = read_device_log(file_path, columns=columns_key)
 
         test_data["cell_pressure"] = float(file_path[file_path.index("=") + 1: len(file_path) - file_path[::-1].index(".")].strip())
         u_consolidations = read_data["Test_DynPorePress_kPa_value"][0]
@@ -541,22 +537,7 @@ class ModelTriaxialCyclicLoading:
 
         Возвращает число переходов и индексы точек До перехода
         """
-        assert len(x) > 1, "x should have more than 1 point"
-
-        zero_crossings_indexes = []
-
-        for i in range(1, len(x) - 1):
-            if ModelTriaxialCyclicLoading.to_positive_zero_cross(x[i], x[i + 1], value=x[0]):
-                zero_crossings_indexes.append(i + 1)
-
-        # skip first stabilization loop
-        # zero_crossings_indexes = zero_crossings_indexes[1:]
-
-        # add last loop if no crossing
-        if x[-1] < 0:
-            zero_crossings_indexes.append(len(x) - 1)
-
-        return len(zero_crossings_indexes), zero_crossings_indexes
+        return hysteresis.find_to_positive_zero_crossings(x)
 
     @staticmethod
     def to_positive_zero_cross(first_point: float, second_point: float, value: Optional[float] = 0) -> bool:
@@ -598,39 +579,7 @@ class ModelTriaxialCyclicLoading:
             при smooth_ending=True массив расширается с конца на season
 
         """
-
-        assert len(x) > season, "lenght of x can't be smaller than season"
-
-        x = np.asarray(x)
-
-        # even_moving_average и odd_moving_average наверняка можно объединить
-        def even_moving_average(_x, _season):
-            """Скользящее среденее четного порядка. 2-MA, 4-MA, etc."""
-            periods = int(_season / 2)
-            return [np.mean([_x[t + j] for j in range(-periods, periods)]) for t in
-                    range(periods, len(_x) - periods + 1)]
-
-        def odd_moving_average(_x, _season):
-            """Скользящее среденее нечетного порядка. 3-MA, 5-MA, etc."""
-            periods = int((_season - 1) / 2)
-            return [np.mean([_x[t + j] for j in range(-periods, periods + 1)]) for t in
-                    range(periods, len(_x) - periods)]
-
-        if season % 2 == 0:
-            # Скользящее среднее четного порядка за которым следует скользящее среднее порядка 2 согласно алгоритму
-            _series = even_moving_average(x, season)
-            _series = even_moving_average(_series, 2)
-            left_values = x[-int(season):]
-        else:
-            _series = odd_moving_average(x, season)
-            left_values = x[-int(season) + 1:]
-
-        if smooth_ending:
-            while len(left_values) > season / 2:
-                _series.append(np.mean(left_values))
-                left_values = np.delete(left_values, 0)
-
-        return np.array(_series)
+        return hysteresis.trend_decomposition(x, season, smooth_ending=smooth_ending)
 
     @staticmethod
     def define_mean_loop(strain: np.ndarray, deviator: np.ndarray,
@@ -646,33 +595,12 @@ class ModelTriaxialCyclicLoading:
         if loops_indexes is None:
             loops_indexes = ModelTriaxialCyclicLoading.separate_deviator_loops(deviator)
 
-        loops_count = len(loops_indexes) - 1
-        '''loops count starts from 0'''
-
-        # print('Human loops count = ', loops_count + 1)
-
-        if loops_count == 0:
-            return np.array(strain[loops_indexes[0]:]), np.array(strain[loops_indexes[0]:])
-
-        deviator_loops = [deviator[loops_indexes[i]:loops_indexes[i + 1] + 1] for i in range(loops_count)]
-        strain_loops = [strain[loops_indexes[i]:loops_indexes[i + 1] + 1] for i in range(loops_count)]
-
-        min_loop_length = min([loops_indexes[i + 1] - loops_indexes[i] + 1 for i in range(loops_count)])
-
-        mean_deviator_loop = [np.mean([deviator_loops[i][j] for i in range(loops_count)]) for j in
-                              range(min_loop_length)]
-        mean_strain_loop = [np.mean([strain_loops[i][j] for i in range(loops_count)]) for j in range(min_loop_length)]
-
-        return np.array(mean_strain_loop), np.array(mean_deviator_loop)
+        return hysteresis.define_mean_loop(strain, deviator, loops_indexes)
 
     @staticmethod
     def area(x: np.ndarray, y: np.ndarray) -> float:
         """Вычисляет площадь области внутри кривой"""
-        result_area = ModelTriaxialCyclicLoading.square_under_line(x, y)
-        if result_area < 0:
-            result_area = ModelTriaxialCyclicLoading.square_under_line(x[::-1], y[::-1])
-        assert result_area > 0, "area is negative"
-        return result_area
+        return hysteresis.area(x, y)
 
     @staticmethod
     def square_under_line(x, y):
@@ -681,13 +609,7 @@ class ModelTriaxialCyclicLoading:
 
         Обход фукнции должен быть по часовой стрелке, иначе получается отрицательный результат
         """
-        square = 0
-        for i in range(len(x) - 1):
-            a = (x[i + 1] - x[i])
-            low_side = min([y[i + 1], y[i]])
-            delta = abs(y[i + 1] - y[i])
-            square += a * (low_side + 0.5 * delta)
-        return square
+        return hysteresis.square_under_line(x, y)
 
     @staticmethod
     def array_smoother(x: np.ndarray, ratio: Optional[int] = 4) -> np.ndarray:
@@ -1752,23 +1674,6 @@ class ModelTriaxialCyclicLoadingSoilTest3(ModelTriaxialCyclicLoading):
         else:
             p = os.path.join(file_path, "Косинусное значение напряжения.txt")
 
-        def wille_number_format(x):
-            x = "{:.6f}".format(x)
-            s = str(x)
-            if s == "-0.000000":
-                s = "0.000000"
-            return s
-
-        def make_string(data, i):
-            s = ""
-            for key in data:
-                try:
-                    s += wille_number_format(data[key][i]) + '\t'
-                except ValueError:
-                    s += data[key][i] + '\t'
-            s += '\n'
-            return (s)
-
         pore_pressure_after_consolidation = noise_data["pore_pressure_after_consolidation"]
 
 
@@ -1806,48 +1711,42 @@ class ModelTriaxialCyclicLoadingSoilTest3(ModelTriaxialCyclicLoading):
                 ((strain + vertical_strain_initial) * sample_height) - piston_position_initial, 4),
             "Piston position (Setpoint)": np.round(((strain + vertical_strain_initial) * sample_height), 4),
 
-            "Cell volume change": ["0.000000" for _ in range(len(deviator))],
+            "Cell volume change": Constant("0.000000"),
 
-            "Sample height": [sample_height for _ in range(len(deviator))],
+            "Sample height": Constant(sample_height),
 
             "Pore pressure": (PPR * cell_pressure) + pore_pressure_after_consolidation,
-            "Pore volume change (water)": ["0.000000" for _ in range(len(deviator))],
-            "Backpressure": ["0.000000" for _ in range(len(deviator))],
+            "Pore volume change (water)": Constant("0.000000"),
+            "Backpressure": Constant("0.000000"),
             "Cell pressure": cell_pressure + pore_pressure_after_consolidation,
             "Cell pressure (Gross value)": cell_pressure + pore_pressure_after_consolidation,
-            "Cell pressure (Setpoint)": [np.mean(cell_pressure + pore_pressure_after_consolidation) for _ in
-                                         range(len(deviator))],
+            "Cell pressure (Setpoint)": Constant(np.mean(cell_pressure + pore_pressure_after_consolidation)),
 
             "Sample area under isotropic conditions": sample_area,
-            "Initial sample height under anisotropic conditions": [sample_height for _ in range(len(deviator))],
+            "Initial sample height under anisotropic conditions": Constant(sample_height),
             "Settlement under anisotropic conditions": np.round(((strain * 76) / 500), 6),
 
             "Vertical strain": strain + vertical_strain_initial,
             "Sample surface area under anisotropic conditions": sample_area,
             "Vertical stress under anistropic conditions": (
                                                                        cell_pressure + pore_pressure_after_consolidation) + deviator,
-            "Piston area": [piston_area for _ in range(len(deviator))],
-            "Initial sample area": [sample_area_initial for _ in range(len(deviator))],
-            "Drainage valve": ["True" for _ in range(len(deviator))],
-            "Volume": ["86.192736" for _ in range(len(deviator))],
+            "Piston area": Constant(piston_area),
+            "Initial sample area": Constant(sample_area_initial),
+            "Drainage valve": Constant("True"),
+            "Volume": Constant("86.192736"),
             "Sample Area under isotropic conditions": sample_area,
             "Diameter under isotropic conditions": noise_data["Diameter under isotropic conditions"],
             "Vertical stress under isotropic conditions": (
                                                                       cell_pressure + pore_pressure_after_consolidation) + deviator,
             "Deviator": deviator,
             "Deviator(shearing)": deviator,
-            "Axial displacement 1": ["0.000000" for _ in range(len(deviator))],
-            "Axial displacement 2": ["0.000000" for _ in range(len(deviator))]
+            "Axial displacement 1": Constant("0.000000"),
+            "Axial displacement 2": Constant("0.000000")
         }
 
-        with open(p, "w") as file:
-            file.write(
-                "		Time	External displacement	Vertical force	Vertical force (Gross value)	Vertical force (Setpoint)	Piston position	Piston position (Gross value)	Piston position (Setpoint)	Cell volume change	Sample height	Pore pressure	Pore volume change (water)	Backpressure	Cell pressure	Cell pressure (Gross value)	Cell pressure (Setpoint)	Sample area under isotropic conditions	Initial sample height under anisotropic conditions	Settlement under anisotropic conditions	Vertical strain	Sample surface area under anisotropic conditions	Vertical stress under anistropic conditions	Piston area	Initial sample area	Drainage valve	Volume	Sample Area under isotropic conditions	Diameter under isotropic conditions	Vertical stress under isotropic conditions	Deviator	Deviator (shearing)	Axial displacement 1	Axial displacement 2" + '\n')
-            file.write(
-                "		s	mm	N	N	N	mm	mm	mm	ml	mm	kPa	ml	kPa	kPa	kPa	kPa	mm2	mm	mm	%	mm2	kPa	mm2	mm2	bool	ml	mm2	mm	kPa	kPa	kPa	mm	mm" + '\n')
-            for i in range(len(data["Time"])):
-                file.write(make_string(data, i))
-        file.close()
+        write_log(p, data, header=["		Time	External displacement	Vertical force	Vertical force (Gross value)	Vertical force (Setpoint)	Piston position	Piston position (Gross value)	Piston position (Setpoint)	Cell volume change	Sample height	Pore pressure	Pore volume change (water)	Backpressure	Cell pressure	Cell pressure (Gross value)	Cell pressure (Setpoint)	Sample area under isotropic conditions	Initial sample height under anisotropic conditions	Settlement under anisotropic conditions	Vertical strain	Sample surface area under anisotropic conditions	Vertical stress under anistropic conditions	Piston area	Initial sample area	Drainage valve	Volume	Sample Area under isotropic conditions	Diameter under isotropic conditions	Vertical stress under isotropic conditions	Deviator	Deviator (shearing)	Axial displacement 1	Axial displacement 2",
+                                   "		s	mm	N	N	N	mm	mm	mm	ml	mm	kPa	ml	kPa	kPa	kPa	kPa	mm2	mm	mm	%	mm2	kPa	mm2	mm2	bool	ml	mm2	mm	kPa	kPa	kPa	mm	mm"],
+                  rows=len(data["Time"]), cell_format=wille_number_format)
 
         #return time[-1] + time_initial
 
@@ -1,9 +1,14 @@
+import bisect
+import os
+import threading
 from datetime import datetime
+from typing import Dict, List, Optional
 from openpyxl import load_workbook
 from openpyxl.styles import Font
+from openpyxl.utils import column_index_from_string
 from excel_statment.position_configs import GeneralDataColumns
 import xlrd
-import xlutils
+import xlutils.copy
 import xlwt
 
 def float_df(x):
@@ -133,36 +138,210 @@ def read_general_prameters(path):
 
 def write_to_excel(path, Lab, params):
     """Запись в файл excel"""
-    wb = load_workbook(path)
+    writer = statment_writer(path)
 
-    wb["Лист1"]["HY5"] = "Сигма1, кПа"
-    wb["Лист1"]["HZ5"] = "Сигма3, кПа"
-    wb["Лист1"]["IA5"] = "Тау, кПа"
-    wb["Лист1"]["IB5"] = "K0"
-    wb["Лист1"]["IC5"] = "Частота, Гц"
-    wb["Лист1"]["ID5"] = "Цикл разрушения"
+    writer.set_cell_data(("HY5", (5, 232)), "Сигма1, кПа")
+    writer.set_cell_data(("HZ5", (5, 233)), "Сигма3, кПа")
+    writer.set_cell_data(("IA5", (5, 234)), "Тау, кПа")
+    writer.set_cell_data(("IB5", (5, 235)), "K0")
+    writer.set_cell_data(("IC5", (5, 236)), "Частота, Гц")
+    writer.set_cell_data(("ID5", (5, 237)), "Цикл разрушения")
 
-    iLab_new = 0
-    iLab = 0
+    iLab = writer.row(Lab, "IG") or writer.row(Lab, "A")
 
-    for i in range(7, len(wb['Лист1']['A']) + 5):
-
-        if str(wb["Лист1"]['IG' + str(i)].value) == Lab:
-            iLab_new = i
-        elif str(wb["Лист1"]['A' + str(i)].value) == Lab:
-            iLab = i
-
-    if iLab_new != 0:
-        cells = ["HW", "HX", "HY", "HZ", "IA", "IB", "IC", "ID", "IE", "IF"]
-        for param, cell in zip(params, cells):
-            wb["Лист1"][cell + str(iLab_new)] = param
-
-    elif iLab != 0:
+    if iLab:
         cells = ["HW", "HX", "HY", "HZ", "IA", "IB", "IC", "ID", "IE", "IF"]
         for param, cell in zip(params, cells):
-            wb["Лист1"][cell + str(iLab)] = param
+            writer.set_cell_data((cell + str(iLab), (iLab, column_index_from_string(cell) - 1)), param)
+
+    writer.flush()
+
+class StatmentWriter:
+    """Сессия записи в ведомость excel (xlsx и xls).
+
+    Записи set_cell_data вносятся в открытую книгу, файл сохраняется один раз методом flush (после пробы
+    или после пакетного сохранения). Книга остается открытой между сохранениями и загружается заново,
+    только если файл изменен не этой сессией. Индекс строк по значениям столбца строится один раз.
+
+    Пример использования:
+        writer = StatmentWriter(path)
+        writer.set_cell_data(("HW" + str(number), (number, 230)), value, color="FF6961")
+        writer.flush()
+    """
+
+    # Первый индекс палитры xls для цветов шрифта
+    XLS_FIRST_COLOUR = 0x21
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._book = None
+        self._xls_book = None
+        self._stat = None
+        self._changed = False
+        self._rows: Dict[tuple, _ColumnIndex] = {}
+        self._xls_styles = {}
+
+    @property
+    def is_xlsx(self) -> bool:
+        return self.path.endswith("xlsx")
+
+    def set_cell_data(self, cell, value, sheet: str = "Лист1", color=None) -> None:
+        """Запись ячейки, аргументы как у set_cell_data"""
+        with self._lock:
+            self._open()
+            if self.is_xlsx:
+                self._book[sheet][cell[0]] = value
+                if color:
+                    self._book[sheet][cell[0]].font = Font(color=color)
+                letters = "".join(symbol for symbol in cell[0] if symbol.isalpha())
+                row, column = int(cell[0][len(letters):]), column_index_from_string(letters)
+            else:
+                # Как и ранее, в ведомость xls запись выполняется на первый лист
+                row, column = cell[1][0], cell[1][1]
+                if color:
+                    self._book.get_sheet(0).write(row - 1, column, value, self._xls_style(color))
+                else:
+                    self._book.get_sheet(0).write(row - 1, column, value)
+            self._changed = True
+
+            index = self._rows.get((sheet if self.is_xlsx else 0, column))
+            if index is not None:
+                index.set(row, value)
+
+    def set_cells(self, cells: List[dict]) -> None:
+        """Запись ячеек, заданных словарями аргументов set_cell_data"""
+        for cell in cells:
+            self.set_cell_data(**cell)
+
+    def write(self, cells: List[dict]) -> None:
+        """Запись ячеек и сохранение файла без записей других потоков между ними"""
+        with self._lock:
+            self.set_cells(cells)
+            self.flush()
+
+    def row(self, value, column: str, sheet: str = "Лист1") -> Optional[int]:
+        """Номер строки (с 1, начиная с 7 строки) с последним вхождением value в столбце column ('A')"""
+        with self._lock:
+            self._open()
+            if self.is_xlsx:
+                key = (sheet, column_index_from_string(column))
+            else:
+                key = (0, column_index_from_string(column) - 1)
+
+            index = self._rows.get(key)
+            if index is None:
+                if self.is_xlsx:
+                    values = (row[0] for row in self._book[sheet].iter_rows(
+                        min_row=7, min_col=key[1], max_col=key[1], values_only=True))
+                else:
+                    xls_sheet = self._xls_book.sheet_by_index(0)
+                    values = (xls_sheet.cell(i, key[1]).value if key[1] < xls_sheet.row_len(i) else None
+                              for i in range(6, xls_sheet.nrows))
+                index = self._rows[key] = _ColumnIndex(values)
+            return index.row(value)
+
+    def flush(self) -> None:
+        """Сохранение файла, если были записи"""
+        with self._lock:
+            if not self._changed:
+                return
+            self._book.save(self.path)
+            self._changed = False
+            self._stat = self._file_stat()
+
+    def close(self) -> None:
+        """Сохранение записей и освобождение книги"""
+        with self._lock:
+            self.flush()
+            self._book = None
+            self._xls_book = None
+            self._rows = {}
+            self._xls_styles = {}
+
+    def _file_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _open(self):
+        if self._book is not None and (self._changed or self._stat == self._file_stat()):
+            return
+        self._rows = {}
+        self._xls_styles = {}
+        if self.is_xlsx:
+            self._book = load_workbook(self.path)
+        elif self.path.endswith("xls"):
+            self._xls_book = xlrd.open_workbook(self.path, formatting_info=True)
+            self._book = xlutils.copy.copy(self._xls_book)
+        else:
+            raise ValueError(f"Неизвестный формат ведомости {self.path}")
+        self._stat = self._file_stat()
+
+    def _xls_style(self, color: str):
+        style = self._xls_styles.get(color)
+        if style is None:
+            colour_index = StatmentWriter.XLS_FIRST_COLOUR + len(self._xls_styles)
+            name = f"font_colour_{colour_index}"
+            xlwt.add_palette_colour(name, colour_index)
+            self._book.set_colour_RGB(colour_index, *tuple(int(color[i:i+2], 16) for i in (0, 2, 4)))
+            style = self._xls_styles[color] = xlwt.easyxf(f"font: colour {name}")
+        return style
+
+
+class _ColumnIndex:
+    """Индекс строк столбца по значениям ячеек (с 7 строки)"""
+
+    FIRST_ROW = 7
+
+    def __init__(self, values):
+        self._values: Dict[int, str] = {}
+        self._rows: Dict[str, List[int]] = {}
+        for row, value in enumerate(values, _ColumnIndex.FIRST_ROW):
+            self._values[row] = str(value)
+            self._rows.setdefault(str(value), []).append(row)
+
+    def set(self, row: int, value) -> None:
+        """Новое значение ячейки строки row: прежнее значение из индекса удаляется"""
+        if row < _ColumnIndex.FIRST_ROW:
+            return
+        old = self._values.get(row)
+        if old is not None:
+            rows = self._rows[old]
+            rows.remove(row)
+            if not rows:
+                del self._rows[old]
+        self._values[row] = str(value)
+        bisect.insort(self._rows.setdefault(str(value), []), row)
+
+    def row(self, value) -> Optional[int]:
+        """Последняя строка со значением value"""
+        rows = self._rows.get(str(value))
+        return rows[-1] if rows else None
+
+
+# Открытые сессии записи {путь: сессия}: книга не разбирается заново, пока файл не изменен
+_writers: Dict[str, StatmentWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def statment_writer(path: str) -> StatmentWriter:
+    """Общая сессия записи в ведомость path"""
+    with _writers_lock:
+        key = os.path.abspath(path)
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = StatmentWriter(path)
+        return writer
+
+
+def close_statment_writers() -> None:
+    """Завершение всех сессий записи (при открытии другой ведомости): записи сохраняются, книги освобождаются"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
 
-    wb.save(path)
 
 def set_cell_data(path: str, cell: str, value, sheet: str="Лист1", color=None)->None:
     """Запись в файл excel
@@ -174,50 +353,7 @@ def set_cell_data(path: str, cell: str, value, sheet: str="Лист1", color=Non
     :argument color: цвет шрифта записи
 
     :return None"""
-    if path.endswith("xlsx"):
-        wb = load_workbook(path)
-        wb[sheet][cell[0]] = value
-        if color:
-            cell = wb[sheet][cell[0]]
-            cell.font = Font(color=color)
-        wb.save(path)
-
-    elif path.endswith("xls"):
-
-        def getBGColor(book, sheet, row, col):
-            xfx = sheet.cell_xf_index(row, col)
-            xf = book.xf_list[xfx]
-            bgx = xf.background.pattern_colour_index
-            pattern_colour = book.colour_map[bgx]
-
-            # Actually, despite the name, the background colour is not the background colour.
-            # background_colour_index = xf.background.background_colour_index
-            # background_colour = book.colour_map[background_colour_index]
-
-            return pattern_colour
-
-        wb = xlrd.open_workbook(path, formatting_info=True)
-        pattern_colour = getBGColor(wb, wb.sheet_by_index(0), cell[1][0] - 1, cell[1][1])
-
-        out_wb = xlutils.copy.copy(wb)
-        sheet = out_wb.get_sheet(0)
-
-        if color:
-            xlwt.add_palette_colour("font_colour", 0x21)
-            out_wb.set_colour_RGB(0x21, *tuple(int(color[i:i+2], 16) for i in (0, 2, 4)))
-            style = xlwt.easyxf('font: colour font_colour')
-            sheet.write(cell[1][0] - 1, cell[1][1], value, style)
-        else:
-            sheet.write(cell[1][0] - 1, cell[1][1], value)
-
-        """if pattern_colour:
-            xlwt.add_palette_colour("cell_colour", 0x16)
-            out_wb.set_colour_RGB(0x16, *pattern_colour)
-            style = xlwt.easyxf('pattern: pattern solid, fore_colour cell_colour;'
-                                'font: colour font_colour')
-        else:
-            style = xlwt.easyxf('font: colour font_colour')"""
-        out_wb.save(path)
+    statment_writer(path).write([dict(cell=cell, value=value, sheet=sheet, color=color)])
 
 
 
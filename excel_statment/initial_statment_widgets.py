@@ -16,6 +16,7 @@ from excel_statment.initial_tables import TableCastomer, ComboBox_Initial_Parame
 from excel_statment.properties_model import PhysicalProperties, MechanicalProperties, CyclicProperties, \
     DataTypeValidation, RCProperties, VibrationCreepProperties, ConsolidationProperties, ShearProperties, RayleighDampingProperties, K0Properties
 from loggers.logger import app_logger, log_this
+from general.regeneration import finish_all, reset_all
 from singletons import statment, E_models, FC_models, VC_models, RC_models, Cyclic_models, Consolidation_models, Shear_models, Shear_Dilatancy_models, VibrationFC_models, RayleighDamping_models, K0_models
 
 from resonant_column.rezonant_column_hss_model import ModelRezonantColumnSoilTest
@@ -32,7 +33,7 @@ from k0_test.triaxial_k0_model import ModelK0SoilTest
 from excel_statment.params import accreditation
 from cyclic_loading.cyclic_stress_ratio_function import define_cycles_array_from_count_linery, define_t_from_csr, define_t_from_csr, define_csr_from_cycles_array, cyclic_stress_ratio_curve_params
 from excel_statment.position_configs import c_fi_E_PropertyPosition, GeneralDataColumns, MechanicalPropertyPosition
-from excel_statment.functions import set_cell_data
+from excel_statment.functions import set_cell_data, close_statment_writers
 from metrics.session_writer import SessionWriter
 
 from vibration_strength.vibration_strangth_model import CyclicVibrationStrangthMohr
@@ -205,6 +206,9 @@ class InitialStatment(QWidget):
 
         waterfill = ' ' + waterfill if waterfill not in ('', 'Не указывать') else ''
 
+        # Сессии записи предыдущей ведомости завершаются
+        close_statment_writers()
+
         statment_file = "".join([i for i in os.path.split(self.path)[:-1]]) + "/" + statment_name + waterfill
 
         if os.path.exists(statment_file) and not self.force_recreate:
@@ -229,7 +233,12 @@ class InitialStatment(QWidget):
                           statment.general_data.shipment_number, sheet="Лист1", color="FF6961")
         statment.save_dir.set_directory(self.path, statment_name.split(".")[0] + waterfill, statment.general_data.shipment_number)
 
-    def load_models(self, models_name, models, models_type):
+    def load_models(self, models_name, models, models_type, related_models=None):
+        """Загрузка моделей из файла или генерация новых
+
+        :param related_models: модели, от которых зависит генерация (см. Models.generateTests)"""
+        # Результаты фонового пересчета моделей прежнего объекта не должны попасть в новые модели
+        reset_all()
         if statment.general_data.shipment_number:
             shipment_number = f" - {statment.general_data.shipment_number}"
         else:
@@ -245,12 +254,13 @@ class InitialStatment(QWidget):
                 QMessageBox.critical(self, "Ошибка", str(err), QMessageBox.Ok)
                 raise
         else:
-            models.generateTests(generate=self.generate)
-            models.dump(model_file)
+            models.generateTests(generate=self.generate, parallel=True, related_models=related_models)
+            models.dump(model_file, attach=True)
             app_logger.info(f"Сгенерирован сохраненен новый файл модели {models_name.split('.')[0] + shipment_number + '.pickle'}")
 
     @log_this(app_logger, "debug")
     def table_physical_properties_click(self, laboratory_number):
+        finish_all()
         self.table_vertical.set_data()
         self.signal.emit(True)
 
@@ -546,13 +556,15 @@ class TriaxialStaticStatment(InitialStatment):
                         self.load_models(models_name="E_models.pickle",
                                          models=E_models, models_type=ModelTriaxialStaticLoadSoilTest)
                         self.load_models(models_name="FC_models.pickle",
-                                         models=FC_models, models_type=ModelMohrCirclesSoilTest)
+                                         models=FC_models, models_type=ModelMohrCirclesSoilTest,
+                                         related_models={"E_models": E_models})
 
                     elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, Eur)":
                         self.load_models(models_name="Eur_models.pickle",
                                          models=E_models, models_type=ModelTriaxialStaticLoadSoilTest)
                         self.load_models(models_name="FC_models.pickle",
-                                         models=FC_models, models_type=ModelMohrCirclesSoilTest)
+                                         models=FC_models, models_type=ModelMohrCirclesSoilTest,
+                                         related_models={"E_models": E_models})
 
         self.force_recreate = False
 
@@ -854,7 +866,8 @@ class VibrationCreepStatment(InitialStatment):
                                      models=E_models, models_type=ModelTriaxialStaticLoadSoilTest)
 
                     self.load_models(models_name="VC_models.pickle",
-                                     models=VC_models, models_type=ModelVibrationCreepSoilTest)
+                                     models=VC_models, models_type=ModelVibrationCreepSoilTest,
+                                     related_models={"E_models": E_models})
 
                     self.statment_directory.emit(self.path)
                     self.open_line.text_file_path.setText(self.path)
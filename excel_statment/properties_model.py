@@ -5,7 +5,8 @@ import numpy as np
 import os
 from typing import Dict, List, Tuple
 from datetime import datetime
-from scipy.interpolate import interp1d, griddata
+from scipy.interpolate import interp1d, CloughTocher2DInterpolator
+from functools import lru_cache
 import pyexcel as p
 from general.general_functions import sigmoida, mirrow_element
 from cyclic_loading.cyclic_stress_ratio_function import define_fail_cycle
@@ -18,6 +19,129 @@ from excel_statment.functions import str_df, float_df, date_df
 from descriptors import DataTypeValidation
 import math
 
+
+# Таблицы и сплайны для определения свойств строятся один раз при импорте модуля. Детерминированные
+# расчеты по таблицам кэшируются по значениям свойств, от которых зависит результат (lru_cache),
+# поэтому повторное чтение ведомости не пересчитывает интерполяцию. Случайные величины не кэшируются.
+
+# Показатель степени m по коэффициенту пористости и показателю текучести
+_M_E = [0.5, 0.8, 1.2]
+_M_IL = [-0.25, 0, 0.25, 0.5, 0.75, 1]
+_M_VALUES = [0.5, 0.6, 0.6, 0.7, 0.8, 0.8, 0.4, 0.5, 0.6, 0.7, 0.7, 0.9, 0.2, 0.3, 0.4, 0.6, 0.8, 1.0]
+# Кубическая интерполяция, как griddata(method='cubic')
+_M_INTERPOLATOR = CloughTocher2DInterpolator([[_e, _Il] for _e in _M_E for _Il in _M_IL], _M_VALUES)
+
+# Угол дилатансии глинистых грунтов по показателю текучести и числу пластичности
+_DILATANCY_IP = [1, 7, 12, 17, 24, 40]  # столбец
+_DILATANCY_IL = [-0.5, -0.25, 0, 0.25, 0.5, 0.75, 1, 1.5]  # строка
+_DILATANCY_CLAY = [7, 4, 3, 2, 2, 0,
+                   6, 4, 3, 2, 2, -1,
+                   3, 2, 1, 0, 1, -2,
+                   2, 2, 1, 0, 0, -3,
+                   1, 1, 0, -2, -3, -4,
+                   -1, -2, -2, -3, -4, -5,
+                   -0.3, -4, -6, -7, -8, -10,
+                   -3, -4, -6, -7, -8, -10]
+_DILATANCY_CLAY_INTERPOLATOR = CloughTocher2DInterpolator(
+    [[_Il, _Ip] for _Il in _DILATANCY_IL for _Ip in _DILATANCY_IP], _DILATANCY_CLAY)
+
+# Угол дилатансии песков по коэффициенту пористости для типов грунта 1 - 5
+_DILATANCY_SAND_E = np.array([0.3, 0.5, 0.7, 0.9])
+_DILATANCY_SAND = {
+    1: np.array([23, 18, 13, 11]),  # Песок гравелистый
+    2: np.array([14, 10, 6, 5]),  # Песок крупный
+    3: np.array([12, 9, 7, 4]),  # Песок средней крупности
+    4: np.array([8, 6, 4, 3]),  # Песок мелкий
+    5: np.array([5, 4, 3, 2]),  # Песок пылеватый
+}
+
+# Границы коэффициента фильтрации [м/сут] по типу грунта для сигмоиды по коэффициенту пористости
+_KF_E_BORDERS = [0.3, 1.2]
+_KF_BORDERS = {
+    1: (10, 50),  # Песок гравелистый
+    2: (5, 30),  # Песок крупный
+    3: (1, 20),  # Песок средней крупности
+    4: (0.5, 2),  # Песок мелкий
+    5: (10 ** (-2), 10 ** (-1)),  # Песок пылеватый
+    6: (10 ** (-4), 10 ** (-2)),  # Супесь
+    7: (10 ** (-5), 10 ** (-4)),  # Суглинок
+    8: (10 ** (-8), 10 ** (-5)),  # Глина
+    9: (10 ** (-3), 10 ** (-2)),  # Торф
+}
+
+# Коэффициент Kd песков по частоте: (границы e, [Kd_low, Kd_hight] для e ниже, внутри и выше границ)
+_KD_SAND_FREQUENCY = np.array([1, 5, 10, 30, 40, 61.5, 100])
+_KD_SAND_TABLES = {
+    "1_2": ((0.55, 0.7), [
+        ([0.96, 0.95, 0.95, 0.95, 0.93, 0.93, 0.92], [0.99, 0.98, 0.98, 0.97, 0.97, 0.96, 0.96]),
+        ([0.82, 0.80, 0.79, 0.77, 0.77, 0.76, 0.75], [0.85, 0.84, 0.83, 0.81, 0.81, 0.80, 0.79]),
+        ([0.80, 0.78, 0.77, 0.76, 0.76, 0.75, 0.74], [0.84, 0.83, 0.82, 0.80, 0.80, 0.79, 0.78])]),
+    "3": ((0.55, 0.7), [
+        ([0.93, 0.91, 0.90, 0.88, 0.87, 0.85, 0.84], [0.97, 0.95, 0.94, 0.94, 0.93, 0.93, 0.92]),
+        ([0.8, 0.78, 0.77, 0.74, 0.73, 0.71, 0.70], [0.84, 0.82, 0.80, 0.77, 0.77, 0.76, 0.75]),
+        ([0.77, 0.76, 0.74, 0.72, 0.71, 0.70, 0.70], [0.82, 0.80, 0.78, 0.77, 0.76, 0.75, 0.74])]),
+    "4": ((0.6, 0.75), [
+        ([0.92, 0.89, 0.87, 0.85, 0.84, 0.82, 0.81], [0.96, 0.93, 0.91, 0.88, 0.88, 0.86, 0.85]),
+        ([0.79, 0.76, 0.75, 0.70, 0.70, 0.68, 0.65], [0.83, 0.80, 0.79, 0.75, 0.74, 0.72, 0.71]),
+        ([0.77, 0.74, 0.72, 0.68, 0.66, 0.64, 0.61], [0.81, 0.78, 0.77, 0.73, 0.72, 0.71, 0.70])]),
+    "5": ((0.6, 0.8), [
+        ([0.90, 0.87, 0.84, 0.80, 0.79, 0.78, 0.76], [0.95, 0.92, 0.89, 0.85, 0.84, 0.83, 0.81]),
+        ([0.77, 0.74, 0.70, 0.68, 0.67, 0.64, 0.63], [0.82, 0.78, 0.75, 0.72, 0.71, 0.69, 0.67]),
+        ([0.74, 0.70, 0.68, 0.64, 0.62, 0.61, 0.58], [0.78, 0.75, 0.72, 0.68, 0.66, 0.65, 0.63])]),
+}
+_KD_SAND_SPLINES = {
+    key: (borders, [(interp1d(_KD_SAND_FREQUENCY, np.array(low), kind='cubic'),
+                     interp1d(_KD_SAND_FREQUENCY, np.array(hight), kind='cubic')) for low, hight in tables])
+    for key, (borders, tables) in _KD_SAND_TABLES.items()
+}
+
+# Ускорение по интенсивности и число циклов по магнитуде
+_ACCELERATION_SPLINE = interp1d(np.array([0, 6, 7, 8, 9, 10]), np.array([0, 0.1, 0.16, 0.24, 0.33, 0.82]),
+                                kind='cubic')
+_CYCLES_COUNT_SPLINE = interp1d(np.array([0, 5.25, 6, 6.75, 7.5, 8.5, 12]), np.array([0, 3, 5, 10, 15, 26, 90]),
+                                kind='cubic')
+
+
+@lru_cache(maxsize=4096)
+def _m_by_table(e: float, Il: float) -> float:
+    return _M_INTERPOLATOR((e, Il)).item()
+
+
+@lru_cache(maxsize=4096)
+def _dilatancy_for_clay_by_table(Il: float, Ip: float) -> float:
+    return np.round(_DILATANCY_CLAY_INTERPOLATOR((Il, Ip)).item(), 2)
+
+
+@lru_cache(maxsize=4096)
+def _kf_by_table(type_ground: int, e: float) -> float:
+    k_min, k_max = _KF_BORDERS[type_ground]
+    e_min, e_max = _KF_E_BORDERS
+    return sigmoida(e, amplitude=(k_max - k_min) / 2, x_indent=e_min + (e_max - e_min) / 2,
+                    y_indent=k_min + (k_max - k_min) / 2, shape=e_max - e_min)
+
+
+@lru_cache(maxsize=4096)
+def _kd_sand_bounds(e: float, frequency: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Границы Kd для типов грунта 1, 2, 3, 4, 5 при заданных e и частоте"""
+    bounds = {}
+    for key, ((e_low, e_hight), splines) in _KD_SAND_SPLINES.items():
+        # Для типов 1, 2 нижняя граница e включается в средний диапазон, для остальных - нет
+        if (e <= e_low) if key == "1_2" else (e < e_low):
+            spline_low, spline_hight = splines[0]
+        elif e > e_hight:
+            spline_low, spline_hight = splines[2]
+        else:
+            spline_low, spline_hight = splines[1]
+        bounds[key] = (float(spline_low(frequency)), float(spline_hight(frequency)))
+    order = ["1_2", "1_2", "3", "4", "5"]
+    return np.array([bounds[key][0] for key in order]), np.array([bounds[key][1] for key in order])
+
+
+def clear_properties_cache():
+    """Сброс кэша расчетов свойств по таблицам"""
+    for function in [_m_by_table, _dilatancy_for_clay_by_table, _kf_by_table, _kd_sand_bounds]:
+        function.cache_clear()
+
 class PhysicalProperties:
     """Класс, хранящий свойсва грунтов, которые считываются без обработки"""
     laboratory_number = DataTypeValidation(str)
@@ -535,24 +659,16 @@ class MechanicalProperties:
         if (not Il or not e):
             return np.round(np.random.uniform(0.5, 0.65), 2)
         else:
-            default_Il = [-0.25, 0, 0.25, 0.5, 0.75, 1]
-            default_e = [0.5, 0.8, 1.2]
-            default_m = [0.5, 0.6, 0.6, 0.7, 0.8, 0.8, 0.4, 0.5, 0.6, 0.7, 0.7, 0.9, 0.2, 0.3, 0.4, 0.6, 0.8, 1.0]
-
-            if Il < default_Il[0]:
-                Il = default_Il[0]
-            if Il > default_Il[-1]:
-                Il = default_Il[-1]
-            if e < default_e[0]:
-                e = default_e[0]
-            if e > default_e[-1]:
-                e = default_e[-1]
+            if Il < _M_IL[0]:
+                Il = _M_IL[0]
+            if Il > _M_IL[-1]:
+                Il = _M_IL[-1]
+            if e < _M_E[0]:
+                e = _M_E[0]
+            if e > _M_E[-1]:
+                e = _M_E[-1]
 
-            default_e_Il = []
-            for _e in default_e:
-                default_e_Il.extend(list(map(lambda Il: [_e, Il], default_Il)))
-
-            m = griddata(default_e_Il, default_m, (e, Il), method='cubic').item()
+            m = _m_by_table(e, Il)
 
             try:
                 return np.round(m, 2)
@@ -566,40 +682,8 @@ class MechanicalProperties:
             :param e: коэффициент пористости
             :return: kf в метрах/сутки"""
         e = e if e else np.random.uniform(0.6, 0.7)
-        # Функция сигмоиды для kf
-        kf_sigmoida = lambda e, e_min, e_max, k_min, k_max: sigmoida(e, amplitude=(k_max - k_min) / 2,
-                                                                     x_indent=e_min + (e_max - e_min) / 2,
-                                                                     y_indent=k_min + (k_max - k_min) / 2,
-                                                                     shape=e_max - e_min)
-        # Общие параметры сигмоиды
-        e_borders = [0.3, 1.2]
-
-        # Зависимость коэффициента фильтрации от грансостава
-        """dependence_kf_on_type_ground = {
-            1: kf_sigmoida(e, *e_borders, 8.64, 86.4), # Песок гравелистый
-            2: kf_sigmoida(e, *e_borders, 8.64, 86.4), # Песок крупный
-            3: kf_sigmoida(e, *e_borders, 0.864, 86.4), # Песок средней крупности
-            4: kf_sigmoida(e, *e_borders, 8.64 * 10 ** (-2), 0.864), # Песок мелкий
-            5: kf_sigmoida(e, *e_borders, 8.64 * 10 ** (-2), 0.864), # Песок пылеватый
-            6: kf_sigmoida(e, *e_borders, 8.64 * 10 ** (-4), 8.64 * 10 ** (-2)), # Супесь
-            7: kf_sigmoida(e, *e_borders, 8.64 * 10 ** (-5), 8.64 * 10 ** (-4)), # Суглинок
-            8: kf_sigmoida(e, *e_borders, 0.0000001, 8.64 * 10 ** (-5)), # Глина
-            9: kf_sigmoida(e, *e_borders, 8.64 * 10 ** (-4), 8.64 * 10 ** (-2)), # Торф
-        }"""
-
-        dependence_kf_on_type_ground = {
-            1: kf_sigmoida(e, *e_borders, 10, 50),  # Песок гравелистый
-            2: kf_sigmoida(e, *e_borders, 5, 30),  # Песок крупный
-            3: kf_sigmoida(e, *e_borders, 1, 20),  # Песок средней крупности
-            4: kf_sigmoida(e, *e_borders, 0.5, 2),  # Песок мелкий
-            5: kf_sigmoida(e, *e_borders, 10 ** (-2), 10 ** (-1)),  # Песок пылеватый
-            6: kf_sigmoida(e, *e_borders, 10 ** (-4), 10 ** (-2)),  # Супесь
-            7: kf_sigmoida(e, *e_borders, 10 ** (-5), 10 ** (-4)),  # Суглинок
-            8: kf_sigmoida(e, *e_borders, 10 ** (-8), 10 ** (-5)),  # Глина
-            9: kf_sigmoida(e, *e_borders, 10 ** (-3), 10 ** (-2)),  # Торф
-        }
-
-        return dependence_kf_on_type_ground[type_ground]
+        # Сигмоида по коэффициенту пористости в границах kf для типа грунта (см. _KF_BORDERS)
+        return _kf_by_table(type_ground, e)
 
     @staticmethod
     def define_Cv(kf: float, m: float = 0.6) -> float:
@@ -983,69 +1067,32 @@ class MechanicalProperties:
 
         def define_dilatancy_for_clay(Il, Ip):
             """Функция расчета параметра угла дилатансии для супесей, суглинков, глин и тофов"""
-
-            default_Ip = [1, 7, 12, 17, 24, 40]  # столбец
-            default_Il = [-0.5, -0.25, 0, 0.25, 0.5, 0.75, 1, 1.5]  # строка
-
-            default_angle_of_dilatancy = [7, 4, 3, 2, 2, 0,
-                                          6, 4, 3, 2, 2, -1,
-                                          3, 2, 1, 0, 1, -2,
-                                          2, 2, 1, 0, 0, -3,
-                                          1, 1, 0, -2, -3, -4,
-                                          -1, -2, -2, -3, -4, -5,
-                                          -0.3, -4, -6, -7, -8, -10,
-                                          -3, -4, -6, -7, -8, -10]
             if Il is None:
                 Il = np.random.uniform(0, 0.75)
             if Ip is None:
                 Ip = np.random.uniform(12, 17)
 
-            if Il < default_Il[0]:
-                Il = default_Il[0]
-            if Il > default_Il[-1]:
-                Il = default_Il[-1]
-            if Ip < default_Ip[0]:
-                Ip = default_Ip[0]
-            if Ip > default_Ip[-1]:
-                Ip = default_Ip[-1]
+            Il = min(max(Il, _DILATANCY_IL[0]), _DILATANCY_IL[-1])
+            Ip = min(max(Ip, _DILATANCY_IP[0]), _DILATANCY_IP[-1])
 
-            default_Ip_Il = []
-            for _Il in default_Il:
-                default_Ip_Il.extend(list(map(lambda Ip: [_Il, Ip], default_Ip)))
-
-            angle_of_dilatancy = griddata(default_Ip_Il, default_angle_of_dilatancy, (Il, Ip), method='cubic').item()
-            return np.round(angle_of_dilatancy, 2)
+            return _dilatancy_for_clay_by_table(Il, Ip)
 
         def define_dilatacy_for_sand(angle_of_dilatancy_array, e):
             """Функция расчета угла дилатнсии для песков"""
-
-            e_array = np.array([0.3, 0.5, 0.7, 0.9])
             if e is None:
                 e = np.random.uniform(0.5, 0.7)
-            if e < e_array[0]:
-                e = e_array[0]
-            if e > e_array[-1]:
-                e = e_array[-1]
+            e = min(max(e, _DILATANCY_SAND_E[0]), _DILATANCY_SAND_E[-1])
 
-            return np.interp(e, e_array, angle_of_dilatancy_array)
+            return np.interp(e, _DILATANCY_SAND_E, angle_of_dilatancy_array)
 
         e = e if e else np.random.uniform(0.6, 0.7)
         Ip = Ip if Ip else np.random.uniform(10, 20)
         Il = Il if Il else np.random.uniform(0, 0.3)
 
-        dependence_angle_of_dilatancy_on_type_ground = {
-            1: define_dilatacy_for_sand(np.array([23, 18, 13, 11]), e),  # Песок гравелистый
-            2: define_dilatacy_for_sand(np.array([14, 10, 6, 5]), e),  # Песок крупный
-            3: define_dilatacy_for_sand(np.array([12, 9, 7, 4]), e),  # Песок средней крупности
-            4: define_dilatacy_for_sand(np.array([8, 6, 4, 3]), e),  # Песок мелкий
-            5: define_dilatacy_for_sand(np.array([5, 4, 3, 2]), e),  # Песок пылеватый
-            6: define_dilatancy_for_clay(Il, Ip),  # Супесь
-            7: define_dilatancy_for_clay(Il, Ip),  # Суглинок
-            8: define_dilatancy_for_clay(Il, Ip),  # Глина
-            9: define_dilatancy_for_clay(Il, 40),  # Торф
-        }
-
-        return dependence_angle_of_dilatancy_on_type_ground[type_ground]
+        # Расчет только для заданного типа грунта
+        if type_ground in _DILATANCY_SAND:
+            return define_dilatacy_for_sand(_DILATANCY_SAND[type_ground], e)
+        return define_dilatancy_for_clay(Il, 40 if type_ground == 9 else Ip)
 
     @staticmethod
     def define_dilatancy_1(type_ground: int, e: float, Il: float, Ip: float) -> float:
@@ -1674,10 +1721,7 @@ class CyclicProperties(MechanicalProperties):
 
     @staticmethod
     def define_acceleration(intensity: float) -> float:
-        y1 = np.array([0, 0.1, 0.16, 0.24, 0.33, 0.82])
-        x1 = np.array([0, 6, 7, 8, 9, 10])
-        Ainter = interp1d(x1, y1, kind='cubic')
-        return float(Ainter(intensity))
+        return float(_ACCELERATION_SPLINE(intensity))
 
     @staticmethod
     def define_intensity(a: float) -> float:
@@ -1689,10 +1733,7 @@ class CyclicProperties(MechanicalProperties):
     @staticmethod
     def define_cycles_count(magnitude: float) -> int:
         if 0 < magnitude <= 12:
-            y2 = np.array([0, 3, 5, 10, 15, 26, 90])
-            x2 = np.array([0, 5.25, 6, 6.75, 7.5, 8.5, 12])
-            Ninter = interp1d(x2, y2, kind='cubic')
-            N = int(Ninter(magnitude)) + 1
+            N = int(_CYCLES_COUNT_SPLINE(magnitude)) + 1
             if N == 0:
                 N = 1
         else:
@@ -1906,82 +1947,14 @@ class VibrationCreepProperties(MechanicalProperties):
 
     @staticmethod
     def define_Kd_sand(type, e, frequency, sigma_3):
-        FREQUENCY = np.array([1, 5, 10, 30, 40, 61.5, 100])
-
         if e is None:
             e = np.round(np.random.uniform(0.6, 0.7), 2)
 
-        def type_1_2(e, frequency, frequency_array=FREQUENCY):
-            if e <= 0.55:
-                Kd_low = np.array([0.96, 0.95, 0.95, 0.95, 0.93, 0.93, 0.92])
-                Kd_hight = np.array([0.99, 0.98, 0.98, 0.97, 0.97, 0.96, 0.96])
-            elif e > 0.7:
-                Kd_low = np.array([0.80, 0.78, 0.77, 0.76, 0.76, 0.75, 0.74])
-                Kd_hight = np.array([0.84, 0.83, 0.82, 0.80, 0.80, 0.79, 0.78])
-            else:  # (0.55 <= e) and (e <= 0.7):
-                Kd_low = np.array([0.82, 0.80, 0.79, 0.77, 0.77, 0.76, 0.75])
-                Kd_hight = np.array([0.85, 0.84, 0.83, 0.81, 0.81, 0.80, 0.79])
-
-            spline_low = interp1d(frequency_array, Kd_low, kind='cubic')
-            spline_hight = interp1d(frequency_array, Kd_hight, kind='cubic')
-
-            return np.random.uniform(float(spline_low(frequency)), float(spline_hight(frequency)))
-
-        def type_3(e, frequency, frequency_array=FREQUENCY):
-            if e < 0.55:
-                Kd_low = np.array([0.93, 0.91, 0.90, 0.88, 0.87, 0.85, 0.84])
-                Kd_hight = np.array([0.97, 0.95, 0.94, 0.94, 0.93, 0.93, 0.92])
-            elif e > 0.7:
-                Kd_low = np.array([0.77, 0.76, 0.74, 0.72, 0.71, 0.70, 0.70])
-                Kd_hight = np.array([0.82, 0.80, 0.78, 0.77, 0.76, 0.75, 0.74])
-            else:  # (0.55 <= e) and (e <= 0.7):
-                Kd_low = np.array([0.8, 0.78, 0.77, 0.74, 0.73, 0.71, 0.70])
-                Kd_hight = np.array([0.84, 0.82, 0.80, 0.77, 0.77, 0.76, 0.75])
-
-            spline_low = interp1d(frequency_array, Kd_low, kind='cubic')
-            spline_hight = interp1d(frequency_array, Kd_hight, kind='cubic')
-
-            return np.random.uniform(float(spline_low(frequency)), float(spline_hight(frequency)))
-
-        def type_4(e, frequency, frequency_array=FREQUENCY):
-            if e < 0.6:
-                Kd_low = np.array([0.92, 0.89, 0.87, 0.85, 0.84, 0.82, 0.81])
-                Kd_hight = np.array([0.96, 0.93, 0.91, 0.88, 0.88, 0.86, 0.85])
-            elif e > 0.75:
-                Kd_low = np.array([0.77, 0.74, 0.72, 0.68, 0.66, 0.64, 0.61])
-                Kd_hight = np.array([0.81, 0.78, 0.77, 0.73, 0.72, 0.71, 0.70])
-            else:  # (0.55 <= e) and (e <= 0.7):
-                Kd_low = np.array([0.79, 0.76, 0.75, 0.70, 0.70, 0.68, 0.65])
-                Kd_hight = np.array([0.83, 0.80, 0.79, 0.75, 0.74, 0.72, 0.71])
-
-            spline_low = interp1d(frequency_array, Kd_low, kind='cubic')
-            spline_hight = interp1d(frequency_array, Kd_hight, kind='cubic')
-
-            return np.random.uniform(float(spline_low(frequency)), float(spline_hight(frequency)))
-
-        def type_5(e, frequency, frequency_array=FREQUENCY):
-            if e < 0.6:
-                Kd_low = np.array([0.90, 0.87, 0.84, 0.80, 0.79, 0.78, 0.76])
-                Kd_hight = np.array([0.95, 0.92, 0.89, 0.85, 0.84, 0.83, 0.81])
-            elif e > 0.8:
-                Kd_low = np.array([0.74, 0.70, 0.68, 0.64, 0.62, 0.61, 0.58])
-                Kd_hight = np.array([0.78, 0.75, 0.72, 0.68, 0.66, 0.65, 0.63])
-            else:  # (0.55 <= e) and (e <= 0.7):
-                Kd_low = np.array([0.77, 0.74, 0.70, 0.68, 0.67, 0.64, 0.63])
-                Kd_hight = np.array([0.82, 0.78, 0.75, 0.72, 0.71, 0.69, 0.67])
-
-            spline_low = interp1d(frequency_array, Kd_low, kind='cubic')
-            spline_hight = interp1d(frequency_array, Kd_hight, kind='cubic')
-
-            return np.random.uniform(float(spline_low(frequency)), float(spline_hight(frequency)))
-
-        Kd_dict = {
-            1: type_1_2(e, frequency),
-            2: type_1_2(e, frequency),
-            3: type_3(e, frequency),
-            4: type_4(e, frequency),
-            5: type_5(e, frequency),
-        }
+        # Kd определяется для всех типов песков (1, 2, 3, 4, 5) одной выборкой, как при поочередном
+        # расчете по каждому типу, чтобы не менять последовательность случайных чисел
+        Kd_low, Kd_hight = _kd_sand_bounds(e, frequency)
+        Kd_types = np.random.uniform(Kd_low, Kd_hight)
+        Kd_dict = {1: Kd_types[0], 2: Kd_types[1], 3: Kd_types[2], 4: Kd_types[3], 5: Kd_types[4]}
 
         e_dependence = sigmoida(mirrow_element(e, 0.5), 0.2, 0, 0.8, 2)
 
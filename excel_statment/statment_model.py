@@ -15,6 +15,7 @@ from general.general_functions import create_path
 from excel_statment.position_configs import PhysicalPropertyPosition, MechanicalPropertyPosition, c_fi_E_PropertyPosition, \
     DynamicsPropertyPosition, IdentificationColumns, GeneralDataColumns
 from excel_statment.functions import str_df, float_df
+from excel_statment.statment_reader import read_statment
 from general.general_functions import read_json_file, create_json_file
 import shelve
 from metrics.functions import user_ip
@@ -345,7 +346,8 @@ class Statment:
 
         self.general_data = StatmentData(excel_path)
 
-        data_frame = Statment.createDataFrame(excel_path)
+        data_frame = Statment.createDataFrame(
+            excel_path, extra_columns=[identification_column] if isinstance(identification_column, int) else [])
 
         duplicated = data_frame.duplicated(subset=["Лаб. № пробы"])
 
@@ -420,20 +422,36 @@ class Statment:
         create_path(backup_test)
         create_path(backup_date_path)
 
+        # Импорт здесь, так как пакет singletons импортирует этот модуль
+        from singletons.model_store import detach_stores, is_model_store
+
         paths = []
         for entry in os.scandir(backup_test):
             if entry.is_dir():
                 paths.append(datetime.strptime(os.path.split(entry)[-1], date_format))
+        paths.sort()
 
         if len(paths) > 20:
-            shutil.rmtree(os.path.join(backup_test, min(paths).strftime(date_format)))
+            # Копии моделей хранятся как дельты от предыдущей копии, следующая копия перед удалением
+            # становится самостоятельной
+            detach_stores(os.path.join(backup_test, paths[1].strftime(date_format)))
+            shutil.rmtree(os.path.join(backup_test, paths[0].strftime(date_format)))
+
+        previous_backups = [path.strftime(date_format) for path in paths if path.strftime(date_format) != str_datetime]
+        previous_backup_path = os.path.join(backup_test, previous_backups[-1], self.general_parameters.test_mode) \
+            if previous_backups else None
 
         shutil.copy(self.general_data.path, os.path.join(backup_date_path, os.path.split(self.general_data.path)[-1]))
 
         for model, model_name in zip(models, models_names):
             model_path = os.path.join(backup_date_path, self.general_parameters.test_mode)
             create_path(model_path)
-            model.dump(os.path.join(model_path, model_name))
+
+            parent = os.path.join(previous_backup_path, model_name) if previous_backup_path else None
+            if parent and not (os.path.isfile(parent) and is_model_store(parent)):
+                parent = None
+
+            model.dump(os.path.join(model_path, model_name), parent=parent)
 
         self.db_writer()
 
@@ -465,8 +483,10 @@ class Statment:
         threading.Thread(target=db_write, args=()).start()
 
     @staticmethod
-    def createDataFrame(excel_path) -> pd.DataFrame:
-        """Функция считывания файла excel в датафрейм"""
+    def createDataFrame(excel_path, extra_columns=()) -> pd.DataFrame:
+        """Функция считывания файла excel в датафрейм
+
+        :param extra_columns: индексы колонок, которые нужно прочитать помимо колонок position_configs"""
 
         def resave_xls_to_xlsx(file):
             """Пересохраняет файл excel из формата xls в xlsx
@@ -501,11 +521,8 @@ class Statment:
             wb = excel_path
         else:
             return None'''
-        wb = excel_path
-        df = pd.read_excel(wb, usecols="A:IV", skiprows=[0, 1, 3, 4, 5])
-        df = df[df['Лаб. № пробы'].notna()]
-
-        return df
+        # Читаются только колонки position_configs, повторное чтение неизмененной ведомости - из кэша
+        return read_statment(excel_path, extra_columns=extra_columns)
 
     def __iter__(self):
         for key in self.tests:
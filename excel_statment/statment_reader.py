@@ -0,0 +1,198 @@
+"""Чтение ведомости excel в датафрейм.
+
+Результат совпадает с pd.read_excel(path, usecols="A:IV", skiprows=[0, 1, 3, 4, 5]) с отбором строк
+с заполненным "Лаб. № пробы", но из файла читаются только колонки, заданные в position_configs
+(остальные колонки датафрейма пустые, заголовки сохраняются). Файлы xlsx читаются потоково
+(openpyxl read_only), разбор значений выполняет тот же парсер pandas, что и в read_excel.
+
+Прочитанные значения ячеек xlsx сохраняются в кэш (json в папке данных пользователя, CACHE_DIRECTORY).
+Повторное чтение неизмененного файла (совпадают время изменения и размер или хеш содержимого) берет
+значения из кэша, датафрейм из них строится тем же парсером. Файлы xls читаются pd.read_excel без кэша.
+
+Пример использования:
+    data_frame = read_statment(excel_path)
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import os
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from excel_statment.position_configs import PhysicalPropertyPosition, MechanicalPropertyPosition, \
+    c_fi_E_PropertyPosition, DynamicsPropertyPosition, IdentificationColumns, K0Columns
+from general.general_functions import user_cache_directory
+from loggers.logger import app_logger
+
+# Изменение формата кэша или правил чтения делает старый кэш недействительным
+READER_VERSION = 2
+
+CACHE_DIRECTORY = user_cache_directory("statment cache")
+
+HEADER_ROW = 2
+SKIP_ROWS = [0, 1, 3, 4, 5]
+MAX_COLUMNS = 256  # A:IV
+LABORATORY_NUMBER = "Лаб. № пробы"
+
+
+def statment_columns(extra_columns: Iterable[int] = ()) -> frozenset:
+    """Индексы колонок ведомости, которые используются при определении свойств"""
+    columns = set(extra_columns)
+    for positions in [PhysicalPropertyPosition, MechanicalPropertyPosition, DynamicsPropertyPosition, K0Columns]:
+        columns.update(position[1] for position in positions.values())
+    for _, indexes in c_fi_E_PropertyPosition.values():
+        columns.update(indexes)
+    columns.update(IdentificationColumns.values())
+    return frozenset(column for column in columns if column < MAX_COLUMNS)
+
+
+def _cell_value(cell):
+    """Значение ячейки, как его передает парсеру pandas.read_excel (движок openpyxl)"""
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n":
+        integer = int(value)
+        return integer if integer == value else float(value)
+    return value
+
+
+def _trim(row: list) -> list:
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _read_xlsx_rows(excel_path: str, columns: frozenset) -> List[list]:
+    """Значения ячеек xlsx в том виде, в котором их разбирает парсер pandas"""
+    workbook = load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        data = []
+        # Число колонок датафрейма - по самой длинной строке файла с учетом непрочитанных колонок
+        width = 0
+        for i, row in enumerate(sheet.iter_rows(max_col=MAX_COLUMNS)):
+            for length in range(len(row), width, -1):
+                if row[length - 1].value is not None:
+                    width = length
+                    break
+            if i in SKIP_ROWS:
+                data.append([""])
+            elif i == HEADER_ROW:
+                data.append(_trim([_cell_value(cell) for cell in row]))
+            else:
+                data.append(_trim([_cell_value(cell) if j in columns else "" for j, cell in enumerate(row)]))
+    finally:
+        workbook.close()
+
+    while data and not data[-1]:
+        data.pop()
+
+    for row in data:
+        row.extend([""] * (width - len(row)))
+
+    return data
+
+
+def _parse_rows(data: List[list]) -> pd.DataFrame:
+    data_frame = pd.io.parsers.TextParser(data, header=0, skiprows=SKIP_ROWS, skip_blank_lines=False).read()
+    return data_frame[data_frame[LABORATORY_NUMBER].notna()]
+
+
+def _read_excel(excel_path: str, columns: frozenset) -> pd.DataFrame:
+    if excel_path.endswith("xlsx"):
+        return _parse_rows(_read_xlsx_rows(excel_path, columns))
+    data_frame = pd.read_excel(excel_path, usecols="A:IV", skiprows=SKIP_ROWS)
+    return data_frame[data_frame[LABORATORY_NUMBER].notna()]
+
+
+_TEMPORAL_TYPES = {"datetime": datetime.datetime, "date": datetime.date, "time": datetime.time}
+
+
+def _encode_value(value):
+    """Значение ячейки для json. Даты, время и nan записываются списками [тип, значение]"""
+    if isinstance(value, float) and math.isnan(value):
+        return ["nan"]
+    for name, value_type in _TEMPORAL_TYPES.items():
+        if type(value) is value_type:
+            return [name, value.isoformat()]
+    if isinstance(value, datetime.timedelta):
+        return ["timedelta", value.total_seconds()]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(f"Значение {value!r} не записывается в кэш ведомости")
+
+
+def _decode_value(value):
+    if not isinstance(value, list):
+        return value
+    if value[0] == "nan":
+        return np.nan
+    if value[0] == "timedelta":
+        return datetime.timedelta(seconds=value[1])
+    return _TEMPORAL_TYPES[value[0]].fromisoformat(value[1])
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_statment(excel_path: str, extra_columns: Iterable[int] = (),
+                  cache_directory: Optional[str] = CACHE_DIRECTORY) -> pd.DataFrame:
+    """Чтение ведомости.
+
+    :param excel_path: путь к ведомости xlsx или xls
+    :param extra_columns: индексы колонок, которые нужно прочитать помимо колонок position_configs
+    :param cache_directory: папка кэша, None - без кэша
+    """
+    columns = statment_columns(extra_columns)
+    if not cache_directory or not excel_path.endswith("xlsx"):
+        return _read_excel(excel_path, columns)
+
+    stat = os.stat(excel_path)
+    key = {"version": READER_VERSION, "columns": sorted(columns)}
+    cache_path = os.path.join(cache_directory,
+                              hashlib.sha1(os.path.abspath(excel_path).encode("utf-8")).hexdigest() + ".json")
+
+    cache = None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        app_logger.exception(f"Ошибка чтения кэша ведомости {cache_path}")
+
+    file_hash = None
+    if isinstance(cache, dict) and cache.get("key") == key:
+        if (cache["mtime"], cache["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return _parse_rows([[_decode_value(value) for value in row] for row in cache["rows"]])
+        file_hash = _file_hash(excel_path)
+        if cache["hash"] == file_hash:
+            return _parse_rows([[_decode_value(value) for value in row] for row in cache["rows"]])
+
+    rows = _read_xlsx_rows(excel_path, columns)
+
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+        with open(cache_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump({"key": key, "mtime": stat.st_mtime_ns, "size": stat.st_size,
+                       "hash": file_hash or _file_hash(excel_path),
+                       "rows": [[_encode_value(value) for value in row] for row in rows]},
+                      file, ensure_ascii=False, allow_nan=False)
+        os.replace(cache_path + ".tmp", cache_path)
+    except (OSError, TypeError, ValueError):
+        app_logger.exception(f"Ошибка записи кэша ведомости {cache_path}")
+
+    return _parse_rows(rows)
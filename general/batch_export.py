@@ -0,0 +1,146 @@
+"""Модуль пакетного сохранения протоколов без участия виджетов.
+
+Опыты объекта распределяются по процессам ProcessPoolExecutor. Каждый процесс получает копию ведомости
+и модели своего опыта, строит графики во внеэкранном режиме (Agg) и сохраняет протоколы и логи.
+Запись результатов в ведомость excel выполняется в основном процессе, поскольку файл ведомости один.
+
+Пример использования:
+    export = BatchReportExport(save_report_job, {"RC_models": RC_models}, progress=lambda message:
+                               Loader.send_message(loader.port, message))
+    export.run(params)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from excel_statment.functions import statment_writer
+from loggers.logger import app_logger
+from thrd.socket_thd import flush_progress
+
+
+class BatchExportError(Exception):
+    """Ошибка сохранения опыта в пакетном режиме"""
+    def __init__(self, test, message):
+        self.test = test
+        self.message = message
+        super().__init__(f"Ошибка сохранения пробы {test}\n{message}")
+
+
+def create_offscreen_figure(**subplots_adjust) -> Tuple[Figure, FigureCanvasAgg]:
+    """Создает фигуру matplotlib с холстом Agg, не связанную с Qt"""
+    figure = Figure()
+    canvas = FigureCanvasAgg(figure)
+    if subplots_adjust:
+        figure.subplots_adjust(**subplots_adjust)
+    return figure, canvas
+
+
+def write_cells(path: str, cells: List[dict], flush: bool = True):
+    """Запись в ведомость ячеек, переданных задачей сохранения в виде аргументов set_cell_data.
+    При flush=False файл сохраняется позже вызовом statment_writer(path).flush() (один раз на пакет)"""
+    writer = statment_writer(path)
+    writer.set_cells(cells)
+    if flush:
+        writer.flush()
+
+
+def _init_worker(statment_state: dict, cwd: str):
+    """Инициализация процесса: внеэкранный бэкенд, рабочая папка и копия ведомости"""
+    matplotlib.use("Agg")
+    os.chdir(cwd)
+    from singletons import statment
+    statment.__dict__.update(statment_state)
+
+
+def _run_job(job: Callable, test: str, models: dict, params: dict):
+    """Выполнение задачи сохранения одного опыта в процессе"""
+    import singletons.models as models_module
+    from singletons import statment
+
+    statment.setCurrentTest(test)
+    for name, model in models.items():
+        getattr(models_module, name).tests = {test: model}
+
+    try:
+        return job(test, params)
+    finally:
+        # Процессы пула завершаются без atexit - ожидающие сообщения прогресса отправляются сразу
+        flush_progress()
+
+
+class BatchReportExport:
+    """Пакетное сохранение протоколов объекта в несколько процессов.
+
+    Задача job - функция уровня модуля вида job(test, params) -> dict, которая сохраняет протоколы
+    текущего опыта singletons.statment. В словаре результата по ключу "cells" передаются аргументы
+    для set_cell_data, они записываются в ведомость в основном процессе функцией write_cells.
+
+    Прогресс передается строкой в функцию progress, совместимую с Loader.send_message."""
+
+    def __init__(self, job: Callable, models: Dict[str, object], max_workers: Optional[int] = None,
+                 progress: Optional[Callable[[str], None]] = None):
+        """
+        :param job: функция сохранения одного опыта
+        :param models: словарь {имя синглтона в singletons.models: синглтон}, модели опыта передаются в процесс
+        :param max_workers: число процессов, по умолчанию по числу ядер
+        :param progress: функция приема сообщений о ходе сохранения
+        """
+        self.job = job
+        self.models = models
+        self.max_workers = max_workers
+        self.progress = progress
+
+    def _send(self, message: str):
+        if self.progress:
+            self.progress(message)
+
+    def run(self, params: dict, tests: Optional[List[str]] = None,
+            on_result: Optional[Callable[[str, dict], None]] = None) -> List[str]:
+        """Сохранение опытов. При ошибке в любом опыте оставшиеся задачи отменяются и вызывается BatchExportError
+
+        :param params: общие параметры сохранения, передаются в job без изменений
+        :param tests: список лабораторных номеров, по умолчанию все опыты ведомости
+        :param on_result: вызывается в основном процессе после сохранения каждого опыта
+        :return: список сохраненных опытов в порядке завершения
+        """
+        from singletons import statment
+
+        if tests is None:
+            tests = list(statment)
+
+        count = len(tests)
+        done = []
+        self._send(f"Сохранено 0 из {count}")
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(dict(statment.__dict__), os.getcwd())) as executor:
+            futures = {
+                executor.submit(_run_job, self.job, test,
+                                {name: models[test] for name, models in self.models.items()}, params): test
+                for test in tests
+            }
+
+            try:
+                for future in as_completed(futures):
+                    test = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as err:
+                        app_logger.exception(f"Ошибка сохранения пробы {test}")
+                        raise BatchExportError(test, str(err))
+
+                    if on_result:
+                        on_result(test, result or {})
+
+                    done.append(test)
+                    self._send(f"Сохранено {len(done)} из {count}")
+            except BatchExportError:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return done
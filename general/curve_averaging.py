@@ -0,0 +1,32 @@
+"""Осреднение кривых девиаторного нагружения нескольких опытов (модели осреднения для PLAXIS).
+
+Точки всех опытов объединяются в массивы, отсортированные по деформации (sorted_union), - объединение
+зависит только от набора опытов и предельной деформации, поэтому модели хранят его и при смене параметров
+аппроксимации не строят заново. Осреднение по секторам (sector_average) считает средние значения
+девиатора в секторах деформации через np.bincount.
+
+Сравнение скорости с прежним расчетом: benchmarks/curve_averaging.py"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def sorted_union(strains: Sequence[np.ndarray], deviators: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Точки всех опытов, отсортированные по деформации. Точки с одинаковой деформацией идут в порядке опытов"""
+    strain = np.concatenate([np.asarray(values, dtype=float) for values in strains])
+    deviator = np.concatenate([np.asarray(values, dtype=float) for values in deviators])
+    order = np.argsort(strain, kind="stable")
+    return strain[order], deviator[order]
+
+
+def sector_average(strain: np.ndarray, deviator: np.ndarray, sectors: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Средние значения девиатора в sectors секторах деформации от 0 до максимальной деформации.
+
+    strain отсортирован по возрастанию (sorted_union). Возвращаются начала непустых секторов и средние
+    значения девиатора в них, первой точкой добавляется (0, 0)"""
+    step = strain[-1] / sectors
+    sector = strain // step
+    keys, index = np.unique(sector, return_inverse=True)
+    means = np.bincount(index, weights=deviator) / np.bincount(index)
+    return np.hstack((0, keys * step)), np.hstack((0, means))
@@ -0,0 +1,70 @@
+"""Модуль аппроксимации опытных кривых двухпараметрическими зависимостями.
+
+Начальное приближение вычисляется линейным методом наименьших квадратов по преобразованным данным
+(вместо генетического поиска differential_evolution), затем уточняется curve_fit. Если уточнение
+не сходится или дает параметры вне допустимой области, выполняется аппроксимация с ограничениями.
+
+    fit_hardin_drnevich - кривая Гардина - Дрневича G = G0 / (1 + a * gam), 1/G линейна по gam
+    fit_log_creep - ползучесть strain = a * ln(t) + b, линейна по ln(t), решение точное
+
+Сравнение скорости с прежним расчетом: benchmarks/curve_fitting.py"""
+
+import warnings
+from typing import Tuple
+
+import numpy as np
+from scipy.optimize import curve_fit, OptimizeWarning
+
+
+def linear_least_squares(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """Прямая y = slope * x + intercept по методу наименьших квадратов. Возвращает (slope, intercept)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    slope = np.dot(dx, y - y_mean) / np.dot(dx, dx)
+    return float(slope), float(y_mean - slope * x_mean)
+
+
+def hardin_drnevich(gam, a, G0):
+    """Кривая Гардина - Дрневича"""
+    return G0 / (1 + a * gam)
+
+
+def fit_hardin_drnevich(gam: np.ndarray, G: np.ndarray) -> Tuple[float, float]:
+    """Аппроксимация кривой Гардина - Дрневича. Возвращает (a, G0).
+
+    Начальное приближение: 1/G = 1/G0 + (a/G0) * gam - прямая по gam"""
+    gam = np.asarray(gam, dtype=np.float64)
+    G = np.asarray(G, dtype=np.float64)
+
+    slope, intercept = linear_least_squares(gam, 1 / G)
+    seed = (slope / intercept, 1 / intercept) if intercept > 0 else (0., np.max(G))
+
+    if np.all(np.isfinite(seed)) and seed[0] > 0:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", OptimizeWarning)
+                popt, _ = curve_fit(hardin_drnevich, gam, G, seed)
+            if popt[0] > 0 and popt[1] > 0:
+                return float(popt[0]), float(popt[1])
+        except RuntimeError:
+            pass
+
+    # Аппроксимация с ограничениями a > 0, G0 > 0
+    seed = (max(seed[0], 1e-12) if np.isfinite(seed[0]) else 1., max(seed[1], np.max(G)))
+    popt, _ = curve_fit(hardin_drnevich, gam, G, seed, bounds=([0, 0], [np.inf, np.inf]))
+    return float(popt[0]), float(popt[1])
+
+
+def log_creep(t, a, b):
+    """Кривая ползучести"""
+    return a * np.log(t) + b
+
+
+def fit_log_creep(t: np.ndarray, strain: np.ndarray) -> Tuple[float, float]:
+    """Аппроксимация strain = a * ln(t) + b. Возвращает (a, b).
+
+    Зависимость линейна по параметрам, поэтому решение метода наименьших квадратов точное"""
+    return linear_least_squares(np.log(np.asarray(t, dtype=np.float64)), strain)
@@ -0,0 +1,170 @@
+"""Модуль чтения логов приборов (Вилли, Геотек) в колоночное представление.
+
+Лог прибора - текстовый файл с колонками, разделенными табуляцией, и строкой заголовка.
+Файл разбирается один раз парсером pandas, числовые колонки
+сохраняются в массивы numpy, текстовые (Action, Trajectory) - в категориальные колонки с целочисленными
+кодами и заранее найденными границами этапов.
+
+Пример использования:
+    log = read_device_log(file_path, columns=["Time", "Deviator", "Action"], skip_rows=1)
+    time = log["Time"]
+    begin = log["Action"].index("WaitLimit")
+"""
+
+import csv
+import locale
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class CategoricalColumn:
+    """Текстовая колонка лога в виде кодов категорий.
+
+    Поддерживает интерфейс списка строк, который использовался при обработке логов:
+    column[i], column[a:b], column.index(value, start), len(column)"""
+
+    def __init__(self, values: np.ndarray):
+        self.categories, codes = np.unique(values, return_inverse=True)
+        self.codes = codes.astype(np.int32).ravel()
+        self._category_codes = {category: code for code, category in enumerate(self.categories.tolist())}
+
+        # Границы этапов - индексы, с которых начинается новая последовательность одинаковых значений
+        self.stage_starts = np.flatnonzero(np.diff(self.codes, prepend=-1))
+        self.stage_codes = self.codes[self.stage_starts]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, item) -> Union[str, List[str]]:
+        values = self.categories[self.codes[item]]
+        return values.tolist() if isinstance(values, np.ndarray) else str(values)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __contains__(self, value):
+        return value in self._category_codes
+
+    def code(self, value: str) -> int:
+        """Код категории. Если значения нет в колонке, ValueError"""
+        try:
+            return self._category_codes[value]
+        except KeyError:
+            raise ValueError(f"{value} is not in column")
+
+    def index(self, value: str, start: Optional[int] = 0) -> int:
+        """Индекс первого вхождения value начиная со start (аналог list.index). Если вхождения нет, ValueError"""
+        code = self.code(value)
+        start = int(start)
+        if not 0 <= start < len(self):
+            raise ValueError(f"{value} is not in column")
+
+        stage = np.searchsorted(self.stage_starts, start, side="right") - 1
+        if self.stage_codes[stage] == code:
+            return start
+
+        next_stages, = np.where(self.stage_codes[stage + 1:] == code)
+        if not len(next_stages):
+            raise ValueError(f"{value} is not in column")
+        return int(self.stage_starts[stage + 1 + next_stages[0]])
+
+    def stages(self, value: str) -> np.ndarray:
+        """Границы этапов со значением value в виде массива пар [начало, конец)"""
+        code = self.code(value)
+        ends = np.append(self.stage_starts[1:], len(self))
+        mask = self.stage_codes == code
+        return np.column_stack((self.stage_starts[mask], ends[mask]))
+
+
+class DeviceLog:
+    """Колоночное представление лога прибора: {имя колонки: np.ndarray или CategoricalColumn}"""
+
+    def __init__(self, header: List[str], columns: Dict[str, Union[np.ndarray, CategoricalColumn]]):
+        self.header = header
+        self.columns = columns
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def __contains__(self, key):
+        return key in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def keys(self):
+        return self.columns.keys()
+
+
+def find_columns(header: List[str], keys: Iterable[str], partial_names: Optional[bool] = False) -> Dict[str, int]:
+    """Индексы колонок заголовка по ключам.
+
+    :param partial_names: если True, ключ ищется как подстрока имени колонки (первое совпадение)
+        и отсутствующие ключи пропускаются, иначе требуется точное совпадение и при отсутствии - ValueError"""
+    indexes = {}
+    for key in keys:
+        if partial_names:
+            for i, column_name in enumerate(header):
+                if key in column_name:
+                    indexes[key] = i
+                    break
+        else:
+            indexes[key] = header.index(key)
+    return indexes
+
+
+def _column_values(column: pd.Series) -> Union[np.ndarray, CategoricalColumn]:
+    """Массив numpy для числовой колонки, CategoricalColumn для текстовой.
+    Числа, записанные с другим десятичным разделителем, приводятся заменой запятой на точку"""
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        return column.to_numpy(dtype=np.float64)
+    values = column.astype(str).to_numpy(dtype=str)
+    try:
+        return np.char.replace(values, ",", ".").astype(np.float64)
+    except ValueError:
+        return CategoricalColumn(values)
+
+
+def read_device_log(file_path: str, columns: Optional[Iterable[str]] = None, skip_rows: Optional[int] = 0,
+                    partial_names: Optional[bool] = False, decimal: Optional[str] = ",",
+                    chunk_rows: Optional[int] = None, encoding: Optional[str] = None) -> DeviceLog:
+    """Чтение лога прибора.
+
+    Разбор выполняет парсер pandas.read_csv с отображением файла в память (memory_map) и чтением
+    только нужных колонок. При заданном chunk_rows файл читается потоково блоками по chunk_rows строк.
+
+    :param file_path: путь к логу
+    :param columns: ключи нужных колонок, по умолчанию все колонки заголовка
+    :param skip_rows: число строк после заголовка, которые пропускаются (например, строка единиц измерения)
+    :param partial_names: поиск колонок по подстроке имени (см. find_columns)
+    :param decimal: десятичный разделитель в файле
+    :param chunk_rows: число строк в блоке разбора, по умолчанию файл читается целиком
+    :param encoding: кодировка файла, по умолчанию системная, как при open(file_path)
+    :return: DeviceLog c числовыми колонками np.ndarray и текстовыми CategoricalColumn
+    """
+    encoding = encoding or locale.getpreferredencoding(False)
+
+    with open(file_path, encoding=encoding) as file:
+        header = file.readline().rstrip("\r\n").split("\t")
+    indexes = find_columns(header, header if columns is None else columns, partial_names=partial_names)
+
+    # Одна колонка файла может соответствовать нескольким ключам
+    usecols = sorted(set(indexes.values()))
+
+    data = pd.read_csv(file_path, sep="\t", header=None, skiprows=1 + skip_rows, usecols=usecols,
+                       decimal=decimal, float_precision="round_trip", encoding=encoding, memory_map=True,
+                       chunksize=chunk_rows,
+                       skip_blank_lines=True, low_memory=False, quoting=csv.QUOTE_NONE)
+    if chunk_rows:
+        data = pd.concat(list(data), ignore_index=True)
+
+    read_data = {}
+    for key, index in indexes.items():
+        read_data[key] = _column_values(data[index])
+
+    return DeviceLog(header, read_data)
@@ -245,20 +245,20 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
                         :param low_first_district: задает начальный участок с меньшими значениями,
                          чтобы не было видно скачка производной. Подается как число начальных участков"""
 
-    def random_value_in_array(x):
-        """Возвращает рандомное значение в пределах массива"""
-        return np.random.uniform(min(x), max(x))
+    def random_values_in_parts(x, parts_count):
+        """Возвращает рандомное значение в пределах каждой из parts_count равных частей массива"""
+        parts = np.asarray(x[:int(parts_count * (len(x) // parts_count))]).reshape(parts_count, -1)
+        return np.random.uniform(parts.min(axis=1), parts.max(axis=1))
 
     def split_amplitude(amplitude, points_of_deviations_count, val, low_first_district):
         """Делает линейную зависимость амплитуды от точки"""
         x = np.linspace(0, points_of_deviations_count - 1, points_of_deviations_count)
 
         if low_first_district:
-            return np.hstack((np.array([amplitude / 10 for _ in range(low_first_district)]), np.array(
-                [((i / x[-1]) * (val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude for i in
-                 x[low_first_district:]])))
+            return np.hstack((np.full(int(low_first_district), amplitude / 10), ((x[low_first_district:] / x[-1]) * (
+                    val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude))
         else:
-            return np.array([((i / x[-1]) * (val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude for i in x])
+            return ((x / x[-1]) * (val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude
 
     def create_amplitude_array(amplitude, x, val):
         """Делает массив с линейной зависимостью амплитуды от точки"""
@@ -277,17 +277,16 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
     def create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district):
         """Делает массив с линейной зависимостью амплитуды от точки"""
 
-        # Определим начение y в каждой точке перегиба
+        # Определим начение y в каждой точке перегиба. Значения генерируются одним вызовом в том же порядке,
+        # что и поэлементно, поэтому при заданном seed кривая не меняется
+        amplitudes = split_amplitude(amplitude, points_of_deviations_count, val, low_first_district)
         if one_side:
-            y_points_of_deviations_array = np.hstack((0, np.array([np.random.uniform(amp/3, amp) for amp in split_amplitude(amplitude, points_of_deviations_count, val, low_first_district)]), 0))
+            y_points_of_deviations_array = np.hstack((0, np.random.uniform(amplitudes / 3, amplitudes), 0))
         else:
-            y_points_of_deviations_array = np.hstack((0, np.array(
-                [np.random.uniform(-amp, amp) for amp in split_amplitude(amplitude, points_of_deviations_count, val, low_first_district)]), 0))
+            y_points_of_deviations_array = np.hstack((0, np.random.uniform(-amplitudes, amplitudes), 0))
 
         # Определим начение x в каждой точке перегиба
-        x_points_of_deviations_array = np.hstack((x[0],
-                                                  np.array([random_value_in_array(i) for i in np.hsplit(x[:int(points_of_deviations_count*(len(x)//points_of_deviations_count))], points_of_deviations_count)]),
-                                                           x[-1]))
+        x_points_of_deviations_array = np.hstack((x[0], random_values_in_parts(x, points_of_deviations_count), x[-1]))
         return x_points_of_deviations_array, y_points_of_deviations_array
 
     x_points_of_deviations_array, y_points_of_deviations_array = create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
@@ -299,7 +298,7 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
         deviation_curve = iterpolate_curve(x)
 
         if one_side:
-            while min(deviation_curve)<0:
+            while np.min(deviation_curve) < 0:
                 x_points_of_deviations_array, y_points_of_deviations_array = \
                     create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
                 iterpolate_curve = make_interp_spline(x_points_of_deviations_array, y_points_of_deviations_array, k=3,
@@ -311,7 +310,7 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
         deviation_curve = np.array(splev(x, iterpolate_curve, der=0))
 
         if one_side:
-            while min(deviation_curve)<0:
+            while np.min(deviation_curve) < 0:
                 x_points_of_deviations_array, y_points_of_deviations_array = \
                     create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
                 iterpolate_curve = splrep(x_points_of_deviations_array, y_points_of_deviations_array, k=3)
@@ -320,7 +319,7 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
     # Нормируем сплайнн
     if amplitude != 0:
         amplitude_array = create_amplitude_array(amplitude, x, val)
-        imax = np.argmax((np.abs(deviation_curve) + min(np.abs(deviation_curve)/1000))/amplitude_array)
+        imax = np.argmax((np.abs(deviation_curve) + np.min(np.abs(deviation_curve)/1000))/amplitude_array)
         if deviation_curve[imax] != 0 and amplitude_array[imax]!=0:
             deviation_curve /= deviation_curve[imax]/amplitude_array[imax]
 
@@ -329,66 +328,90 @@ def create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders =
     return deviation_curve
 
 def find_line_area(x, y, d, step, Uslovie = [0.8, 1]):
-    '''Для полученных массивов определим границы по углу наклона'''
-    def findKoeff(x, y, d, step):
-        '''Берем одну точку из общего массива и по 3 с каждой стороны от нее
-                   Проводим через этот набор аппроксимирующую кривую и смотрим, сколько точек из общего массива еше попали на заданную дистанцию от кривой'''
-        def distanse(x, y, A, B):
-            ''' Возвращает расстояние между точнкой и прямой'''
-            return (abs(A * x - y + B)) / ((A ** 2 + 1) ** 0.5)
-
-        arrayA = []  # Массив углов наклона
-        arrayB = []  # Массив смещений
-        arrayPointsCount = []  # Массив колличества точет, аппроксимированных данной кривой
-
-        for i in range(step, len(x) - step):
+    '''Для полученных массивов определим границы по углу наклона
+
+    Через каждую точку проводится прямая по методу наименьших квадратов по окну из 2 * step точек
+    вокруг нее. Для прямой считается количество точек, лежащих к ней ближе, чем d * расстояние от
+    центральной точки окна, идущих подряд с начала массива с разрывами не более 10 точек.
+    Из прямых с наклоном в заданном диапазоне Uslovie выбирается прямая с наибольшим количеством точек.'''
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    A, B = _window_lines(x, y, step)
+
+    # Количество точек считается только для прямых, наклон которых удовлетворяет условию
+    min_A = abs(np.min(A))
+    condition, = np.where((np.abs(A) >= Uslovie[0] * min_A) & (np.abs(A) <= Uslovie[1] * min_A))
+    A1 = A[condition]
+    B1 = B[condition]
+    Points = _line_points_count(x, y, A1, B1, d, condition + step)
+
+    i = np.argmax(Points)
+    return A1[i], B1[i]
+
+
+def _window_lines(x, y, step):
+    '''Наклоны и смещения прямых метода наименьших квадратов по окнам x[i - step: i + step]
+    для i из range(step, len(x) - step)'''
+    count = max(len(x) - 2 * step, 0)
+    x_windows = np.lib.stride_tricks.sliding_window_view(x, 2 * step)[:count]
+    y_windows = np.lib.stride_tricks.sliding_window_view(y, 2 * step)[:count]
+
+    x_mean = x_windows.mean(axis=1)
+    y_mean = y_windows.mean(axis=1)
+    dx = x_windows - x_mean[:, None]
+    A = np.einsum("ij,ij->i", dx, y_windows - y_mean[:, None]) / np.einsum("ij,ij->i", dx, dx)
+    B = y_mean - A * x_mean
+    return A, B
 
-            xData = np.array(x[i - step: i + step])
-            yData = np.array(y[i - step: i + step])
 
-            # Аппроксимация
-            p = np.polyfit(xData, yData, 1)
-            ya = np.polyval(p, xData)
+# Размер блока прямых и точек в _line_points_count. Подобраны benchmarks.general_functions --blocks
+LINE_ROWS_BLOCK = 256
+LINE_COLUMNS_BLOCK = 2048
 
-            A = (ya[-1] - ya[0]) / (xData[-1] - xData[0])
-            B = np.polyval(p, 0)
 
-            # Обнуляем количество точек
-            points = 0
-            iEnd = i
+def _line_points_count(x, y, A, B, d, centers, rows_block=LINE_ROWS_BLOCK, columns_block=LINE_COLUMNS_BLOCK,
+                       max_gap=10):
+    '''Количество точек, аппроксимированных прямыми A, B.
 
-            # Проходим по всем точкам и смотрим дистанцию
-            for g in range(len(x)):
-                if distanse(x[g], y[g], A, B) < d * distanse(x[i], y[i], A, B):
-                    if g <= iEnd + 10:
-                        iEnd = g
-                        points += 1
+    Точка g попадает на прямую, если расстояние от нее до прямой меньше d * расстояние от точки centers.
+    Точки перебираются с начала массива: точка засчитывается, если она не дальше max_gap от последней
+    засчитанной (для первой - от центральной точки), на первом разрыве подсчет прекращается.
 
-            arrayA.append(A)
-            arrayB.append(B)
-            arrayPointsCount.append(points)
+    Для каждой прямой точки просматриваются до первого разрыва, поэтому время - O(число прямых * номер точки
+    первого разрыва), в худшем случае квадратично по числу точек. Массив просматривается блоками
+    rows_block * columns_block, что ограничивает память, прямые с разрывом выбывают после своего блока'''
+    points = np.zeros(len(A), dtype=np.int64)
+    norm = np.sqrt(A ** 2 + 1)
+    limit = d * np.abs(A * x[centers] - y[centers] + B) / norm
 
+    for rows_start in range(0, len(A), rows_block):
+        rows = np.arange(rows_start, min(rows_start + rows_block, len(A)))
+        last = centers[rows].copy()
 
-        return np.array(arrayA), np.array(arrayB), np.array(arrayPointsCount)
+        for columns_start in range(0, len(x), columns_block):
+            g = np.arange(columns_start, min(columns_start + columns_block, len(x)))
+            mask = np.abs(A[rows, None] * x[g] - y[g] + B[rows, None]) / norm[rows, None] < limit[rows, None]
 
+            # Номер последней засчитанной точки перед каждой точкой блока
+            previous = np.maximum.accumulate(np.where(mask, g, -1), axis=1)
+            before = np.empty_like(previous)
+            before[:, 0] = last
+            before[:, 1:] = np.where(previous[:, :-1] >= 0, previous[:, :-1], last[:, None])
 
-    A, B, Points = findKoeff(x, y, d, step)
-    M1 = []
-    A1 = []
-    B1 = []
+            gaps = mask & (g - before > max_gap)
+            broken = gaps.any(axis=1)
+            counted = np.cumsum(mask, axis=1)
+            first_gap = np.argmax(gaps, axis=1)
+            points[rows] += np.where(broken, np.where(first_gap > 0, counted[np.arange(len(rows)), first_gap - 1], 0),
+                                     counted[:, -1])
 
-    for i in range(len(A)):
-        if abs(A[i]) >= Uslovie[0] * abs(min(A)) and abs(A[i]) <= Uslovie[1] * abs(min(A)):
-            M1.append(Points[i])
-            A1.append(A[i])
-            B1.append(B[i])
+            last = np.where(previous[:, -1] >= 0, previous[:, -1], last)[~broken]
+            rows = rows[~broken]
+            if not len(rows):
+                break
 
-    M = np.array(M1)
-    i = np.argmax(M)
-    A = A1[i]
-    B = B1[i]
-
-    return A, B
+    return points
 
 def find_line_koef(x, y):
     """Функция возвращает коэффициенты аппроксимации прямой A, B"""
@@ -452,15 +475,64 @@ def interpolated_intercept(x, y1, y2):
     except IndexError:
         return 0, 0
 
+# Наибольшая и наименьшая длина участка векторизованного расчета discrete_array
+DISCRETE_ARRAY_WINDOW = 1 << 16
+DISCRETE_ARRAY_MIN_WINDOW = 64
+
 def discrete_array(array, n_step):
     """Функция делает массив дискретным по заданнаму шагу датчика
     Входные параметры: array - массив данных
-    n_step - значение шага"""
-    current_val = (array[0]//n_step)*n_step # значение массива с учетом шага в заданной точке
-    for i in range(1, len(array)): # перебираем весь массив
-        count_step = (array[i]-current_val)//n_step
-        array[i] = current_val + count_step*n_step
-        current_val = array[i]
+    n_step - значение шага
+
+    Значение в точке i: current + ((array[i] - current) // n_step) * n_step, где current - значение в точке i - 1
+    (в первой точке - (array[0] // n_step) * n_step, сама первая точка не меняется). Массив изменяется на месте.
+
+    Расчет векторизован с тем же округлением, что и поточечный: число шагов в каждой точке считается по
+    приближенным значениям предыдущих точек, значения получаются последовательной суммой шагов
+    (np.add.accumulate), затем число шагов проверяется по полученным значениям. Участок до первого
+    расхождения принимается, с точки расхождения расчет повторяется."""
+    if isinstance(array, np.ndarray) and array.dtype != np.float64:
+        # Массив другого типа округляет каждое значение при записи - только поточечный расчет
+        current_val = (array[0] // n_step) * n_step
+        for i in range(1, len(array)):
+            count_step = (array[i] - current_val) // n_step
+            array[i] = current_val + count_step * n_step
+            current_val = array[i]
+        return array
+
+    values = np.asarray(array, dtype=np.float64)
+    if len(values) < 2:
+        return array
+
+    current_val = (values[0] // n_step) * n_step  # значение массива с учетом шага в заданной точке
+    result = np.empty(len(values))
+    approximate = current_val + ((values - current_val) // n_step) * n_step
+
+    start = 1
+    window = DISCRETE_ARRAY_WINDOW
+    while start < len(values):
+        stop = min(start + window, len(values))
+        previous = np.empty(stop - start)
+        previous[0] = current_val
+        previous[1:] = approximate[start:stop - 1]
+
+        count_step = (values[start:stop] - previous) // n_step
+        chain = np.add.accumulate(np.hstack((current_val, count_step * n_step)))[1:]
+
+        previous[1:] = chain[:-1]
+        mismatch = np.flatnonzero((values[start:stop] - previous) // n_step != count_step)
+        accepted = mismatch[0] if len(mismatch) else stop - start
+
+        result[start:start + accepted] = chain[:accepted]
+        if accepted:
+            current_val = chain[accepted - 1]
+        start += accepted
+        # Окно сокращается при частых расхождениях (значения на границе шага) и растет при их отсутствии
+        window = min(DISCRETE_ARRAY_WINDOW, max(DISCRETE_ARRAY_MIN_WINDOW, 2 * int(accepted)))
+        # Приближение после расхождения строится заново от последнего верного значения
+        approximate[start:stop] = current_val + ((values[start:stop] - current_val) // n_step) * n_step
+
+    array[1:] = result[1:]
     return array
 
 def array_discreate_noise(array, discreate_step, num_format, koef_noise_before=float(1), koef_noise_after=0.01):
@@ -492,9 +564,31 @@ def array_discreate_noise(array, discreate_step, num_format, koef_noise_before=f
 
     new_array = discrete_array(array + np.random.uniform(-measurement_error, measurement_error, len(array)),
                                discreate_step) + np.random.uniform(-noise_step, noise_step, len(array))
+    return round_decimals(new_array, num_format).tolist()
+
+
+def round_decimals(array, num_format):
+    """Округление массива до num_format знаков после запятой, совпадающее с float("{:.Nf}".format(x)).
+
+    Округление выполняется через np.rint(x * 10 ** N) / 10 ** N. Результат совпадает со строковым
+    форматированием, если произведение вычислено без перехода через половину единицы, поэтому точки,
+    где дробная часть произведения отличается от 0.5 меньше погрешности умножения, округляются через строку"""
+    array = np.asarray(array, dtype=np.float64)
     str_for_format = "{:." + str(num_format) + "f}"
-    new_array = [float(str_for_format.format(x)) for x in new_array]
-    return new_array
+    if int(num_format) > 15:
+        return np.array([float(str_for_format.format(x)) for x in array])
+
+    scale = float(10 ** int(num_format))
+    scaled = array * scale
+    rounded = np.rint(scaled)
+    result = rounded / scale
+
+    with np.errstate(invalid="ignore"):
+        doubtful = np.flatnonzero(~(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) > np.abs(scaled) * 2.0 ** -50)
+                                  & np.isfinite(array) | (np.abs(scaled) >= 2.0 ** 52))
+    for i in doubtful:
+        result[i] = float(str_for_format.format(array[i]))
+    return result
 
 def number_format(x, characters_number = 0, split = "."):
     """Функция возвращает число с заданным количеством знаков после запятой
@@ -583,6 +677,14 @@ def create_path(path):
     else:
         os.mkdir(path)
 
+def user_cache_directory(name: str) -> str:
+    """Папка кэша name текущего пользователя: в Windows в %LOCALAPPDATA%, иначе в $XDG_CACHE_HOME или ~/.cache"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "DigitRock", name)
+
 def match_keys_in_dict(dict_1, dict_2):
     """Удавляет из первого словаря ключи, которых нет во втором"""
     key1 = [i for i in dict_1]
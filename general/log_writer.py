@@ -0,0 +1,100 @@
+"""Модуль записи синтетических логов приборов.
+
+Колонки форматируются целиком (одна операция форматирования на колонку), строки собираются
+объединением отформатированных колонок, файл записывается одной операцией write.
+Постоянные колонки задаются через Constant и не разворачиваются в списки.
+
+Форматы ячеек:
+    str_format - str(значение), логи Геотек (трехосное сжатие, K0, срез)
+    wille_number_format - число с 6 знаками после точки, строки без изменений, логи Вилли
+
+Пример использования:
+    write_log(file_path, {"Time": time, "Action": Constant("Start")}, header=["Time", "Action"])
+"""
+
+import re
+from itertools import chain, repeat
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+
+class Constant:
+    """Колонка с одинаковым значением во всех строках"""
+    def __init__(self, value):
+        self.value = value
+
+
+def str_format(values, rows: int) -> List[str]:
+    """Форматирование колонки через str()"""
+    values = values[:rows]
+    if isinstance(values, np.ndarray) and (values.dtype.kind in "iubU" or values.dtype == np.float64):
+        # Для этих типов str() скаляра python совпадает с str() скаляра numpy, а tolist() быстрее поэлементного
+        # обращения к массиву
+        values = values.tolist()
+    return list(map(str, values))
+
+
+def _wille_cell(value) -> str:
+    try:
+        s = "{:.6f}".format(value)
+    except ValueError:
+        return value
+    return "0.000000" if s == "-0.000000" else s
+
+
+_NEGATIVE_ZERO = re.compile("\0-0\\.000000(?=\0)")
+
+
+def wille_number_format(values, rows: int) -> List[str]:
+    """Форматирование колонки числами с 6 знаками после точки ("-0.000000" пишется как "0.000000").
+    Значения, которые нельзя записать как число, пишутся без изменений"""
+    values = values[:rows]
+    try:
+        cells = ("\0%.6f" * len(values)) % tuple(values) + "\0"
+    except TypeError:
+        # В колонке есть строки - форматирование по ячейкам
+        return list(map(_wille_cell, values))
+    return _NEGATIVE_ZERO.sub("\0" + "0.000000", cells)[1:-1].split("\0") if len(values) else []
+
+
+def write_log(file_path: str, data: Dict[str, Union[Iterable, Constant]], header: Union[str, List[str]],
+              rows: Optional[int] = None, cell_format: Callable = str_format, encoding: Optional[str] = None):
+    """Запись лога прибора.
+
+    Каждая строка файла - значения колонок data по порядку, после каждого значения ставится табуляция.
+    Если колонка короче числа строк, в строках за ее концом ячейка пропускается.
+
+    :param file_path: путь к файлу
+    :param data: колонки {имя: массив значений или Constant}
+    :param header: строки заголовка (без перевода строки) или готовый текст заголовка
+    :param rows: число строк, по умолчанию по длине первой колонки
+    :param cell_format: функция форматирования колонки (values, rows) -> список строк
+    :param encoding: кодировка файла, по умолчанию системная, как при open(file_path, "w")
+    """
+    if rows is None:
+        rows = len(next(iter(data.values())))
+
+    columns = []
+    short_columns = False
+    for values in data.values():
+        if isinstance(values, Constant):
+            columns.append(repeat(cell_format([values.value], 1)[0], rows))
+            continue
+
+        cells = cell_format(values, rows)
+        if len(cells) < rows:
+            short_columns = True
+            cells = chain(cells, repeat(None, rows - len(cells)))
+        columns.append(cells)
+
+    if not isinstance(header, str):
+        header = "".join(line + "\n" for line in header)
+
+    if short_columns:
+        text = "".join("".join(cell + "\t" for cell in row if cell is not None) + "\n" for row in zip(*columns))
+    else:
+        text = "\t\n".join(map("\t".join, zip(*columns))) + "\t\n" if rows else ""
+
+    with open(file_path, "w", encoding=encoding) as file:
+        file.write(header + text)
@@ -1,5 +1,3 @@
-import pickle
-import socket
 import sys
 import threading
 import time
@@ -11,6 +9,8 @@ from PyQt5.QtGui import QMovie
 
 from typing import Tuple
 
+from thrd.socket_thd import ProgressServer, send_to_server
+
 # Для примера
 import numpy
 # Для примера
@@ -110,16 +110,13 @@ class MovieLabel(MovieObject):
 class Loader(QDialog):
     """
     Класс загрузчика. Реализован через `QDialog` поскольку нет необходимости в методе `run` у `QProgress`.
-    Получение сообщений от async фукнций реализовано через сокеты.ъ
+    Получение сообщений от async фукнций реализовано через постоянные соединения thrd.socket_thd.
     Может получает сообщения однопоточно, тогда вызывает `QApplication.processEvents()` для обновления интерфейса.
     В случае не async выполнения фукнций в потоке с загрузчиком, изображение двигаться не будет.
     Может быть проинициализирован заранее, поскольку запускается отдельно методом show().
 
     Пример использования см. ниже в App.
     """
-    # Размер буфера для сообщений socket.
-    BUFFER_SIZE = 4096
-
     def __init__(self, start_message: 'str' = '',
                  window_title: 'str' = 'Загрузка...',
                  gif: 'str' = "./general/loading.gif",
@@ -205,33 +202,16 @@ class Loader(QDialog):
 
     def __run(self):
         """
-        Запускает работу сокета по прослушиванию сообщений. Вызывается только через `show`
+        Запускает прием сообщений сервером. Вызывается только через `show`
         """
-        while self.__is_running:
-            try:
-                conn, addr = self.sock.accept()
-            except Exception as err:
-                break
-
-            all_data = bytearray()
-            while True and self.__is_running:
-                data = conn.recv(Loader.BUFFER_SIZE)
-                if not data:
-                    break
-                all_data += data
-
-            if all_data:
-                message = pickle.loads(all_data)
-            else:
-                message = ''
+        self.sock.serve(self.__receive, lambda: self.__is_running)
 
-            if not message or not self.__is_running:
-                conn.close()
-                break
-
-            self.__set_message(str(message))
-
-        return
+    def __receive(self, message) -> bool:
+        """Обработка принятого сообщения. Пустое сообщение останавливает прием"""
+        if not message or not self.__is_running:
+            return True
+        self.__set_message(str(message))
+        return False
 
     def __set_message(self, message):
         """Устанавливает сообщение на элементы виджета"""
@@ -250,9 +230,7 @@ class Loader(QDialog):
         self.ok_btn.setVisible(False)
 
         # Подключение сокета делаем при каждом отображении
-        self.sock = socket.socket()
-        self.sock.bind(('', self.port))
-        self.sock.listen(10)
+        self.sock = ProgressServer(self.port)
 
         self.__thread = threading.Thread(target=self.__run, args=())
         self.__thread.start()
@@ -327,16 +305,9 @@ class Loader(QDialog):
         """
         Устанавливает текущее сообщение для виджета.
         Для использования ВНУТРИ потоков threading.Thread.
-        Работает через сокет.
+        Работает через постоянное соединение процесса с лоадером, частые сообщения объединяются.
         """
-        if port:
-            sock = socket.socket()
-            sock.settimeout(1)
-            is_ok = sock.connect_ex(('localhost', port))
-            #print(is_ok)
-            if is_ok == 0:
-                sock.sendall(pickle.dumps(message))
-            sock.close()
+        send_to_server(port, message)
 
 
 class App(QMainWindow):
@@ -0,0 +1,473 @@
+"""Общий слой построения графиков опытов.
+
+PersistentPlot хранит линии, точки, подписи и легенды фигуры между перестроениями. Линии создаются один раз
+и обновляются через set_data, оформление осей (очистка, подписи, вспомогательные оси) выполняется только
+при смене раскладки графика или если оси были очищены другим режимом построения. Изменяемые элементы
+рисуются в режиме animated: если пределы осей не изменились, перерисовываются только они поверх
+сохраненного фона (blit), иначе выполняется полная отрисовка холста. При сохранении фигуры в файл
+animated элементы рисуются как обычные.
+
+render_to_file - сохранение фигуры для отчета, общее для виджетов и внеэкранных фигур пакетного сохранения.
+Фигура копируется (pickle) и отрисовывается на отдельном холсте Agg, поэтому фигура виджета не меняет размер
+и не перерисовывается. Готовые файлы хранятся в FigureCache по хешу копии фигуры (данные и оформление всех
+элементов), размера, формата и настроек matplotlib: при повторном сохранении неизмененного опыта файл
+берется из кэша без построения. Кэш общий для процессов пакетного сохранения (папка во временной папке).
+
+envelope_indices - прореживание длинных записей для построения: на каждом интервале индексов сохраняются
+первая, последняя, минимальная и максимальная точки каждой кривой, поэтому пики и участки разрушения
+остаются на графике без изменений при ширине графика меньше числа интервалов в пикселях.
+
+Пример использования:
+    self.deviator_plot = PersistentPlot(self.deviator_figure, self.deviator_canvas)
+
+    if self.deviator_plot.begin("deviator"):
+        self.deviator_ax.clear()
+        self.deviator_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
+    self.deviator_plot.line(self.deviator_ax, "deviator", plots["strain"], plots["deviator"])
+    self.deviator_plot.label(self.deviator_ax, "E50", "$E_{50}$ = " + str(res["E50"]))
+    self.deviator_plot.legend(self.deviator_ax)
+    self.deviator_plot.finish()
+
+    path = render_to_file(self.deviator_figure, [6, 2], "svg")
+
+    index = envelope_indices([strain, PPR])
+    ax.plot(cycles[index], strain[index])
+"""
+
+import copyreg
+import hashlib
+import itertools
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Hashable, Iterable, Optional, Sequence
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cbook import CallbackRegistry
+from matplotlib.figure import Figure
+from matplotlib.transforms import TransformNode
+
+from loggers.logger import app_logger
+
+# Число интервалов прореживания - не меньше ширины графика в пикселях на экране и в отчете
+DECIMATION_BUCKETS = 2000
+
+# Изменение правил построения копии фигуры делает старый кэш недействительным
+FIGURE_CACHE_VERSION = 1
+FIGURE_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), "DigitRock figure cache")
+# Объем файлов в памяти и число файлов в папке кэша
+FIGURE_CACHE_MEMORY = 64 * 1024 * 1024
+FIGURE_CACHE_FILES = 2000
+
+
+# Признак преобразования, требующего полного пересчета (имя зависит от версии matplotlib)
+_TRANSFORM_INVALID = getattr(TransformNode, "_INVALID_FULL", getattr(TransformNode, "INVALID", 2))
+
+
+class _FigurePickler(pickle.Pickler):
+    """Копия фигуры без связи с pyplot и с одинаковым содержимым для одинаково построенных фигур"""
+    def __init__(self, file, figure):
+        super().__init__(file, protocol=4)
+        self._figure = figure
+
+    def reducer_override(self, obj):
+        if obj is self._figure:
+            state = obj.__getstate__()
+            # Копия не создает окно pyplot при восстановлении, номер окна не входит в содержимое
+            for key in ["_restore_to_pylab", "_number", "number"]:
+                state.pop(key, None)
+            return copyreg.__newobj__, (Figure,), state
+        if isinstance(obj, TransformNode):
+            # Ключи связей преобразований - id объектов, заменяются порядковыми номерами. Кэшированные
+            # матрицы зависят от истории отрисовки и в копии пересчитываются
+            state = obj.__getstate__()
+            state["_parents"] = dict(enumerate(state["_parents"].values()))
+            state["_invalid"] = _TRANSFORM_INVALID
+            if "_inverted" in state:
+                state["_inverted"] = None
+            return copyreg.__newobj__, (type(obj),), state
+        if isinstance(obj, CallbackRegistry):
+            # Счетчик номеров подключений растет при каждой отрисовке, сохраняется следующий номер после
+            # номеров, которые входят в копию
+            state = obj.__getstate__()
+            cids = [cid for callbacks in state["callbacks"].values() for cid in callbacks]
+            start = max(cids) + 1 if cids else 0
+            state["_cid_gen"] = start if isinstance(state["_cid_gen"], int) else itertools.count(start)
+            return copyreg.__newobj__, (type(obj),), state
+        return NotImplemented
+
+
+def figure_snapshot(figure) -> bytes:
+    """Копия фигуры (pickle) для построения вне виджета и ключа кэша"""
+    file = BytesIO()
+    _FigurePickler(file, figure).dump(figure)
+    return file.getvalue()
+
+
+class FigureCache:
+    """Кэш сохраненных графиков: файлы в памяти (до memory_limit байт) и в папке directory"""
+    def __init__(self, directory: Optional[str] = FIGURE_CACHE_DIRECTORY, memory_limit: int = FIGURE_CACHE_MEMORY,
+                 files_limit: int = FIGURE_CACHE_FILES):
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.files_limit = files_limit
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(snapshot: bytes, *params) -> str:
+        """Ключ файла: копия фигуры, параметры сохранения и настройки matplotlib"""
+        digest = hashlib.sha1(snapshot)
+        digest.update(repr((FIGURE_CACHE_VERSION, matplotlib.__version__, params,
+                            sorted(matplotlib.rcParams.items()))).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, key), "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        self._remember(key, data)
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            app_logger.exception(f"Ошибка записи кэша графиков {path}")
+            return
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._prune()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.memory_limit:
+            return
+        with self._lock:
+            if key not in self._memory:
+                self._memory_size += len(data)
+            self._memory[key] = data
+            while self._memory_size > self.memory_limit:
+                _, removed = self._memory.popitem(last=False)
+                self._memory_size -= len(removed)
+
+    def _prune(self):
+        """Удаление самых старых файлов папки кэша сверх files_limit"""
+        try:
+            files = [entry for entry in os.scandir(self.directory) if entry.is_file()]
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:max(len(files) - self.files_limit, 0)]:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+figure_cache = FigureCache()
+
+
+def _save_figure(figure, path, file_type, dpi):
+    if file_type == "svg":
+        figure.savefig(path, format='svg', transparent=True)
+    elif file_type == "jpg":
+        figure.savefig(path, format='jpg', dpi=dpi, bbox_inches='tight')
+
+
+def render_to_file(figure, size: Optional[Sequence[float]] = None, file_type: str = "svg", dpi: int = 200,
+                   cache: Optional[FigureCache] = figure_cache) -> BytesIO:
+    """Сохранение фигуры в svg (прозрачный фон) или jpg размером size.
+    Сохраняется копия фигуры на холсте Agg, результат берется из кэша cache, если фигура не изменилась"""
+    try:
+        snapshot = figure_snapshot(figure)
+    except Exception:
+        # Фигура с элементами, которые нельзя скопировать (например, функции форматирования осей)
+        snapshot = None
+
+    if snapshot is None:
+        path = BytesIO()
+        figure_size = figure.get_size_inches()
+        if size is not None:
+            figure.set_size_inches(size)
+        try:
+            _save_figure(figure, path, file_type, dpi)
+        finally:
+            figure.set_size_inches(figure_size)
+        path.seek(0)
+        return path
+
+    key = None
+    if cache is not None:
+        key = cache.key(snapshot, None if size is None else [float(i) for i in size], file_type, dpi)
+        data = cache.get(key)
+        if data is not None:
+            return BytesIO(data)
+
+    headless = pickle.loads(snapshot)
+    FigureCanvasAgg(headless)
+    if size is not None:
+        headless.set_size_inches(size)
+    path = BytesIO()
+    _save_figure(headless, path, file_type, dpi)
+
+    if cache is not None:
+        cache.put(key, path.getvalue())
+    path.seek(0)
+    return path
+
+
+def envelope_indices(series: Sequence, buckets: int = DECIMATION_BUCKETS, keep: Iterable[int] = ()) -> np.ndarray:
+    """Индексы точек для построения длинной записи.
+
+    Индексы делятся на buckets равных интервалов, на каждом сохраняются первая и последняя точки и точки
+    минимума и максимума каждой кривой series (кривые одной длины), а также индексы keep. Если точек
+    меньше 4 * buckets, возвращаются все индексы. Индексы общие для всех кривых, поэтому массивы,
+    построенные друг относительно друга, остаются согласованными."""
+    length = len(series[0])
+    if length <= 4 * buckets:
+        return np.arange(length)
+
+    size = -(-length // buckets)
+    count = -(-length // size)
+    starts = np.arange(count) * size
+    indices = [starts, np.minimum(starts + size, length) - 1, np.asarray(list(keep), dtype=int)]
+
+    padded = np.empty(count * size)
+    for values in series:
+        padded[:length] = values
+        padded[length:] = values[-1]
+        blocks = padded.reshape(count, size)
+        indices.append(starts + blocks.argmin(axis=1))
+        indices.append(starts + blocks.argmax(axis=1))
+
+    return np.unique(np.clip(np.concatenate(indices), 0, length - 1))
+
+
+class PersistentPlot:
+    """Постоянные элементы графика фигуры с обновлением данных и перерисовкой через blit"""
+    # Подписи легенды без линии, как ax.plot([], [], label=..., color="#eeeeee")
+    LABEL_COLOR = "#eeeeee"
+
+    def __init__(self, figure, canvas=None):
+        self.figure = figure
+        self.canvas = canvas if canvas is not None else figure.canvas
+
+        self._layout = None
+        self._axes = None
+        self._artists = {}
+        self._touched = []
+        self._legends = {}
+        self._legend_requests = []
+        self._limits = {}
+        self._background = None
+        self._full_draw = True
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def begin(self, layout: Hashable) -> bool:
+        """Начало обновления графика в раскладке layout.
+        Возвращает True, если оформление осей нужно построить заново (первое построение, смена раскладки
+        или оси изменены другим методом построения). Тогда все сохраненные элементы удаляются."""
+        rebuild = layout != self._layout or self._axes != list(self.figure.axes) or \
+                  not all(self._attached(artist) for artist in self._artists.values())
+        if rebuild:
+            for artist in self._artists.values():
+                self._remove(artist)
+            for _, legend in self._legends.values():
+                self._remove(legend)
+            self._artists.clear()
+            self._legends.clear()
+            self._layout = layout
+            self._full_draw = True
+        else:
+            # Пределы, заданные вручную (например, панелью инструментов), сбрасываются как при ax.clear()
+            for ax in self._tracked_axes():
+                ax.set_autoscale_on(True)
+
+        self._touched = []
+        self._legend_requests = []
+        return rebuild
+
+    def line(self, ax, name: Hashable, x, y, label: Optional[str] = None, **params):
+        """Линия name на осях ax. При повторном вызове обновляются данные и подпись"""
+        line = self._artists.get(name)
+        if line is None or line.axes is not ax:
+            if line is not None:
+                self._remove(line)
+            if label is not None:
+                params["label"] = label
+            line, = ax.plot(x, y, animated=True, **params)
+            self._artists[name] = line
+        else:
+            # Данные хранятся массивами, как после ax.plot: копия фигуры не зависит от истории обновлений
+            line.set_data(np.asanyarray(x), np.asanyarray(y))
+            if label is not None:
+                line.set_label(label)
+        self._touch(name)
+        return line
+
+    def points(self, ax, name: Hashable, points: Iterable[Sequence[float]], size: Optional[float] = None,
+               zorder: float = 1, **params):
+        """Точки [(x, y), ...] одной линией с маркерами вместо ax.scatter. size - площадь маркера, как s в scatter"""
+        x, y = self._xy(points)
+        params.setdefault("marker", "o")
+        if size is not None:
+            params["markersize"] = np.sqrt(size)
+        return self.line(ax, name, x, y, linestyle="none", zorder=zorder, **params)
+
+    def label(self, ax, name: Hashable, label: str):
+        """Подпись в легенде без линии"""
+        return self.line(ax, name, [], [], label=label, color=self.LABEL_COLOR)
+
+    def text(self, ax, name: Hashable, x: float, y: float, text: str, **params):
+        """Текстовая подпись name на осях ax"""
+        artist = self._artists.get(name)
+        if artist is None or artist.axes is not ax:
+            if artist is not None:
+                self._remove(artist)
+            artist = ax.text(x, y, text, animated=True, **params)
+            self._artists[name] = artist
+        else:
+            artist.set_position((x, y))
+            artist.set_text(text)
+        self._touch(name)
+        return artist
+
+    def legend(self, ax, **params):
+        """Легенда осей ax. Строится при завершении обновления по линиям с подписью в порядке их вызова"""
+        self._legend_requests.append((ax, params))
+
+    def update_limits(self):
+        """Пересчет пределов осей по текущим данным (нужен, если пределы читаются до finish)"""
+        for ax in self._tracked_axes():
+            ax.relim()
+            ax.autoscale_view()
+
+    def finish(self):
+        """Завершение обновления: удаление элементов, не затронутых обновлением, построение легенд и отрисовка"""
+        for name in [name for name in self._artists if name not in self._touched]:
+            self._remove(self._artists.pop(name))
+
+        requested = {ax for ax, _ in self._legend_requests}
+        for ax in [ax for ax in self._legends if ax not in requested]:
+            self._remove(self._legends.pop(ax)[1])
+        for ax, params in self._legend_requests:
+            self._build_legend(ax, params)
+
+        self.update_limits()
+        limits = {ax: tuple(ax.viewLim.bounds) for ax in self.figure.axes}
+        self._axes = list(self.figure.axes)
+
+        if self._full_draw or self._background is None or limits != self._limits:
+            self._limits = limits
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+        self._full_draw = False
+
+    def _build_legend(self, ax, params):
+        handles = [self._artists[name] for name in self._touched
+                   if self._artists[name].axes is ax and hasattr(self._artists[name], "get_data")
+                   and not self._artists[name].get_label().startswith("_")]
+        key = ([handle.get_label() for handle in handles], [id(handle) for handle in handles], repr(params))
+
+        current = ax.get_legend()
+        cached = self._legends.get(ax)
+        if cached is not None and cached[0] == key and current is cached[1]:
+            return
+        if current is not None and not current.get_animated():
+            # Легенда, построенная вне слоя (например, при сохранении отчета), входит в сохраненный фон
+            self._full_draw = True
+        legend = ax.legend(handles=handles, **params)
+        legend.set_animated(True)
+        self._legends[ax] = (key, legend)
+
+    def _on_draw(self, event):
+        """После полной отрисовки холста сохраняется фон и рисуются animated элементы"""
+        if event is not None and (event.canvas is not self.canvas or self.canvas.is_saving()):
+            return
+        if not hasattr(self.canvas, "copy_from_bbox"):
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        animated = {}
+        for artist in list(self._artists.values()) + [legend for _, legend in self._legends.values()]:
+            if self._attached(artist):
+                animated.setdefault(artist.axes, []).append(artist)
+
+        drawn = []
+        for ax in sorted(self.figure.axes, key=lambda ax: ax.get_zorder()):
+            # Оси, лежащие поверх уже нарисованных элементов (врезка графика), рисуются заново
+            if any(ax.bbox.overlaps(other.bbox) for other in drawn):
+                self.figure.draw_artist(ax)
+                drawn.append(ax)
+            artists = animated.get(ax, [])
+            for artist in sorted(artists, key=lambda artist: artist.get_zorder()):
+                ax.draw_artist(artist)
+            if artists and ax not in drawn:
+                drawn.append(ax)
+
+    def _tracked_axes(self):
+        axes = []
+        for artist in self._artists.values():
+            if artist.axes is not None and artist.axes not in axes:
+                axes.append(artist.axes)
+        return axes
+
+    def _touch(self, name):
+        if name in self._touched:
+            self._touched.remove(name)
+        self._touched.append(name)
+
+    def _attached(self, artist) -> bool:
+        ax = artist.axes
+        if ax is None or ax not in self.figure.axes:
+            return False
+        if artist is ax.get_legend():
+            return True
+        return artist in ax.get_children()
+
+    @staticmethod
+    def _remove(artist):
+        try:
+            artist.remove()
+        except (ValueError, NotImplementedError, AttributeError):
+            pass
+
+    @staticmethod
+    def _xy(points):
+        points = [point for point in points if point is not None and len(point)]
+        if not points:
+            return [], []
+        x, y = zip(*points)
+        return list(x), list(y)
@@ -0,0 +1,213 @@
+"""Пересчет моделей опытов по параметрам слайдеров в фоновом потоке.
+
+Слайдеры отправляют параметры во время перемещения (с задержкой debounce), пересчет модели выполняется
+в потоке ModelRegeneration на копии модели, чтобы интерфейс не зависал. Запросы объединяются:
+пока пересчет выполняется, новые запросы одной группы параметров заменяют ожидающие, результаты
+устаревших запросов отбрасываются. Готовая модель передается сигналом ready в поток интерфейса,
+где виджет подставляет ее в контейнер моделей и перестраивает графики.
+
+Пересчет идет над копией, поэтому прямые изменения модели в интерфейсе (обработка, сохранение отчетов,
+переключение опыта) выполняются только после finish_all: ожидающие запросы досчитываются, и готовые модели
+подставляются до изменения. При загрузке нового объекта reset_all начинает новое поколение запросов -
+результаты запросов прошлого поколения отбрасываются.
+
+Пример использования:
+    self.regeneration = ModelRegeneration(self)
+    self.regeneration.ready.connect(self._model_regenerated)
+
+    self.regeneration.submit(statment.current_test, E_models[statment.current_test], "deviator_loading",
+                             lambda model: model.set_deviator_loading_draw_params(params))
+
+    def _model_regenerated(self, key, model):
+        E_models[key] = model
+
+    def _deviator_volumeter(self, button):
+        finish_all()
+        E_models[statment.current_test].choise_volume_strain(button.text())
+"""
+
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from PyQt5.QtCore import QCoreApplication, QObject, QThread, QTimer, pyqtSignal
+
+from loggers.logger import app_logger
+
+# Задержка отправки параметров при перемещении слайдера, мс
+DEBOUNCE_INTERVAL = 150
+
+# Все созданные объекты пересчета (для finish_all и reset_all)
+_instances = weakref.WeakSet()
+
+
+def debounce_timer(parent: QObject, function: Callable, interval: int = DEBOUNCE_INTERVAL) -> QTimer:
+    """Однократный таймер: function вызывается через interval мс после последнего перезапуска таймера"""
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(interval)
+    timer.timeout.connect(function)
+    return timer
+
+
+class _RegenerationThread(QThread):
+    done = pyqtSignal(object, int, int, object, object)
+
+    def __init__(self, owner: "ModelRegeneration"):
+        super().__init__()
+        self._owner = owner
+
+    def run(self):
+        owner = self._owner
+        while True:
+            with owner._condition:
+                while not owner._pending and not owner._stopped:
+                    owner._condition.wait()
+                if owner._stopped:
+                    return
+                key = next(iter(owner._pending))
+                job = owner._pending.pop(key)
+                owner._running = key
+                # Продолжение цепочки запросов - от последнего результата, иначе от текущей модели
+                source = owner._results.get(key, job["model"])
+
+            model, error = None, None
+            try:
+                model = copy.deepcopy(source)
+                for function in job["functions"].values():
+                    function(model)
+            except Exception as err:
+                error = err
+
+            with owner._condition:
+                if owner._generation == job["generation"] and owner._epochs.get(key) == job["epoch"]:
+                    if error is None:
+                        owner._results[key] = model
+                        owner._errors.pop(key, None)
+                    else:
+                        owner._results.pop(key, None)
+                        owner._errors[key] = error
+                owner._running = None
+                owner._condition.notify_all()
+
+            self.done.emit(key, job["generation"], job["serial"], model, error)
+
+
+class ModelRegeneration(QObject):
+    """Фоновый пересчет моделей с объединением запросов.
+
+    Сигналы:
+        ready(key, model) - пересчитанная копия модели по последнему запросу ключа
+        failed(key, error) - ошибка пересчета по последнему запросу ключа"""
+    ready = pyqtSignal(object, object)
+    failed = pyqtSignal(object, object)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()
+        self._results = {}
+        self._errors = {}
+        self._serials = {}
+        self._epochs = {}
+        self._generation = 0
+        self._running = None
+        self._stopped = False
+
+        self._thread = _RegenerationThread(self)
+        self._thread.done.connect(self._done)
+        self._thread.start()
+
+        application = QCoreApplication.instance()
+        if application is not None:
+            application.aboutToQuit.connect(self.stop)
+
+        _instances.add(self)
+
+    def submit(self, key: Hashable, model: Any, group: Optional[str], function: Callable[[Any], None]):
+        """Запрос пересчета модели key: function(model) выполняется в фоновом потоке над копией модели.
+        Ожидающий запрос той же группы заменяется новым, запросы разных групп выполняются по порядку.
+        group=None - запрос не заменяет ожидающие (например, относительное изменение параметров)"""
+        if group is None:
+            group = object()
+        with self._condition:
+            serial = self._serials[key] = self._serials.get(key, 0) + 1
+            job = self._pending.get(key)
+            if job is None:
+                job = self._pending[key] = {"model": model, "generation": self._generation,
+                                            "epoch": self._epochs.setdefault(key, 0), "functions": OrderedDict()}
+            job["functions"].pop(group, None)
+            job["functions"][group] = function
+            job["serial"] = serial
+            self._condition.notify_all()
+
+    def cancel(self, key: Hashable):
+        """Отмена запросов модели key. Выполняющийся пересчет не прерывается, но его результат отбрасывается"""
+        with self._condition:
+            self._pending.pop(key, None)
+            self._results.pop(key, None)
+            self._errors.pop(key, None)
+            self._serials[key] = self._serials.get(key, 0) + 1
+            self._epochs[key] = self._epochs.get(key, 0) + 1
+
+    def finish(self):
+        """Ожидание всех запросов и передача готовых моделей сигналами ready/failed в текущем потоке.
+        Вызывается перед прямым изменением моделей, чтобы пересчет не затер изменение и не подставил
+        модель позже. Сигналы фонового потока по выполненным запросам после этого отбрасываются"""
+        with self._condition:
+            while (self._pending or self._running is not None) and not self._stopped:
+                self._condition.wait()
+            results, self._results = self._results, {}
+            errors, self._errors = self._errors, {}
+            for key in list(results) + list(errors):
+                self._serials[key] = self._serials.get(key, 0) + 1
+
+        for key, model in results.items():
+            self.ready.emit(key, model)
+        for key, error in errors.items():
+            app_logger.exception(f"Ошибка пересчета модели {key}", exc_info=error)
+            self.failed.emit(key, error)
+
+    def reset(self):
+        """Новое поколение запросов (загрузка нового объекта): ожидающие запросы отменяются,
+        результаты запросов прошлых поколений отбрасываются"""
+        with self._condition:
+            self._generation += 1
+            self._pending.clear()
+            self._results.clear()
+            self._errors.clear()
+
+    def stop(self):
+        """Остановка фонового потока"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.wait()
+
+    def _done(self, key, generation, serial, model, error):
+        with self._condition:
+            if generation != self._generation or serial != self._serials.get(key) or key in self._pending:
+                return
+            self._results.pop(key, None)
+            self._errors.pop(key, None)
+
+        if error is None:
+            self.ready.emit(key, model)
+        else:
+            app_logger.exception(f"Ошибка пересчета модели {key}", exc_info=error)
+            self.failed.emit(key, error)
+
+
+def finish_all():
+    """Ожидание запросов всех объектов пересчета (см. ModelRegeneration.finish)"""
+    for regeneration in list(_instances):
+        if not regeneration._stopped:
+            regeneration.finish()
+
+
+def reset_all():
+    """Новое поколение запросов всех объектов пересчета (см. ModelRegeneration.reset)"""
+    for regeneration in list(_instances):
+        regeneration.reset()
@@ -16,7 +16,10 @@ from excel_statment.params import accreditation
 from general.general_functions import AttrDict
 
 import ctypes
+import functools
+import hashlib
 import io
+import os
 
 def GetTextDimensions(text, points, font):
     class SIZE(ctypes.Structure):
@@ -158,28 +161,66 @@ def SaveCode(version):  # Создает защитный код и записы
 
 
 
-def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
-    #if Data_customer.accreditation == "ООО":
-        #accreditation = "ON"
-    #elif Data_customer.accreditation == "ОАО" or Data_customer.accreditation == "АО":
-        #accreditation = "AN"z
+_registered_fonts = set()
 
-    data = Data_customer.end_date
+def register_fonts(path):
+    """Регистрация шрифтов протоколов. Файлы шрифтов разбираются один раз в процессе"""
+    fonts_path = os.path.abspath(path + 'Report Data')
+    if fonts_path in _registered_fonts:
+        return
+    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
+    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
+    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    _registered_fonts.clear()
+    _registered_fonts.add(fonts_path)
 
+@functools.lru_cache(maxsize=None)
+def report_data_rows(path):
+    """Строки файла данных аккредитации и исполнителей (Report Data/Data(НЕ УДАЛЯТЬ).txt)"""
+    A = []
+    fi = open(path + "Report Data/Data(НЕ УДАЛЯТЬ).txt")
+    line = fi.readline().strip()
+    while line:
+        p = line.split('\t')
+        A.append(p)
+        line = fi.readline().strip()
+    fi.close()
+    return A
 
+@functools.lru_cache(maxsize=None)
+def report_qr_drawing(path):
+    """Разобранный и масштабированный qr код лаборатории для верхней надписи"""
+    b = svg2rlg(path + "Report Data/qr.svg")
+    b.scale(0.053, 0.053)
+    return b
+
+def clear_report_cache():
+    """Сброс шрифтов и разобранных файлов оформления (например, после замены файлов Report Data)"""
+    _registered_fonts.clear()
+    report_data_rows.cache_clear()
+    report_qr_drawing.cache_clear()
+
+def static_form(canvas, key, draw):
+    """Неизменяемые элементы страницы: draw() выполняется один раз в документе как Form XObject,
+    на каждой странице рисуется ссылка на него. key - параметры, от которых зависят элементы"""
+    name = "Static" + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+    if not canvas.hasForm(name):
+        canvas.beginForm(name)
+        draw()
+        canvas.endForm()
+    canvas.doForm(name)
+
+def frame_header(canvas, path, Data_customer):
+    """Основная рамка, логотип, qr код и аккредитация лаборатории"""
     canvas.setLineWidth(0.3 * mm)
     canvas.rect(20 * mm, 5 * mm, 185 * mm, 287 * mm)  # Основная рамка
 
-
-
     # Верхняя надпись
     canvas.line((47) * mm, (280 ) * mm, (179) * mm, (280 ) * mm)  # Линия аккредитации
     canvas.drawImage(path + "Report Data/Logo2.jpg", 23 * mm, 270 * mm,
                      width=21 * mm, height=21 * mm)  # логотип
 
-    b = svg2rlg(path + "Report Data/qr.svg")
-    b.scale(0.053, 0.053)
-    renderPDF.draw(b, canvas, 180 * mm, 269 * mm)
+    renderPDF.draw(report_qr_drawing(path), canvas, 180 * mm, 269 * mm)
 
     #a = ImageReader(path + "mdgt_qr_1.png")
     #canvas.drawImage(a, 182 * mm, 270 * mm, width=20 * mm, height=20 * mm)
@@ -192,15 +233,6 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
     canvas.drawString((124.5) * mm, (282) * mm, "129344, г. Москва, ул. Искры, д.31, к.1")
 
     # Аккредитация
-    A = []  # аккредитация и низ
-    fi = open(path + "Report Data/Data(НЕ УДАЛЯТЬ).txt")
-    line = fi.readline().strip()
-    while line:
-        p = line.split('\t')
-        A.append(p)
-        line = fi.readline().strip()
-    fi.close()
-
     dat4 = [
         [accreditation[Data_customer.accreditation][Data_customer.accreditation_key][0]],
         [accreditation[Data_customer.accreditation][Data_customer.accreditation_key][1]],
@@ -217,7 +249,6 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
     #else:
         #dat4 = ["", ""]
 
-
     t = Table(dat4, colWidths=132 * mm, rowHeights=3 * mm)
     t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
                  ("FONTSIZE", (0, 0), (-1, -1), 7),
@@ -229,15 +260,45 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
     t.wrapOn(canvas, 0, 0)
     t.drawOn(canvas, (47) * mm, (273.5) * mm)
 
+def frame_state(canvas):
+    """Состояние страницы после рамки, нарисованной ссылкой на Form XObject
+    (толщина линий и шрифт, которые задает рамка, используются далее на странице)"""
+    canvas.setLineWidth(0.3 * mm)
+    canvas.setFont('Times', 9)
 
+def executors_table(canvas, rows, colWidths, fontSize):
+    t = Table(rows, colWidths=colWidths, rowHeights=4 * mm)
+    t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
+                ("FONTSIZE", (0, 0), (-1, -1), fontSize),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
+                ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"), ])
 
-    # Исполнители
-    if accreditation == "AS" or accreditation == "AN":
-        s = 0
-    elif accreditation == "OS" or accreditation == "ON":
-        s = 5
-    else:
-        s = 0
+    t.wrapOn(canvas, 0, 0)
+    t.drawOn(canvas, 25 * mm, 12 * mm)
+
+def georeport_table(canvas, x, y):
+    t = Table([["Сервис georeport.ru"], [""]], colWidths=46.25*0.85*mm,
+              rowHeights=1*mm)
+    t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
+                ("FONTSIZE", (0, 0), (-1, -1), 7),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
+                ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"), ])
+    t.wrapOn(canvas, 0, 0)
+    t.drawOn(canvas, x, y)
+
+def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
+    #if Data_customer.accreditation == "ООО":
+        #accreditation = "ON"
+    #elif Data_customer.accreditation == "ОАО" or Data_customer.accreditation == "АО":
+        #accreditation = "AN"z
+
+    data = Data_customer.end_date
 
     executors_data_1 = [
         ["Исполнители:", "Жмылёв Д.А., Старостин П.А., Чалая Т.А.,"],
@@ -258,29 +319,25 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
 
     executors_data = executors_data_1 if full_executors else executors_data_2
 
-    if qr_code:
-        dat3 = [[A[0 + s][0], A[0 + s][1]],
-                ['', A[0 + s][2]],
-                [A[1 + s][0], A[1 + s][1]],
-                [A[2 + s][0], A[2 + s][1]],
-                [A[3 + s][0], A[3 + s][1]]]
-        t = Table(executors_data, colWidths=68 * mm, rowHeights = 4 * mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                     ("FONTSIZE", (0, 0), (-1, -1), 7),
-                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                     ("LEFTPADDING", (1, 0), (1, -1), 1.4*mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                     ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                     ("ALIGN", (0, 0), (-1, -1), "LEFT"), ])
+    def static():
+        frame_header(canvas, path, Data_customer)
+        if qr_code:
+            executors_table(canvas, executors_data, 68 * mm, 7)
+            canvas.line((47) * mm, (280) * mm, (179) * mm, (280) * mm)
+            canvas.line((158.75*1.05) * mm, (5) * mm, (158.75*1.05) * mm, (51.25*0.79) * mm)
+            canvas.line((158.75*1.05) * mm, (51.25*0.79) * mm, (210-5) * mm, (51.25*0.79) * mm)
+            georeport_table(canvas, 158.75*1.05 * mm, 51.25*0.68 - 8 + 28* mm)
+        else:
+            executors_table(canvas, executors_data, 100 * mm, 8)
 
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 25 * mm, 12 * mm)
+    static_form(canvas, ("main_frame", os.path.abspath(path), Data_customer.accreditation,
+                         Data_customer.accreditation_key, executors_data, bool(qr_code)), static)
+    frame_state(canvas)
 
+    if qr_code:
         t = Table([["Номер документа №:", "", "", "", code, "", "", "Дата:", "",
                     str(data.strftime("%d.%m.%Y")), "", "Лист:", "", list, "", "", "", "", "", ""]], colWidths=9.775 * mm, rowHeights=5 * mm)
 
-        canvas.line((47) * mm, (280) * mm, (179) * mm, (280) * mm)
-
         t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'TimesK'),
                     ("FONTSIZE", (0, 0), (-1, -1), 8),
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
@@ -297,22 +354,6 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
         t.wrapOn(canvas, 0, 0)
         t.drawOn(canvas, 20 * mm, 5 * mm)
 
-        canvas.line((158.75*1.05) * mm, (5) * mm, (158.75*1.05) * mm, (51.25*0.79) * mm)
-
-        canvas.line((158.75*1.05) * mm, (51.25*0.79) * mm, (210-5) * mm, (51.25*0.79) * mm)
-
-        t = Table([["Сервис georeport.ru"], [""]], colWidths=46.25*0.85*mm,
-                  rowHeights=1*mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                    ("FONTSIZE", (0, 0), (-1, -1), 7),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"), ])
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 158.75*1.05 * mm, 51.25*0.68 - 8 + 28* mm)
-
         # canvas.drawImage(qr_code, (8.25*0.5 + 158.75*1.05 + 0.5) * mm, (8.5*0.95) * mm,
         #                  width=(37*0.85) * mm, height=(37*0.85) * mm)
         canvas.drawImage(qr_code, (170.11875) * mm, (8.5 * 0.65) * mm,
@@ -320,23 +361,6 @@ def main_frame(canvas, path, Data_customer, code, list, qr_code=None):
 
 
     else:
-        dat3 = [[A[0 + s][0], A[0 + s][1]],
-                ['', A[0 + s][2]],
-                [A[1 + s][0], A[1 + s][1]],
-                [A[2 + s][0], A[2 + s][1]],
-                [A[3 + s][0], A[3 + s][1]]]
-        t = Table(executors_data, colWidths=100 * mm, rowHeights=4 * mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"), ])
-
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 25 * mm, 12 * mm)
-
         # Нижняя таблица
         t = Table([["Номер документа №:", "", "", "", code, "", "", "", "", "", "", "Дата:", "",
                     str(data.strftime("%d.%m.%Y")), "", "", "Лист:", "", list, ""]], colWidths=9.25 * mm,
@@ -364,67 +388,8 @@ def main_frame_consolidation(canvas, path, Data_customer, code, list, qr_code=No
 
     data = Data_customer.end_date
 
-
-    canvas.setLineWidth(0.3 * mm)
-    canvas.rect(20 * mm, 5 * mm, 185 * mm, 287 * mm)  # Основная рамка
-
-
-
-    # Верхняя надпись
-    canvas.line((47) * mm, (280 ) * mm, (179) * mm, (280 ) * mm)  # Линия аккредитации
-    canvas.drawImage(path + "Report Data/Logo2.jpg", 23 * mm, 270 * mm,
-                     width=21 * mm, height=21 * mm)  # логотип
-
-    b = svg2rlg(path + "Report Data/qr.svg")
-    b.scale(0.053, 0.053)
-    renderPDF.draw(b, canvas, 180 * mm, 269 * mm)
-
-    canvas.setFont('TimesDj', 20)
-    canvas.drawString((47) * mm, (282) * mm, "МОСТДОРГЕОТРЕСТ")
-    canvas.setFont('TimesDj', 12)
-    canvas.drawString((125) * mm, (284.8) * mm, "испытательная лаборатория")
-    canvas.setFont('Times', 9)
-    canvas.drawString((124.5) * mm, (282) * mm, "129344, г. Москва, ул. Искры, д.31, к.1")
-
     # Аккредитация
-    A = []  # аккредитация и низ
-    fi = open(path + "Report Data/Data(НЕ УДАЛЯТЬ).txt")
-    line = fi.readline().strip()
-    while line:
-        p = line.split('\t')
-        A.append(p)
-        line = fi.readline().strip()
-    fi.close()
-
-    dat4 = [
-        [accreditation[Data_customer.accreditation][Data_customer.accreditation_key][0]],
-        [accreditation[Data_customer.accreditation][Data_customer.accreditation_key][1]],
-    ]
-
-    #if accreditation == "OS":
-        #dat4 = [[A[9][1]], [A[9][2]]]
-    #elif accreditation == "ON":
-        #dat4 = [[A[10][1]], [A[10][2]]]
-    #elif accreditation == "AS":
-        #dat4 = [[A[11][1]], [A[11][2]]]
-    #elif accreditation == "AN":
-        #dat4 = [[A[12][1]], [A[12][2]]]
-    #else:
-        #dat4 = ["", ""]
-
-
-    t = Table(dat4, colWidths=132 * mm, rowHeights=3 * mm)
-    t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                 ("FONTSIZE", (0, 0), (-1, -1), 7),
-                 ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                 ("LEFTPADDING", (0, 0), (0, -1), 0),
-                 ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                 ("ALIGN", (0, 0), (-1, -1), "CENTER"), ])
-
-    t.wrapOn(canvas, 0, 0)
-    t.drawOn(canvas, (47) * mm, (273.5) * mm)
-
-
+    A = report_data_rows(path)  # аккредитация и низ
 
     # Исполнители
     if accreditation == "AS" or accreditation == "AN":
@@ -434,30 +399,31 @@ def main_frame_consolidation(canvas, path, Data_customer, code, list, qr_code=No
     else:
         s = 0
 
+    dat3 = [[A[0 + s][0], A[0 + s][1]],
+            ['', A[0 + s][2]],
+            [A[1 + s][0], A[1 + s][1]],
+            [A[2 + s][0], A[2 + s][1]],
+            [A[3 + s][0], A[3 + s][1]]]
+
+    def static():
+        frame_header(canvas, path, Data_customer)
+        if qr_code:
+            executors_table(canvas, dat3, 68 * mm, 7)
+            canvas.line((47) * mm, (280) * mm, (179) * mm, (280) * mm)
+            canvas.line((158.75*1.1) * mm, (5) * mm, (158.75*1.1) * mm, (51.25*0.68) * mm)
+            canvas.line((158.75*1.1) * mm, (51.25*0.68) * mm, (210-5) * mm, (51.25*0.68) * mm)
+            georeport_table(canvas, 158.75*1.075 * mm, 51.25*0.38 - 8 + 28* mm)
+        else:
+            executors_table(canvas, dat3, 100 * mm, 8)
 
-    if qr_code:
-        dat3 = [[A[0 + s][0], A[0 + s][1]],
-                ['', A[0 + s][2]],
-                [A[1 + s][0], A[1 + s][1]],
-                [A[2 + s][0], A[2 + s][1]],
-                [A[3 + s][0], A[3 + s][1]]]
-        t = Table(dat3, colWidths=68 * mm, rowHeights = 4 * mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                     ("FONTSIZE", (0, 0), (-1, -1), 7),
-                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                     ("LEFTPADDING", (1, 0), (1, -1), 1.4*mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                     ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                     ("ALIGN", (0, 0), (-1, -1), "LEFT"), ])
-
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 25 * mm, 12 * mm)
+    static_form(canvas, ("main_frame_consolidation", os.path.abspath(path), Data_customer.accreditation,
+                         Data_customer.accreditation_key, dat3, bool(qr_code)), static)
+    frame_state(canvas)
 
+    if qr_code:
         t = Table([["Номер документа №:", "", "", "", code, "", "", "Дата:", "",
                     str(data.strftime("%d.%m.%Y")), "", "Лист:", "", list, "", "", "", "", "", ""]], colWidths=10.3 * mm, rowHeights=5 * mm)
 
-        canvas.line((47) * mm, (280) * mm, (179) * mm, (280) * mm)
-
         t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'TimesK'),
                     ("FONTSIZE", (0, 0), (-1, -1), 8),
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
@@ -474,22 +440,6 @@ def main_frame_consolidation(canvas, path, Data_customer, code, list, qr_code=No
         t.wrapOn(canvas, 0, 0)
         t.drawOn(canvas, 20 * mm, 5 * mm)
 
-        canvas.line((158.75*1.1) * mm, (5) * mm, (158.75*1.1) * mm, (51.25*0.68) * mm)
-
-        canvas.line((158.75*1.1) * mm, (51.25*0.68) * mm, (210-5) * mm, (51.25*0.68) * mm)
-
-        t = Table([["Сервис georeport.ru"], [""]], colWidths=46.25*0.85*mm,
-                  rowHeights=1*mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                    ("FONTSIZE", (0, 0), (-1, -1), 7),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"), ])
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 158.75*1.075 * mm, 51.25*0.38 - 8 + 28* mm)
-
         # canvas.drawImage(qr_code, (8.25*0.5 + 158.75*1.05 + 0.5) * mm, (8.5*0.95) * mm,
         #                  width=(37*0.85) * mm, height=(37*0.85) * mm)
         canvas.drawImage(qr_code, (176.3075) * mm, (8.5 * 0.62) * mm,
@@ -497,23 +447,6 @@ def main_frame_consolidation(canvas, path, Data_customer, code, list, qr_code=No
 
 
     else:
-        dat3 = [[A[0 + s][0], A[0 + s][1]],
-                ['', A[0 + s][2]],
-                [A[1 + s][0], A[1 + s][1]],
-                [A[2 + s][0], A[2 + s][1]],
-                [A[3 + s][0], A[3 + s][1]]]
-        t = Table(dat3, colWidths=100 * mm, rowHeights=4 * mm)
-        t.setStyle([("FONTNAME", (0, 0), (-1, -1), 'Times'),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (1, 0), (1, -1), 1.4 * mm),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0.3 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"), ])
-
-        t.wrapOn(canvas, 0, 0)
-        t.drawOn(canvas, 25 * mm, 12 * mm)
-
         # Нижняя таблица
         t = Table([["Номер документа №:", "", "", "", code, "", "", "", "", "", "", "Дата:", "",
                     str(data.strftime("%d.%m.%Y")), "", "", "Лист:", "", list, ""]], colWidths=9.25 * mm,
@@ -4025,9 +3958,7 @@ def report_rc(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, pi
 
 
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     # Загружаем документ эксель, проверяем изменялось ли имя документа и создаем отчет
 
@@ -4058,9 +3989,7 @@ def report_rc(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, pi
 
 def report_averaged(file_name, data_customer, path, data, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(file_name, pagesize=A4)
     code = SaveCode(version)
@@ -4088,9 +4017,7 @@ def report_averaged(file_name, data_customer, path, data, version = 1.1, qr_code
 
 def report_liquid_potential(file_name, data_customer, path, data, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(file_name, pagesize=A4)
     code = SaveCode(version)
@@ -4121,9 +4048,7 @@ def report_liquid_potential(file_name, data_customer, path, data, version = 1.1,
 
 def report_triaxial_cyclic(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(Name, pagesize=A4)
 
@@ -4225,9 +4150,7 @@ def report_triaxial_cyclic(Name, Data_customer, Data_phiz, Lab, path, test_param
 
 def report_triaxial_cyclic_shear(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(Name, pagesize=A4)
 
@@ -4263,9 +4186,7 @@ def report_triaxial_cyclic_shear(Name, Data_customer, Data_phiz, Lab, path, test
 
 def report_consolidation(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, report_type, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     res["description"] = Data_phiz.description
 
@@ -4309,9 +4230,7 @@ def report_consolidation(Name, Data_customer, Data_phiz, Lab, path, test_paramet
 
 def report_E(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, report_type=None, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     res["description"] = Data_phiz.description
 
@@ -4367,9 +4286,7 @@ def report_E(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, pic
 
 def report_FCE(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, report_type=None, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     res["description"] = Data_phiz.description
 
@@ -4447,9 +4364,7 @@ def report_FCE(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, p
 
 def report_FC(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     test_parameter = dict(test_parameter)
     test_parameter["K0"] = test_parameter["K0"][1]
     name = "ТД"
@@ -4472,9 +4387,7 @@ def report_FC(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, pi
 
 def report_FC_res(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, report_type, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     test_parameter = dict(test_parameter)
     test_parameter["K0"] = test_parameter["K0"][1]
     if report_type == "vibro":
@@ -4507,9 +4420,7 @@ def report_FC_res(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res
 
 def report_FC_NN(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, test_type, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     test_parameter = dict(test_parameter)
     test_parameter["K0"] = test_parameter["K0"][0]
     # test_parameter["mode"] = "НН, девиаторное нагружение в кинематическом режиме"
@@ -4548,9 +4459,7 @@ def report_FC_NN(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res,
 
 def report_vibration_strangth(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, report_type, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     test_parameter = dict(test_parameter)
     name = "ВП"
     canvas = Canvas(Name, pagesize=A4)
@@ -4592,9 +4501,7 @@ def report_vibration_strangth(Name, Data_customer, Data_phiz, Lab, path, test_pa
 
 def report_FC_KN(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     test_parameter["K0"] = test_parameter["K0"][1]
     # test_parameter["mode"] = "КН, девиаторное нагружение в кинематическом режиме"
     name = "КН"
@@ -4618,9 +4525,7 @@ def report_FC_KN(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res,
 
 def report_VibrationCreep(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res_static, res_dynamic,  picks, report_type, test_type, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
     if test_type == "Виброползучесть":
         if report_type == "standart" or report_type == 'E50_E':
             name = "ОПРЕДЕЛЕНИЕ ПАРАМЕТРОВ ВИБРОПОЛЗУЧЕСТИ ГРУНТОВ МЕТОДОМ ЦИКЛИЧЕСКИХ ТРЁХОСНЫХ"
@@ -4685,9 +4590,7 @@ def report_VibrationCreep3(Name, Data_customer, Data_phiz, Lab, path, test_param
     pick_vc_array = picks[0]
     pick_c_array = picks[1]
 
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(Name, pagesize=A4)
 
@@ -4739,9 +4642,7 @@ def report_VibrationCreep3(Name, Data_customer, Data_phiz, Lab, path, test_param
 def report_RayleighDamping(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(Name, pagesize=A4)
     code = SaveCode(version)
@@ -4782,9 +4683,7 @@ def report_RayleighDamping(Name, Data_customer, Data_phiz, Lab, path, test_param
 
 def report_cyclic_damping(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1, qr_code=None):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas(Name, pagesize=A4)
 
@@ -4978,9 +4877,7 @@ def report_k0(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, pi
 
 
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     # Загружаем документ эксель, проверяем изменялось ли имя документа и создаем отчет
 
@@ -5135,9 +5032,7 @@ def report_k0ur(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res,
 
 
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     # Загружаем документ эксель, проверяем изменялось ли имя документа и создаем отчет
 
@@ -5271,9 +5166,7 @@ def StampReport(M, R, p1, p2, Nop, path, version = 1):  # p1 - папка сох
 
 
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     # Загружаем документ эксель, проверяем изменялось ли имя документа и создаем отчет
     wb = load_workbook(p2, data_only=True)
@@ -5324,9 +5217,7 @@ def StampReport(M, R, p1, p2, Nop, path, version = 1):  # p1 - папка сох
 def StatmentReport(name, Data, path):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
 
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     # Загружаем документ эксель, проверяем изменялось ли имя документа и создаем отчет
 
@@ -5347,9 +5238,7 @@ def StatmentReport(name, Data, path):  # p1 - папка сохранения о
 def report_Shear_Dilatancy(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1,
                            qr_code=None, name="ДС"):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     res["description"] = Data_phiz.description
 
@@ -5379,9 +5268,7 @@ def report_Shear_Dilatancy(Name, Data_customer, Data_phiz, Lab, path, test_param
 def report_Shear(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res, picks, version = 1.1,
                  qr_code=None, name="Сп"):  # p1 - папка сохранения отчета, p2-путь к файлу XL, Nop - номер опыта
     # Подгружаем шрифты
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     res["description"] = Data_phiz.description
 
@@ -5406,9 +5293,7 @@ def report_Shear(Name, Data_customer, Data_phiz, Lab, path, test_parameter, res,
 
 if __name__ == '__main__':
     path = "C:/Users/Пользователь/PycharmProjects/DigitRock/project_data/"
-    pdfmetrics.registerFont(TTFont('Times', path + 'Report Data/Times.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesK', path + 'Report Data/TimesK.ttf'))
-    pdfmetrics.registerFont(TTFont('TimesDj', path + 'Report Data/TimesDj.ttf'))
+    register_fonts(path)
 
     canvas = Canvas("C:/Users/Пользователь/Desktop/Загрузки/test.pdf", pagesize=A4)
 
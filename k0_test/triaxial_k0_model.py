@@ -2,6 +2,7 @@ import os
 import copy
 import random
 from random import choices
+from typing import Optional
 
 import numpy as np
 import scipy.optimize
@@ -14,6 +15,7 @@ from cvi.cvi_writer import save_cvi_K0
 from excel_statment.properties_model import K0Properties
 from general.general_functions import AttrDict, discrete_array, exponent, create_json_file, mirrow_element, \
     array_discreate_noise
+from general.log_writer import write_log
 from singletons import statment, K0_models
 
 
@@ -415,11 +417,7 @@ class ModelK0:
             test_all_k0.append(test_k0)
 
         test_all_k0 = np.asarray(test_all_k0)
-        test_all_residuals = np.asarray(test_all_residuals)
-        index, = np.where(test_all_residuals < 5)
-        if index[0] == 0:
-            index[0] = 1
-        index = index[0] + np.argmax(test_all_residuals[index[0]:])
+        index = ModelK0.hs_line_index(np.asarray(test_all_residuals))
 
         defined_k0 = test_all_k0[index]
         defined_b = test_all_b[index]
@@ -427,6 +425,32 @@ class ModelK0:
 
         return (defined_k0, defined_sigma_p, defined_b) if no_round else (round(defined_k0, 2), defined_sigma_p, defined_b)
 
+    @staticmethod
+    def hs_line_index(errors):
+        """
+        Индекс начала прямолинейного участка по ошибкам МНК приближения участков sigma_1[i:], sigma_3[i:]
+
+        :param errors: array-like, ошибки приближения для каждого i
+        :return: int
+        """
+        index, = np.where(errors < 5)
+        if index[0] == 0:
+            index[0] = 1
+        return index[0] + np.argmax(errors[index[0]:])
+
+    @staticmethod
+    def define_k0_hs_estimation(sigma_1, sigma_3):
+        """
+        То же, что define_k0_hs с no_round=True, но приближения всех участков sigma_1[i:], sigma_3[i:] считаются
+        сразу по суффиксным суммам (lse_tail_estimation), а не отдельным МНК для каждого участка
+
+        :return: defined_k0, defined_sigma_p, defined_b и индекс начала прямолинейного участка
+        """
+        sigma_1 = np.asarray(sigma_1, dtype=float)
+        k, b, errors = ModelK0.lse_tail_estimation(sigma_1, sigma_3)
+        index = ModelK0.hs_line_index(errors)
+        return k[index], sigma_1[index], b[index], index
+
     @staticmethod
     def define_Nuur(sigma_1_ur, sigma_3_ur, no_round=False):
         if not no_round:
@@ -472,6 +496,187 @@ class ModelK0:
 
         return k, b, error
 
+    @staticmethod
+    def lse_tail_estimation(__x, __y):
+        """
+        Выполняет МНК приближение прямой вида kx+b к каждому участку __x[i:], __y[i:] так же, как
+        lse_linear_estimation, по суффиксным суммам
+
+        :param __x: array-like, координаты х
+        :param __y: array-like, координаты y
+        :return: массивы коэффициентов k, b и ошибок для каждого i
+        """
+        __x = np.asarray(__x, dtype=float)
+        __y = np.asarray(__y, dtype=float)
+
+        def suffix_sum(values):
+            return np.cumsum(values[::-1])[::-1]
+
+        m = np.arange(len(__x), 0, -1)
+        sx, sy = suffix_sum(__x), suffix_sum(__y)
+        sxx, sxy = suffix_sum(__x * __x), suffix_sum(__x * __y)
+
+        den = m * sxx - sx ** 2
+        # Участок из одной точки (или точек с одинаковым х): lstsq возвращает решение с минимальной нормой
+        degenerate = den <= 1e-12 * m * sxx
+        den = np.where(degenerate, 1, den)
+        k = np.where(degenerate, sx / m * (sy / m) / ((sx / m) ** 2 + 1), (m * sxy - sx * sy) / den)
+        b = np.where(degenerate, (sy / m) / ((sx / m) ** 2 + 1), (sy - k * sx) / m)
+
+        relative = np.abs(__y - (k[:, None] * __x + b[:, None])) / np.where(__y != 0, __y, 1) * 100
+        error = np.sum(np.triu(relative), axis=1) / m
+
+        return k, b, error
+
+
+class StepStages:
+    """Ступени нагружения ступенчатого режима прибора K0.
+
+    Ступень состоит из 6-7 точек нагрузки, точки начала стабилизации, stab_len точек стабилизации и повторной
+    последней точки стабилизации, поэтому массивы для steps ступеней выделяются один раз по наибольшей длине
+    и заполняются по месту. Действия хранятся кодами и переводятся в имена действий прибора методом names
+    только при формировании данных для лог файла.
+
+    Пример использования:
+        stages = StepStages(len(sigma_1) - 1)
+        for i in range(1, len(sigma_1)):
+            stages.add(sigma_1[i], sigma_1[i - 1], sigma_3[i], sigma_3[i - 1])
+        sigma_1, action, time, sigma_3 = stages.result()
+    """
+
+    LOAD_STAGE, STABILIZATION, UNLOAD = range(3)
+    '''Коды действий'''
+
+    ACTION_NAMES = np.asarray(['LoadStage', 'Stabilization', 'Unload'])
+    '''Имена действий прибора по кодам'''
+
+    MAX_LOAD_LEN = 7
+    '''Наибольшее число тиков нагрузки'''
+
+    SENSOR_S3 = 0.52143
+    '''Шум датчика сигма3'''
+
+    def __init__(self, steps: int, stab_len: int = 365, reload: bool = False, time: float = 0):
+        """
+        :param steps: наибольшее число ступеней
+        :param stab_len: число точек стабилизации (в случае разгрузки участок стабилизации вдвое длиннее)
+        :param reload: ступени разгрузки
+        :param time: время, от которого отсчитывается первая ступень
+        """
+        self.reload = reload
+        self.stab_len = stab_len * 2 if reload else stab_len
+
+        size = steps * (StepStages.MAX_LOAD_LEN + self.stab_len + 2)
+        self._sigma_1 = np.empty(size)
+        self._sigma_3 = np.empty(size)
+        self._time = np.empty(size)
+        self._action = np.empty(size, dtype=np.int8)
+        self._len = 0
+        self._last_time = time
+
+    def __len__(self):
+        return self._len
+
+    def add(self, sigma_1_i, sigma_1_i_prev, sigma_3_i, sigma_3_i_prev, sensor_s1=2.3088,
+            action_type: int = LOAD_STAGE, first: Optional[bool] = None, mirror: bool = False) -> slice:
+        """Добавляет ступень от (sigma_1_i_prev, sigma_3_i_prev) до (sigma_1_i, sigma_3_i).
+
+        :param first: первая ступень опыта (по умолчанию - если ступеней еще нет), на ней меньше "опусканий" сигма3
+        :param mirror: отразить ступень относительно начальных значений (разгрузка)
+        :return: срез массивов, занятый ступенью
+        """
+        rnd = np.random.randint(6, 8)
+        '''число тиков нагрузки'''
+
+        sensor_s3 = StepStages.SENSOR_S3
+
+        num_s3_stabs_err = np.random.randint(30, 40)
+        '''число "опусканий" сигма3 на этапе стабилизации'''
+        if (self._len == 0 if first is None else first) and not self.reload:
+            num_s3_stabs_err = np.random.randint(10, 20)
+
+        _s3_exp_slant = 5 if self.reload else 3
+        '''резкость экспоненты для убывания сигма3 во время стаблизации'''
+
+        time_load = [0, np.random.uniform(0.5, 1.0), np.random.uniform(1.0, 2.0), np.random.uniform(2.0, 3.0),
+                     np.random.uniform(5.0, 6.0), np.random.uniform(9.0, 11.0), np.random.uniform(20.0, 31.0),
+                     np.random.uniform(40.0, 46.0), np.random.uniform(49.0, 51.0)]
+        '''Временные тики во время этапов нагрузки и выхода на стабилизацию'''
+
+        start = self._len
+        end = start + rnd + self.stab_len + 2
+        sigma_1 = self._sigma_1[start:end]
+        sigma_3 = self._sigma_3[start:end]
+        time = self._time[start:end]
+
+        # Первый блок : нагрузка до значения
+        exp_grid = np.linspace(0, rnd - 1, rnd)
+        sigma_1[:rnd] = exponent(exp_grid, sigma_1_i - sigma_1_i_prev, 10) + sigma_1_i_prev
+
+        sigma_3_overload = sigma_3_i + num_s3_stabs_err * sensor_s3
+        sigma_3[:rnd] = exponent(exp_grid, sigma_3_overload - sigma_3_i_prev, 10) + sigma_3_i_prev
+
+        #   Время во время нагрузки формируется исходя из "скоростей" нагрузок в time_load
+        time[:rnd] = np.cumsum(time_load[:rnd]) + self._last_time
+
+        # Второй блок : стабилизация
+        #   первая стаблизация повторяет последнюю нагрузку
+        sigma_1[rnd] = sigma_1[rnd - 1]
+        sigma_3[rnd] = sigma_3[rnd - 1]
+        time[rnd] = time[rnd - 1]
+
+        #       коррекция для соблюдения погрешностей датчика - при стаблизации значение "скачет" туда-сюда
+        # сигма1
+        correction = sensor_s1 - (sigma_1[rnd] - sigma_1_i)
+        jumps = np.asarray(choices([0, 1], weights=[0.8, 0.2], k=self.stab_len), dtype=bool)
+        sigma_1[rnd + 1:-1] = np.where(jumps, sigma_1_i, sigma_1[rnd] + correction)
+
+        # сигма3
+        exp_grid = np.linspace(0, self.stab_len - 1, self.stab_len)
+        sigma_3_step = exponent(exp_grid, abs(sigma_3_overload - sigma_3_i), slant=_s3_exp_slant) + sigma_3_overload
+        sigma_3_step = mirrow_element(sigma_3_step, sigma_3_overload).tolist()
+        for i in range(1, len(sigma_3_step)):
+            if sigma_3_step[i] - sigma_3_step[i - 1] <= -sensor_s3:
+                sigma_3_step[i] = sigma_3_step[i - 1] - sensor_s3
+            elif sigma_3_step[i] - sigma_3_step[i - 1] >= sensor_s3:
+                sigma_3_step[i] = sigma_3_step[i - 1] + sensor_s3
+            else:
+                sigma_3_step[i] = sigma_3_step[i - 1]
+        sigma_3[rnd + 1:-1] = sigma_3_step
+
+        #   Время во время стаблизации состоит из двух подэтапов
+        #       сначала идет "разгон" до нужного времени, а потом тики по 60 секунд
+        time_step = time[rnd + 1:-1]
+        time_step[0] = time[rnd] + time_load[1]
+        time_step[1:7] = time_load[2:2 + len(time_step[1:7])]
+        time_step[7:] = 60
+        np.cumsum(time_step, out=time_step)
+
+        #   последняя стабилизация дважды
+        sigma_1[-1] = sigma_1_i
+        sigma_3[-1] = sigma_3_i
+        time[-1] = time[-2]
+
+        if mirror:
+            sigma_1[:] = mirrow_element(sigma_1, sigma_1_i_prev)
+            sigma_3[:] = mirrow_element(sigma_3, sigma_3_i_prev)
+
+        self._action[start:start + rnd] = action_type
+        self._action[start + rnd:end] = StepStages.STABILIZATION
+        self._len = end
+        self._last_time = time[-1]
+        return slice(start, end)
+
+    def result(self):
+        """Массивы сигма1, кодов действий, времени и сигма3 всех ступеней"""
+        n = self._len
+        return self._sigma_1[:n], self._action[:n], self._time[:n], self._sigma_3[:n]
+
+    @staticmethod
+    def names(action: np.ndarray) -> np.ndarray:
+        """Имена действий прибора по кодам действий"""
+        return StepStages.ACTION_NAMES[action]
+
 
 class ModelK0SoilTest(ModelK0):
     """
@@ -710,7 +915,7 @@ class ModelK0SoilTest(ModelK0):
                 time = np.hstack((time, time_ur))
 
         self.set_debug_data(debug_data)
-        self.set_test_data({'sigma_1': sigma_1, 'sigma_3': sigma_3, 'action': action, 'time': time})
+        self.set_test_data({'sigma_1': sigma_1, 'sigma_3': sigma_3, 'action': StepStages.names(action), 'time': time})
         self.form_log_data()
 
     def verify_test_params(self):
@@ -903,22 +1108,22 @@ class ModelK0SoilTest(ModelK0):
             sgima_3_synth = np.hstack((sigma_3_spl[:-1], sgima_3_synth))
             sigma_1, sigma_3 = ModelK0SoilTest.lse_faker_mc(sgima_1_synth, sgima_3_synth, params.K0nc)
 
+        sigma_1_as_v_p, sigma_3_as_p_p, action, time = ModelK0SoilTest._form_step_data(sigma_1, sigma_3)
+        return sigma_1_as_v_p, sigma_3_as_p_p, action, time, (sigma_1, sigma_3)
+
+    @staticmethod
+    def _form_step_data(sigma_1, sigma_3):
+        """Формирует ступени нагружения по точкам sigma_1, sigma_3 (МПа). Действия возвращаются кодами StepStages"""
         sigma_1_res = sigma_1 * 1000
         sigma_3_res = sigma_3 * 1000
-        sigma_1_as_v_p = np.asarray([])
-        action = np.asarray([])
-        time = np.asarray([])
-        sigma_3_as_p_p = np.asarray([])
+        stages = StepStages(len(sigma_1_res) - 1)
 
         for i in range(1, len(sigma_1_res)):
             sensor = np.random.uniform(ModelK0SoilTest.SENSOR_LIMITS[0], ModelK0SoilTest.SENSOR_LIMITS[1])
+            stages.add(sigma_1_res[i], sigma_1_res[i - 1], sigma_3_res[i], sigma_3_res[i - 1], sensor)
 
-            res = ModelK0SoilTest._form_step(sigma_1_res[i], sigma_1_res[i - 1], sigma_3_res[i], sigma_3_res[i - 1],
-                                             sigma_1_as_v_p, sigma_3_as_p_p,
-                                             action, time, sensor)
-            sigma_1_as_v_p, action, time, sigma_3_as_p_p = res
-
-        return sigma_1_as_v_p, sigma_3_as_p_p, action, time, (sigma_1, sigma_3)
+        sigma_1_as_v_p, action, time, sigma_3_as_p_p = stages.result()
+        return sigma_1_as_v_p, sigma_3_as_p_p, action, time
 
     @staticmethod
     def _step_mode_ur_modeling(sigma_1, sigma_3, params: 'AttrDict'):
@@ -959,36 +1164,18 @@ class ModelK0SoilTest(ModelK0):
     def _form_ur_data(sigma_1_ur, sigma_3_ur, time):
         sigma_1_ur_res = sigma_1_ur * 1000
         sigma_3_ur_res = sigma_3_ur * 1000
-        action_ur = np.asarray([])
-        time_ur = np.asarray([])
-
-        sigma_1_ur_as_v_p = np.asarray([])
-        sigma_3_ur_as_p_p = np.asarray([])
+        stages = StepStages(len(sigma_1_ur_res) - 1, time=time[-1])
 
         for i in range(1, len(sigma_1_ur_res)):
             sensor = np.random.uniform(ModelK0SoilTest.SENSOR_LIMITS[0], ModelK0SoilTest.SENSOR_LIMITS[1])
 
-            #                                               ДО                          ОТ
-            res = ModelK0SoilTest._form_step(sigma_1_ur_res[i - 1] + (sigma_1_ur_res[i - 1] - sigma_1_ur_res[i]),
-                                             sigma_1_ur_res[i - 1],
-                                             sigma_3_ur_res[i - 1] + (sigma_3_ur_res[i - 1] - sigma_3_ur_res[i]),
-                                             sigma_3_ur_res[i - 1],
-                                             np.asarray([]), np.asarray([]),
-                                             np.asarray([]), np.asarray([]), sensor, action_type='Unload')
-            sigma_1_ur_as_v_p_step, action_ur_step, time_ur_step, sigma_3_ur_as_p_p_step = res
-            sigma_1_ur_as_v_p_step = np.asarray([mirrow_element(elem, sigma_1_ur_res[i - 1])
-                                                 for elem in sigma_1_ur_as_v_p_step])
-            sigma_3_ur_as_p_p_step = np.asarray([mirrow_element(elem, sigma_3_ur_res[i - 1])
-                                                 for elem in sigma_3_ur_as_p_p_step])
-            sigma_1_ur_as_v_p = np.hstack((sigma_1_ur_as_v_p, sigma_1_ur_as_v_p_step))
-            sigma_3_ur_as_p_p = np.hstack((sigma_3_ur_as_p_p, sigma_3_ur_as_p_p_step))
-
-            time_ur_step += time[-1] if len(time_ur) < 1 else time_ur[-1]
-            time_ur = np.hstack((time_ur, time_ur_step))
-
-            # action_ur_step = np.full(len(action_ur_step), 'Unload')
-            action_ur = np.hstack((action_ur, action_ur_step))
+            # Ступень разгрузки строится как нагрузка на ту же величину и отражается относительно начала ступени
+            #                   ДО                                                  ОТ
+            stages.add(sigma_1_ur_res[i - 1] + (sigma_1_ur_res[i - 1] - sigma_1_ur_res[i]), sigma_1_ur_res[i - 1],
+                       sigma_3_ur_res[i - 1] + (sigma_3_ur_res[i - 1] - sigma_3_ur_res[i]), sigma_3_ur_res[i - 1],
+                       sensor, action_type=StepStages.UNLOAD, first=True, mirror=True)
 
+        sigma_1_ur_as_v_p, action_ur, time_ur, sigma_3_ur_as_p_p = stages.result()
         return sigma_1_ur_as_v_p, sigma_3_ur_as_p_p, action_ur, time_ur
 
 
@@ -1029,17 +1216,18 @@ class ModelK0SoilTest(ModelK0):
                 1. Чтобы корректно наложить шум, фиксируется одна точка, после чего на нее накладывается сдвиг.
                 2. На все остальные точки кроме первой накладывается чуть меньший шум (чтобы увеличить итоговый разборс)
                 3. Проводитися оптимизация положения всех точек кроме первой и зафиксированной.
-                4. Фукнцией оптимизации служит полный алгортим определния К0 из кривой включая нелинейный участок
+                4. Фукнцией оптимизации служит К0 по МНК прямой через начало координат (как в define_k0_mc),
+                    который считается в замкнутом виде
                 5. Критерий минимизации - минимум абсолютной ошибки определения К0
                 Иначе говоря, не зафиксированные точки двигаются, пока из заданной кривой не будет корретно
-                    определяться К0
+                    определяться К0. Результат проверяется полным define_k0
 
         :param sigma_1_line: Сигма 1 линейного устастка
         :param sigma_3_line: Сигма 3 линейного участка
         :param sigma_1_spl: Сигма 1 нелинейного участка (включая первую точку линейного участка)
         :param sigma_3_spl: Сигма 3 нелинейного участка (включая первую точку линейного участка)
         :param K0nc: заданный К0
-        :param is_hs_model: Модель определения K0
+        :param is_hs_model: Модель определения K0 при проверке результата
         :param noise: уровень шума, при None определяется автоматически
         :param loops: число циклов (дополнительный параметр, подавать не надо)
         :return: Два массива Сигма 1 и Сигма 3 единой кривой (криволинейный и линейный участки)
@@ -1077,39 +1265,30 @@ class ModelK0SoilTest(ModelK0):
 
         sigma_3_noise[0] = sigma_3_line_fixed
 
+        # К0 по МНК прямой через начало координат (define_k0_mc) линеен по сигма3: K0 = weights @ sigma_3,
+        #   поэтому при подборе он считается без повторного МНК, а градиент - аналитически
+        weights = sigma_1_line / np.sum(sigma_1_line ** 2)
+        free = np.arange(len(sigma_3_noise)) != fixed_point_index
+        free_weights = weights[free]
+        free_weights[0] = 0  # первая точка остается на месте
+        K0_fixed = weights[fixed_point_index] * sigma_3_noise[fixed_point_index] + weights[0] * sigma_3_line_fixed
+
         def func(x):
             """x - массив sigma_3 без зафиксированной точки"""
-            # возвращаем зафиксированную точку для подачи в МНК
-            x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
-            x[0] = sigma_3_line_fixed  # оставляем первую точку на месте
+            return (free_weights @ x + K0_fixed - K0nc) ** 2
 
-            _K0_new, _sigma_p_new, _ = ModelK0.define_k0(sigma_1_line, x, is_hs_model=is_hs_model, no_round=True)
-
-            return abs(_K0_new - K0nc)**2
+        def jac(x):
+            return 2 * (free_weights @ x + K0_fixed - K0nc) * free_weights
 
         initial = np.delete(sigma_3_noise, fixed_point_index)
         bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
         '''Граничные условия типа a <= xi <= b'''
 
-        def constrains(x):
-            x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
-
-            # первое ограничение - каждая последующая сигма не меньше предыдущей
-            first = np.array([x[j + 1] - x[j] for j in range(len(x) - 1)])
-
-            # замыкаем последний на первый на всякий случай
-            second = np.array([x[-1] - x[0]])
-
-            third = np.array([0.035-abs(x[j]-sigma_3_line[j]) for j in range(len(x))])
+        cons = ModelK0SoilTest._noise_constraints(sigma_3_line, fixed_point_index, sigma_3_noise[fixed_point_index])
+        '''Линейные ограничения типа cj(x)>=0'''
 
-            res = np.hstack((first, second, third))
-            return res
-
-        cons = {'type': 'ineq',
-                'fun': constrains}
-        '''Нелинейные ограничения типа cj(x)>=0'''
-
-        res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-8})
+        res = minimize(func, initial, jac=jac, method='SLSQP', constraints=cons, bounds=bnds,
+                       options={'ftol': 1e-8})
         res = res.x
 
         # Результат:
@@ -1136,9 +1315,10 @@ class ModelK0SoilTest(ModelK0):
                 2. На все остальные точки кроме первой накладывается чуть меньший шум (чтобы увеличить итоговый разборс)
                 3. Проводитися оптимизация положения всех точек кроме первой и зафиксированной.
                 4. Фукнцией оптимизации служит полный алгортим определния К0 из кривой включая нелинейный участок
+                    (define_k0_hs_estimation - приближения всех участков считаются сразу)
                 5. Критерий минимизации - минимум абсолютной ошибки определения К0
                 Иначе говоря, не зафиксированные точки двигаются, пока из заданной кривой не будет корретно
-                    определяться К0
+                    определяться К0. Результат проверяется полным define_k0
 
         :param sigma_1_line: Сигма 1 линейного устастка
         :param sigma_3_line: Сигма 3 линейного участка
@@ -1180,42 +1360,42 @@ class ModelK0SoilTest(ModelK0):
             sigma_3_noise[i] += np.random.choice([-noise*(1-i/100), noise*(1-i/100)])
             sigma_3_noise[i] += np.random.uniform(-0.05*noise, 0.05*noise)
 
-        def func(x):
-            """x - массив sigma_3 без зафиксированной точки"""
+        __sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
+        free = np.hstack((np.zeros(len(sigma_1_spl) - 1, dtype=bool),
+                          np.arange(len(sigma_3_noise)) != fixed_point_index))
+        line_start = len(sigma_1_spl) - 1
+
+        def full_sigma_3(x):
             # возвращаем зафиксированную точку для подачи в МНК
             x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
             x[0] = sigma_3_line_fixed  # оставляем первую точку на месте
+            return np.hstack((sigma_3_spl[:-1], x))
 
-            x = np.hstack((sigma_3_spl[:-1], x))
-            __sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
-
-            _K0_new, _sigma_p_new, _ = ModelK0.define_k0(__sigma_1, x, is_hs_model=is_hs_model, no_round=True)
-
+        # К0 определяется приближением всех участков кривой сразу (define_k0_hs_estimation).
+        #   На выбранном участке [index:] К0 линеен по сигма3, отсюда градиент
+        def func(x):
+            """x - массив sigma_3 без зафиксированной точки"""
+            _K0_new, _sigma_p_new, _, _ = ModelK0.define_k0_hs_estimation(__sigma_1, full_sigma_3(x))
             return abs(_K0_new - K0nc)
 
+        def jac(x):
+            _K0_new, _sigma_p_new, _, index = ModelK0.define_k0_hs_estimation(__sigma_1, full_sigma_3(x))
+            tail = __sigma_1[index:] - np.mean(__sigma_1[index:])
+            gradient = np.zeros(len(__sigma_1))
+            if np.sum(tail ** 2) > 0:
+                gradient[index:] = tail / np.sum(tail ** 2)
+            gradient[line_start] = 0  # первая точка прямолинейного участка остается на месте
+            return np.sign(_K0_new - K0nc) * gradient[free]
+
         initial = np.delete(sigma_3_noise, fixed_point_index)
         bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
         '''Граничные условия типа a <= xi <= b'''
 
-        def constrains(x):
-            x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
-
-            # первое ограничение - каждая последующая сигма не меньше предыдущей
-            first = np.array([x[j + 1] - x[j] for j in range(len(x) - 1)])
-
-            # замыкаем последний на первый на всякий случай
-            second = np.array([x[-1] - x[0]])
-
-            third = np.array([0.035-abs(x[j]-sigma_3_line[j]) for j in range(len(x))])
+        cons = ModelK0SoilTest._noise_constraints(sigma_3_line, fixed_point_index, sigma_3_noise[fixed_point_index])
+        '''Линейные ограничения типа cj(x)>=0'''
 
-            res = np.hstack((first, second, third))
-            return res
-
-        cons = {'type': 'ineq',
-                'fun': constrains}
-        '''Нелинейные ограничения типа cj(x)>=0'''
-
-        res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-8})
+        res = minimize(func, initial, jac=jac, method='SLSQP', constraints=cons, bounds=bnds,
+                       options={'ftol': 1e-8})
         res = res.x
 
         # Результат:
@@ -1239,6 +1419,25 @@ class ModelK0SoilTest(ModelK0):
 
         return _sigma_1, _sigma_3
 
+    @staticmethod
+    def _noise_constraints(sigma_3_line, fixed_point_index, fixed_value):
+        """
+        Ограничения подбора шума lse_faker_mc и lse_faker_hs для сигма3 линейного участка без зафиксированной точки:
+        каждая последующая сигма не меньше предыдущей, последняя не меньше первой, отклонение от sigma_3_line
+        не больше 0.035. Все ограничения линейные, поэтому задаются постоянной матрицей A @ x + b >= 0
+        """
+        n = len(sigma_3_line)
+        eye = np.eye(n)
+        A = np.vstack((np.diff(eye, axis=0), eye[-1] - eye[0], -eye, eye))
+        b = np.concatenate((np.zeros(n), 0.035 + sigma_3_line, 0.035 - sigma_3_line))
+
+        b = b + A[:, fixed_point_index] * fixed_value
+        A = np.delete(A, fixed_point_index, axis=1)
+
+        return {'type': 'ineq',
+                'fun': lambda x: A @ x + b,
+                'jac': lambda x: A}
+
     @staticmethod
     def dictionary_without_VFS(sigma_3=100, velocity=49):
 
@@ -1423,17 +1622,14 @@ class ModelK0SoilTest(ModelK0):
             unload_point_s3 = 2*pore_pressure[-1] + np.random.randint(1, 3)*ModelK0SoilTest.SENSOR_LIMITS[0]
             unload_point_s3 -= np.random.uniform(40, 50)  # разгрукзка по сигма3 происходит не до нулевых значений!
 
-            res = ModelK0SoilTest._form_step(unload_point_s1, vertical_pressure[-1], unload_point_s3, pore_pressure[-1], reload=True)
-            vertical_p_reload, action_reload, time_reload, pore_pressure_reload = res
-
-            vertical_p_reload = np.asarray([mirrow_element(elem, vertical_pressure[-1]) for elem in vertical_p_reload])
-            pore_pressure_reload = np.asarray([mirrow_element(elem, pore_pressure[-1]) for elem in pore_pressure_reload])
+            stages = StepStages(1, reload=True, time=time[-1])
+            stages.add(unload_point_s1, vertical_pressure[-1], unload_point_s3, pore_pressure[-1], mirror=True)
+            vertical_p_reload, action_reload, time_reload, pore_pressure_reload = stages.result()
 
             action_reload = np.full(len(action_reload), 'Unload')
             vertical_pressure = np.hstack((vertical_pressure, vertical_p_reload))
             pore_pressure = np.hstack((pore_pressure, pore_pressure_reload))
             action = np.hstack((action, action_reload))
-            time_reload += time[-1]
             time = np.hstack((time, time_reload))
 
         assert (len(action) == len(vertical_pressure))\
@@ -1632,23 +1828,11 @@ class ModelK0SoilTest(ModelK0):
     def text_file(file_path, data):
         """Сохранение текстового файла формата Willie.
                     Передается папка, массивы"""
-        p = os.path.join(file_path, "Тест.log")
-
-        def make_string(data, i):
-            s = ""
-            for key in data:
-                s += str(data[key][i]) + '\t'
-            s += '\n'
-            return (s)
-
-        with open(file_path, "w") as file:
-            file.write(
-                "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + "SampleDiameter_mm" + '\t' +
-                "Deviator_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + "CellPress_kPa" + '\t' + "CellVolume_mm3" + '\t' +
-                "PorePress_kPa" + '\t' + "PoreVolume_mm3" + '\t' + "VerticalPress_kPa" + '\t' +
-                "Trajectory" + '\n')
-            for i in range(len(data["Time"])):
-                file.write(make_string(data, i))
+        write_log(file_path, data, header="\t".join(["Time", "Action", "Action_Changed", "SampleHeight_mm",
+                                                     "SampleDiameter_mm", "Deviator_kPa", "VerticalDeformation_mm",
+                                                     "CellPress_kPa", "CellVolume_mm3", "PorePress_kPa", "PoreVolume_mm3",
+                                                     "VerticalPress_kPa", "Trajectory"]) + "\n",
+                  rows=len(data["Time"]))
 
     @staticmethod
     def form_time_array(x, points_count: int = 5000, discrete_level=0.5, noise=0.4):
@@ -1673,119 +1857,6 @@ class ModelK0SoilTest(ModelK0):
         time = np.linspace(0, len(x) - 1, len(x))
         return time
 
-    @staticmethod
-    def _form_step(sigma_1_i, sigma_1_i_prev, sigma_3_i, sigma_3_i_prev, sigma_1=np.asarray([]), sigma_3=np.asarray([]),
-                   action=np.asarray([]), time=np.asarray([]),
-                   sensor_s1=2.3088, stab_len: int = 365, reload: bool = False, action_type: 'str' = 'LoadStage'):
-
-        # в случае разгрузки участок стабилизации длинее
-        if reload:
-            stab_len *= 2
-
-        rnd = np.random.randint(6, 8)
-        '''число тиков нагрузки'''
-
-        _is_first_sigma_3 = len(sigma_3) == 0
-
-        sensor_s3 = 0.52143
-        '''шум датчика сигма3'''
-
-        num_s3_stabs_err = np.random.randint(30, 40)
-        '''число "опусканий" сигма3 на этапе стабилизации'''
-        if _is_first_sigma_3 and not reload:
-            num_s3_stabs_err = np.random.randint(10, 20)
-
-        _s3_exp_slant = 3
-        '''резкость экспоненты для убывания сигма3 во время стаблизации'''
-        if reload:
-            _s3_exp_slant = 5
-
-        time_load = [0, np.random.uniform(0.5, 1.0), np.random.uniform(1.0, 2.0), np.random.uniform(2.0, 3.0),
-                     np.random.uniform(5.0, 6.0), np.random.uniform(9.0, 11.0), np.random.uniform(20.0, 31.0),
-                     np.random.uniform(40.0, 46.0), np.random.uniform(49.0, 51.0)]
-        '''Временные тики во время этапов нагрузки и выхода на стабилизацию'''
-
-        # Первый блок : нагрузка до значения
-        exp_grid = np.linspace(0, rnd - 1, rnd)
-        sigma_1_step = exponent(exp_grid, sigma_1_i - sigma_1_i_prev, 10)
-        sigma_1_step = sigma_1_step + sigma_1_i_prev
-
-        sigma_3_overload = sigma_3_i+num_s3_stabs_err*sensor_s3
-        sigma_3_lim = sigma_3_overload - sigma_3_i_prev
-        sigma_3_step = exponent(exp_grid, sigma_3_lim, 10)
-        sigma_3_step = sigma_3_step + sigma_3_i_prev
-
-        #   Время во время нагрузки формируется исходя из "скоростей" нагрузок в time_load
-        time_i = np.asarray([time_load[i] for i in range(len(sigma_1_step))])
-        for i in range(1, len(time_i)):
-            time_i[i] += time_i[i-1]
-        if len(time) > 0:  # не забываем прибавить время с предыдущего участка
-            time_i += time[-1]
-
-        time = np.hstack((time, time_i))
-        sigma_1 = np.hstack((sigma_1, sigma_1_step))
-        action = np.hstack((action, np.full(len(sigma_1_step), action_type)))
-        sigma_3 = np.hstack((sigma_3, sigma_3_step))
-
-        # Второй блок : стабилизация
-        #   первая стаблизация повторяет последнюю нагрузку
-        action = np.hstack((action, ['Stabilization']))
-        time = np.hstack((time, np.asarray(time[-1])))
-        sigma_1 = np.hstack((sigma_1, np.asarray(sigma_1[-1])))
-        sigma_3 = np.hstack((sigma_3, np.asarray(sigma_3[-1])))
-
-        #       коррекция для соблюдения погрешностей датчика - при стаблизации значение "скачет" туда-сюда
-        # сигма1
-        correction = sensor_s1 - (sigma_1[-1] - sigma_1_i)
-        sigma_1_step = np.full(stab_len, sigma_1[-1]) + correction
-        rnd = choices([0, 1], weights=[0.8, 0.2], k=len(sigma_1_step))
-        sigma_1_step = np.asarray([sigma_1_i if rnd[i] else sigma_1_step[i] for i in range(len(sigma_1_step))])
-
-        # сигма3
-        #
-        exp_grid = np.linspace(0, stab_len - 1, stab_len)
-        sigma_3_step = exponent(exp_grid, abs(sigma_3_overload-sigma_3_i), slant=_s3_exp_slant)
-        sigma_3_step = sigma_3_step + sigma_3_overload
-        sigma_3_step = np.asarray([mirrow_element(elem, sigma_3_overload) for elem in sigma_3_step])
-
-        for i in range(1, len(sigma_3_step)):
-            if sigma_3_step[i]-sigma_3_step[i-1] <= -0.52143:
-                sigma_3_step[i] = sigma_3_step[i-1] - sensor_s3
-            elif sigma_3_step[i]-sigma_3_step[i-1] >= 0.52143:
-                sigma_3_step[i] = sigma_3_step[i - 1] + sensor_s3
-            else:
-                sigma_3_step[i] = sigma_3_step[i-1]
-
-        if reload:
-            for i in range(1, len(sigma_3_step)):
-                rnd = np.random.randint(0, 1)
-                if rnd:
-                    sigma_3_step = np.asarray([sigma_3_step[:i], sigma_3_step[i:] - sensor_s3])
-
-        #   Время во время стаблизации состоит из двух подэтапов
-        #       сначала идет "разгон" до нужного времени, а потом тики по 60 секунд
-        time_i = [time[-1] + time_load[1]]
-        for i in range(1, len(sigma_1_step)):
-            if i <= 6:
-                time_i.append(time_i[-1] + time_load[i+1])
-            else:
-                time_i.append(time_i[-1] + 60)
-        time_i = np.asarray(time_i)
-
-        #
-        sigma_1 = np.hstack((sigma_1, sigma_1_step))
-        action = np.hstack((action, np.full(len(sigma_1_step), 'Stabilization')))
-        time = np.hstack((time, time_i))
-        sigma_3 = np.hstack((sigma_3, sigma_3_step))
-
-        #   последняя стабилизация дважды
-        sigma_1 = np.hstack((sigma_1, np.asarray(sigma_1_i)))
-        sigma_3 = np.hstack((sigma_3, np.asarray(sigma_3_i)))
-        action = np.hstack((action, ['Stabilization']))
-        time = np.hstack((time, np.asarray(time[-1])))
-
-        return sigma_1, action, time, sigma_3
-
     @staticmethod
     def sigma_1_max_mpa(sigma_1_max_kpa, sigma_1_step_mpa):
         num_steps = int(int(sigma_1_max_kpa) / int(sigma_1_step_mpa*1000))
@@ -350,10 +350,10 @@ class K0SoilTestApp(QWidget):
 
             if read_parameters["test_mode"] == K0Statment.test_modes[0]:
                 K0_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"k0_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"k0_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             if read_parameters["test_mode"] == K0Statment.test_modes[1]:
                 K0_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"k0ur_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"k0ur_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             control()
             return True, 'Успешно'
 
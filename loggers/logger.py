@@ -24,10 +24,14 @@ def log_this(logger_obj, level: str = "info") -> object:
         decorator.log_wite = getattr(decorator.loger, level)
 
         def wrapper(*args, **kwargs):
+            # Строка с аргументами (например, датафрейм ведомости) формируется, только если уровень включен
+            enabled = decorator.loger.isEnabledFor(logging.getLevelName(level.upper()))
             try:
-                decorator.log_wite(f"Вызов функции: {function.__name__}, аргументы: {args, kwargs}")
+                if enabled:
+                    decorator.log_wite(f"Вызов функции: {function.__name__}, аргументы: {args, kwargs}")
                 function(*args, **kwargs)
-                decorator.log_wite(f"Вызов функции выполнен успешно")
+                if enabled:
+                    decorator.log_wite(f"Вызов функции выполнен успешно")
             except:
                 decorator.loger.exception(f"Ошибка в функции {function.__name__}")
         return wrapper
@@ -1,6 +1,9 @@
 import os
 import shutil
-from typing import List, Dict
+import time
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional
 import logging
 from thrd.socket_thd import send_to_server
 
@@ -14,6 +17,40 @@ def read_json_file(path):
         json_data = json.load(file)
     return json_data
 
+# Интервал отправки прогресса, с
+PROGRESS_INTERVAL = 0.2
+# При меньшем числе файлов обработка выполняется в текущем процессе без запуска пула
+PARALLEL_MIN_FILES = 8
+
+# Содержимое файлов ватермарок процесса {путь: байты}. Страница разбирается для каждого отчета заново:
+# PdfFileWriter при записи заменяет ссылки объектов вставленной страницы, общую страницу использовать нельзя
+_watermark_files: Dict[str, bytes] = {}
+
+
+def watermark_page(path: str):
+    """Первая страница файла ватермарки. Файл читается с диска один раз в процессе"""
+    path = os.path.abspath(path)
+    if path not in _watermark_files:
+        with open(path, "rb") as file:
+            _watermark_files[path] = file.read()
+    return PdfFileReader(BytesIO(_watermark_files[path])).getPage(0)
+
+
+def _init_worker(watermark: Dict):
+    """Чтение ватермарок при запуске процесса пула"""
+    for path in watermark.values():
+        watermark_page(path)
+
+
+def _set_watermark_job(input_pdf: str, output_pdf: str, watermark_config: Dict, watermark: Dict) -> Optional[str]:
+    """Задача процесса: вставка ватермарки в один файл. Возвращает текст ошибки или None"""
+    try:
+        WaterMarks.set_watermark(input_pdf, output_pdf, watermark_config, watermark)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return None
+
+
 class WaterMarks:
     """Модель генерации ватермарок"""
     # Выбранная папка с отчетами
@@ -25,6 +62,9 @@ class WaterMarks:
     # Все PDF файлы из self._initial_directory
     _files: List[str] = []
 
+    # Файлы, которые не удалось обработать при последнем запуске process
+    _errors: List[str] = []
+
     # Все файлы ватермарок
     #_watermark: str = "pdf_watermark/5.pdf"
 
@@ -63,6 +103,9 @@ class WaterMarks:
     def get_initial_directory(self) -> str:
         return self._initial_directory
 
+    def get_errors(self) -> List[str]:
+        return self._errors
+
     def _make_modified_directory(self) -> None:
         """Создадние папки с модифицированными отчетами"""
         if self._initial_directory:
@@ -75,23 +118,46 @@ class WaterMarks:
             except OSError:
                 app_logger.info("pdf_watermark: failed to create a directory of modified reports")
 
-    def process(self) -> bool:
-        """Метод обработки директории, ищет все файлы"""
+    def process(self, max_workers: Optional[int] = None) -> bool:
+        """Метод обработки директории, ищет все файлы.
+        Файлы обрабатываются в пуле процессов, прогресс отправляется не чаще PROGRESS_INTERVAL"""
         if self._files:
             send_to_server(self._port, {"window_title": "Процесс ..."})
             send_to_server(self._port, {"label": "Обработка PDF отчетов..."})
             send_to_server(self._port, {"maximum": len(self._files)})
 
-            for i, file in enumerate(self._files):
-                file_name = os.path.split(file)[-1]
-                WaterMarks.set_watermark(file, os.path.join(self._modified_directory, file_name),
-                                         self._watermark_config, self._watermark)
-                send_to_server(self._port, {"value": i + 1})
-
-            app_logger.info("pdf_watermark: {} files processed successfully".format(len(self._files)))
+            watermark = {key: os.path.abspath(path) for key, path in self._watermark.items()}
+            tasks = [(file, os.path.join(self._modified_directory, os.path.split(file)[-1]),
+                      self._watermark_config, watermark) for file in self._files]
+
+            errors = self._errors = []
+            done = 0
+            sent = time.monotonic()
+
+            def result(file, error):
+                nonlocal done, sent
+                done += 1
+                if error:
+                    errors.append(file)
+                    app_logger.error("pdf_watermark: {} - {}".format(file, error))
+                if done == len(tasks) or time.monotonic() - sent >= PROGRESS_INTERVAL:
+                    send_to_server(self._port, {"value": done})
+                    sent = time.monotonic()
+
+            if len(tasks) < PARALLEL_MIN_FILES or max_workers == 1:
+                for task in tasks:
+                    result(task[0], _set_watermark_job(*task))
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                         initargs=(watermark,)) as executor:
+                    futures = {executor.submit(_set_watermark_job, *task): task[0] for task in tasks}
+                    for future in as_completed(futures):
+                        result(futures[future], future.result())
+
+            app_logger.info("pdf_watermark: {} files processed successfully".format(len(self._files) - len(errors)))
             send_to_server(self._port, {"break": True})
 
-            return True
+            return not errors
         else:
             return False
 
@@ -112,12 +178,11 @@ class WaterMarks:
             watermark = watermark["vertical"]
         else:
             watermark = watermark["horizontal"]
-        watermark_instance = PdfFileReader(watermark)
-        watermark_page = watermark_instance.getPage(0)
+        stamp = watermark_page(watermark)
         pdf_writer = PdfFileWriter()
         for page in range(pdf_reader.getNumPages()):
             page = pdf_reader.getPage(page)
-            page.mergePage(watermark_page)
+            page.mergePage(stamp)
             pdf_writer.addPage(page)
 
         with open(output_pdf, 'wb') as out:
@@ -2,6 +2,7 @@ import numpy as np
 import pickle
 import os
 import scipy.ndimage as ndimage
+from general.curve_averaging import sector_average, sorted_union
 from singletons import E_models
 from plaxis_average.statment import averaged_statment
 
@@ -35,6 +36,7 @@ class AveragedItemModel:
         # TODO: Аппроксимация и уменьшение точек
         for key in keys:
             self.tests[key] = E_models[key].deviator_loading.get_for_average()
+        self._points = None
         self.first_time = True
         self.processing()
         self.first_time = False
@@ -43,11 +45,15 @@ class AveragedItemModel:
         self.averaged_strain, self.averaged_deviator = self.approximate_average()
         self.averaged_E50, self.averaged_qf = AveragedItemModel.define_E50_qf(self.averaged_strain, self.averaged_deviator)
 
+    def __getstate__(self):
+        # Объединение точек опытов не сохраняется, оно строится заново при первом расчете
+        state = dict(self.__dict__)
+        state.pop("_points", None)
+        return state
+
     def approximate_average(self) -> (np.array, np.array):
         param = self.approximate_param_poly if self.approximate_type == "poly" else self.approximate_param_sectors
 
-        points = []
-
         '''max_strains_array = []
         for test in self.tests:
             i, = np.where(self.tests[test]["strain"] >= np.max(self.tests[test]["strain"]) - 0.015)
@@ -70,6 +76,32 @@ class AveragedItemModel:
         else:
             max_strain = self.approximate_param_max_deformation
 
+        strain, deviator = self.sorted_points(max_strain)
+
+        if self.approximate_type == "sectors":
+            averange_strain, averange_deviator = sector_average(strain, deviator, param)
+
+            averange_deviator = ndimage.gaussian_filter(averange_deviator, 3, order=0)
+            averange_deviator[0] = 0
+
+        elif self.approximate_type == "poly":
+            averange_strain = np.linspace(0, strain[-1], 50)
+            averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
+            averange_deviator[0] = 0
+
+        averange_deviator = ndimage.gaussian_filter(averange_deviator, 1, order=0)
+        averange_deviator[0] = 0
+        return averange_strain, averange_deviator
+
+    def sorted_points(self, max_strain) -> (np.array, np.array):
+        """Точки всех опытов до max_strain, отсортированные по деформации.
+        Зависят только от опытов и max_strain, поэтому при смене типа и параметра аппроксимации берутся готовыми"""
+        points = getattr(self, "_points", None)
+        if points is not None and points[0] == max_strain:
+            return points[1]
+
+        strains = []
+        deviators = []
         for test in self.tests:
             if self.tests[test]["strain"][-1] <= max_strain:
                 i_max = np.argmax(self.tests[test]["deviator"])
@@ -86,47 +118,11 @@ class AveragedItemModel:
                 strain_for_sum = self.tests[test]["strain"][:i]
                 deviator_for_sum = self.tests[test]["deviator"][:i]
 
-            for point in zip(strain_for_sum, deviator_for_sum):
-                points.append(point)
-
-        points.sort(key=lambda point: point[0])
-
-        strain = [point[0] for point in points]
-        deviator = [point[1] for point in points]
-
-        if self.approximate_type == "sectors":
-            step = max(strain) / param
-            step_points = {}
-            for i in range(len(strain)):
-                step_x = strain[i] // step
-                step_key = step_x * step
-                if step_points.get(step_key, None):
-                    step_points[step_key].append(deviator[i])
-                else:
-                    step_points[step_key] = [deviator[i]]
-
-            averange_strain = [0]
-            averange_deviator = [0]
-            for key in step_points.keys():
-                if len(step_points[key]):
-                    averange_strain.append(key)
-                    averange_deviator.append(sum(step_points[key]) / len(step_points[key]))
-
-            averange_deviator = ndimage.gaussian_filter(np.array(averange_deviator), 3, order=0)
-            averange_deviator[0] = 0
+            strains.append(strain_for_sum)
+            deviators.append(deviator_for_sum)
 
-            averange_strain, averange_deviator = np.array(averange_strain), np.array(averange_deviator)
-
-        elif self.approximate_type == "poly":
-            averange_strain = np.linspace(0, max(strain), 50)
-            averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
-            averange_deviator[0] = 0
-
-            averange_strain, averange_deviator = np.array(averange_strain), np.array(averange_deviator)
-
-        averange_deviator = ndimage.gaussian_filter(averange_deviator, 1, order=0)
-        averange_deviator[0] = 0
-        return averange_strain, averange_deviator
+        self._points = (max_strain, sorted_union(strains, deviators))
+        return self._points[1]
 
     def set_approximate_type(self, approximate_type, approximate_param, approximate_max_deformation) -> None:
         self.approximate_type = approximate_type
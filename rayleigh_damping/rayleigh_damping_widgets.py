@@ -156,9 +156,9 @@ class RayleighDampingSoilTestApp(AppMixin, QWidget):
         self.tab_3.popOut.connect(self.removeTab)
 
         self.tab_4 = Save_Dir(result_table_params={
-            "alpha": lambda lab: RayleighDamping_models[lab].get_test_results()['alpha'],
-            "betta": lambda lab: RayleighDamping_models[lab].get_test_results()["betta"],
-            "Коэф. демпфирования": lambda lab: str(RayleighDamping_models[lab].get_test_results()["damping_ratio"]),
+            "alpha": lambda lab: RayleighDamping_models.get_test_results(lab)['alpha'],
+            "betta": lambda lab: RayleighDamping_models.get_test_results(lab)["betta"],
+            "Коэф. демпфирования": lambda lab: str(RayleighDamping_models.get_test_results(lab)["damping_ratio"]),
         }, qr={"state": True})
         self.tab_4.popIn.connect(self.addTab)
         self.tab_4.popOut.connect(self.removeTab)
@@ -327,7 +327,7 @@ class RayleighDampingSoilTestApp(AppMixin, QWidget):
     def save_pickle(self):
         try:
             RayleighDamping_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                     f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"))
+                                                     f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             statment.save([RayleighDamping_models], [f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"])
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
@@ -341,7 +341,7 @@ class RayleighDampingSoilTestApp(AppMixin, QWidget):
 
         try:
             RayleighDamping_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                     f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"))
+                                                     f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             statment.save([RayleighDamping_models], [f"RayleighDamping_models{statment.general_data.get_shipment_number()}.pickle"])
             print("Pickle успешно сохранен")
         except Exception as err:
@@ -395,9 +395,9 @@ class RayleighDampingSoilTestApp(AppMixin, QWidget):
                 dialog.get_data()
                 VC_models.generateTests()
                 VC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"VC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"VC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 app_logger.info("Новые параметры ведомости и модели сохранены")
 
     def general_statment(self):
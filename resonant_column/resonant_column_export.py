@@ -0,0 +1,65 @@
+"""Сохранение протоколов резонансной колонки в пакетном режиме (см. general.batch_export)"""
+import os
+import shutil
+
+from authentication.control import control
+from authentication.request_qr import request_qr
+from general.reports import report_rc
+from resonant_column.resonant_column_widgets_UI import RezonantColumnFigures
+from singletons import RC_models, statment
+
+
+def save_report_job(test: str, params: dict) -> dict:
+    """Сохранение протокола и лога опыта test.
+
+    :param params: report_type - тип протокола, qr - запрашивать qr код, version - версия программы
+    :return: ячейки ведомости для записи результатов"""
+    file_path_name = statment.getLaboratoryNumber().replace("/", "-").replace("*", "")
+
+    save = statment.save_dir.arhive_directory + "/" + file_path_name
+    save = save.replace("*", "")
+
+    if not os.path.isdir(save):
+        os.mkdir(save)
+
+    file_name = save + "/" + "Отчет " + file_path_name + "-РК" + ".pdf"
+
+    test_result = RC_models[test].get_test_results()
+
+    results = {
+        "G0": test_result["G0"],
+        "gam07": test_result["threshold_shear_strain"],
+        "E0": test_result["E0"],
+    }
+
+    data_customer = statment.general_data
+    date = statment[test].physical_properties.date
+    if date:
+        data_customer.end_date = date
+
+    qr = request_qr(os.path.join(save, "qr.png")) if params["qr"] else None
+
+    figures = RezonantColumnFigures()
+    figures.plot(RC_models[test].get_plot_data(), test_result)
+
+    report_rc(file_name, data_customer,
+              statment[test].physical_properties,
+              statment.getLaboratoryNumber(),
+              os.getcwd() + "/project_data/", statment[test].mechanical_properties, results,
+              figures.save_canvas(), params["report_type"], params["version"], qr_code=qr)
+
+    shutil.copy(file_name, statment.save_dir.report_directory + "/" + os.path.split(file_name)[-1])
+    RC_models[test].save_log_file(save)
+
+    control()
+
+    number = statment[test].physical_properties.sample_number + 7
+
+    return {
+        "cells": [
+            {"cell": ("HL" + str(number), (number, 219)), "value": test_result["G0"], "sheet": "Лист1"},
+            {"cell": ("HJ" + str(number), (number, 217)), "value": test_result["E0"], "sheet": "Лист1"},
+            {"cell": ("HK" + str(number), (number, 218)), "value": test_result["threshold_shear_strain"],
+             "sheet": "Лист1"},
+        ]
+    }
@@ -19,10 +19,12 @@ from general.save_widget import Save_Dir
 from general.reports import report_rc
 from excel_statment.initial_statment_widgets import RezonantColumnStatment
 from loggers.logger import app_logger, log_this, handler
-from excel_statment.functions import set_cell_data
+from excel_statment.functions import statment_writer
 from singletons import RC_models, statment
 from version_control.configs import actual_version
 from general.movie_label import Loader
+from general.batch_export import BatchReportExport, BatchExportError, write_cells
+from resonant_column.resonant_column_export import save_report_job
 
 from general.tab_view import AppMixin, TabMixin
 __version__ = actual_version
@@ -384,8 +386,8 @@ class RezonantColumnProcessingApp(AppMixin, QWidget):
         self.tab_2.popOut.connect(self.removeTab)
 
         self.tab_3 = Save_Dir(result_table_params={
-            "G0": lambda lab: RC_models[lab].get_test_results()['G0'],
-            "gam_07": lambda lab: RC_models[lab].get_test_results()["threshold_shear_strain"],
+            "G0": lambda lab: RC_models.get_test_results(lab)['G0'],
+            "gam_07": lambda lab: RC_models.get_test_results(lab)["threshold_shear_strain"],
         }, qr=True)
         self.tab_3.popIn.connect(self.addTab)
         self.tab_3.popOut.connect(self.removeTab)
@@ -432,7 +434,7 @@ class RezonantColumnProcessingApp(AppMixin, QWidget):
                 dialog.get_data()
                 RC_models.generateTests()
                 RC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"rc_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"rc_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 # statment.dump(''.join(os.path.split(self.tab_2.save_widget.directory)[:-1]),
                 # name="Резонансная колонка.pickle")
                 app_logger.info("Новые параметры ведомости и модели сохранены")
@@ -475,9 +477,11 @@ class RezonantColumnProcessingApp(AppMixin, QWidget):
 
             number = statment[statment.current_test].physical_properties.sample_number + 7
 
-            set_cell_data(self.tab_1.path, ("HL" + str(number), (number, 219)), test_result["G0"], sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HK" + str(number), (number, 218)), test_result["threshold_shear_strain"],
-                          sheet="Лист1")
+            writer = statment_writer(self.tab_1.path)
+            writer.set_cell_data(("HL" + str(number), (number, 219)), test_result["G0"], sheet="Лист1")
+            writer.set_cell_data(("HK" + str(number), (number, 218)), test_result["threshold_shear_strain"],
+                                 sheet="Лист1")
+            writer.flush()
 
             shutil.copy(file_name, statment.save_dir.report_directory + "/" + file_name[len(file_name) -
                                                                                         file_name[::-1].index("/"):])
@@ -568,8 +572,8 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
                              message_port=7786, parent=self)
 
         def G0_repeat(lab):
-            G0 = int(RC_models[lab].get_test_results()["G0"])
-            G0_list = [int(RC_models[i].get_test_results()["G0"]) for i in statment]
+            G0 = int(RC_models.get_test_results(lab)["G0"])
+            G0_list = [int(RC_models.get_test_results(i)["G0"]) for i in statment]
             G0_list.pop(G0_list.index(G0))
 
             return G0 in G0_list
@@ -579,8 +583,8 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
                 "G0": "G0",
                 "G0E0": "G0 + E0"},
         result_table_params={
-            "G0": lambda lab: RC_models[lab].get_test_results()['G0'],
-            "gam_07": lambda lab: RC_models[lab].get_test_results()["threshold_shear_strain"],
+            "G0": lambda lab: RC_models.get_test_results(lab)['G0'],
+            "gam_07": lambda lab: RC_models.get_test_results(lab)["threshold_shear_strain"],
         }, qr={"state": True},
             result_table_condition_params={
                 "G0_repeat": lambda lab: G0_repeat(lab)
@@ -634,7 +638,7 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
                 dialog.get_data()
                 RC_models.generateTests()
                 RC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"rc_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"rc_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 #statment.dump(''.join(os.path.split(self.tab_2.save_widget.directory)[:-1]),
                               #name="Резонансная колонка.pickle")
                 app_logger.info("Новые параметры ведомости и модели сохранены")
@@ -683,9 +687,11 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
 
             number = statment[statment.current_test].physical_properties.sample_number + 7
 
-            set_cell_data(self.tab_1.path, ("HL" + str(number), (number, 219)), test_result["G0"], sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HJ" + str(number), (number, 217)), test_result["E0"], sheet="Лист1")
-            set_cell_data(self.tab_1.path, ("HK" + str(number), (number, 218)), test_result["threshold_shear_strain"], sheet="Лист1")
+            writer = statment_writer(self.tab_1.path)
+            writer.set_cell_data(("HL" + str(number), (number, 219)), test_result["G0"], sheet="Лист1")
+            writer.set_cell_data(("HJ" + str(number), (number, 217)), test_result["E0"], sheet="Лист1")
+            writer.set_cell_data(("HK" + str(number), (number, 218)), test_result["threshold_shear_strain"], sheet="Лист1")
+            writer.flush()
 
             shutil.copy(file_name, statment.save_dir.report_directory + "/" + file_name[len(file_name) -
                                                                                       file_name[::-1].index("/"):])
@@ -716,7 +722,7 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
         try:
             statment.save([RC_models], [f"rc_models{statment.general_data.get_shipment_number()}.pickle"])
             RC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"rc_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"rc_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
@@ -733,7 +739,7 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
         RC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                    f"rc_models{statment.general_data.get_shipment_number()}.pickle"))
+                                    f"rc_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
         try:
             statment.save_dir.clear_dirs()
@@ -741,33 +747,27 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
             QMessageBox.critical(self, "Ошибка", "Ошибка очистки папки с отчетами. Не закрыт файл отчета.")
             return
 
-        def save():
-
-            count = len(statment)
-            Loader.send_message(self.loader.port, f"Сохранено 0 из {count}")
+        def on_result(test, result):
+            write_cells(self.tab_1.path, result["cells"], flush=False)
+            self.tab_1.table_physical_properties.set_row_color(
+                self.tab_1.table_physical_properties.get_row_by_lab_naumber(test))
+            app_logger.info(f"Проба {test} успешно сохранена")
 
-            for i, test in enumerate(statment):
-                self.save_massage = False
-                statment.setCurrentTest(test)
-                self.tab_2.set_test_params(True)
-                try:
-                    is_ok, message = self.save_report(save_all_mode=True)
-                    if not is_ok:
-                        self.loader.close_OK(
-                            f"Ошибка сохранения пробы {statment.current_test}\n{message}.\nОперация прервана.")
-                        app_logger.info(f"Ошибка сохранения пробы {message}")
-                        return
-                except Exception as err:
-                    self.loader.close_OK(f"Ошибка сохранения пробы {statment.current_test}\n{err}.\nОперация прервана.")
-                    app_logger.info(f"Ошибка сохранения пробы {err}")
-                    return
-
-                Loader.send_message(self.loader.port, f"Сохранено {i + 1} из {count}")
-
-            Loader.send_message(self.loader.port, f"Сохранено {count} из {count}")
+        def save():
+            export = BatchReportExport(save_report_job, {"RC_models": RC_models},
+                                       progress=lambda message: Loader.send_message(self.loader.port, message))
+            try:
+                export.run({"report_type": self.tab_3.report_type, "qr": bool(self.tab_3.qr), "version": __version__},
+                           on_result=on_result)
+            except BatchExportError as err:
+                self.loader.close_OK(f"{err}.\nОперация прервана.")
+                app_logger.info(f"Ошибка сохранения пробы {err.message}")
+                return
+            finally:
+                # Результаты сохраненных проб записываются в ведомость одним сохранением
+                statment_writer(self.tab_1.path).flush()
 
             self.loader.close_OK(f"Объект выгнан")
-            self.save_massage = True
 
         t = threading.Thread(target=save)
         self.loader.start()
@@ -779,7 +779,7 @@ class RezonantColumnSoilTestApp(AppMixin, QWidget):
         try:
             statment.save([RC_models], [f"rc_models{statment.general_data.get_shipment_number()}.pickle"])
             RC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"rc_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"rc_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             print(err)
 
@@ -9,11 +9,12 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import os
 import sys
-from io import BytesIO
 
 from excel_statment.initial_tables import Table, TableVertical
 from general.general_widgets import Float_Slider, RangeSlider
 from general.general_functions import read_json_file
+from general.batch_export import create_offscreen_figure
+from general.plotting import render_to_file
 from configs.styles import style
 from static_loading.triaxial_static_test_widgets import TriaxialStaticLoading_Sliders
 from singletons import statment
@@ -107,14 +108,7 @@ class RezonantColumnUI(QWidget):
         """Сохранение графиков для передачи в отчет"""
 
         self.ax_G.get_legend().remove()
-        self.canvas.draw()
-
-        path = BytesIO()
-        size = self.figure.get_size_inches()
-        self.figure.set_size_inches([6, 5])
-        self.figure.savefig(path, format='svg', transparent=True)
-        path.seek(0)
-        self.figure.set_size_inches(size)
+        path = render_to_file(self.figure, [6, 5], "svg")
 
         self.ax_G.legend()
         self.canvas.draw()
@@ -134,6 +128,18 @@ class RezonantColumnUI(QWidget):
 
         self.canvas.draw()
 
+class RezonantColumnFigures:
+    """Графики резонансной колонки без виджетов Qt для пакетного сохранения протоколов.
+    Построение выполняется методами RezonantColumnUI на фигуре с холстом Agg."""
+    plot = RezonantColumnUI.plot
+    save_canvas = RezonantColumnUI.save_canvas
+
+    def __init__(self):
+        self.figure, self.canvas = create_offscreen_figure(right=0.98, top=0.98, bottom=0.14, wspace=0.2, hspace=0.2,
+                                                           left=0.08)
+        self.ax_G = self.figure.add_subplot(2, 1, 2)
+        self.ax_rezonant = self.figure.add_subplot(2, 1, 1)
+
 class RezonantColumnIdentificationUI_old(QWidget):
     """Интерфейс обработчика Резонансной колонки"""
     def __init__(self):
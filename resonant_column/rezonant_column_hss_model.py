@@ -27,7 +27,7 @@ import warnings
 import sys
 import matplotlib.pyplot as plt
 from scipy.optimize import curve_fit
-from scipy.optimize import differential_evolution
+from general.curve_fitting import fit_hardin_drnevich
 
 from general.general_functions import AttrDict
 from resonant_column.rezonant_column_function import define_G0_threshold_shear_strain
@@ -257,30 +257,8 @@ class ModelRezonantColumn:
 
     @staticmethod
     def approximate_Hardin_Drnevick(x, y):
-
-        def sumOfSquaredError(parameterTuple):
-            warnings.filterwarnings("ignore")  # do not print warnings by genetic algorithm
-            val = ModelRezonantColumn.Hardin_Drnevick(x, *parameterTuple)
-            return np.sum((x - val) ** 2.0)
-
-        def generate_Initial_Parameters():
-            # min and max used for bounds
-            maxX = np.max(x)
-            minX = np.min(x)
-            maxY = np.max(y)
-            minY = np.min(y)
-
-            parameterBounds = []
-            parameterBounds.append([minX, maxX])  # search bounds for h
-            parameterBounds.append([minY, maxY])
-            result = differential_evolution(sumOfSquaredError, parameterBounds, seed=3)
-            return result.x
-
-        geneticParameters = generate_Initial_Parameters()
-
-        popt, pcov = curve_fit(ModelRezonantColumn.Hardin_Drnevick, x, y, geneticParameters)
-
-        aa, G = popt
+        """Аппроксимация кривой Гардина - Дрневича. Возвращает G0 и пороговую деформацию сдвига"""
+        aa, G = fit_hardin_drnevich(x, y)
         threshold_shear_strain = 0.278 / (aa * 0.722)
 
         return np.round(G, 2), np.round(threshold_shear_strain * 10000, 2)
@@ -30,6 +30,7 @@ from excel_statment.properties_model import ShearProperties
 from general.general_functions import sigmoida, make_increas, line_approximate, line, define_poissons_ratio, mirrow_element, \
     define_dilatancy, define_type_ground, AttrDict, find_line_area, interpolated_intercept, Point, point_to_xy, \
     array_discreate_noise, create_stabil_exponent, discrete_array, create_deviation_curve, exponent, create_json_file
+from general.log_writer import write_log
 from typing import Dict, List
 from shear_test.shear_dilatancy_functions import curve_shear_dilatancy
 from configs.plot_params import plotter_params
@@ -1465,22 +1466,10 @@ class ModelShearDilatancySoilTest(ModelShearDilatancy):
     def text_file(file_path, data):
         """Сохранение текстового файла формата Willie.
                     Передается папка, массивы"""
-        p = os.path.join(file_path, "Тест.log")
-
-        def make_string(data, i):
-            s = ""
-            for key in data:
-                s += str(data[key][i]) + '\t'
-            s += '\n'
-            return (s)
-
-        with open(file_path, "w") as file:
-            file.write(
-                "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + "SampleDiameter_mm" + '\t' +
-                "VerticalPress_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + "ShearDeformation_mm" + '\t' +
-                "ShearPress_kPa" + '\t' + "Stage"+ '\n')
-            for i in range(len(data["Time"])):
-                file.write(make_string(data, i))
+        write_log(file_path, data, header="\t".join(["Time", "Action", "Action_Changed", "SampleHeight_mm",
+                                                     "SampleDiameter_mm", "VerticalPress_kPa", "VerticalDeformation_mm",
+                                                     "ShearDeformation_mm", "ShearPress_kPa", "Stage"]) + "\n",
+                  rows=len(data["Time"]))
 
 if __name__ == '__main__':
 
@@ -11,10 +11,10 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import os
-from io import BytesIO
 
 from general.general_widgets import Float_Slider, RangeSlider
 from general.general_functions import point_to_xy
+from general.plotting import PersistentPlot, render_to_file
 from excel_statment.initial_tables import TableVertical
 from configs.plot_params import plotter_params
 from general.general_functions import read_json_file
@@ -100,6 +100,7 @@ class ModelShearDilatancyUI(QWidget):
         # self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
 
         self.deviator_canvas.draw()
+        self.deviator_plot = PersistentPlot(self.deviator_figure, self.deviator_canvas)
         self.deviator_frame_layout.setSpacing(0)
         self.deviator_frame_layout.addWidget(self.deviator_canvas)
         self.deviator_toolbar = NavigationToolbar(self.deviator_canvas, self)
@@ -118,6 +119,7 @@ class ModelShearDilatancyUI(QWidget):
         self.volume_strain_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
         self.volume_strain_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
         self.volume_strain_canvas.draw()
+        self.volume_strain_plot = PersistentPlot(self.volume_strain_figure, self.volume_strain_canvas)
         self.volume_strain_frame_layout.setSpacing(0)
         self.volume_strain_frame_layout.addWidget(self.volume_strain_canvas)
         self.volume_strain_toolbar = NavigationToolbar(self.volume_strain_canvas, self)
@@ -137,23 +139,26 @@ class ModelShearDilatancyUI(QWidget):
     def plot(self, plots, res):
         """Построение графиков опыта"""
         try:
-            self.deviator_ax.clear()
-            self.deviator_ax.set_xlabel("Абсолютная деформация $l_1$, мм")
-            self.deviator_ax.set_ylabel("Касательное напряжение τ, МПа")
+            if self.deviator_plot.begin("deviator"):
+                self.deviator_ax.clear()
+                self.deviator_ax.set_xlabel("Абсолютная деформация $l_1$, мм")
+                self.deviator_ax.set_ylabel("Касательное напряжение τ, МПа")
 
-            self.volume_strain_ax.clear()
-            self.volume_strain_ax.set_xlabel("Абсолютная деформация $l_1$, мм")
-            self.volume_strain_ax.set_ylabel("Абсолютная \n вертикальная деформация $h_1$, мм")
+            if self.volume_strain_plot.begin("volume_strain"):
+                self.volume_strain_ax.clear()
+                self.volume_strain_ax.set_xlabel("Абсолютная деформация $l_1$, мм")
+                self.volume_strain_ax.set_ylabel("Абсолютная \n вертикальная деформация $h_1$, мм")
 
             # self.deviator_ax2.clear()
 
             if plots["strain"] is not None:
-                self.deviator_ax.plot(plots["strain"], plots["deviator"],
-                                      **plotter_params["static_loading_main_line"])
+                self.deviator_plot.line(self.deviator_ax, "deviator", plots["strain"], plots["deviator"],
+                                        **plotter_params["static_loading_main_line"])
 
-                self.deviator_ax.plot(plots["strain_cut"], plots["deviator_cut"],
-                                      **plotter_params["static_loading_gray_line"])
-                self.deviator_ax.scatter(plots["strain"], plots["deviator"], s=50)
+                self.deviator_plot.line(self.deviator_ax, "deviator_cut", plots["strain_cut"], plots["deviator_cut"],
+                                        **plotter_params["static_loading_gray_line"])
+                self.deviator_plot.points(self.deviator_ax, "deviator_points", zip(plots["strain"], plots["deviator"]),
+                                          size=50, color="C0")
 
                 h, d = statment.general_parameters.equipment_sample_h_d
                 if d == 71.4:
@@ -161,31 +166,35 @@ class ModelShearDilatancyUI(QWidget):
                 elif d == 150:
                     xlim = 16
 
+                self.deviator_plot.update_limits()
                 lim = self.deviator_ax.get_xlim()
                 self.deviator_ax.set_xlim([lim[0], xlim])
 
-                self.volume_strain_ax.plot(plots["strain"], plots["volume_strain"], **plotter_params["static_loading_main_line"])
-                self.volume_strain_ax.plot(plots["strain"], plots["volume_strain_approximate"],
-                                      **plotter_params["static_loading_red_dotted_line"])
-                self.volume_strain_ax.scatter(plots["strain"], plots["volume_strain"], s=20)
+                self.volume_strain_plot.line(self.volume_strain_ax, "volume_strain", plots["strain"],
+                                             plots["volume_strain"], **plotter_params["static_loading_main_line"])
+                self.volume_strain_plot.line(self.volume_strain_ax, "volume_strain_approximate", plots["strain"],
+                                             plots["volume_strain_approximate"],
+                                             **plotter_params["static_loading_red_dotted_line"])
+                self.volume_strain_plot.points(self.volume_strain_ax, "volume_strain_points",
+                                               zip(plots["strain"], plots["volume_strain"]), size=20, color="C0")
                 if plots["dilatancy"]:
-                    self.volume_strain_ax.plot(plots["dilatancy"]["x"], plots["dilatancy"]["y"],
-                                          **plotter_params["static_loading_black_dotted_line"])
+                    self.volume_strain_plot.line(self.volume_strain_ax, "dilatancy", plots["dilatancy"]["x"],
+                                                 plots["dilatancy"]["y"],
+                                                 **plotter_params["static_loading_black_dotted_line"])
 
                 self.volume_strain_ax.set_xlim([lim[0], xlim])
 
-                self.volume_strain_ax.plot([], [], label="Poissons ratio" + ", д.е. = " + str(res["poissons_ratio"]),
-                                      color="#eeeeee")
+                self.volume_strain_plot.label(self.volume_strain_ax, "poissons_ratio",
+                                              "Poissons ratio" + ", д.е. = " + str(res["poissons_ratio"]))
                 if res["dilatancy_angle"] is not None:
-                    self.volume_strain_ax.plot([], [],
-                                          label="Dilatancy angle" + ", град. = " + str(res["dilatancy_angle"][0]),
-                                          color="#eeeeee")
+                    self.volume_strain_plot.label(self.volume_strain_ax, "dilatancy_angle",
+                                                  "Dilatancy angle" + ", град. = " + str(res["dilatancy_angle"][0]))
 
                 # self.deviator_ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.75))
-                self.volume_strain_ax.legend()
+                self.volume_strain_plot.legend(self.volume_strain_ax)
 
-            self.deviator_canvas.draw()
-            self.volume_strain_canvas.draw()
+            self.deviator_plot.finish()
+            self.volume_strain_plot.finish()
 
         except:
             pass
@@ -196,17 +205,7 @@ class ModelShearDilatancyUI(QWidget):
 
             if ax.get_legend():
                 ax.get_legend().remove()
-            canvas.draw()
-
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
+            path = render_to_file(figure, size_figure, file_type)
             ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.75))
 
             canvas.draw()
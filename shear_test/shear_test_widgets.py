@@ -18,6 +18,7 @@ from excel_statment.functions import set_cell_data
 from general.reports import report_consolidation, report_FCE, report_Shear, report_Shear_Dilatancy, zap
 from shear_test.shear_dilatancy_widgets_UI import ModelShearItemUI, ModelShearFileOpenUI, ModelShearDilatancyUI
 from general.general_widgets import Slider
+from general.regeneration import ModelRegeneration, debounce_timer, finish_all
 from configs.styles import style
 from singletons import Shear_Dilatancy_models, Shear_models, statment
 from loggers.logger import app_logger, log_this, handler
@@ -111,6 +112,7 @@ class ShearProcessingWidget(QWidget):
 
     def _deviator_volumeter(self, button):
         """Передача значения выбранного волюмометра в модель"""
+        finish_all()
         if Shear_Dilatancy_models[statment.current_test].shear_dilatancy.check_none():
             Shear_Dilatancy_models[statment.current_test].shear_dilatancy.choise_volume_strain(button.text())
             self._cut_slider_deviator_set_val(Shear_Dilatancy_models[statment.current_test].shear_dilatancy.get_borders())
@@ -145,6 +147,7 @@ class ShearProcessingWidget(QWidget):
 
     def _cut_slider_deviator_moove(self):
         """Обработчик перемещения слайдера обрезки"""
+        finish_all()
         if Shear_Dilatancy_models[statment.current_test].check_none():
             if (int(self.deviator_loading.slider_cut.high()) - int(self.deviator_loading.slider_cut.low())) >= 50:
                 Shear_Dilatancy_models[statment.current_test].change_borders(int(self.deviator_loading.slider_cut.low()),
@@ -171,6 +174,9 @@ class Shear_Sliders(QWidget):
 
         self._activate = False
 
+        # Во время перемещения параметры отправляются после паузы в движении слайдера
+        self._debounce = debounce_timer(self, self._sliders_released)
+
         self._createUI("Настройки отрисовки", params)
 
     def _createUI(self, name, params):
@@ -208,6 +214,7 @@ class Shear_Sliders(QWidget):
                 box_layout.addLayout(line)
                 func = getattr(self, "_sliders_moove".format(name_widget=name, name_var=var))
                 slider.sliderMoved.connect(func)
+                slider.sliderMoved.connect(lambda value: self._debounce.start())
                 release = getattr(self, "_sliders_released".format(name_widget=name, name_var=var))
                 slider.sliderReleased.connect(release)
                 slider.setStyleSheet(style)
@@ -248,6 +255,7 @@ class Shear_Sliders(QWidget):
 
     def _sliders_released(self):
         """Обработка окончания перемещения слайдеров деформации"""
+        self._debounce.stop()
         if self._activate:
             params = self._get_slider_params(self._params)
             self._set_slider_labels_params(params)
@@ -292,8 +300,12 @@ class ShearDilatancySoilTestWidget(TabMixin, ShearProcessingWidget):
         self.deviator_loading.setFixedHeight(530+180)
         self.deviator_loading_sliders.signal[object].connect(self._deviator_loading_sliders_moove)
 
+        self.regeneration = ModelRegeneration(self)
+        self.regeneration.ready.connect(self._model_regenerated)
+
     def refresh(self):
         try:
+            self.regeneration.cancel(statment.current_test)
             Shear_Dilatancy_models[statment.current_test].set_test_params()
             self.deviator_loading_sliders.set_sliders_params(Shear_Dilatancy_models[statment.current_test].get_draw_params())
             self._plot_deviator_loading()
@@ -324,12 +336,18 @@ class ShearDilatancySoilTestWidget(TabMixin, ShearProcessingWidget):
     def _deviator_loading_sliders_moove(self, params):
         """Обработчик движения слайдера"""
         try:
-            Shear_Dilatancy_models[statment.current_test].set_draw_params(params)
+            self.regeneration.submit(statment.current_test, Shear_Dilatancy_models[statment.current_test],
+                                     "deviator_loading", lambda model: model.set_draw_params(params))
+        except KeyError:
+            pass
+
+    def _model_regenerated(self, key, model):
+        """Подстановка пересчитанной в фоновом потоке модели"""
+        Shear_Dilatancy_models[key] = model
+        if key == statment.current_test:
             self._plot_deviator_loading()
             self._connect_model_Ui()
             self.signal.emit(True)
-        except KeyError:
-            pass
 
 
 class ShearProcessingApp(QWidget):
@@ -506,6 +524,7 @@ class ShearSoilTestApp(AppMixin, QWidget):
                         message_port=7782, parent=self)
 
     def save_pickle(self):
+        finish_all()
         try:
             models = [model for model in [Shear_models] if len(model)]
 
@@ -520,15 +539,16 @@ class ShearSoilTestApp(AppMixin, QWidget):
 
             if ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_Dilatancy_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                         f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                                         f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif not ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_models.dump(os.path.join(statment.save_dir.save_directory,
-                                               f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                               f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
     def keyPressEvent(self, event):
+        finish_all()
         if statment.current_test:
             list = [x for x in statment]
             index = list.index(statment.current_test)
@@ -542,6 +562,7 @@ class ShearSoilTestApp(AppMixin, QWidget):
                     self.set_test_parameters(True)
 
     def set_test_parameters(self, params):
+        finish_all()
         if self.tab_1.shear_test_type_from_open_line() in [ShearStatment.SHEAR, ShearStatment.SHEAR_NATURAL,
                                                            ShearStatment.SHEAR_SATURATED,
                                                            ShearStatment.SHEAR_NN, ShearStatment.SHEAR_DD,
@@ -557,6 +578,7 @@ class ShearSoilTestApp(AppMixin, QWidget):
 
 
     def save_report(self, save_all_mode=False):
+        finish_all()
         try:
             assert statment.current_test, "Не выбран образец в ведомости"
             file_path_name = statment.getLaboratoryNumber().replace("/", "-").replace("*", "")
@@ -746,6 +768,7 @@ class ShearSoilTestApp(AppMixin, QWidget):
 
 
     def save_all_reports(self):
+        finish_all()
         if self.loader.is_running:
             QMessageBox.critical(self, "Ошибка", "Закройте окно сохранения")
             return
@@ -763,10 +786,10 @@ class ShearSoilTestApp(AppMixin, QWidget):
 
             if ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_Dilatancy_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif not ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
@@ -818,6 +841,7 @@ class ShearSoilTestApp(AppMixin, QWidget):
         SessionWriter.write_session(len(statment))
 
     def jornal(self):
+        finish_all()
         self.dialog = TestsLogWidget({"ЛИГА КЛ-1С": 23, "АСИС ГТ.2.0.5": 30}, TestsLogTriaxialStatic, self.tab_1.path)
         self.dialog.show()
 
@@ -857,10 +881,10 @@ class ShearSoilTestApp(AppMixin, QWidget):
 
             if ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_Dilatancy_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                         f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                                         f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif not ShearStatment.is_dilatancy_type(_test_mode):
                 Shear_models.dump(os.path.join(statment.save_dir.save_directory,
-                                               f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"))
+                                               f"{ShearStatment.models_name(ShearStatment.shear_type(self.tab_1._shear_type)).split('.')[0]}{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
@@ -0,0 +1,387 @@
+"""Хранилище моделей опытов с записью по лабораторным номерам.
+
+Файл хранилища - база SQLite с одной записью на опыт. Модель опыта сериализуется pickle,
+массивы numpy выносятся из pickle и хранятся отдельно сжатым архивом .npz. Для каждой записи
+хранится хеш содержимого, поэтому при сохранении переписываются только изменившиеся опыты.
+Результаты опытов (get_test_results) хранятся отдельно как индекс и читаются без загрузки моделей.
+
+При загрузке (LazyTests) читаются только лабораторные номера, модели загружаются при обращении,
+число моделей в памяти можно ограничить (max_loaded).
+
+Резервные копии хранятся как дельты: в копии записываются хеши всех опытов, а содержимое только
+тех опытов, которые изменились относительно предыдущей копии (parent). Недостающие опыты читаются
+по цепочке родительских копий.
+
+Файлы хранилища сохраняются по тем же путям, что и прежние pickle файлы моделей. Формат файла
+определяется по заголовку (см. is_model_store), прежние pickle файлы по-прежнему открываются Models.load.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+from collections.abc import ItemsView, ValuesView
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Массивы меньшего размера остаются внутри pickle
+MIN_ARRAY_SIZE = 64
+
+
+def is_model_store(path: str) -> bool:
+    """Является ли файл хранилищем моделей (иначе - pickle файл прежнего формата)"""
+    with open(path, "rb") as file:
+        return file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler, выносящий числовые массивы numpy в отдельный список"""
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = []
+
+    def persistent_id(self, obj):
+        if type(obj) is np.ndarray and obj.dtype.kind in "biufc" and obj.size >= MIN_ARRAY_SIZE:
+            self.arrays.append(obj)
+            return len(self.arrays) - 1
+        return None
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays):
+        super().__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+
+def pickle_model(model) -> Tuple[bytes, List[np.ndarray], str]:
+    """Сериализация модели. Возвращает pickle без больших массивов, список массивов и хеш содержимого"""
+    buffer = io.BytesIO()
+    pickler = _ArrayPickler(buffer)
+    pickler.dump(model)
+    data = buffer.getvalue()
+
+    digest = hashlib.sha1(data)
+    for array in pickler.arrays:
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(np.ascontiguousarray(array).data)
+
+    return data, pickler.arrays, digest.hexdigest()
+
+
+def pickle_results(model) -> Optional[bytes]:
+    """Результаты опыта для индекса хранилища. None, если модель не возвращает результаты"""
+    get_test_results = getattr(model, "get_test_results", None)
+    if get_test_results is None:
+        return None
+    try:
+        return pickle.dumps(get_test_results(), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+def pack_arrays(arrays: List[np.ndarray]) -> Optional[bytes]:
+    """Сжатый архив .npz массивов модели"""
+    if not arrays:
+        return None
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, *arrays)
+    return buffer.getvalue()
+
+
+def unpickle_model(data: bytes, packed_arrays: Optional[bytes]):
+    """Восстановление модели из записи хранилища"""
+    arrays = []
+    if packed_arrays:
+        with np.load(io.BytesIO(packed_arrays), allow_pickle=False) as npz:
+            arrays = [npz[f"arr_{i}"] for i in range(len(npz.files))]
+    return _ArrayUnpickler(io.BytesIO(data), arrays).load()
+
+
+class ModelStore:
+    """Файл хранилища моделей опытов
+
+    Таблица tests: name - лабораторный номер, position - порядок опытов, digest - хеш содержимого,
+    data и arrays - pickle модели и сжатые массивы (NULL в дельта-копии, если опыт не изменился
+    относительно родительской копии), results - pickle результатов опыта для индекса. Таблица meta: версия моделей и путь к родительской копии."""
+
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+        self._parent = None
+        if read_only:
+            # Файл должен существовать, запись запрещена
+            self._connection = sqlite3.connect(Path(path).absolute().as_uri() + "?mode=ro", uri=True,
+                                               check_same_thread=False)
+            return
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tests (name TEXT PRIMARY KEY, position INTEGER, digest TEXT,
+                                              data BLOB, arrays BLOB, results BLOB);
+        """)
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(tests)")]
+        if "results" not in columns:
+            self._connection.execute("ALTER TABLE tests ADD COLUMN results BLOB")
+
+    def close(self):
+        if self._parent:
+            self._parent.close()
+            self._parent = None
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]):
+        with self._connection:
+            if value is None:
+                self._connection.execute("DELETE FROM meta WHERE key = ?", (key,))
+            else:
+                self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.get_meta("version")
+
+    @property
+    def parent(self) -> Optional["ModelStore"]:
+        """Родительская копия дельта-копии"""
+        if self._parent is None:
+            parent = self.get_meta("parent")
+            if parent:
+                self._parent = ModelStore(os.path.normpath(os.path.join(os.path.dirname(self.path), parent)),
+                                          read_only=True)
+        return self._parent
+
+    def names(self) -> List[str]:
+        """Лабораторные номера опытов в порядке сохранения"""
+        return [row[0] for row in self._connection.execute("SELECT name FROM tests ORDER BY position")]
+
+    def digests(self) -> Dict[str, str]:
+        return dict(self._connection.execute("SELECT name, digest FROM tests"))
+
+    def read_record(self, name: str, digest: Optional[str] = None) -> Tuple[bytes, Optional[bytes]]:
+        """Сырая запись опыта (pickle и сжатые массивы). Для дельта-копии запись ищется в родительских копиях"""
+        row = self._connection.execute("SELECT digest, data, arrays FROM tests WHERE name = ?", (name,)).fetchone()
+        if row is None and digest is None:
+            raise KeyError(f"No test with key {name}")
+        if row is not None and row[1] is not None and (digest is None or row[0] == digest):
+            return row[1], row[2]
+        if self.parent is None:
+            raise KeyError(f"No data for test {name} in {self.path}")
+        return self.parent.read_record(name, digest or row[0])
+
+    def read(self, name: str):
+        """Модель опыта"""
+        return unpickle_model(*self.read_record(name))
+
+    def results(self) -> Dict[str, Optional[bytes]]:
+        """Индекс хранилища: pickle результатов опытов (get_test_results модели)"""
+        return dict(self._connection.execute("SELECT name, results FROM tests"))
+
+    def _put(self, name, digest, data, arrays, results):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO tests (name, digest, data, arrays, results) VALUES (?, ?, ?, ?, ?)",
+            (name, digest, data, arrays, results))
+
+    def write(self, models: Dict[str, object], order: Iterable[str], digests: Optional[Dict[str, str]] = None,
+              source: Optional["ModelStore"] = None):
+        """Запись опытов одной транзакцией.
+
+        :param models: модели, которые нужно сериализовать. Записываются только опыты, хеш которых отличается
+            от digests (по умолчанию - от хешей этого файла)
+        :param order: порядок всех опытов. Опыты, которых нет в order, удаляются
+        :param source: хранилище, из которого без десериализации копируются записи опытов из order,
+            которых нет в models и в этом файле
+        """
+        order = list(order)
+        stored = self.digests()
+        digests = stored if digests is None else digests
+
+        with self._connection:
+            for name, model in models.items():
+                data, arrays, digest = pickle_model(model)
+                if stored.get(name) == digest:
+                    continue
+                if digests.get(name) == digest:
+                    # Содержимое есть в родительской копии
+                    self._put(name, digest, None, None, pickle_results(model))
+                else:
+                    self._put(name, digest, data, pack_arrays(arrays), pickle_results(model))
+
+            if source is not None:
+                source_digests = source.digests()
+                for name in order:
+                    if name in models or name not in source_digests or stored.get(name) == source_digests[name]:
+                        continue
+                    results = source._connection.execute("SELECT results FROM tests WHERE name = ?",
+                                                         (name,)).fetchone()[0]
+                    if digests.get(name) == source_digests[name]:
+                        self._put(name, source_digests[name], None, None, results)
+                    else:
+                        self._put(name, source_digests[name], *source.read_record(name), results)
+
+            removed = set(stored) - set(order)
+            self._connection.executemany("DELETE FROM tests WHERE name = ?", [(name,) for name in removed])
+            self._connection.executemany("UPDATE tests SET position = ? WHERE name = ?",
+                                         [(i, name) for i, name in enumerate(order)])
+
+    def detach_parent(self):
+        """Перенос в файл записей, которые читаются из родительских копий. После этого копия самостоятельна"""
+        parent = self.parent
+        if parent is None:
+            return
+        rows = self._connection.execute("SELECT name, digest FROM tests WHERE data IS NULL").fetchall()
+        with self._connection:
+            for name, digest in rows:
+                data, arrays = parent.read_record(name, digest)
+                self._connection.execute("UPDATE tests SET data = ?, arrays = ? WHERE name = ?", (data, arrays, name))
+        self.set_meta("parent", None)
+        self._parent = None
+        parent.close()
+
+
+class _NotLoaded:
+    def __repr__(self):
+        return "<not loaded>"
+
+
+NOT_LOADED = _NotLoaded()
+
+
+class LazyTests(dict):
+    """Словарь моделей опытов {лабораторный номер: модель}, связанный с хранилищем.
+
+    Ключи известны сразу, модель читается из хранилища при первом обращении. Прочитанные и присвоенные
+    модели считаются возможно измененными и при сохранении проверяются по хешу (см. loaded).
+
+    Если задан max_loaded, в памяти остается не больше max_loaded последних прочитанных моделей:
+    давно прочитанные модели, совпадающие с хранилищем, выгружаются. Измененные модели не выгружаются
+    до сохранения."""
+
+    def __init__(self, store: ModelStore, loaded: Optional[Dict[str, object]] = None,
+                 max_loaded: Optional[int] = None):
+        loaded = loaded or {}
+        super().__init__((name, loaded.get(name, NOT_LOADED)) for name in store.names())
+        self.store = store
+        self.max_loaded = max_loaded
+        self._recent = OrderedDict((name, None) for name in loaded if name in self)
+        self._dirty = set()
+        self._digests = store.digests()
+        self._results = None
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is NOT_LOADED:
+            value = self.store.read(key)
+            dict.__setitem__(self, key, value)
+        self._touch(key)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._touch(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._recent.pop(key, None)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def copy(self):
+        return dict(self.items())
+
+    def is_loaded(self, key) -> bool:
+        return dict.__getitem__(self, key) is not NOT_LOADED
+
+    def loaded(self) -> Dict[str, object]:
+        """Модели, прочитанные из хранилища или присвоенные"""
+        return {key: value for key, value in dict.items(self) if value is not NOT_LOADED}
+
+    def results(self, key) -> Optional[dict]:
+        """Результаты опыта из индекса хранилища. Актуальны, пока модель не прочитана (см. is_loaded)"""
+        if self._results is None:
+            self._results = self.store.results()
+        results = self._results.get(key)
+        return pickle.loads(results) if results is not None else None
+
+    def saved(self):
+        """Сброс состояния после записи моделей в хранилище"""
+        self._digests = self.store.digests()
+        self._dirty.clear()
+        self._results = None
+
+    def _touch(self, key):
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        if self.max_loaded is not None and len(self._recent) > self.max_loaded:
+            self._evict()
+
+    def _evict(self):
+        """Выгрузка давно прочитанных моделей, которые не изменились относительно хранилища"""
+        for key in list(self._recent)[:-1]:
+            if len(self._recent) <= self.max_loaded:
+                break
+            if key in self._dirty:
+                continue
+            if pickle_model(dict.__getitem__(self, key))[2] != self._digests.get(key):
+                self._dirty.add(key)
+                continue
+            dict.__setitem__(self, key, NOT_LOADED)
+            del self._recent[key]
+
+    def __reduce__(self):
+        # Копия в процессах и pickle файлах - обычный словарь со всеми моделями
+        return dict, (self.copy(),)
+
+
+def open_store(path: str, version: str, parent: Optional[str] = None) -> ModelStore:
+    """Создание нового файла хранилища (прежний файл по пути path заменяется)
+
+    :param parent: путь к родительской копии для дельта-копии"""
+    if os.path.exists(path):
+        os.remove(path)
+    store = ModelStore(path)
+    store.set_meta("version", version)
+    if parent:
+        store.set_meta("parent", os.path.relpath(parent, os.path.dirname(os.path.abspath(path))))
+    return store
+
+
+def detach_stores(directory: str):
+    """Перевод всех дельта-копий в папке directory (с подпапками) в самостоятельные.
+    Выполняется перед удалением родительской копии"""
+    for root, _, files in os.walk(directory):
+        for file in files:
+            path = os.path.join(root, file)
+            if is_model_store(path):
+                store = ModelStore(path)
+                try:
+                    store.detach_parent()
+                finally:
+                    store.close()
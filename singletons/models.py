@@ -3,11 +3,58 @@ from descriptors import DataTypeValidation
 from loggers.logger import app_logger, log_this
 import pickle
 import os
+import random
+import secrets
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from singletons.model_store import ModelStore, LazyTests, is_model_store, open_store
 from version_control.configs import actual_version
 __version__ = actual_version
 
 instances = {}
 
+
+def test_seed(test_name: str, seed: int = 0) -> int:
+    """Зерно генератора случайных чисел для опыта. Зависит только от лабораторного номера и seed,
+    поэтому не меняется от числа процессов и порядка генерации"""
+    return zlib.crc32(f"{seed}:{test_name}".encode("utf-8"))
+
+
+def _generate_test(model_class, test_name, properties=None, generate=True, seed=None, related_models=None):
+    """Создание модели опыта test_name. В процессе генерации свойства опыта передаются в properties,
+    а модели этого опыта из других синглтонов, от которых зависит генерация, в related_models"""
+    if properties is not None:
+        statment.tests[test_name] = properties
+    for name, model in (related_models or {}).items():
+        globals()[name].tests[test_name] = model
+    statment.current_test = test_name
+
+    if seed is not None:
+        np.random.seed(test_seed(test_name, seed))
+        random.seed(test_seed(test_name, seed))
+
+    model = model_class()
+    if generate:
+        model.set_test_params()
+    return model
+
+
+def _generate_test_in_worker(model_class, test_name, properties, seed, related_models):
+    """Генерация опыта в процессе. Вместе с моделью возвращаются свойства опыта, так как генерация
+    может их менять (например, CyclicVibrationStrangthMohr записывает в ведомость u, sigma_d и step)"""
+    model = _generate_test(model_class, test_name, properties, True, seed, related_models)
+    return model, statment.tests[test_name]
+
+
+def _init_generation_worker(statment_state):
+    """Инициализация процесса генерации: копия ведомости без опытов"""
+    statment.__dict__.update(statment_state)
+    statment.tests = {}
+
 def singleton(aClass):
     instance = None
     def onCall(*args, **kwargs):
@@ -21,37 +68,134 @@ def singleton(aClass):
 class Models:
     tests = DataTypeValidation(dict)
     model_class = None
+    _store = None
+    # Зерно генерации моделей (см. generateTests)
+    seed = None
+    # Число моделей из хранилища, которые одновременно держатся в памяти (None - без ограничения)
+    max_loaded_tests = None
 
     def __init__(self):
+        self._close_store()
         self.tests = {}
         self.model_class = None
+        self.seed = None
         self.version = "{:.2f}".format(__version__)
 
     def setModelType(self, model):
         self.model_class = model
 
-    def generateTests(self, generate=True):
+    def generateTests(self, generate=True, parallel=False, max_workers=None, seed=None, related_models=None):
+        """Генерация моделей всех опытов ведомости
+
+        :param generate: моделировать опыты (set_test_params), иначе создаются пустые модели
+        :param parallel: генерация в нескольких процессах
+        :param max_workers: число процессов, по умолчанию по числу ядер
+        :param seed: зерно генерации. Генератор каждого опыта инициализируется по лабораторному номеру и seed,
+            поэтому результат не зависит от числа процессов. По умолчанию для каждой генерации выбирается
+            новое случайное зерно. Зерно сохраняется в self.seed и в файле моделей (dump)
+        :param related_models: {имя синглтона в singletons.models: синглтон} - модели, которые читаются
+            при генерации (например, E_models для FC_models). В параллельном режиме передаются в процессы
+        """
+        if seed is None:
+            seed = secrets.randbits(32)
+        self.seed = seed
+
+        if parallel and generate and len(statment) > 1:
+            try:
+                self._generate_tests_parallel(max_workers, seed, related_models or {})
+                return
+            except BrokenProcessPool:
+                app_logger.exception("Ошибка параллельной генерации опытов, выполняется последовательная генерация")
+
         for test_name in statment:
             try:
-                statment.current_test = test_name
-                self.tests[test_name] = self.model_class()
-                if generate:
-                    self.tests[test_name].set_test_params()
+                self.tests[test_name] = _generate_test(self.model_class, test_name, generate=generate, seed=seed)
             except:
                 app_logger.exception(f"Ошибка моделирования опыта {test_name}")
                 break
 
-    def dump(self, path):
-        with open(path, "wb") as file:
-            pickle.dump(
-                {
-                    "tests": self.tests,
-                    "version": self.version
-                },
-                file
-            )
+    def _generate_tests_parallel(self, max_workers, seed, related_models):
+        """Генерация опытов в процессах. Модели и измененные при генерации свойства опытов возвращаются
+        в порядке ведомости, при ошибке опыта генерация следующих опытов отменяется, как в последовательном режиме"""
+        statment_state = {key: value for key, value in statment.__dict__.items() if key != "tests"}
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_generation_worker,
+                                 initargs=(statment_state,)) as executor:
+            futures = [(test_name, executor.submit(_generate_test_in_worker, self.model_class, test_name,
+                                                   statment[test_name], seed,
+                                                   {name: models[test_name] for name, models in related_models.items()}))
+                       for test_name in statment]
+            for i, (test_name, future) in enumerate(futures):
+                try:
+                    self.tests[test_name], statment.tests[test_name] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except:
+                    app_logger.exception(f"Ошибка моделирования опыта {test_name}")
+                    for _, other in futures[i + 1:]:
+                        other.cancel()
+                    break
+                statment.current_test = test_name
+
+    def dump(self, path, parent=None, attach=False):
+        """Сохранение моделей в хранилище (см. singletons.model_store)
+
+        При повторном сохранении в файл, из которого загружены модели, переписываются только измененные опыты.
+
+        :param path: путь к файлу
+        :param parent: путь к файлу предыдущей резервной копии. Если задан, сохраняется дельта-копия:
+            записываются только опыты, изменившиеся относительно parent
+        :param attach: основное сохранение моделей объекта - если модели еще не связаны с хранилищем,
+            они связываются с сохраненным файлом, и следующие сохранения в него переписывают только
+            измененные опыты. Резервные копии сохраняются без attach, так как они удаляются
+        """
+        tests = self.tests
+        lazy = isinstance(tests, LazyTests) and tests.store is self._store
+
+        if lazy and parent is None and os.path.abspath(self._store.path) == os.path.abspath(path):
+            self._store.write(tests.loaded(), order=list(tests))
+            tests.saved()
+            return
+
+        temp_path = path + ".tmp"
+        store = open_store(temp_path, self.version, parent=parent)
+        try:
+            if self.seed is not None:
+                store.set_meta("seed", str(self.seed))
+            models = tests.loaded() if lazy else tests
+            store.write(models, order=list(tests), digests=store.parent.digests() if parent else None,
+                        source=self._store if lazy else None)
+        finally:
+            store.close()
+
+        if self._store is not None and os.path.abspath(self._store.path) == os.path.abspath(path):
+            self._close_store()
+        os.replace(temp_path, path)
+
+        if attach and self._store is None and parent is None:
+            self._attach_store(ModelStore(path), loaded=models)
 
     def load(self, path):
+        """Загрузка моделей. Модели из хранилища читаются при первом обращении к опыту,
+        файлы прежнего формата (pickle) читаются целиком"""
+        if is_model_store(path):
+            store = ModelStore(path)
+            try:
+                assert store.version, \
+                    f"Несовпадение версии модели и программы. Программа: {self.version}, модель: неизвестно"
+                assert self.version == store.version, \
+                    f"Несовпадение версии модели и программы. Программа: {self.version}, модель: {store.version}"
+                assert store.names(), \
+                    f"Несовпадение версии модели и программы. Программа: {self.version}, модель: неизвестно"
+            except AssertionError:
+                store.close()
+                raise
+            self._close_store()
+            self._attach_store(store)
+            seed = store.get_meta("seed")
+            self.seed = int(seed) if seed is not None else None
+            return
+
         with open(path, 'rb') as f:
             data = pickle.load(f)
             assert data.get("version", None), \
@@ -60,7 +204,27 @@ class Models:
                 f"Несовпадение версии модели и программы. Программа: {self.version}, модель: {data['version']}"
             assert data.get("tests", None), \
                 f"Несовпадение версии модели и программы. Программа: {self.version}, модель: неизвестно"
+            self._close_store()
             self.tests = data["tests"]
+            self.seed = data.get("seed", None)
+
+    def _attach_store(self, store, loaded=None):
+        self._store = store
+        self.tests = LazyTests(store, loaded=loaded, max_loaded=self.max_loaded_tests)
+
+    def _close_store(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def get_test_results(self, key):
+        """Результаты опыта. Для модели из хранилища, которая еще не прочитана, результаты берутся
+        из индекса хранилища без чтения модели"""
+        if isinstance(self.tests, LazyTests) and key in self.tests and not self.tests.is_loaded(key):
+            results = self.tests.results(key)
+            if results is not None:
+                return results
+        return self[key].get_test_results()
 
     def __iter__(self):
         for key in self.tests:
@@ -69,10 +233,13 @@ class Models:
     def __getitem__(self, key):
         if key is None:
             raise KeyError(f"No test with key None")
-        elif not key in list(self.tests.keys()):
+        elif key not in self.tests:
             raise KeyError(f"No test with key {key}")
         return self.tests[key]
 
+    def __setitem__(self, key, value):
+        self.tests[key] = value
+
     def __len__(self):
         return len(self.tests)
 
@@ -95,7 +262,7 @@ class ModelsVibrationFC(Models):
 
 @singleton
 class ModelsVibrationCreep(Models):
-    pass
+    max_loaded_tests = 10
 
 @singleton
 class ModelsRC(Models):
@@ -103,7 +270,7 @@ class ModelsRC(Models):
 
 @singleton
 class ModelsCyclic(Models):
-    pass
+    max_loaded_tests = 10
 
 @singleton
 class ModelsConsolidation(Models):
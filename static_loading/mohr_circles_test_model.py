@@ -18,10 +18,12 @@ import numpy as np
 import copy
 import os
 import matplotlib.pyplot as plt
-from typing import List
+from typing import List, Optional
 from scipy.optimize import fsolve, curve_fit
 from scipy.optimize import differential_evolution
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from scipy.optimize import Bounds, minimize
 
 from static_loading.triaxial_static_loading_test_model import ModelTriaxialStaticLoad, ModelTriaxialStaticLoadSoilTest
 from general.general_functions import sigmoida, make_increas, line_approximate, line, define_poissons_ratio, mirrow_element, \
@@ -719,94 +721,141 @@ class ModelMohrCirclesSoilTest(ModelMohrCircles):
         return np.round(qf_with_noise, 1)
 
     @staticmethod
-    def new_noise_for_mohrs_circles(sigma3: list, sigma1: list, fi: float, c: float, loops: int = 0) -> list:
+    def new_noise_for_mohrs_circles(sigma3: list, sigma1: list, fi: float, c: float, starts: int = 1,
+                                    max_workers: Optional[int] = None) -> list:
         """ Генерация шума для кругов мора
         Аргументы:
             :param sigma3: массив sigma3 для количества кругов > 2
             :param sigma1: массив sigma1 для количества кругов > 2
             :param fi: угол внутреннего трения
             :param c: сцепление
-            :param loops: число самозацикливаний
-            :return: значение девиатора с шумом"""
+            :param starts: число случайных смещений, подбор для которых выполняется одновременно
+            :param max_workers: число потоков подбора при starts > 1
+            :return: значение девиатора с шумом
+
+        Если ошибка подбора больше MOHR_NOISE_ERROR или круги получились ошибочными, генерируется новый шум
+        (всего не более MOHR_NOISE_ATTEMPTS попыток). Из одновременно рассчитанных вариантов выбирается первый
+        подходящий в порядке генерации, поэтому результат не зависит от числа потоков"""
 
         '''fi - в градусах, так что
         tan(np.deg2rad(fi)) - тангенс угла наклона касательной'''
         fi = np.tan(np.deg2rad(fi))
+        sigma3 = np.asarray(sigma3, dtype=float)
+        sigma1 = np.asarray(sigma1, dtype=float)
 
         fixed_circle_index = 1  # circles_pos[np.random.randint(0, 1)]  # np.random.randint(0, len(sigma1) - 1)
 
-        # генерируем случайной значение
-        a = np.random.uniform(np.min(sigma1 - sigma3) / 5, np.min(sigma1 - sigma3) / 4) / 2
-
-        # создаем копию массива для зашумленных значений
-        sigma1_with_noise = copy.deepcopy(sigma1)
-
-        # добавляем шум к зафиксированной окружности
-        if np.random.randint(0, 2) == 0:
-            sigma1_with_noise[fixed_circle_index] -= a
+        problem = MohrNoiseProblem(sigma3, sigma1, fixed_circle_index, fi, c)
+
+        def noises(count):
+            """Случайные смещения зафиксированной окружности"""
+            result = []
+            for _ in range(count):
+                a = np.random.uniform(np.min(sigma1 - sigma3) / 5, np.min(sigma1 - sigma3) / 4) / 2
+                result.append(-a if np.random.randint(0, 2) == 0 else a)
+            return result
+
+        error = None
+        loops = 0
+        while loops < MOHR_NOISE_ATTEMPTS:
+            count = min(max(starts, 1), MOHR_NOISE_ATTEMPTS - loops)
+            if count > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    candidates = list(executor.map(problem.solve, noises(count)))
+            else:
+                candidates = [problem.solve(noise) for noise in noises(count)]
+            loops += count
 
-        else:
-            sigma1_with_noise[fixed_circle_index] += a
+            for qf_with_noise, fun in candidates:
+                error = problem.check(qf_with_noise)
+                if error is None and fun <= MOHR_NOISE_ERROR:
+                    return np.round(qf_with_noise, 1)
 
-        def func(x):
-            """x - массив sigma_1 без зафиксированной окружности"""
-            # возвращаем зафиксированную огружность для подачи в фукнцию mohr_cf_stab
-            x = np.insert(x, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
-            # определяем новые фи и с для измененной окружности
-            c_new, fi_new = ModelMohrCirclesSoilTest.mohr_cf_stab(sigma3, x)
-            # критерий минимизации - ошибка между fi и c для несмещенных кругов
-            return abs(abs(c_new - c) + abs(100 * (fi_new - fi)))
+        # Подходящий шум не найден - как и ранее, возвращается последний вариант, если круги не ошибочные
+        if error is not None:
+            raise error
+        return np.round(qf_with_noise, 1)
 
-        initial = np.delete(sigma1_with_noise, fixed_circle_index)
-        from scipy.optimize import Bounds, minimize
-        bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
 
-        def constrains(x):
-            """
-            Функция ограничений на икс, должна подаваться в cons.
-            Должна представлять собой массивы ограничений вида x1 - x2 >= 0
-            """
+# Допустимая ошибка подбора c и fi при генерации шума кругов мора и число попыток генерации
+MOHR_NOISE_ERROR = 5
+MOHR_NOISE_ATTEMPTS = 101
 
-            # икс для фукнции оптимизации это два круга, поэтому возвращаем в икс убранный круг
-            x = np.insert(x, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
 
-            # первое ограничение - каждая последующая сигма не меньше предыдущей
-            first = np.array([x[i + 1] - x[i] for i in range(len(x) - 1)])
+class MohrNoiseProblem:
+    """Подбор sigma_1 кругов мора при смещенной окружности fixed так, чтобы c и fi по кругам совпали с заданными.
 
-            # замыкаем последний на первый на всякий случай
-            second = np.array([x[-1] - x[0]])
+    c и fi определяются по линейной регрессии sigma_1 = k * sigma_3 + b (mohr_cf_stab): k и b - линейные функции
+    sigma_1 с весами w и v, поэтому градиент ошибки считается аналитически. Ограничения линейные и задаются
+    постоянной матрицей"""
 
-            # здесь считаем тау - каждый следующий тау не меньше предыдущего (- погреность)
-            EPS = 1
-            third = np.array([(x[i + 1] - sigma3[i+1])/2 - (x[i] - sigma3[i])/2 - EPS for i in range(len(x) - 1)])
+    # Минимальное приращение тау между соседними кругами
+    EPS = 1
 
-            res = np.hstack((first, second, third))
-            return res
+    def __init__(self, sigma3: np.ndarray, sigma1: np.ndarray, fixed: int, fi: float, c: float):
+        self.sigma3 = sigma3
+        self.sigma1 = sigma1
+        self.fixed = fixed
+        self.fi = fi
+        self.c = c
 
+        n = len(sigma3)
+        self.free = np.arange(n) != fixed
+        denominator = n * np.sum(sigma3 ** 2) - np.sum(sigma3) ** 2
+        self.w = (n * sigma3 - np.sum(sigma3)) / denominator
+        self.v = (np.sum(sigma3 ** 2) - sigma3 * np.sum(sigma3)) / denominator
+
+        # Ограничения A @ sigma_1 + b >= 0: sigma_1 не убывают, последний круг не меньше первого,
+        # тау каждого следующего круга не меньше предыдущего плюс EPS
+        difference = np.diff(np.eye(n), axis=0)
+        self.A = np.vstack((difference, np.eye(n)[-1] - np.eye(n)[0], difference / 2))
+        self.b = np.concatenate((np.zeros(n), -np.diff(sigma3) / 2 - MohrNoiseProblem.EPS))
+
+    def error(self, sigma1: np.ndarray) -> float:
+        """Ошибка подбора: отклонение c плюс 100 отклонений tg(fi) по кругам sigma1"""
+        k, b = self.w @ sigma1, self.v @ sigma1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return abs(b / (2 * np.sqrt(k)) - self.c) + abs(100 * ((k - 1) / (2 * np.sqrt(k)) - self.fi))
+
+    def gradient(self, sigma1: np.ndarray) -> np.ndarray:
+        """Градиент ошибки подбора по sigma1"""
+        k, b = self.w @ sigma1, self.v @ sigma1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            root = np.sqrt(k)
+            d_c = self.v / (2 * root) - b / (4 * k * root) * self.w
+            d_fi = (1 / (4 * root) + 1 / (4 * k * root)) * self.w
+            return np.sign(b / (2 * root) - self.c) * d_c + 100 * np.sign((k - 1) / (2 * root) - self.fi) * d_fi
+
+    def solve(self, noise: float):
+        """Подбор при смещении зафиксированной окружности на noise. Возвращает девиаторы и ошибку подбора"""
+        sigma1 = self.sigma1.copy()
+        sigma1[self.fixed] += noise
+        free = self.free
+
+        def full(x):
+            sigma1[free] = x
+            return sigma1
+
+        A = self.A[:, free]
+        b = self.b + self.A[:, self.fixed] * sigma1[self.fixed]
         cons = {'type': 'ineq',
-                'fun': constrains}
-
-        res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-9})
-        # res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds,
-        #                options={'ftol': 1e-9, 'maxiter': 50}) # отбойник на 50
-        error = res.fun
-        res = res.x
-        sigma1_with_noise = np.insert(res, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
+                'fun': lambda x: A @ x + b,
+                'jac': lambda x: A}
+        bnds = Bounds(np.zeros(len(sigma1) - 1), np.full(len(sigma1) - 1, np.inf))
 
-        qf_with_noise = sigma1_with_noise - sigma3
+        res = minimize(lambda x: self.error(full(x)), sigma1[free], jac=lambda x: self.gradient(full(x))[free],
+                       method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-9})
+        full(res.x)
+        return sigma1 - self.sigma3, res.fun
 
+    def check(self, qf_with_noise: np.ndarray) -> Optional[Exception]:
+        """Ошибка, если круги получились ошибочными"""
         if np.any(qf_with_noise[1:] < qf_with_noise[:-1]):
-            raise RuntimeWarning(f"Круги имеют ошибочные размеры : tau : {qf_with_noise / 2}")
-
-        assert sum([abs(sigma1[i] - sigma1_with_noise[i]) < 10 ** (-1) for i in range(len(sigma1))]) < 2, \
-            "Два круга не зашумлены!"
-
-        if error > 5 and loops < 100:
-            print(f'looping with error = {error}')
-            loops = loops + 1
-            qf_with_noise = ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles(sigma3, sigma1, np.rad2deg(np.arctan(fi)), c, loops)
+            return RuntimeWarning(f"Круги имеют ошибочные размеры : tau : {qf_with_noise / 2}")
+        if np.sum(np.abs(self.sigma1 - (qf_with_noise + self.sigma3)) < 10 ** (-1)) >= 2:
+            return AssertionError("Два круга не зашумлены!")
+        return None
 
-        return np.round(qf_with_noise, 1)
 
 if __name__ == '__main__':
 
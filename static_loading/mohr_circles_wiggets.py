@@ -21,6 +21,7 @@ from static_loading.triaxial_static_widgets_UI import ModelTriaxialItemUI
 from configs.styles import style
 from general.initial_tables import Table
 from general.general_widgets import Float_Slider
+from general.regeneration import ModelRegeneration, finish_all
 from configs.plot_params import plotter_params
 from general.general_functions import read_json_file, AttrDict
 from singletons import FC_models, VibrationFC_models, E_models, statment
@@ -230,6 +231,7 @@ class MohrWidget(QWidget):
         self.box_graph.setFixedHeight(int(w / 3))"""
 
     def _add_test(self):
+        finish_all()
         path = QFileDialog.getOpenFileName(self, 'Open file')[0]
         if path:
             try:
@@ -244,6 +246,7 @@ class MohrWidget(QWidget):
 
     def _dell_test(self):
         """Удаление опыта"""
+        finish_all()
         parent = self.sender().parent()
         test_id = int(parent.title()[-1])
 
@@ -299,6 +302,7 @@ class MohrWidget(QWidget):
 
     def _processing_test(self):
         """Вызов окна обработки опыта"""
+        finish_all()
         parent = self.sender().parent()
         test_id = int(parent.title()[-1])
 
@@ -864,6 +868,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
         self.reference_pressure_array_box_layout.addStretch(-1)"""
 
     def add_test(self, path):
+        finish_all()
         if self._model == "FC_models":
             FC_models[statment.current_test].add_test(path)
         else:
@@ -914,6 +919,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
             print(r)
 
     def _m_sliders_moove(self, param):
+        finish_all()
         try:
             statment[statment.current_test].mechanical_properties.m = param["m"]
             FC_models[statment.current_test].set_test_params()
@@ -922,6 +928,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
             pass
 
     def _k_sliders_moove(self, param):
+        finish_all()
         try:
             statment[statment.current_test].mechanical_properties.Kcu = param["Kcu"]
             VibrationFC_models[statment.current_test].set_test_params()
@@ -931,6 +938,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
 
     #@log_this(app_logger, "debug")
     def refresh(self):
+        finish_all()
         try:
             if self._model == "FC_models":
                 FC_models[statment.current_test].set_test_params()
@@ -941,6 +949,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
             pass
 
     def clear(self):
+        finish_all()
 
         if self._model == "FC_models":
             FC_models[statment.current_test]._tests = []
@@ -955,6 +964,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
 
     def _processing_test(self):
         """Вызов окна обработки опыта"""
+        finish_all()
         parent = self.sender().parent()
         test_id = int(parent.title()[-1])
 
@@ -971,6 +981,7 @@ class MohrWidgetSoilTest(TabMixin, MohrWidget):
             self._plot()
 
     def _on_split_radio_clicked(self, is_split_deviator):
+        finish_all()
         self.is_split_deviator = is_split_deviator
         FC_models[statment.current_test].is_split_deviator = self.is_split_deviator
         self._plot()
@@ -1169,6 +1180,7 @@ class MWidgetUI(QGroupBox):
         self.layout.addWidget(self.frame)
 
     def _choose_m_type(self, object):
+        finish_all()
         if self.chose_processing_type_group.id(object) == -2:
             FC_models[statment.current_test].set_m_type("plaxis")
         else:
@@ -1636,6 +1648,9 @@ class GeneralSlider(QWidget):
 
         self.general_sliders.setFixedHeight(280)
 
+        self.regeneration = ModelRegeneration(self)
+        self.regeneration.ready.connect(self._model_regenerated)
+
         self.layout = QVBoxLayout(self)
 
         self.layout.addWidget(self.general_sliders)
@@ -1644,32 +1659,41 @@ class GeneralSlider(QWidget):
         self.general_sliders.set_sliders_params(self.params)
 
     def _general_sliders_moove(self, params):
-        """Обработчик движения слайдера"""
+        """Обработчик движения слайдера. Параметры опытов умножаются на значения слайдеров,
+        пересчет выполняется в фоновом потоке, слайдеры возвращаются в исходное положение"""
         try:
-            params_modified = {}
+            # Изменение относительное, поэтому запросы не заменяют друг друга
+            self.regeneration.submit(statment.current_test, FC_models[statment.current_test], None,
+                                     lambda model: self._set_relative_params(model, params))
+            self.set_initial_general_sliders_params()
+        except Exception as err:
+            print(err)
 
-            for i in range(len(FC_models[statment.current_test]._tests)):
-                original = FC_models[statment.current_test]._tests[i].deviator_loading.get_draw_params()
-                for param in params:
-                    if original[param]["value"] is not None and (params[param] < 0.98 or params[param] > 1.02):
-                        value = original[param]["value"] * params[param]
-                        if value < original[param]["borders"][0]:
-                            params_modified[param] = original[param]["borders"][0]
-                        elif value > original[param]["borders"][1]:
-                            params_modified[param] = original[param]["borders"][1]
-                        else:
-                            params_modified[param] = original[param]["value"] * params[param]
+    @staticmethod
+    def _set_relative_params(model, params):
+        for test in model._tests:
+            params_modified = {}
+            original = test.deviator_loading.get_draw_params()
+            for param in params:
+                if original[param]["value"] is not None and (params[param] < 0.98 or params[param] > 1.02):
+                    value = original[param]["value"] * params[param]
+                    if value < original[param]["borders"][0]:
+                        params_modified[param] = original[param]["borders"][0]
+                    elif value > original[param]["borders"][1]:
+                        params_modified[param] = original[param]["borders"][1]
                     else:
-                        params_modified[param] = original[param]["value"]
+                        params_modified[param] = original[param]["value"] * params[param]
+                else:
+                    params_modified[param] = original[param]["value"]
 
-                FC_models[statment.current_test]._tests[i].set_deviator_loading_draw_params(params_modified)
+            test.set_deviator_loading_draw_params(params_modified)
 
-            self.set_initial_general_sliders_params()
+    def _model_regenerated(self, key, model):
+        """Подстановка пересчитанной в фоновом потоке модели"""
+        FC_models[key] = model
+        if key == statment.current_test:
             self.signal.emit(True)
 
-        except Exception as err:
-            print(err)
-
 
 if __name__ == '__main__':
     import sys
@@ -2,6 +2,7 @@ import numpy as np
 import pickle
 import os
 import scipy.ndimage as ndimage
+from general.curve_averaging import sector_average, sorted_union
 from singletons import E_models, FC_models, statment
 
 class AveragedModel:
@@ -72,8 +73,39 @@ class AveragedModel:
 
         self.averaged_E50, self.averaged_qf = AveragedModel.define_E50_qf(self.averaged_strain, self.averaged_deviator)
 
+    def __getstate__(self):
+        # Объединение точек опытов не сохраняется, оно строится заново при первом расчете
+        state = dict(self.__dict__)
+        state.pop("_points", None)
+        return state
+
     def approximate_average(self, type="poly", param=8) -> (np.array, np.array):
-        points = []
+        strain, deviator = self.sorted_points()
+
+        if type == "sectors":
+            averange_strain, averange_deviator = sector_average(strain, deviator, param)
+
+            averange_deviator = ndimage.gaussian_filter(averange_deviator, 3, order=0)
+            averange_deviator[0] = 0
+
+            return averange_strain, averange_deviator
+
+        elif type == "poly":
+            averange_strain = np.linspace(0, strain[-1], 50)
+            averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
+            averange_deviator[0] = 0
+
+            return averange_strain, averange_deviator
+
+    def sorted_points(self) -> (np.array, np.array):
+        """Точки всех опытов, отсортированные по деформации.
+        Зависят только от опытов, поэтому при смене типа и параметра аппроксимации берутся готовыми"""
+        points = getattr(self, "_points", None)
+        if points is not None:
+            return points
+
+        strains = []
+        deviators = []
 
         max_strain = max([max(self.tests[test]["strain"]) for test in self.tests])
 
@@ -87,43 +119,11 @@ class AveragedModel:
                 strain_for_sum = self.tests[test]["strain"]
                 deviator_for_sum = self.tests[test]["deviator"]
 
-            for point in zip(strain_for_sum, deviator_for_sum):
-                points.append(point)
-
-        points.sort(key=lambda point: point[0])
-
-        strain = [point[0] for point in points]
-        deviator = [point[1] for point in points]
-
-        if type == "sectors":
-            step = max(strain) / param
-            step_points = {}
-            for i in range(len(strain)):
-                step_x = strain[i] // step
-                step_key = step_x * step
-                if step_points.get(step_key, None):
-                    step_points[step_key].append(deviator[i])
-                else:
-                    step_points[step_key] = [deviator[i]]
-
-            averange_strain = [0]
-            averange_deviator = [0]
-            for key in step_points.keys():
-                if len(step_points[key]):
-                    averange_strain.append(key)
-                    averange_deviator.append(sum(step_points[key]) / len(step_points[key]))
-
-            averange_deviator = ndimage.gaussian_filter(np.array(averange_deviator), 3, order=0)
-            averange_deviator[0] = 0
-
-            return np.array(averange_strain), np.array(averange_deviator)
-
-        elif type == "poly":
-            averange_strain = np.linspace(0, max(strain), 50)
-            averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
-            averange_deviator[0] = 0
+            strains.append(strain_for_sum)
+            deviators.append(deviator_for_sum)
 
-            return np.array(averange_strain), np.array(averange_deviator)
+        self._points = sorted_union(strains, deviators)
+        return self._points
 
     def set_approximate_type(self, approximate_type, approximate_param) -> None:
         self.approximate_type = approximate_type
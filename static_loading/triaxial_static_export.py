@@ -0,0 +1,252 @@
+"""Сохранение протоколов трехосного сжатия (E) в пакетном режиме (см. general.batch_export)"""
+import os
+import shutil
+
+from authentication.control import control
+from authentication.request_qr import request_qr
+from excel_statment.position_configs import c_fi_E_PropertyPosition
+from general.reports import report_E, zap
+from singletons import E_models, FC_models, statment
+from static_loading.triaxial_static_widgets_UI import ModelTriaxialDeviatorLoadingFigures, \
+    ModelTriaxialConsolidationFigures
+
+# Режимы, протоколы которых сохраняются задачей save_E_report_job: постфикс имени протокола и размеры графиков
+E_REPORT_MODES = {
+    "Трёхосное сжатие (E)": (" ТС", [[6, 2], [6, 2]]),
+    "Трёхосное сжатие с разгрузкой": (" ТС Р", [[6, 4], [6, 2]]),
+    "Трёхосное сжатие с разгрузкой (plaxis)": (" ТС Р (plaxis)", [[6, 4], [6, 2]]),
+}
+
+
+# Обозначение вида испытания в строке режима протокола, для остальных режимов - КД
+MODE_NAMES = {
+    "Трёхосное сжатие КН": "KH",
+    "Трёхосное сжатие НН": "НН",
+}
+
+WATERFILL_DESCRIPTIONS = {
+    "Водонасыщенное состояние": "в водонасыщенном состоянии",
+    "Природная влажность": "при природной влажности",
+}
+
+
+def mode_description(test_mode: str, waterfill: str) -> str:
+    """Строка режима испытания для протокола"""
+    return MODE_NAMES.get(test_mode, "КД") + ", девиаторное нагружение в кинематическом режиме " + \
+           WATERFILL_DESCRIPTIONS.get(waterfill, "")
+
+
+def define_test_parameter(test: str, K0_mode: str, reference_pressure_array: str) -> dict:
+    """Параметры испытания для протокола
+
+    :param K0_mode: режим определения K0 из строки открытия ведомости
+    :param reference_pressure_array: выбранный массив обжимающих давлений"""
+    d, h = statment[test].physical_properties.sample_size
+
+    test_parameter = {"equipment": statment.general_parameters.equipment,
+                      "mode": mode_description(statment.general_parameters.test_mode,
+                                               getattr(statment.general_parameters, "waterfill", None)),
+                      "sigma_3": statment[test].mechanical_properties.sigma_3,
+                      "K0": [statment[test].mechanical_properties.K0,
+                             "-" if reference_pressure_array in ["set_by_user", "state_standard"]
+                             else statment[test].mechanical_properties.K0],
+                      "h": h,
+                      "d": d}
+
+    if K0_mode in ["K0: По ГОСТ 12248.3-2020", "K0: Формула Джекки"] \
+            and statment[test].physical_properties.type_ground in [1, 2, 3, 4]:
+        test_parameter["K0"][0] = zap(test_parameter["K0"][0], 1)
+    else:
+        test_parameter["K0"][0] = zap(test_parameter["K0"][0], 2)
+
+    return test_parameter
+
+
+def general_data_cells(test: str, number: int) -> list:
+    """Ячейки ведомости со сводными результатами опыта test"""
+    general_for_write = {
+        "test_type": [],
+        "sigma_3": [],
+        "sigma_1": [],
+        "fi": [],
+        "c": [],
+        "E": [],
+        "E50": [],
+        "Eur": [],
+        "poissons_ratio": [],
+    }
+
+    general_for_write_params = {
+        "test_type": ("CY" + str(number), (number, 102)),
+        "sigma_3": ("CZ" + str(number), (number, 103)),
+        "sigma_1": ("DA" + str(number), (number, 104)),
+        "fi": ("DB" + str(number), (number, 105)),
+        "c": ("DC" + str(number), (number, 106)),
+        "E": ("DD" + str(number), (number, 107)),
+        "E50": ("DE" + str(number), (number, 108)),
+        "Eur": ("DF" + str(number), (number, 109)),
+        "poissons_ratio": ("DG" + str(number), (number, 110)),
+    }
+    if statment.general_parameters.test_mode in [
+        "Трёхосное сжатие (F, C, E)",
+        "Трёхосное сжатие (F, C, Eur)",
+        'Трёхосное сжатие (F, C)',
+        'Трёхосное сжатие КН',
+        'Трёхосное сжатие НН',
+        "Трёхосное сжатие (F, C) res"
+    ]:
+
+        if statment.general_parameters.test_mode in [
+            "Трёхосное сжатие (F, C, E)",
+            "Трёхосное сжатие (F, C, Eur)",
+            ]:
+            result_E = E_models[test].deviator_loading.get_test_results()
+            general_for_write["test_type"].append("E")
+            general_for_write["sigma_3"].append(result_E['sigma_3'])
+            general_for_write["sigma_1"].append(round(result_E['sigma_3'] + result_E["qf"], 2))
+            general_for_write["E"].append(result_E['E'][0])
+            general_for_write["E50"].append(result_E['E50'])
+            if result_E['Eur']:
+                general_for_write["Eur"].append(result_E['Eur'])
+            general_for_write["poissons_ratio"].append(result_E['poissons_ratio'])
+
+
+        for fc_test in FC_models[test]:
+            result_test = fc_test.deviator_loading.get_test_results()
+
+            general_for_write["test_type"].append("FC")
+            general_for_write["sigma_3"].append(result_test['sigma_3'])
+            general_for_write["sigma_1"].append(round(result_test['sigma_3'] + result_test["qf"], 2))
+            general_for_write["E"].append(result_test['E'][0])
+            general_for_write["E50"].append(result_test['E50'])
+            general_for_write["poissons_ratio"].append(result_test['poissons_ratio'])
+
+        general_for_write["c"].append(FC_models[test].get_test_results()["c"])
+        general_for_write["fi"].append(FC_models[test].get_test_results()["fi"])
+
+    if statment.general_parameters.test_mode in [
+        "Трёхосное сжатие (E)",
+        "Трёхосное сжатие с разгрузкой",
+        "Трёхосное сжатие с разгрузкой (plaxis)"
+    ]:
+        result_E = E_models[test].deviator_loading.get_test_results()
+        general_for_write["test_type"].append("E")
+        general_for_write["sigma_3"].append(result_E['sigma_3'])
+        general_for_write["sigma_1"].append(round(result_E['sigma_3'] + result_E["qf"], 2))
+        general_for_write["E"].append(result_E['E'][0])
+        general_for_write["E50"].append(result_E['E50'])
+        if result_E['Eur']:
+            general_for_write["Eur"].append(result_E['Eur'])
+        general_for_write["poissons_ratio"].append(result_E['poissons_ratio'])
+
+
+    return [{"cell": general_for_write_params[key],
+             "value": ';'.join([str(i).replace(".", ",") for i in general_for_write[key]])
+             if len(general_for_write[key]) else "-",
+             "sheet": "Лист1",
+             "color": "FF6961"} for key in general_for_write]
+
+
+def E_report_name(file_path_name: str) -> str:
+    """Имя файла протокола в режимах E_REPORT_MODES"""
+    return file_path_name + " " + statment.general_data.object_number + \
+           E_REPORT_MODES[statment.general_parameters.test_mode][0] + ".pdf"
+
+
+def save_E_files(test: str, save: str, file_path_name: str, save_plaxis: bool) -> None:
+    """Сохранение лога и ЦВИ опыта test в папку save и копирование их в папки объекта"""
+    d, h = statment[test].physical_properties.sample_size
+
+    E_models[test].save_log_file(save + "/" + f"{file_path_name}.log", sample_size=(h, d),
+                                 save_plaxis=save_plaxis)
+    E_models[test].save_cvi_file(save, f"{file_path_name} ЦВИ.xls")
+    shutil.copy(os.path.join(save, f"{file_path_name} ЦВИ.xls"),
+                statment.save_dir.cvi_directory + "/" + f"{file_path_name} ЦВИ.xls")
+
+    if save_plaxis:
+        shutil.copy(
+            os.path.join(save, "plaxis_log.txt"),
+            os.path.join(statment.save_dir.plaxis_log_E50,
+                         f"{file_path_name} {statment[test].mechanical_properties.sigma_3} kPa.txt"))
+
+
+def E_result_cells(test: str, test_result: dict, report_type: str) -> list:
+    """Ячейки ведомости с модулями опыта test в режимах E_REPORT_MODES (без сводных, см. general_data_cells)"""
+    test_mode = statment.general_parameters.test_mode
+    number = statment[test].physical_properties.sample_number + 7
+    cells = []
+
+    if test_mode != "Трёхосное сжатие (E)":
+        cells.append({"cell": ("GI" + str(number), (number, 190)), "value": test_result["Eur"],
+                      "sheet": "Лист1", "color": "FF6961"})
+
+    if test_mode == "Трёхосное сжатие с разгрузкой (plaxis)":
+        position = c_fi_E_PropertyPosition[test_mode]
+        value = test_result["E50"]
+    elif report_type in ["standart_E50", "plaxis_m", "plaxis"]:
+        position = c_fi_E_PropertyPosition["Трёхосное сжатие (E)"]
+        value = test_result["E50"]
+    else:
+        position = c_fi_E_PropertyPosition[test_mode]
+        value = test_result["E"][0]
+
+    cells.append({"cell": (position[0][2] + str(number), (number, position[1][2])), "value": value,
+                  "sheet": "Лист1", "color": "FF6961"})
+    return cells
+
+
+def save_E_report_job(test: str, params: dict) -> dict:
+    """Сохранение протокола, логов и ЦВИ опыта test в режимах E_REPORT_MODES.
+
+    :param params: report_type - тип протокола, qr - запрашивать qr код, save_plaxis - сохранять лог plaxis,
+        plot_mode - режим построения девиатора, with_dilatancy - построение дилатансии,
+        K0_mode, reference_pressure_array - см. define_test_parameter, version - версия программы
+    :return: ячейки ведомости для записи результатов"""
+    size = E_REPORT_MODES[statment.general_parameters.test_mode][1]
+
+    file_path_name = statment.getLaboratoryNumber().replace("/", "-").replace("*", "")
+
+    test_parameter = define_test_parameter(test, params["K0_mode"], params["reference_pressure_array"])
+
+    data_customer = statment.general_data
+    date = statment[test].physical_properties.date
+    if date:
+        data_customer.end_date = date
+
+    save = statment.save_dir.arhive_directory + "/" + file_path_name
+    save = save.replace("*", "")
+    if not os.path.isdir(save):
+        os.mkdir(save)
+
+    qr = request_qr(os.path.join(save, "qr.png")) if params["qr"] else None
+
+    name = E_report_name(file_path_name)
+
+    save_E_files(test, save, file_path_name, params["save_plaxis"])
+
+    consolidation = ModelTriaxialConsolidationFigures()
+    consolidation.plot_sqrt(E_models[test].consolidation.get_plot_data_sqrt(),
+                            E_models[test].consolidation.get_test_results())
+    consolidation.plot_log(E_models[test].consolidation.get_plot_data_log(),
+                           E_models[test].consolidation.get_test_results())
+
+    deviator_loading = ModelTriaxialDeviatorLoadingFigures()
+    deviator_loading.plot(E_models[test].deviator_loading.get_plot_data(),
+                          E_models[test].deviator_loading.get_test_results(),
+                          params["plot_mode"], with_dilatancy=params["with_dilatancy"])
+
+    test_result = E_models[test].get_test_results()
+
+    report_E(save + "/" + name, data_customer,
+             statment[test].physical_properties, statment.getLaboratoryNumber(),
+             os.getcwd() + "/project_data/",
+             test_parameter, test_result,
+             (*consolidation.save_canvas(), *deviator_loading.save_canvas(size=size)), params["report_type"],
+             params["version"], qr_code=qr)
+
+    shutil.copy(save + "/" + name, statment.save_dir.report_directory + "/" + name)
+
+    control()
+
+    number = statment[test].physical_properties.sample_number + 7
+    return {"cells": general_data_cells(test, number) + E_result_cells(test, test_result, params["report_type"])}
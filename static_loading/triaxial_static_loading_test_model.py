@@ -21,6 +21,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from numpy.linalg import lstsq
 from general.general_functions import exponent
+from general.log_writer import write_log
+from general.device_log import read_device_log
 __version__ = 1
 
 def lse(__y):
@@ -178,17 +180,6 @@ class ModelTriaxialStaticLoad:
     def open_geotek_log(file_path, camera="A"):
         """Функция открытия файла прибора геотек"""
 
-        def find_current_columns(line, column_keys):
-            """Функция находит нужные колонки по ключу и определяет их размерность"""
-            columns_dict = {}
-            for key in column_keys:
-                for column_name in line:
-                    if key in column_name:
-                        columns_dict[key] = {"index": line.index(column_name),
-                                             "scale": 1}
-                        break
-            return columns_dict
-
         def define_reconsolidation(read_data):
             """Обработка реконсолидации"""
             reconsolidation = {}
@@ -211,13 +202,11 @@ class ModelTriaxialStaticLoad:
             # Найдем начало и конец этапа консолидации
             try:
                 begin_consolidation = read_data['Trajectory'].index('Consolidation')
-                iload = read_data['Action'][begin_consolidation:].index('Stabilization')
-                begin_consolidation += iload - 1
+                begin_consolidation = read_data['Action'].index('Stabilization', begin_consolidation) - 1
             except ValueError:
                 try:
                     begin_consolidation = read_data['Trajectory'].index('Consolidation')
-                    iload = read_data['Action'][begin_consolidation:].index('Wait')
-                    begin_consolidation += iload
+                    begin_consolidation = read_data['Action'].index('Wait', begin_consolidation)
                 except ValueError:
                     try:
                         begin_consolidation = read_data['Trajectory'].index('Consolidation')
@@ -259,8 +248,7 @@ class ModelTriaxialStaticLoad:
 
             try:
                 begin_deviator_loading = read_data['Trajectory'].index('CTC')
-                iload = read_data['Action'][begin_deviator_loading:].index('WaitLimit')
-                begin_deviator_loading += iload
+                begin_deviator_loading = read_data['Action'].index('WaitLimit', begin_deviator_loading)
 
                 try:
                     end_deviator_loading = read_data['Action'].index('Unload')
@@ -303,8 +291,8 @@ class ModelTriaxialStaticLoad:
                     deviator_loading["reload_points"] = [begin_upload - begin_deviator_loading,
                                                          read_data['Action'].index('CyclicLoading') -
                                                          begin_deviator_loading,
-                                                         read_data['Action'][begin_upload:].index('WaitLimit') +
-                                                         begin_upload - begin_deviator_loading]
+                                                         read_data['Action'].index('WaitLimit', begin_upload) -
+                                                         begin_deviator_loading]
                 except (ValueError, IndexError):
                     deviator_loading["reload_points"] = None
 
@@ -326,23 +314,9 @@ class ModelTriaxialStaticLoad:
         column_keys = ['VerticalDeformation', 'Deviator', 'CellVolume', 'PoreVolume', 'Time', 'Action',
                        'Trajectory', 'CellPress', 'PorePress']
 
-        # Считываем файл
-        f = open(file_path)
-        lines = f.readlines()
-        f.close()
-
-        columns_dict = find_current_columns(lines[0].split("\t"), column_keys)
-
-        # Словарь считанных данных по ключам колонок
-        read_data = {}
-
-        for key in columns_dict:  # по нужным столбцам
-            try:
-                read_data[key] = np.array(
-                    list(map(lambda x: float(x.split("\t")[columns_dict[key]["index"]].replace(",", ".")), lines[1:])))
-            except ValueError:
-                read_data[key] = list(
-                    map(lambda x: x.split("\t")[columns_dict[key]["index"]].replace(",", "."), lines[1:]))
+        # Словарь считанных данных по ключам колонок. Колонки ищутся по вхождению ключа в имя,
+        # Action и Trajectory читаются как категориальные колонки
+        read_data = read_device_log(file_path, columns=column_keys, partial_names=True)
 
         # Обработка реконсолидации
         test_data["reconsolidation"] = define_reconsolidation(read_data)
@@ -698,45 +672,21 @@ class ModelTriaxialStaticLoadSoilTest(ModelTriaxialStaticLoad):
     def text_file(file_path, data):
         """Сохранение текстового файла формата Willie.
                     Передается папка, массивы"""
-        p = os.path.join(file_path, "Тест.log")
-
-        def make_string(data, i):
-            s = ""
-            for key in data:
-                s += str(data[key][i]) + '\t'
-            s += '\n'
-            return (s)
-
-        with open(file_path, "w") as file:
-            file.write(
-                "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + "SampleDiameter_mm" + '\t' +
-                "Deviator_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + "CellPress_kPa" + '\t' + "CellVolume_mm3" + '\t' +
-                "PorePress_kPa" + '\t' + "PoreVolume_mm3" + '\t' + "VerticalPress_kPa" + '\t' +
-                "Trajectory" + '\n')
-            for i in range(len(data["Time"])):
-                file.write(make_string(data, i))
+        write_log(file_path, data, header="\t".join(["Time", "Action", "Action_Changed", "SampleHeight_mm",
+                                                     "SampleDiameter_mm", "Deviator_kPa", "VerticalDeformation_mm",
+                                                     "CellPress_kPa", "CellVolume_mm3", "PorePress_kPa", "PoreVolume_mm3",
+                                                     "VerticalPress_kPa", "Trajectory"]) + "\n",
+                  rows=len(data["Time"]))
 
     @staticmethod
     def text_file_new(file_path, data):
         """Сохранение текстового файла формата Willie.
                     Передается папка, массивы"""
-        p = os.path.join(file_path, "Тест.log")
-
-        def make_string(data, i):
-            s = ""
-            for key in data:
-                s += str(data[key][i]) + '\t'
-            s += '\n'
-            return (s)
-
-        with open(file_path, "w") as file:
-            file.write(
-                "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + "SampleDiameter_mm" + '\t' +
-                "Deviator_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + "CellPress_kPa" + '\t' + "CellVolume_mm3" + '\t' +
-                "PorePress_kPa" + '\t' + "PoreVolume_mm3" + '\t' + "VerticalPress_kPa" + '\t' +
-                "Trajectory" + '\n')
-            for i in range(len(data["Time"])):
-                file.write(make_string(data, i))
+        write_log(file_path, data, header="\t".join(["Time", "Action", "Action_Changed", "SampleHeight_mm",
+                                                     "SampleDiameter_mm", "Deviator_kPa", "VerticalDeformation_mm",
+                                                     "CellPress_kPa", "CellVolume_mm3", "PorePress_kPa", "PoreVolume_mm3",
+                                                     "VerticalPress_kPa", "Trajectory"]) + "\n",
+                  rows=len(data["Time"]))
 
     @staticmethod
     def number_format(x, characters_number=0, split=".", change_negatives=True):
@@ -15,7 +15,7 @@ from static_loading.mohr_circles_wiggets import MohrWidget, MohrWidgetSoilTest
 from excel_statment.initial_statment_widgets import TriaxialStaticStatment
 from excel_statment.initial_tables import LinePhysicalProperties
 from general.save_widget import Save_Dir
-from excel_statment.functions import set_cell_data
+from excel_statment.functions import StatmentWriter, statment_writer
 from excel_statment.position_configs import c_fi_E_PropertyPosition, MechanicalPropertyPosition
 from general.reports import report_consolidation, report_FCE, report_FC, report_FC_KN, report_E, report_FC_NN, \
     report_FC_res, zap
@@ -23,6 +23,7 @@ from static_loading.triaxial_static_widgets_UI import ModelTriaxialItemUI, Model
     ModelTriaxialReconsolidationUI, \
     ModelTriaxialConsolidationUI, ModelTriaxialDeviatorLoadingUI
 from general.general_widgets import Float_Slider
+from general.regeneration import ModelRegeneration, debounce_timer, finish_all
 from configs.styles import style
 from singletons import E_models, FC_models, statment
 from loggers.logger import app_logger, log_this, handler
@@ -41,6 +42,9 @@ from saver import XMLWidget
 from general.general_statement import StatementGenerator
 from metrics.session_writer import SessionWriter
 from general.movie_label import Loader
+from general.batch_export import BatchReportExport, BatchExportError, write_cells
+from static_loading.triaxial_static_export import E_REPORT_MODES, save_E_report_job, define_test_parameter, \
+    general_data_cells, E_report_name, save_E_files, E_result_cells
 
 
 class StaticProcessingWidget(QWidget):
@@ -194,12 +198,14 @@ class StaticProcessingWidget(QWidget):
 
     def _deviator_volumeter(self, button):
         """Передача значения выбранного волюмометра в модель"""
+        finish_all()
         if E_models[statment.current_test].deviator_loading.check_none():
             E_models[statment.current_test].deviator_loading.choise_volume_strain(button.text())
             self._cut_slider_deviator_set_val(E_models[statment.current_test].deviator_loading.get_borders())
             self._plot_deviator_loading()
 
     def _split_deviator(self, is_split_deviator):
+        finish_all()
         if E_models[statment.current_test].deviator_loading.check_none():
             E_models[statment.current_test].deviator_loading.set_split_deviator(is_split_deviator)
             self._plot_deviator_loading()
@@ -233,6 +239,7 @@ class StaticProcessingWidget(QWidget):
 
     def _cut_slider_deviator_moove(self):
         """Обработчик перемещения слайдера обрезки"""
+        finish_all()
         if E_models[statment.current_test].deviator_loading.check_none():
             if (int(self.deviator_loading.slider_cut.high()) - int(self.deviator_loading.slider_cut.low())) >= 50:
                 E_models[statment.current_test].deviator_loading.change_borders(
@@ -259,6 +266,7 @@ class StaticProcessingWidget(QWidget):
 
     def _consolidation_volumeter(self, button):
         """Передача значения выбранного волюмометра в модель"""
+        finish_all()
         if E_models[statment.current_test].consolidation.check_none():
             E_models[statment.current_test].consolidation.choise_volume_strain(button.text())
             self._cut_slider_consolidation_set_len(len(E_models[statment.current_test].consolidation._test_data.time))
@@ -272,6 +280,7 @@ class StaticProcessingWidget(QWidget):
         self.consolidation.slider_cut.setHigh(len)
 
     def _cut_slider_consolidation_moove(self):
+        finish_all()
         if E_models[statment.current_test].consolidation.check_none():
             if (int(self.consolidation.slider_cut.high()) - int(self.consolidation.slider_cut.low())) >= 50:
                 E_models[statment.current_test].consolidation.change_borders(int(self.consolidation.slider_cut.low()),
@@ -281,6 +290,7 @@ class StaticProcessingWidget(QWidget):
 
     def _consolidation_interpolation_type(self, button):
         """Смена метода интерполяции консолидации"""
+        finish_all()
         if self._model.deviator_loading.check_none():
             if button.text() == "Интерполяция полиномом":
                 interpolation_type = "poly"
@@ -300,6 +310,7 @@ class StaticProcessingWidget(QWidget):
 
     def _interpolate_slider_consolidation_moove(self):
         """Перемещение слайдера интерполяции. Не производит обработки, только отрисовка интерполированной кривой"""
+        finish_all()
         if E_models[statment.current_test].consolidation.check_none():
             param = self.consolidation.function_replacement_slider.current_value()
             plot = E_models[statment.current_test].consolidation.set_interpolation_param(param)
@@ -307,6 +318,7 @@ class StaticProcessingWidget(QWidget):
 
     def _interpolate_slider_consolidation_release(self):
         """Обработка консолидации при окончании движения слайдера"""
+        finish_all()
         if E_models[statment.current_test].consolidation.check_none():
             E_models[statment.current_test].consolidation.change_borders(int(self.consolidation.slider_cut.low()),
                                                                          int(self.consolidation.slider_cut.high()))
@@ -315,6 +327,7 @@ class StaticProcessingWidget(QWidget):
 
     def _canvas_click(self, event):
         """Метод обрабатывает нажатие на канвас"""
+        finish_all()
         if event.canvas is self.consolidation.sqrt_canvas:
             canvas = "sqrt"
         if event.canvas is self.consolidation.log_canvas:
@@ -326,6 +339,7 @@ class StaticProcessingWidget(QWidget):
 
     def _canvas_deviator_click(self, event):
         """Метод обрабатывает нажатие на канвас"""
+        finish_all()
         if event.button == 1 and event.xdata and event.ydata:
             self.point_identificator_deviator = E_models[statment.current_test].deviator_loading.define_click_point(
                 float(event.xdata),
@@ -379,6 +393,9 @@ class TriaxialStaticLoading_Sliders(QWidget):
 
         self._activate = False
 
+        # Во время перемещения параметры отправляются после паузы в движении слайдера
+        self._debounce = debounce_timer(self, self._sliders_released)
+
         self._createUI("Настройки отрисовки", params)
 
     def _createUI(self, name, params):
@@ -416,6 +433,7 @@ class TriaxialStaticLoading_Sliders(QWidget):
                 box_layout.addLayout(line)
                 func = getattr(self, "_sliders_moove".format(name_widget=name, name_var=var))
                 slider.sliderMoved.connect(func)
+                slider.sliderMoved.connect(lambda value: self._debounce.start())
                 release = getattr(self, "_sliders_released".format(name_widget=name, name_var=var))
                 slider.sliderReleased.connect(release)
                 slider.setStyleSheet(style)
@@ -456,6 +474,7 @@ class TriaxialStaticLoading_Sliders(QWidget):
 
     def _sliders_released(self):
         """Обработка окончания перемещения слайдеров деформации"""
+        self._debounce.stop()
         if self._activate:
             params = self._get_slider_params(self._params)
             self._set_slider_labels_params(params)
@@ -526,8 +545,12 @@ class StaticSoilTestWidget(TabMixin, StaticProcessingWidget):
 
         self.consolidation_sliders.signal[object].connect(self._consolidation_sliders_moove)
 
+        self.regeneration = ModelRegeneration(self)
+        self.regeneration.ready.connect(self._model_regenerated)
+
     def refresh(self):
         try:
+            self.regeneration.cancel(statment.current_test)
             E_models[statment.current_test].set_test_params()
             self.deviator_loading_sliders.set_sliders_params(
                 E_models[statment.current_test].get_deviator_loading_draw_params())
@@ -574,11 +597,8 @@ class StaticSoilTestWidget(TabMixin, StaticProcessingWidget):
     def _consolidation_sliders_moove(self, params):
         """Обработчик движения слайдера"""
         try:
-            E_models[statment.current_test].set_consolidation_draw_params(params)
-            self._plot_consolidation_sqrt()
-            self._plot_consolidation_log()
-            self._connect_model_Ui()
-            self.signal.emit(True)
+            self.regeneration.submit(statment.current_test, E_models[statment.current_test], "consolidation",
+                                     lambda model: model.set_consolidation_draw_params(params))
         except KeyError:
             pass
 
@@ -586,10 +606,8 @@ class StaticSoilTestWidget(TabMixin, StaticProcessingWidget):
     def _deviator_loading_sliders_moove(self, params):
         """Обработчик движения слайдера"""
         try:
-            E_models[statment.current_test].set_deviator_loading_draw_params(params)
-            self._plot_deviator_loading()
-            self._connect_model_Ui()
-            self.signal.emit(True)
+            self.regeneration.submit(statment.current_test, E_models[statment.current_test], "deviator_loading",
+                                     lambda model: model.set_deviator_loading_draw_params(params))
         except KeyError:
             pass
 
@@ -597,12 +615,20 @@ class StaticSoilTestWidget(TabMixin, StaticProcessingWidget):
     def _deviator_loading_sliders_unload_start_y_slider_moove(self, params):
         """Обработчик движения слайдера"""
         try:
-            E_models[statment.current_test].set_deviator_loading_draw_params_unload_start_y(params)
+            self.regeneration.submit(statment.current_test, E_models[statment.current_test], "unload_start_y",
+                                     lambda model: model.set_deviator_loading_draw_params_unload_start_y(params))
+        except KeyError:
+            pass
+
+    def _model_regenerated(self, key, model):
+        """Подстановка пересчитанной в фоновом потоке модели"""
+        E_models[key] = model
+        if key == statment.current_test:
+            self._plot_consolidation_sqrt()
+            self._plot_consolidation_log()
             self._plot_deviator_loading()
             self._connect_model_Ui()
             self.signal.emit(True)
-        except KeyError:
-            pass
 
 
 class StatickProcessingApp(QWidget):
@@ -816,6 +842,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
             self.tab_3.refresh()
 
     def keyPressEvent(self, event):
+        finish_all()
         if statment.current_test:
             list = [x for x in statment]
             index = list.index(statment.current_test)
@@ -829,6 +856,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
                     self.set_test_parameters(True)
 
     def set_test_parameters(self, params):
+        finish_all()
         if statment.general_parameters.test_mode == 'Трёхосное сжатие (F, C, E)' or statment.general_parameters.test_mode == 'Трёхосное сжатие (F, C, Eur)':
             self.tab_2.item_identification.set_data()
             self.tab_3.item_identification.set_data()
@@ -892,37 +920,18 @@ class StatickSoilTestApp(AppMixin, QWidget):
             pass
 
     def save_report(self, save_all_mode = False):
+        finish_all()
         try:
             assert statment.current_test, "Не выбран образец в ведомости"
+            # Ячейки пробы записываются в ведомость одним сохранением
+            writer = statment_writer(self.tab_1.path)
             file_path_name = statment.getLaboratoryNumber().replace("/", "-").replace("*", "")
 
             d, h = statment[statment.current_test].physical_properties.sample_size
 
-            try:
-                if statment.general_parameters.waterfill == "Водонасыщенное состояние":
-                    s = "в водонасыщенном состоянии"
-                elif statment.general_parameters.waterfill == "Природная влажность":
-                    s = "при природной влажности"
-                elif statment.general_parameters.waterfill == "Не указывать":
-                    s = ""
-            except:
-                s = ""
-
-            test_parameter = {"equipment": statment.general_parameters.equipment,
-                              "mode": "КД, девиаторное нагружение в кинематическом режиме " + s,
-                              "sigma_3": statment[statment.current_test].mechanical_properties.sigma_3,
-                              "K0": [statment[statment.current_test].mechanical_properties.K0,
-                                     "-" if self.tab_3.reference_pressure_array_box.get_checked() == "set_by_user" or
-                                            self.tab_3.reference_pressure_array_box.get_checked() == "state_standard"
-                                     else statment[statment.current_test].mechanical_properties.K0],
-                              "h": h,
-                              "d": d}
-
-            if self.tab_1.open_line.get_data()["K0_mode"] in ["K0: По ГОСТ 12248.3-2020", "K0: Формула Джекки"]\
-                    and statment[statment.current_test].physical_properties.type_ground in [1, 2, 3, 4]:
-                test_parameter["K0"][0] = zap(test_parameter["K0"][0], 1)
-            else:
-                test_parameter["K0"][0] = zap(test_parameter["K0"][0], 2)
+            test_parameter = define_test_parameter(statment.current_test,
+                                                   self.tab_1.open_line.get_data()["K0_mode"],
+                                                   self.tab_3.reference_pressure_array_box.get_checked())
 
             data_customer = statment.general_data
             date = statment[statment.current_test].physical_properties.date
@@ -957,124 +966,27 @@ class StatickSoilTestApp(AppMixin, QWidget):
             except AttributeError:
                 pass
 
-            if statment.general_parameters.test_mode == "Трёхосное сжатие (E)":
-                name = file_path_name + " " + statment.general_data.object_number + " ТС" + ".pdf"
-
-                E_models[statment.current_test].save_log_file(save + "/" + f"{file_path_name}.log", sample_size=(h, d),
-                                                              save_plaxis=save_plaxis)
-                E_models[statment.current_test].save_cvi_file(save, f"{file_path_name} ЦВИ.xls")
+            if statment.general_parameters.test_mode in E_REPORT_MODES:
+                name = E_report_name(file_path_name)
 
-                if save_plaxis:
-                    shutil.copy(
-                        os.path.join(save, f"plaxis_log.txt"),
-                        os.path.join(statment.save_dir.plaxis_log_E50,
-                                     f"{file_path_name} {statment[statment.current_test].mechanical_properties.sigma_3} kPa.txt"))
-
-                shutil.copy(os.path.join(save, f"{file_path_name} ЦВИ.xls"),
-                            statment.save_dir.cvi_directory + "/" + f"{file_path_name} ЦВИ.xls")
-
-                test_result = E_models[statment.current_test].get_test_results()
-
-                report_E(save + "/" + name, data_customer,
-                         statment[statment.current_test].physical_properties, statment.getLaboratoryNumber(),
-                         os.getcwd() + "/project_data/",
-                         test_parameter, test_result,
-                         (*self.tab_2.consolidation.save_canvas(),
-                          *self.tab_2.deviator_loading.save_canvas()), self.tab_4.report_type,
-                         "{:.2f}".format(__version__), qr_code=qr)
-
-                shutil.copy(save + "/" + name, statment.save_dir.report_directory + "/" + name)
-
-                number = statment[statment.current_test].physical_properties.sample_number + 7
-
-                if self.tab_4.report_type == "standart_E50" or self.tab_4.report_type == "plaxis_m" or self.tab_4.report_type == "plaxis":
-                    set_cell_data(self.tab_1.path,
-                                  (c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][0][2] + str(number),
-                                   (number, c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][1][2])),
-                                  test_result["E50"], sheet="Лист1", color="FF6961")
-                else:
-                    set_cell_data(self.tab_1.path,
-                                  (c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][0][2] + str(number),
-                                   (number, c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][1][2])),
-                                  test_result["E"][0], sheet="Лист1", color="FF6961")
-
-            elif statment.general_parameters.test_mode == "Трёхосное сжатие с разгрузкой":
-                name = file_path_name + " " + statment.general_data.object_number + " ТС Р" + ".pdf"
-                E_models[statment.current_test].save_log_file(save + "/" + f"{file_path_name}.log", sample_size=(h, d),
-                                                              save_plaxis=save_plaxis)
-                E_models[statment.current_test].save_cvi_file(save, f"{file_path_name} ЦВИ.xls")
-                shutil.copy(os.path.join(save, f"{file_path_name} ЦВИ.xls"),
-                            statment.save_dir.cvi_directory + "/" + f"{file_path_name} ЦВИ.xls")
-
-                if save_plaxis:
-                    shutil.copy(
-                        os.path.join(save, f"plaxis_log.txt"),
-                        os.path.join(statment.save_dir.plaxis_log_E50,
-                                     f"{file_path_name} {statment[statment.current_test].mechanical_properties.sigma_3} kPa.txt"))
+                save_E_files(statment.current_test, save, file_path_name, save_plaxis)
 
                 test_result = E_models[statment.current_test].get_test_results()
-                report_E(save + "/" + name, data_customer,
-                         statment[statment.current_test].physical_properties, statment.getLaboratoryNumber(),
-                         os.getcwd() + "/project_data/",
-                         test_parameter, test_result,
-                         (*self.tab_2.consolidation.save_canvas(),
-                          *self.tab_2.deviator_loading.save_canvas(size=[[6, 4], [6, 2]])), self.tab_4.report_type,
-                         "{:.2f}".format(__version__), qr_code=qr)
-
-                shutil.copy(save + "/" + name, statment.save_dir.report_directory + "/" + name)
 
-                number = statment[statment.current_test].physical_properties.sample_number + 7
-
-                set_cell_data(self.tab_1.path,
-                              ("GI" + str(number), (number, 190)),
-                              test_result["Eur"], sheet="Лист1", color="FF6961")
-
-                if self.tab_4.report_type == "standart_E50" or self.tab_4.report_type == "plaxis_m" or self.tab_4.report_type == "plaxis":
-                    set_cell_data(self.tab_1.path,
-                                  (c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][0][2] + str(number),
-                                   (number, c_fi_E_PropertyPosition["Трёхосное сжатие (E)"][1][2])),
-                                  test_result["E50"], sheet="Лист1", color="FF6961")
-                else:
-                    set_cell_data(self.tab_1.path,
-                                  (c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][0][2] + str(number),
-                                   (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][1][2])),
-                                  test_result["E"][0], sheet="Лист1", color="FF6961")
-
-            elif statment.general_parameters.test_mode == "Трёхосное сжатие с разгрузкой (plaxis)":
-                name = file_path_name + " " + statment.general_data.object_number + " ТС Р (plaxis)" + ".pdf"
-                E_models[statment.current_test].save_log_file(save + "/" + f"{file_path_name}.log", sample_size=(h, d),
-                                                              save_plaxis=save_plaxis)
-                E_models[statment.current_test].save_cvi_file(save, f"{file_path_name} ЦВИ.xls")
-                shutil.copy(os.path.join(save, f"{file_path_name} ЦВИ.xls"),
-                            statment.save_dir.cvi_directory + "/" + f"{file_path_name} ЦВИ.xls")
-
-                if save_plaxis:
-                    shutil.copy(
-                        os.path.join(save, f"plaxis_log.txt"),
-                        os.path.join(statment.save_dir.plaxis_log_E50,
-                                     f"{file_path_name} {statment[statment.current_test].mechanical_properties.sigma_3} kPa.txt"))
-
-                test_result = E_models[statment.current_test].get_test_results()
                 report_E(save + "/" + name, data_customer,
                          statment[statment.current_test].physical_properties, statment.getLaboratoryNumber(),
                          os.getcwd() + "/project_data/",
                          test_parameter, test_result,
                          (*self.tab_2.consolidation.save_canvas(),
-                          *self.tab_2.deviator_loading.save_canvas(size=[[6, 4], [6, 2]])), self.tab_4.report_type,
-                         "{:.2f}".format(__version__), qr_code=qr)
+                          *self.tab_2.deviator_loading.save_canvas(
+                              size=E_REPORT_MODES[statment.general_parameters.test_mode][1])),
+                         self.tab_4.report_type, "{:.2f}".format(__version__), qr_code=qr)
 
                 shutil.copy(save + "/" + name, statment.save_dir.report_directory + "/" + name)
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              ("GI" + str(number), (number, 190)),
-                              test_result["Eur"], sheet="Лист1", color="FF6961")
-
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой (plaxis)"][0][2] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой (plaxis)"][1][2])),
-                              test_result["E50"], sheet="Лист1", color="FF6961")
+                writer.set_cells(E_result_cells(statment.current_test, test_result, self.tab_4.report_type))
 
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, E)":
                 name = file_path_name + " " + statment.general_data.object_number + " ТД" + ".pdf"
@@ -1153,27 +1065,23 @@ class StatickSoilTestApp(AppMixin, QWidget):
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
                 if self.tab_4.report_type == "Standart_E50" or self.tab_4.report_type == "plaxis":
-                    set_cell_data(
-                        self.tab_1.path,
+                    writer.set_cell_data(
                         (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][2] + str(number),
                          (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][2])),
                         test_result["E50"], sheet="Лист1", color="FF6961")
                 else:
-                    set_cell_data(
-                        self.tab_1.path,
+                    writer.set_cell_data(
                         (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][2] + str(number),
                          (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][2])),
                         test_result["E"][0], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][1] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][1])),
-                              test_result["fi"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][0][1] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C, E)"][1][1])),
+                                     test_result["fi"], sheet="Лист1", color="FF6961")
 
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, Eur)":
 
@@ -1248,29 +1156,24 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][1] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][1])),
-                              test_result["fi"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][1] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][1])),
+                                     test_result["fi"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              ("GI" + str(number), (number, 190)),
-                              test_result["Eur"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data(("GI" + str(number), (number, 190)),
+                                     test_result["Eur"], sheet="Лист1", color="FF6961")
                 if self.tab_4.report_type == "plaxis":
-                    set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][0][2] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][1][2])),
-                              test_result["E50"][0], sheet="Лист1", color="FF6961")
+                    writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][0][2] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][1][2])),
+                                     test_result["E50"][0], sheet="Лист1", color="FF6961")
                 else:
-                    set_cell_data(self.tab_1.path,
-                                  (c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][0][2] + str(number),
-                                   (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][1][2])),
-                                  test_result["E"][0], sheet="Лист1", color="FF6961")
+                    writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][0][2] + str(number),
+                                          (number, c_fi_E_PropertyPosition["Трёхосное сжатие с разгрузкой"][1][2])),
+                                         test_result["E"][0], sheet="Лист1", color="FF6961")
 
             elif statment.general_parameters.test_mode == 'Трёхосное сжатие (F, C)':
                 name = file_path_name + " " + statment.general_data.object_number + " ТД" + ".pdf"
@@ -1314,20 +1217,16 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][1] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][1])),
-                              test_result["fi"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][0][1] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C)"][1][1])),
+                                     test_result["fi"], sheet="Лист1", color="FF6961")
 
             elif statment.general_parameters.test_mode == 'Трёхосное сжатие КН':
 
-                test_parameter["mode"] = "KH, девиаторное нагружение в кинематическом режиме " + s
-
                 name = file_path_name + " " + statment.general_data.object_number + " КН" + ".pdf"
                 FC_models[statment.current_test].save_log_files(save, file_path_name, sample_size=(h, d),
                                                                 save_plaxis=save_plaxis)
@@ -1367,20 +1266,16 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие КН"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие КН"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие КН"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие КН"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие КН"][0][1] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие КН"][1][1])),
-                              test_result["fi"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие КН"][0][1] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие КН"][1][1])),
+                                     test_result["fi"], sheet="Лист1", color="FF6961")
 
             elif statment.general_parameters.test_mode == 'Трёхосное сжатие НН':
 
-                test_parameter["mode"] = "НН, девиаторное нагружение в кинематическом режиме " + s
-
                 if self.tab_4.report_type == "vibroNN":
                     name = file_path_name + " " + statment.general_data.object_number + " КВ" + ".pdf"
                 else:
@@ -1421,10 +1316,9 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие НН"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие НН"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие НН"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие НН"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C) res":
                 if self.tab_4.report_type == "vibro":
@@ -1478,27 +1372,24 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
                 number = statment[statment.current_test].physical_properties.sample_number + 7
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][0][0] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][1][0])),
-                              test_result["c"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][0][0] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][1][0])),
+                                     test_result["c"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][0][1] + str(number),
-                               (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][1][1])),
-                              test_result["fi"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][0][1] + str(number),
+                                      (number, c_fi_E_PropertyPosition["Трёхосное сжатие (F, C) res"][1][1])),
+                                     test_result["fi"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (MechanicalPropertyPosition["c_res"][0] + str(number),
-                               (number, MechanicalPropertyPosition["c_res"][1])),
-                              test_result["c_res"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((MechanicalPropertyPosition["c_res"][0] + str(number),
+                                      (number, MechanicalPropertyPosition["c_res"][1])),
+                                     test_result["c_res"], sheet="Лист1", color="FF6961")
 
-                set_cell_data(self.tab_1.path,
-                              (MechanicalPropertyPosition["fi_res"][0] + str(number),
-                               (number, MechanicalPropertyPosition["fi_res"][1])),
-                              test_result["fi_res"], sheet="Лист1", color="FF6961")
+                writer.set_cell_data((MechanicalPropertyPosition["fi_res"][0] + str(number),
+                                      (number, MechanicalPropertyPosition["fi_res"][1])),
+                                     test_result["fi_res"], sheet="Лист1", color="FF6961")
 
-            self.write_excel_general_data(number)
+            writer.set_cells(general_data_cells(statment.current_test, number))
+            writer.flush()
 
             if self.save_massage:
                 QMessageBox.about(self, "Сообщение", "Успешно сохранено")
@@ -1544,94 +1435,8 @@ class StatickSoilTestApp(AppMixin, QWidget):
                 pass
         SessionWriter.write_test()
 
-    def write_excel_general_data(self, number):
-
-        general_for_write = {
-            "test_type": [],
-            "sigma_3": [],
-            "sigma_1": [],
-            "fi": [],
-            "c": [],
-            "E": [],
-            "E50": [],
-            "Eur": [],
-            "poissons_ratio": [],
-        }
-
-        general_for_write_params = {
-            "test_type": ("CY" + str(number), (number, 102)),
-            "sigma_3": ("CZ" + str(number), (number, 103)),
-            "sigma_1": ("DA" + str(number), (number, 104)),
-            "fi": ("DB" + str(number), (number, 105)),
-            "c": ("DC" + str(number), (number, 106)),
-            "E": ("DD" + str(number), (number, 107)),
-            "E50": ("DE" + str(number), (number, 108)),
-            "Eur": ("DF" + str(number), (number, 109)),
-            "poissons_ratio": ("DG" + str(number), (number, 110)),
-        }
-        if statment.general_parameters.test_mode in [
-            "Трёхосное сжатие (F, C, E)",
-            "Трёхосное сжатие (F, C, Eur)",
-            'Трёхосное сжатие (F, C)',
-            'Трёхосное сжатие КН',
-            'Трёхосное сжатие НН',
-            "Трёхосное сжатие (F, C) res"
-        ]:
-
-            if statment.general_parameters.test_mode in [
-                "Трёхосное сжатие (F, C, E)",
-                "Трёхосное сжатие (F, C, Eur)",
-                ]:
-                result_E = E_models[statment.current_test].deviator_loading.get_test_results()
-                general_for_write["test_type"].append("E")
-                general_for_write["sigma_3"].append(result_E['sigma_3'])
-                general_for_write["sigma_1"].append(round(result_E['sigma_3'] + result_E["qf"], 2))
-                general_for_write["E"].append(result_E['E'][0])
-                general_for_write["E50"].append(result_E['E50'])
-                if result_E['Eur']:
-                    general_for_write["Eur"].append(result_E['Eur'])
-                general_for_write["poissons_ratio"].append(result_E['poissons_ratio'])
-
-
-            for test in FC_models[statment.current_test]:
-                result_test = test.deviator_loading.get_test_results()
-
-                general_for_write["test_type"].append("FC")
-                general_for_write["sigma_3"].append(result_test['sigma_3'])
-                general_for_write["sigma_1"].append(round(result_test['sigma_3'] + result_test["qf"], 2))
-                general_for_write["E"].append(result_test['E'][0])
-                general_for_write["E50"].append(result_test['E50'])
-                general_for_write["poissons_ratio"].append(result_test['poissons_ratio'])
-
-            general_for_write["c"].append(FC_models[statment.current_test].get_test_results()["c"])
-            general_for_write["fi"].append(FC_models[statment.current_test].get_test_results()["fi"])
-
-        if statment.general_parameters.test_mode in [
-            "Трёхосное сжатие (E)",
-            "Трёхосное сжатие с разгрузкой",
-            "Трёхосное сжатие с разгрузкой (plaxis)"
-        ]:
-            result_E = E_models[statment.current_test].deviator_loading.get_test_results()
-            general_for_write["test_type"].append("E")
-            general_for_write["sigma_3"].append(result_E['sigma_3'])
-            general_for_write["sigma_1"].append(round(result_E['sigma_3'] + result_E["qf"], 2))
-            general_for_write["E"].append(result_E['E'][0])
-            general_for_write["E50"].append(result_E['E50'])
-            if result_E['Eur']:
-                general_for_write["Eur"].append(result_E['Eur'])
-            general_for_write["poissons_ratio"].append(result_E['poissons_ratio'])
-
-
-        for key in general_for_write:
-            set_cell_data(
-                self.tab_1.path,
-                general_for_write_params[key],
-                ';'.join([str(i).replace(".", ",") for i in general_for_write[key]]) if len(general_for_write[key]) else "-",
-                sheet="Лист1",
-                color="FF6961"
-            )
-
     def save_all_reports(self):
+        finish_all()
         if self.loader.is_running:
             QMessageBox.critical(self, "Ошибка", "Закройте окно сохранения")
             return
@@ -1656,23 +1461,23 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
             if statment.general_parameters.test_mode == "Трёхосное сжатие (E)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode in [
                 "Трёхосное сжатие с разгрузкой",
                 "Трёхосное сжатие с разгрузкой (plaxis)"
             ]:
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, E)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, Eur)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode in [
                 'Трёхосное сжатие (F, C)',
                 'Трёхосное сжатие КН',
@@ -1680,7 +1485,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
                 "Трёхосное сжатие (F, C) res"
             ]:
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
@@ -1691,6 +1496,10 @@ class StatickSoilTestApp(AppMixin, QWidget):
             QMessageBox.critical(self, "Ошибка", "Ошибка очистки папки с отчетами. Не закрыт файл отчета.")
             return
 
+        if statment.general_parameters.test_mode in E_REPORT_MODES:
+            self._save_all_reports_parallel()
+            return
+
         def save():
             count = len(statment)
             Loader.send_message(self.loader.port, f"Сохранено 0 из {count}")
@@ -1724,7 +1533,48 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
         SessionWriter.write_session(len(statment))
 
+    def _save_all_reports_parallel(self):
+        """Сохранение всех протоколов в несколько процессов без перерисовки вкладок"""
+        params = {
+            "report_type": self.tab_4.report_type,
+            "qr": bool(self.tab_4.qr),
+            "save_plaxis": self.tab_4.plaxis_btn.isChecked(),
+            "plot_mode": self.tab_2.deviator_loading.combo_box.currentText(),
+            "with_dilatancy": self.tab_2.deviator_loading.dilatancy_radio_btn.isChecked(),
+            "K0_mode": self.tab_1.open_line.get_data()["K0_mode"],
+            "reference_pressure_array": self.tab_3.reference_pressure_array_box.get_checked(),
+            "version": "{:.2f}".format(__version__),
+        }
+
+        def on_result(test, result):
+            write_cells(self.tab_1.path, result["cells"], flush=False)
+            self.tab_1.table_physical_properties.set_row_color(
+                self.tab_1.table_physical_properties.get_row_by_lab_naumber(test))
+            app_logger.info(f"Проба {test} успешно сохранена")
+
+        def save():
+            export = BatchReportExport(save_E_report_job, {"E_models": E_models},
+                                       progress=lambda message: Loader.send_message(self.loader.port, message))
+            try:
+                export.run(params, on_result=on_result)
+            except BatchExportError as err:
+                self.loader.close_OK(f"{err}.\nОперация прервана.")
+                app_logger.info(f"Ошибка сохранения пробы {err.message}")
+                return
+            finally:
+                # Результаты сохраненных проб записываются в ведомость одним сохранением
+                statment_writer(self.tab_1.path).flush()
+
+            self.loader.close_OK(f"Объект выгнан")
+
+        t = threading.Thread(target=save)
+        self.loader.start()
+        t.start()
+
+        SessionWriter.write_session(len(statment))
+
     def jornal(self):
+        finish_all()
         if statment.tests == {}:
             QMessageBox.critical(self, "Ошибка", "Загрузите объект", QMessageBox.Ok)
         else:
@@ -1732,6 +1582,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
             self.dialog.show()
 
     def save_pickle(self):
+        finish_all()
         try:
             models = [model for model in [E_models, FC_models] if len(model)]
 
@@ -1752,23 +1603,23 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
             if statment.general_parameters.test_mode == "Трёхосное сжатие (E)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode in [
                 "Трёхосное сжатие с разгрузкой",
                 "Трёхосное сжатие с разгрузкой (plaxis)"
             ]:
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, E)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode == "Трёхосное сжатие (F, C, Eur)":
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"Eur_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             elif statment.general_parameters.test_mode in [
                 'Трёхосное сжатие (F, C)',
                 'Трёхосное сжатие КН',
@@ -1776,7 +1627,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
                 "Трёхосное сжатие (F, C) res"
             ]:
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
@@ -1797,6 +1648,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
             print(str(err))
 
     def save_excel(self):
+        finish_all()
         try:
             customer_name = ''.join(list(filter(lambda c: c not in '''«»\/:*?"'<>|''', statment.general_data.customer)))
             save_file_name = f"{customer_name} - {statment.general_data.object_number} - {statment.general_data.object_short_name} - Сводная ведомость {'Трехосное сжатие'}{statment.general_data.get_shipment_number()}.xlsx"
@@ -1804,6 +1656,7 @@ class StatickSoilTestApp(AppMixin, QWidget):
 
             path = os.path.join(statment.save_dir.save_directory, save_file_name)
             shutil.copy(os.getcwd() + "/project_data/" + "FCE. Выгрузка.xlsx", path)
+            writer = StatmentWriter(path)
             i = 3
 
             parameters_for_write = []
@@ -1848,65 +1701,64 @@ class StatickSoilTestApp(AppMixin, QWidget):
                 try:
                     E_models[statment.current_test]
 
-                    set_cell_data(path, (parameters["laboratory_number"][0] + str(i), (i, parameters["laboratory_number"][1])),
-                                  laboratory_number, sheet="Лист1")
-                    set_cell_data(path, (parameters["borehole"][0] + str(i), (i, parameters["borehole"][1])),
-                                  borehole, sheet="Лист1")
-                    set_cell_data(path, (parameters["depth"][0] + str(i), (i, parameters["depth"][1])),
-                                  depth, sheet="Лист1")
-                    set_cell_data(path, (parameters["waterfill"][0] + str(i), (i, parameters["waterfill"][1])),
-                                  waterfill, sheet="Лист1")
-
-                    set_cell_data(path, (parameters["test_type"][0] + str(i), (i, parameters["test_type"][1])),
-                                  "E", sheet="Лист1")
-                    set_cell_data(path, (parameters["scheme"][0] + str(i), (i, parameters["scheme"][1])),
-                                  "КД", sheet="Лист1")
-
-                    set_cell_data(path, (parameters["sigma_3"][0] + str(i), (i, parameters["sigma_3"][1])),
-                                  round(statment[statment.current_test].mechanical_properties.sigma_3 / 1000, 3), sheet="Лист1")
-                    set_cell_data(path, (parameters["sigma_1"][0] + str(i), (i, parameters["sigma_1"][1])),
-                                  round(statment[statment.current_test].mechanical_properties.sigma_1 / 1000, 3), sheet="Лист1")
-                    set_cell_data(path, (parameters["K0"][0] + str(i), (i, parameters["K0"][1])),
-                                  statment[statment.current_test].mechanical_properties.K0,
-                                  sheet="Лист1")
+                    writer.set_cell_data((parameters["laboratory_number"][0] + str(i), (i, parameters["laboratory_number"][1])),
+                                         laboratory_number, sheet="Лист1")
+                    writer.set_cell_data((parameters["borehole"][0] + str(i), (i, parameters["borehole"][1])),
+                                         borehole, sheet="Лист1")
+                    writer.set_cell_data((parameters["depth"][0] + str(i), (i, parameters["depth"][1])),
+                                         depth, sheet="Лист1")
+                    writer.set_cell_data((parameters["waterfill"][0] + str(i), (i, parameters["waterfill"][1])),
+                                         waterfill, sheet="Лист1")
+
+                    writer.set_cell_data((parameters["test_type"][0] + str(i), (i, parameters["test_type"][1])),
+                                         "E", sheet="Лист1")
+                    writer.set_cell_data((parameters["scheme"][0] + str(i), (i, parameters["scheme"][1])),
+                                         "КД", sheet="Лист1")
+
+                    writer.set_cell_data((parameters["sigma_3"][0] + str(i), (i, parameters["sigma_3"][1])),
+                                         round(statment[statment.current_test].mechanical_properties.sigma_3 / 1000, 3), sheet="Лист1")
+                    writer.set_cell_data((parameters["sigma_1"][0] + str(i), (i, parameters["sigma_1"][1])),
+                                         round(statment[statment.current_test].mechanical_properties.sigma_1 / 1000, 3), sheet="Лист1")
+                    writer.set_cell_data((parameters["K0"][0] + str(i), (i, parameters["K0"][1])),
+                                         statment[statment.current_test].mechanical_properties.K0,
+                                         sheet="Лист1")
                     E = E_models[statment.current_test].deviator_loading.get_test_results()["E"]
                     try:
                         E[0]
-                        set_cell_data(path, (parameters["E"][0] + str(i), (i, parameters["E"][1])),
-                                      E[0], sheet="Лист1")
+                        writer.set_cell_data((parameters["E"][0] + str(i), (i, parameters["E"][1])),
+                                             E[0], sheet="Лист1")
                     except:
                         pass
 
-                    set_cell_data(path, (parameters["E50"][0] + str(i), (i, parameters["E50"][1])),
-                                  E_models[statment.current_test].deviator_loading.get_test_results()["E50"], sheet="Лист1")
+                    writer.set_cell_data((parameters["E50"][0] + str(i), (i, parameters["E50"][1])),
+                                         E_models[statment.current_test].deviator_loading.get_test_results()["E50"], sheet="Лист1")
 
                     Eur = E_models[statment.current_test].deviator_loading.get_test_results()["Eur"]
                     if Eur is not None:
-                        set_cell_data(path, (parameters["Eur"][0] + str(i), (i, parameters["Eur"][1])),
-                                      Eur, sheet="Лист1")
+                        writer.set_cell_data((parameters["Eur"][0] + str(i), (i, parameters["Eur"][1])),
+                                             Eur, sheet="Лист1")
 
                     poissons_ratio = E_models[statment.current_test].deviator_loading.get_test_results()["poissons_ratio"]
-                    set_cell_data(path, (parameters["poissons_ratio"][0] + str(i), (i, parameters["poissons_ratio"][1])),
-                                  poissons_ratio, sheet="Лист1")
-
-                    set_cell_data(path,
-                                  (parameters["uf"][0] + str(i), (i, parameters["uf"][1])),
-                                  E_models[statment.current_test].deviator_loading.get_test_results()[
-                                      "max_pore_pressure"],
-                                  sheet="Лист1")
-
-                    set_cell_data(path, (parameters["c"][0] + str(i), (i, parameters["c"][1])),
-                                  statment[statment.current_test].mechanical_properties.c,
-                                  sheet="Лист1")
-                    set_cell_data(path, (parameters["fi"][0] + str(i), (i, parameters["fi"][1])),
-                                  statment[statment.current_test].mechanical_properties.fi,
-                                  sheet="Лист1")
+                    writer.set_cell_data((parameters["poissons_ratio"][0] + str(i), (i, parameters["poissons_ratio"][1])),
+                                         poissons_ratio, sheet="Лист1")
+
+                    writer.set_cell_data((parameters["uf"][0] + str(i), (i, parameters["uf"][1])),
+                                         E_models[statment.current_test].deviator_loading.get_test_results()[
+                                             "max_pore_pressure"],
+                                         sheet="Лист1")
+
+                    writer.set_cell_data((parameters["c"][0] + str(i), (i, parameters["c"][1])),
+                                         statment[statment.current_test].mechanical_properties.c,
+                                         sheet="Лист1")
+                    writer.set_cell_data((parameters["fi"][0] + str(i), (i, parameters["fi"][1])),
+                                         statment[statment.current_test].mechanical_properties.fi,
+                                         sheet="Лист1")
                     if E_models[statment.current_test].reconsolidation is not None:
-                        set_cell_data(path, (parameters["Skempton"][0] + str(i), (i, parameters["Skempton"][1])),
-                                      E_models[statment.current_test].reconsolidation.get_test_results()["scempton"],
-                                      sheet="Лист1")
+                        writer.set_cell_data((parameters["Skempton"][0] + str(i), (i, parameters["Skempton"][1])),
+                                             E_models[statment.current_test].reconsolidation.get_test_results()["scempton"],
+                                             sheet="Лист1")
 
-                    set_cell_data(path, ("A" + str(i), (i, 1)), i - 2, sheet="Лист1")
+                    writer.set_cell_data(("A" + str(i), (i, 1)), i - 2, sheet="Лист1")
                     i += 1
                 except Exception as err:
                     print(err)
@@ -1915,76 +1767,75 @@ class StatickSoilTestApp(AppMixin, QWidget):
                     FC_models[statment.current_test]
 
                     for test in FC_models[statment.current_test]:
-                        set_cell_data(path, (
-                        parameters["laboratory_number"][0] + str(i), (i, parameters["laboratory_number"][1])),
-                                      laboratory_number, sheet="Лист1")
-                        set_cell_data(path, (parameters["borehole"][0] + str(i), (i, parameters["borehole"][1])),
-                                      borehole, sheet="Лист1")
-                        set_cell_data(path, (parameters["depth"][0] + str(i), (i, parameters["depth"][1])),
-                                      depth, sheet="Лист1")
-                        set_cell_data(path, (parameters["waterfill"][0] + str(i), (i, parameters["waterfill"][1])),
-                                      waterfill, sheet="Лист1")
-
-                        set_cell_data(path, (parameters["K0"][0] + str(i), (i, parameters["K0"][1])),
-                                      statment[statment.current_test].mechanical_properties.K0, sheet="Лист1")
-
-
-                        set_cell_data(path, (parameters["test_type"][0] + str(i), (i, parameters["test_type"][1])),
-                                      "FC", sheet="Лист1")
-                        set_cell_data(path, (parameters["scheme"][0] + str(i), (i, parameters["scheme"][1])),
-                                      "КД", sheet="Лист1")
-                        set_cell_data(path, (parameters["sigma_3"][0] + str(i), (i, parameters["sigma_3"][1])),
-                                      test.deviator_loading.get_test_results()["sigma_3"], sheet="Лист1")
+                        writer.set_cell_data((parameters["laboratory_number"][0] + str(i), (i, parameters["laboratory_number"][1])),
+                                             laboratory_number, sheet="Лист1")
+                        writer.set_cell_data((parameters["borehole"][0] + str(i), (i, parameters["borehole"][1])),
+                                             borehole, sheet="Лист1")
+                        writer.set_cell_data((parameters["depth"][0] + str(i), (i, parameters["depth"][1])),
+                                             depth, sheet="Лист1")
+                        writer.set_cell_data((parameters["waterfill"][0] + str(i), (i, parameters["waterfill"][1])),
+                                             waterfill, sheet="Лист1")
+
+                        writer.set_cell_data((parameters["K0"][0] + str(i), (i, parameters["K0"][1])),
+                                             statment[statment.current_test].mechanical_properties.K0, sheet="Лист1")
+
+
+                        writer.set_cell_data((parameters["test_type"][0] + str(i), (i, parameters["test_type"][1])),
+                                             "FC", sheet="Лист1")
+                        writer.set_cell_data((parameters["scheme"][0] + str(i), (i, parameters["scheme"][1])),
+                                             "КД", sheet="Лист1")
+                        writer.set_cell_data((parameters["sigma_3"][0] + str(i), (i, parameters["sigma_3"][1])),
+                                             test.deviator_loading.get_test_results()["sigma_3"], sheet="Лист1")
                         sigma_1 = round(test.deviator_loading.get_test_results()["sigma_3"] + test.deviator_loading.get_test_results()["qf"], 3)
 
-                        set_cell_data(path, (parameters["sigma_1"][0] + str(i), (i, parameters["sigma_1"][1])),
-                                      sigma_1, sheet="Лист1")
+                        writer.set_cell_data((parameters["sigma_1"][0] + str(i), (i, parameters["sigma_1"][1])),
+                                             sigma_1, sheet="Лист1")
 
                         E = test.deviator_loading.get_test_results()["E"]
                         try:
                             E[0]
-                            set_cell_data(path, (parameters["E"][0] + str(i), (i, parameters["E"][1])),
-                                          E[0], sheet="Лист1")
+                            writer.set_cell_data((parameters["E"][0] + str(i), (i, parameters["E"][1])),
+                                                 E[0], sheet="Лист1")
                         except:
                             pass
 
-                        set_cell_data(path, (parameters["E50"][0] + str(i), (i, parameters["E50"][1])),
-                                      test.deviator_loading.get_test_results()["E50"],
-                                      sheet="Лист1")
+                        writer.set_cell_data((parameters["E50"][0] + str(i), (i, parameters["E50"][1])),
+                                             test.deviator_loading.get_test_results()["E50"],
+                                             sheet="Лист1")
 
                         poissons_ratio = test.deviator_loading.get_test_results()["poissons_ratio"]
-                        set_cell_data(path, (
-                        parameters["poissons_ratio"][0] + str(i), (i, parameters["poissons_ratio"][1])),
-                                      poissons_ratio,
-                                      sheet="Лист1")
-
-                        set_cell_data(path,
-                                      (parameters["uf"][0] + str(i), (i, parameters["uf"][1])),
-                                      test.deviator_loading.get_test_results()["max_pore_pressure"],
-                                      sheet="Лист1")
-
-                        set_cell_data(path, (parameters["c"][0] + str(i), (i, parameters["c"][1])),
-                                      FC_models[statment.current_test].get_test_results()["c"],
-                                      sheet="Лист1")
-                        set_cell_data(path, (parameters["fi"][0] + str(i), (i, parameters["fi"][1])),
-                                      FC_models[statment.current_test].get_test_results()["fi"],
-                                      sheet="Лист1")
+                        writer.set_cell_data((parameters["poissons_ratio"][0] + str(i), (i, parameters["poissons_ratio"][1])),
+                                             poissons_ratio,
+                                             sheet="Лист1")
+
+                        writer.set_cell_data((parameters["uf"][0] + str(i), (i, parameters["uf"][1])),
+                                             test.deviator_loading.get_test_results()["max_pore_pressure"],
+                                             sheet="Лист1")
+
+                        writer.set_cell_data((parameters["c"][0] + str(i), (i, parameters["c"][1])),
+                                             FC_models[statment.current_test].get_test_results()["c"],
+                                             sheet="Лист1")
+                        writer.set_cell_data((parameters["fi"][0] + str(i), (i, parameters["fi"][1])),
+                                             FC_models[statment.current_test].get_test_results()["fi"],
+                                             sheet="Лист1")
                         if test.reconsolidation is not None:
-                            set_cell_data(path, (parameters["Skempton"][0] + str(i), (i, parameters["Skempton"][1])),
-                                          test.reconsolidation.get_test_results()["scempton"],
-                                          sheet="Лист1")
+                            writer.set_cell_data((parameters["Skempton"][0] + str(i), (i, parameters["Skempton"][1])),
+                                                 test.reconsolidation.get_test_results()["scempton"],
+                                                 sheet="Лист1")
 
-                        set_cell_data(path, ("A" + str(i), (i, 1)), i - 2, sheet="Лист1")
+                        writer.set_cell_data(("A" + str(i), (i, 1)), i - 2, sheet="Лист1")
                         i += 1
                 except Exception as err:
                     print(err)
 
+            writer.flush()
             QMessageBox.about(self, "Сообщение", "Excel сохранен")
             app_logger.info("Excel сохранен")
         except Exception as error:
             QMessageBox.critical(self, "Ошибка", str(error), QMessageBox.Ok)
 
     def general_statment(self):
+        finish_all()
         try:
             s = statment.general_data.path
         except:
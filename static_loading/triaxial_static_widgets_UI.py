@@ -14,10 +14,11 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import os
-from io import BytesIO
 
 from general.general_widgets import Float_Slider, RangeSlider
 from general.general_functions import point_to_xy
+from general.batch_export import create_offscreen_figure
+from general.plotting import PersistentPlot, render_to_file
 from excel_statment.initial_tables import TableVertical
 from configs.plot_params import plotter_params
 from general.general_functions import read_json_file
@@ -126,6 +127,7 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
 
         self.deviator_canvas.draw()
+        self.deviator_plot = PersistentPlot(self.deviator_figure, self.deviator_canvas)
         self.deviator_frame_layout.setSpacing(0)
         self.deviator_frame_layout.addWidget(self.deviator_canvas)
         self.deviator_toolbar = NavigationToolbar(self.deviator_canvas, self)
@@ -144,6 +146,7 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         self.volume_strain_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
         self.volume_strain_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
         self.volume_strain_canvas.draw()
+        self.volume_strain_plot = PersistentPlot(self.volume_strain_figure, self.volume_strain_canvas)
         self.volume_strain_frame_layout.setSpacing(0)
         self.volume_strain_frame_layout.addWidget(self.volume_strain_canvas)
         self.volume_strain_toolbar = NavigationToolbar(self.volume_strain_canvas, self)
@@ -215,41 +218,46 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
                         self.combo_box.setCurrentText("Eur_E")
 
         try:
-            # Если необходимо безразрывное построение девиатора
-            if not plots["is_split_deviator"] or plots["strain"][-1] < 0.13:
-                if self.combo_box.currentText() == "E":
-                    self._plot_E(plots, res, plot_dots)
-                elif self.combo_box.currentText() == "E50":
-                    self._plot_E50(plots, res)
-                elif self.combo_box.currentText() == "E и E50":
-                    self._plot_E_E50(plots, res, plot_dots)
-                elif self.combo_box.currentText() == "Eur_E":
-                    self._plot_Eur_E(plots, res, plot_dots)
-                elif self.combo_box.currentText() == "Eur_E50":
-                    self._plot_Eur_E50(plots, res)
-                elif self.combo_box.currentText() == "Eur":
-                    self._plot_Eur(plots, res)
-                self._plot_volume_strain(plots, res, with_dilatancy=self.dilatancy_radio_btn.isChecked())
-            # Если необходимо разрывное построение девиатора
-            elif plots["is_split_deviator"]:
-                if self.combo_box.currentText() == "E":
-                    self._plot_E_split(plots, res)
-                elif self.combo_box.currentText() == "E50":
-                    self._plot_E50_split(plots, res)
-                elif self.combo_box.currentText() == "E и E50":
-                    self._plot_E_E50_split(plots, res)
-                elif self.combo_box.currentText() == "Eur_E":
-                    self._plot_Eur_E_split(plots, res)
-                elif self.combo_box.currentText() == "Eur_E50":
-                    self._plot_Eur_E50_split(plots, res)
-                elif self.combo_box.currentText() == "Eur":
-                    self._plot_Eur_split(plots, res)
-
-                self._plot_volume_strain(plots, res, with_dilatancy=self.dilatancy_radio_btn.isChecked())
-                # self._plot_volume_strain_split(plots, res, with_dilatancy=self.dilatancy_radio_btn.isChecked())
+            self._plot_by_mode(self.combo_box.currentText(), plots, res, plot_dots,
+                               with_dilatancy=self.dilatancy_radio_btn.isChecked())
         except:
             pass
 
+    def _plot_by_mode(self, mode, plots, res, plot_dots=True, with_dilatancy=False):
+        """Построение графиков в выбранном режиме построения"""
+        # Если необходимо безразрывное построение девиатора
+        if not plots["is_split_deviator"] or plots["strain"][-1] < 0.13:
+            if mode == "E":
+                self._plot_E(plots, res, plot_dots)
+            elif mode == "E50":
+                self._plot_E50(plots, res)
+            elif mode == "E и E50":
+                self._plot_E_E50(plots, res, plot_dots)
+            elif mode == "Eur_E":
+                self._plot_Eur_E(plots, res, plot_dots)
+            elif mode == "Eur_E50":
+                self._plot_Eur_E50(plots, res)
+            elif mode == "Eur":
+                self._plot_Eur(plots, res)
+            self._plot_volume_strain(plots, res, with_dilatancy=with_dilatancy)
+        # Если необходимо разрывное построение девиатора
+        elif plots["is_split_deviator"]:
+            if mode == "E":
+                self._plot_E_split(plots, res)
+            elif mode == "E50":
+                self._plot_E50_split(plots, res)
+            elif mode == "E и E50":
+                self._plot_E_E50_split(plots, res)
+            elif mode == "Eur_E":
+                self._plot_Eur_E_split(plots, res)
+            elif mode == "Eur_E50":
+                self._plot_Eur_E50_split(plots, res)
+            elif mode == "Eur":
+                self._plot_Eur_split(plots, res)
+
+            self._plot_volume_strain(plots, res, with_dilatancy=with_dilatancy)
+            # self._plot_volume_strain_split(plots, res, with_dilatancy=with_dilatancy)
+
     def clear_split_axis(self, fig_type='deviator'):
         try:
             if fig_type == 'deviator':
@@ -264,16 +272,17 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
             pass
 
     def _plot_E(self, plots, res, plot_dots=True):
-        self.clear_split_axis()
-        self.replot_deviator_axis()
+        if self.deviator_plot.begin("deviator"):
+            self.clear_split_axis()
+            self.replot_deviator_axis()
 
-        self.deviator_ax.clear()
-        self.deviator_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
-        self.deviator_ax.set_ylabel("Напряжение $𝜎_1$', МПa")
+            self.deviator_ax.clear()
+            self.deviator_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
+            self.deviator_ax.set_ylabel("Напряжение $𝜎_1$', МПa")
 
-        self.deviator_ax2.clear()
-        self.deviator_ax2.set_ylabel("Девиатор q, МПа", fontsize=8)
-        self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
+            self.deviator_ax2.clear()
+            self.deviator_ax2.set_ylabel("Девиатор q, МПа", fontsize=8)
+            self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
 
         if plots["strain"] is not None:
 
@@ -284,22 +293,23 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
                 _label = "$E_{50} = $" + str(res["E50"]) + "; $E$ = " + str(res["E"][0]) + "; $E_{ur}$ = " + str(
                     res["Eur"]) if res["Eur"] else "$E_{50} = $" + str(res["E50"]) + "; $E$ = " + "-"
 
-            self.deviator_ax.plot(plots["strain"], plots["deviator"] + plots["sigma_3"],
-                                  **plotter_params["static_loading_main_line"])
-            self.deviator_ax.plot(plots["strain_cut"], plots["deviator_cut"] + plots["sigma_3"],
-                                  **plotter_params["static_loading_gray_line"])
+            self.deviator_plot.line(self.deviator_ax, "deviator", plots["strain"], plots["deviator"] + plots["sigma_3"],
+                                    **plotter_params["static_loading_main_line"])
+            self.deviator_plot.line(self.deviator_ax, "deviator_cut", plots["strain_cut"],
+                                    plots["deviator_cut"] + plots["sigma_3"],
+                                    **plotter_params["static_loading_gray_line"])
             if plot_dots:
-                self.deviator_ax.scatter(*plots["E_point_1"], s=20, color="black")
-                self.deviator_ax.scatter(*plots["E_point_2"], s=20, color="black")
+                self.deviator_plot.points(self.deviator_ax, "E_points", [plots["E_point_1"], plots["E_point_2"]],
+                                          size=20, color="black")
 
-            self.deviator_ax.plot(plots["E"]["x"], plots["E"]["y"] + plots["sigma_3"], label=_label,
-                                  **plotter_params["static_loading_black_dotted_line"])
+            self.deviator_plot.line(self.deviator_ax, "E", plots["E"]["x"], plots["E"]["y"] + plots["sigma_3"],
+                                    label=_label, **plotter_params["static_loading_black_dotted_line"])
 
-            self.deviator_ax2.plot(plots["strain"], plots["deviator"],
-                                   **plotter_params["static_loading_main_line"])
+            self.deviator_plot.line(self.deviator_ax2, "inset_deviator", plots["strain"], plots["deviator"],
+                                    **plotter_params["static_loading_main_line"])
 
-            self.deviator_ax2.plot(plots["E"]["x"], plots["E"]["y"], label=_label,
-                                  **plotter_params["static_loading_black_dotted_line"])
+            self.deviator_plot.line(self.deviator_ax2, "inset_E", plots["E"]["x"], plots["E"]["y"], label=_label,
+                                    **plotter_params["static_loading_black_dotted_line"])
 
         label = "$K_{E_{50}} = $" + str(res["K_E50"]) + "; " + "$K_{E_{ur}} = $" + str(res["K_Eur"]) if res[
             "K_Eur"] else "$K_{E_{50}} = $" + str(res["K_E50"])
@@ -307,10 +317,10 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         if res["q_rel"]:
             label = label + "; " + "$q_{rel} = $" + str(res["q_rel"])
 
-        self.deviator_ax.plot([], [], label=label, color="#eeeeee")
+        self.deviator_plot.label(self.deviator_ax, "K", label)
 
-        self.deviator_ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.92), fontsize=10)
-        self.deviator_canvas.draw()
+        self.deviator_plot.legend(self.deviator_ax, loc='upper right', bbox_to_anchor=(0.98, 0.92), fontsize=10)
+        self.deviator_plot.finish()
 
     def _plot_E_split(self, plots, res):
         self.clear_split_axis()
@@ -774,16 +784,17 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         self.deviator_canvas.draw()
 
     def _plot_Eur_E(self, plots, res, plot_dots=True):
-        self.clear_split_axis()
-        self.replot_deviator_axis()
+        if self.deviator_plot.begin("deviator"):
+            self.clear_split_axis()
+            self.replot_deviator_axis()
 
-        self.deviator_ax.clear()
-        self.deviator_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
-        self.deviator_ax.set_ylabel("Напряжение $𝜎_1$', МПa")
+            self.deviator_ax.clear()
+            self.deviator_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
+            self.deviator_ax.set_ylabel("Напряжение $𝜎_1$', МПa")
 
-        self.deviator_ax2.clear()
-        self.deviator_ax2.set_ylabel("Девиатор q, МПа", fontsize=8)
-        self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
+            self.deviator_ax2.clear()
+            self.deviator_ax2.set_ylabel("Девиатор q, МПа", fontsize=8)
+            self.deviator_ax2.set_xlabel("Относительная деформация $ε_1$, д.е.", fontsize=8)
 
         if plots["strain"] is not None:
 
@@ -795,22 +806,25 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
                     res["Eur"]) if res["Eur"] else "$E_{50} = $" + str(res["E50"]) + "; $E$ = " + "-"
 
             if plots["Eur"]:
-                self.deviator_ax.plot(plots["strain"], plots["deviator"] + plots["sigma_3"],
-                                      **plotter_params["static_loading_main_line"])
-                self.deviator_ax.plot(plots["strain_cut"], plots["deviator_cut"] + plots["sigma_3"],
-                                      **plotter_params["static_loading_gray_line"])
+                self.deviator_plot.line(self.deviator_ax, "deviator", plots["strain"],
+                                        plots["deviator"] + plots["sigma_3"],
+                                        **plotter_params["static_loading_main_line"])
+                self.deviator_plot.line(self.deviator_ax, "deviator_cut", plots["strain_cut"],
+                                        plots["deviator_cut"] + plots["sigma_3"],
+                                        **plotter_params["static_loading_gray_line"])
 
-                self.deviator_ax.plot(plots["E"]["x"], plots["E"]["y"] + plots["sigma_3"], label=_label,
-                                      **plotter_params["static_loading_black_dotted_line"])
+                self.deviator_plot.line(self.deviator_ax, "E", plots["E"]["x"], plots["E"]["y"] + plots["sigma_3"],
+                                        label=_label, **plotter_params["static_loading_black_dotted_line"])
 
                 if plot_dots:
-                    self.deviator_ax.scatter(*plots["E_point_1"], s=20, color="black")
-                    self.deviator_ax.scatter(*plots["E_point_2"], s=20, color="black")
+                    self.deviator_plot.points(self.deviator_ax, "E_points", [plots["E_point_1"], plots["E_point_2"]],
+                                              size=20, color="black")
 
-                self.deviator_ax2.plot(plots["strain_Eur"], plots["deviator_Eur"],
-                                       **plotter_params["static_loading_main_line"])
+                self.deviator_plot.line(self.deviator_ax2, "inset_deviator", plots["strain_Eur"],
+                                        plots["deviator_Eur"], **plotter_params["static_loading_main_line"])
                 if statment.general_parameters.test_mode != "Виброползучесть":
-                    self.deviator_ax2.plot(*plots["Eur"], **plotter_params["static_loading_black_dotted_line"])
+                    self.deviator_plot.line(self.deviator_ax2, "inset_Eur", *plots["Eur"],
+                                            **plotter_params["static_loading_black_dotted_line"])
 
                 label = "$K_{E_{50}} = $" + str(res["K_E50"]) + "; " + "$K_{E_{ur}} = $" + str(res["K_Eur"]) if res[
                     "K_Eur"] else "$K_{E_{50}} = $" + str(res["K_E50"])
@@ -818,10 +832,10 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
                 if res["q_rel"]:
                     label = label + "; " + "$q_{rel} = $" + str(res["q_rel"])
 
-                self.deviator_ax.plot([], [], label=label, color="#eeeeee")
+                self.deviator_plot.label(self.deviator_ax, "K", label)
 
-        self.deviator_ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.82), fontsize=10)
-        self.deviator_canvas.draw()
+        self.deviator_plot.legend(self.deviator_ax, loc='upper right', bbox_to_anchor=(0.98, 0.82), fontsize=10)
+        self.deviator_plot.finish()
 
     def _plot_Eur_E_split(self, plots, res):
         self.clear_split_axis()
@@ -1180,34 +1194,36 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         self.deviator_canvas.draw()
 
     def _plot_volume_strain(self, plots, res, with_dilatancy=False):
-        self.clear_split_axis(fig_type='volume')
-        self.replot_volume_strain_axis()
+        if self.volume_strain_plot.begin("volume_strain"):
+            self.clear_split_axis(fig_type='volume')
+            self.replot_volume_strain_axis()
 
-        self.volume_strain_ax.clear()
-        self.volume_strain_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
-        self.volume_strain_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
+            self.volume_strain_ax.clear()
+            self.volume_strain_ax.set_xlabel("Относительная деформация $ε_1$, д.е.")
+            self.volume_strain_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
 
-        self.volume_strain_ax.plot(plots["strain"], plots["volume_strain"],
-                                   **plotter_params["static_loading_main_line"])
-        self.volume_strain_ax.plot(plots["strain"], plots["volume_strain_approximate"],
-                                   **plotter_params["static_loading_red_dotted_line"])
+        self.volume_strain_plot.line(self.volume_strain_ax, "volume_strain", plots["strain"], plots["volume_strain"],
+                                     **plotter_params["static_loading_main_line"])
+        self.volume_strain_plot.line(self.volume_strain_ax, "volume_strain_approximate", plots["strain"],
+                                     plots["volume_strain_approximate"],
+                                     **plotter_params["static_loading_red_dotted_line"])
 
         self.volume_strain_ax.set_xlim(self.deviator_ax.get_xlim())
 
-        self.volume_strain_ax.plot([], [], label="Poissons ratio" + ", д.е. = " + str(res["poissons_ratio"]),
-                                   color="#eeeeee")
+        self.volume_strain_plot.label(self.volume_strain_ax, "poissons_ratio",
+                                      "Poissons ratio" + ", д.е. = " + str(res["poissons_ratio"]))
 
         if with_dilatancy:
             if plots["dilatancy"]:
-                self.volume_strain_ax.plot(plots["dilatancy"]["x"], plots["dilatancy"]["y"],
-                                           **plotter_params["static_loading_black_dotted_line"])
+                self.volume_strain_plot.line(self.volume_strain_ax, "dilatancy", plots["dilatancy"]["x"],
+                                             plots["dilatancy"]["y"],
+                                             **plotter_params["static_loading_black_dotted_line"])
         if res["dilatancy_angle"] is not None:
-            self.volume_strain_ax.plot([], [],
-                                        label="Dilatancy angle" + ", град. = " + str(res["dilatancy_angle"][0]),
-                                        color="#eeeeee")
+            self.volume_strain_plot.label(self.volume_strain_ax, "dilatancy_angle",
+                                          "Dilatancy angle" + ", град. = " + str(res["dilatancy_angle"][0]))
 
-        self.volume_strain_ax.legend()
-        self.volume_strain_canvas.draw()
+        self.volume_strain_plot.legend(self.volume_strain_ax)
+        self.volume_strain_plot.finish()
 
     def _plot_volume_strain_split(self, plots, res, with_dilatancy=False):
         self.clear_split_axis(fig_type='volume')
@@ -1333,22 +1349,15 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
     def _combo_changed(self):
         pass
 
+    def _is_split_deviator(self):
+        return self.split_deviator_radio_button.isChecked()
+
     def save_canvas(self, format=["svg", "svg"], size=[[6, 2], [6, 2]]):
         """Сохранение графиков для передачи в отчет"""
         def save(figure, canvas, size_figure, ax, file_type):
 
             ax.get_legend().remove()
-            canvas.draw()
-
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
+            path = render_to_file(figure, size_figure, file_type)
             ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.75))
 
             canvas.draw()
@@ -1357,7 +1366,6 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
         def save_split(figure, canvas, size_figure, ax, file_type):
 
             ax.get_legend().remove()
-            canvas.draw()
 
             try:
                 self.deviator_ax_2.tick_params(axis='y',
@@ -1380,21 +1388,13 @@ class ModelTriaxialDeviatorLoadingUI(QWidget):
             except:
                 pass
 
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
+            path = render_to_file(figure, size_figure, file_type)
             ax.legend(loc='upper right', bbox_to_anchor=(0.98, 0.75))
 
             canvas.draw()
             return path
 
-        if self.split_deviator_radio_button.isChecked():
+        if self._is_split_deviator():
             result = [save_split(fig, can, size, ax, _format) for fig, can, size, ax, _format in zip([self.deviator_figure,
                                                                                 self.volume_strain_figure],
                                                        [self.deviator_canvas, self.volume_strain_canvas], size,
@@ -1544,6 +1544,7 @@ class ModelTriaxialConsolidationUI(QWidget):
         self.sqrt_ax.set_xlabel("Время")
         self.sqrt_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
         self.sqrt_canvas.draw()
+        self.sqrt_plot = PersistentPlot(self.sqrt_figure, self.sqrt_canvas)
         self.sqrt_frame_layout.setSpacing(0)
         self.sqrt_frame_layout.addWidget(self.sqrt_canvas)
         self.sqrt_toolbar = NavigationToolbar(self.sqrt_canvas, self)
@@ -1562,6 +1563,7 @@ class ModelTriaxialConsolidationUI(QWidget):
         self.log_ax.set_xlabel("Время")
         self.log_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
         self.log_canvas.draw()
+        self.log_plot = PersistentPlot(self.log_figure, self.log_canvas)
         self.log_frame_layout.setSpacing(0)
         self.log_frame_layout.addWidget(self.log_canvas)
         self.log_toolbar = NavigationToolbar(self.log_canvas, self)
@@ -1581,129 +1583,131 @@ class ModelTriaxialConsolidationUI(QWidget):
     def plot_sqrt(self, plots, res):
         """Построение графиков опыта"""
         try:
-            self.sqrt_ax.clear()
-            self.sqrt_ax.set_xlabel("Время")
-            self.sqrt_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
+            if self.sqrt_plot.begin("sqrt"):
+                self.sqrt_ax.clear()
+                self.sqrt_ax.set_xlabel("Время")
+                self.sqrt_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
 
             if plots is not None:
                 # Квадратный корень
                 # Основной график
-                self.sqrt_ax.plot(plots["time_sqrt"], plots["volume_strain_approximate"], **plotter_params["static_loading_main_line"])
+                self.sqrt_plot.line(self.sqrt_ax, "volume_strain", plots["time_sqrt"],
+                                    plots["volume_strain_approximate"], **plotter_params["static_loading_main_line"])
                 # Точки концов линий
-                self.sqrt_ax.scatter(*plots["sqrt_line_points"].line_start_point, zorder=5, color="dimgray")
-                self.sqrt_ax.scatter(*plots["sqrt_line_points"].line_end_point, zorder=5, color="dimgray")
+                self.sqrt_plot.points(self.sqrt_ax, "line_points", [plots["sqrt_line_points"].line_start_point,
+                                                                    plots["sqrt_line_points"].line_end_point],
+                                      zorder=5, color="dimgray")
 
                 # Линии обработки
                 if plots["sqrt_line_points"].line_start_point and plots["sqrt_line_points"].line_end_point:
                     # Основные линии обработки
-                    self.sqrt_ax.plot(*point_to_xy(plots["sqrt_line_points"].line_start_point,
-                                              plots["sqrt_line_points"].line_end_point),
-                                 **plotter_params["static_loading_sandybrown_line"])
+                    self.sqrt_plot.line(self.sqrt_ax, "line", *point_to_xy(plots["sqrt_line_points"].line_start_point,
+                                                                           plots["sqrt_line_points"].line_end_point),
+                                        **plotter_params["static_loading_sandybrown_line"])
 
                 if plots["sqrt_line_points"].Cv:
-                    self.sqrt_ax.plot(
+                    self.sqrt_plot.line(self.sqrt_ax, "Cv_line",
                         *point_to_xy(plots["sqrt_line_points"].line_start_point, plots["sqrt_line_points"].Cv),
                         **plotter_params["static_loading_sandybrown_line"])
 
                     # Точки обработки
-                    self.sqrt_ax.scatter(*plots["sqrt_line_points"].Cv, zorder=5, color="tomato")
+                    self.sqrt_plot.points(self.sqrt_ax, "Cv", [plots["sqrt_line_points"].Cv], zorder=5,
+                                          color="tomato")
 
                     # Пунктирные линии
-                    self.sqrt_ax.plot(*plots["sqrt_t90_vertical_line"],
-                                      **plotter_params["static_loading_black_dotted_line"])
-                    self.sqrt_ax.plot(*plots["sqrt_t90_horizontal_line"],
-                                      **plotter_params["static_loading_black_dotted_line"])
+                    for name in ["sqrt_t90_vertical_line", "sqrt_t90_horizontal_line"]:
+                        self.sqrt_plot.line(self.sqrt_ax, name, *plots[name],
+                                            **plotter_params["static_loading_black_dotted_line"])
 
                     if plots["sqrt_t100_vertical_line"]:
-                        self.sqrt_ax.plot(*plots["sqrt_t100_vertical_line"],
-                                          **plotter_params["static_loading_black_dotted_line"])
-                        self.sqrt_ax.plot(*plots["sqrt_t100_horizontal_line"],
-                                          **plotter_params["static_loading_black_dotted_line"])
-                        self.sqrt_ax.plot(*plots["sqrt_t50_vertical_line"],
-                                          **plotter_params["static_loading_black_dotted_line"])
-                        self.sqrt_ax.plot(*plots["sqrt_t50_horizontal_line"],
-                                          **plotter_params["static_loading_black_dotted_line"])
+                        for name in ["sqrt_t100_vertical_line", "sqrt_t100_horizontal_line",
+                                     "sqrt_t50_vertical_line", "sqrt_t50_horizontal_line"]:
+                            self.sqrt_plot.line(self.sqrt_ax, name, *plots[name],
+                                                **plotter_params["static_loading_black_dotted_line"])
 
                     # Текстовые подписи
-                    self.sqrt_ax.text(*plots["sqrt_t90_text"], '$\sqrt{t_{90}}$', horizontalalignment='center',
-                                 verticalalignment='bottom')
-                    self.sqrt_ax.text(*plots["sqrt_strain90_text"], '$ε_{90}$', horizontalalignment='right',
-                                 verticalalignment='center')
+                    self.sqrt_plot.text(self.sqrt_ax, "t90_text", *plots["sqrt_t90_text"], '$\\sqrt{t_{90}}$',
+                                        horizontalalignment='center', verticalalignment='bottom')
+                    self.sqrt_plot.text(self.sqrt_ax, "strain90_text", *plots["sqrt_strain90_text"], '$ε_{90}$',
+                                        horizontalalignment='right', verticalalignment='center')
                     if plots["sqrt_t100_text"]:
-                        self.sqrt_ax.text(*plots["sqrt_t100_text"], '$\sqrt{t_{100}}$', horizontalalignment='center',
-                                     verticalalignment='bottom')
-                        self.sqrt_ax.text(*plots["sqrt_strain100_text"], '$ε_{100}$', horizontalalignment='right',
-                                     verticalalignment='center')
-                        self.sqrt_ax.text(*plots["sqrt_t50_text"], '$\sqrt{t_{50}}$', horizontalalignment='center',
-                                          verticalalignment='bottom')
-                        self.sqrt_ax.text(*plots["sqrt_strain50_text"], '$ε_{50}$', horizontalalignment='right',
-                                          verticalalignment='center')
-
-                    self.sqrt_ax.plot([], [], label="$C_{v}$" + " = " + str(res["Cv_sqrt"]),
-                                 color="#eeeeee")
-                    self.sqrt_ax.plot([], [], label="$t_{100}$" + " = " + str(round(res["t100_sqrt"])),
-                                 color="#eeeeee")
-                    self.sqrt_ax.plot([], [], label="$t_{50}$" + " = " + str(round(res["t50_sqrt"], 3)),
-                                      color="#eeeeee")
-                    self.sqrt_ax.legend()
-
-            self.sqrt_canvas.draw()
+                        self.sqrt_plot.text(self.sqrt_ax, "t100_text", *plots["sqrt_t100_text"],
+                                            '$\\sqrt{t_{100}}$', horizontalalignment='center',
+                                            verticalalignment='bottom')
+                        self.sqrt_plot.text(self.sqrt_ax, "strain100_text", *plots["sqrt_strain100_text"],
+                                            '$ε_{100}$', horizontalalignment='right', verticalalignment='center')
+                        self.sqrt_plot.text(self.sqrt_ax, "t50_text", *plots["sqrt_t50_text"], '$\\sqrt{t_{50}}$',
+                                            horizontalalignment='center', verticalalignment='bottom')
+                        self.sqrt_plot.text(self.sqrt_ax, "strain50_text", *plots["sqrt_strain50_text"],
+                                            '$ε_{50}$', horizontalalignment='right', verticalalignment='center')
+
+                    self.sqrt_plot.label(self.sqrt_ax, "Cv_label", "$C_{v}$" + " = " + str(res["Cv_sqrt"]))
+                    self.sqrt_plot.label(self.sqrt_ax, "t100_label",
+                                         "$t_{100}$" + " = " + str(round(res["t100_sqrt"])))
+                    self.sqrt_plot.label(self.sqrt_ax, "t50_label",
+                                         "$t_{50}$" + " = " + str(round(res["t50_sqrt"], 3)))
+                    self.sqrt_plot.legend(self.sqrt_ax)
+
+            self.sqrt_plot.finish()
         except:
             pass
 
     def plot_log(self, plots, res):
         """Построение графиков опыта"""
         try:
-            self.log_ax.clear()
-            self.log_ax.set_xlabel("Время")
-            self.log_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
+            if self.log_plot.begin("log"):
+                self.log_ax.clear()
+                self.log_ax.set_xlabel("Время")
+                self.log_ax.set_ylabel("Объемная деформация $ε_v$, д.е.")
 
             if plots is not None:
                 # Логарифм
                 # Основной график
-                self.log_ax.plot(plots["time_log"], plots["volume_strain_approximate"], **plotter_params["static_loading_main_line"])
+                self.log_plot.line(self.log_ax, "volume_strain", plots["time_log"],
+                                   plots["volume_strain_approximate"], **plotter_params["static_loading_main_line"])
 
                 # Линии обработки
                 if plots["log_line_points"]:
                     # Основные линии обработки
-                    self.log_ax.plot(*point_to_xy(plots["log_line_points"].first_line_start_point,
-                                             plots["log_line_points"].first_line_end_point),
-                                **plotter_params["static_loading_sandybrown_line"])
-                    self.log_ax.plot(*point_to_xy(plots["log_line_points"].second_line_start_point,
-                                             plots["log_line_points"].second_line_end_point),
-                                **plotter_params["static_loading_sandybrown_line"])
+                    self.log_plot.line(self.log_ax, "first_line",
+                                       *point_to_xy(plots["log_line_points"].first_line_start_point,
+                                                    plots["log_line_points"].first_line_end_point),
+                                       **plotter_params["static_loading_sandybrown_line"])
+                    self.log_plot.line(self.log_ax, "second_line",
+                                       *point_to_xy(plots["log_line_points"].second_line_start_point,
+                                                    plots["log_line_points"].second_line_end_point),
+                                       **plotter_params["static_loading_sandybrown_line"])
 
                     # Точки концов линий
-                    self.log_ax.scatter(*plots["log_line_points"].first_line_start_point, zorder=5, color="dimgray")
-                    self.log_ax.scatter(*plots["log_line_points"].first_line_end_point, zorder=5, color="dimgray")
-                    self.log_ax.scatter(*plots["log_line_points"].second_line_start_point, zorder=5, color="dimgray")
-                    self.log_ax.scatter(*plots["log_line_points"].second_line_end_point, zorder=5, color="dimgray")
+                    self.log_plot.points(self.log_ax, "line_points",
+                                         [plots["log_line_points"].first_line_start_point,
+                                          plots["log_line_points"].first_line_end_point,
+                                          plots["log_line_points"].second_line_start_point,
+                                          plots["log_line_points"].second_line_end_point],
+                                         zorder=5, color="dimgray")
 
                     # Точки обработки
                     if plots["log_line_points"].Cv:
-                        self.log_ax.scatter(*plots["log_line_points"].Cv, zorder=5, color="tomato")
-                        self.log_ax.scatter(*plots["d0"], zorder=5, color="tomato")
+                        self.log_plot.points(self.log_ax, "Cv", [plots["log_line_points"].Cv, plots["d0"]],
+                                             zorder=5, color="tomato")
 
                         # Пунктирные линии
-                        self.log_ax.plot(*plots["log_t100_vertical_line"],
-                                         **plotter_params["static_loading_black_dotted_line"])
-                        self.log_ax.plot(*plots["log_t100_horizontal_line"],
-                                         **plotter_params["static_loading_black_dotted_line"])
+                        for name in ["log_t100_vertical_line", "log_t100_horizontal_line"]:
+                            self.log_plot.line(self.log_ax, name, *plots[name],
+                                               **plotter_params["static_loading_black_dotted_line"])
 
                         # Текстовые подписи
-                        self.log_ax.text(*plots["log_t100_text"], '$\sqrt{t_{100}}$', horizontalalignment='center',
-                                    verticalalignment='bottom')
-                        self.log_ax.text(*plots["log_strain100_text"], '$ε_{100}$', horizontalalignment='right',
-                                    verticalalignment='center')
+                        self.log_plot.text(self.log_ax, "t100_text", *plots["log_t100_text"], '$\\sqrt{t_{100}}$',
+                                           horizontalalignment='center', verticalalignment='bottom')
+                        self.log_plot.text(self.log_ax, "strain100_text", *plots["log_strain100_text"],
+                                           '$ε_{100}$', horizontalalignment='right', verticalalignment='center')
 
-                    self.log_ax.plot([], [], label="$C_{v}$" + " = " + str(res["Cv_log"]), color="#eeeeee")
-                    self.log_ax.plot([], [], label="$t_{100}$" + " = " + str(res["t100_log"]),
-                                color="#eeeeee")
-                    self.log_ax.plot([], [], label="$C_{a}$" + " = " + str(res["Ca_log"]), color="#eeeeee")
-                    self.log_ax.legend()
+                    self.log_plot.label(self.log_ax, "Cv_label", "$C_{v}$" + " = " + str(res["Cv_log"]))
+                    self.log_plot.label(self.log_ax, "t100_label", "$t_{100}$" + " = " + str(res["t100_log"]))
+                    self.log_plot.label(self.log_ax, "Ca_label", "$C_{a}$" + " = " + str(res["Ca_log"]))
+                    self.log_plot.legend(self.log_ax)
 
-            self.sqrt_canvas.draw()
-            self.log_canvas.draw()
+            self.log_plot.finish()
 
         except:
             pass
@@ -1747,29 +1751,11 @@ class ModelTriaxialConsolidationUI(QWidget):
         def save(figure, canvas, size_figure, ax, file_type):
             try:
                 ax.get_legend().remove()
-                canvas.draw()
-
-                path = BytesIO()
-                size = figure.get_size_inches()
-                figure.set_size_inches(size_figure)
-                if file_type == "svg":
-                    figure.savefig(path, format='svg', transparent=True)
-                elif file_type == "jpg":
-                    figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-                path.seek(0)
-                figure.set_size_inches(size)
+                path = render_to_file(figure, size_figure, file_type)
                 ax.legend()
                 canvas.draw()
             except AttributeError:
-                path = BytesIO()
-                size = figure.get_size_inches()
-                figure.set_size_inches(size_figure)
-                if file_type == "svg":
-                    figure.savefig(path, format='svg', transparent=True)
-                elif file_type == "jpg":
-                    figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-                path.seek(0)
-                figure.set_size_inches(size)
+                path = render_to_file(figure, size_figure, file_type)
 
             return path
 
@@ -1852,17 +1838,7 @@ class ModelTriaxialReconsolidationUI(QWidget):
         """Сохранение графиков для передачи в отчет"""
 
         def save(figure, canvas, size_figure, file_type):
-            path = BytesIO()
-            size = figure.get_size_inches()
-            figure.set_size_inches(size_figure)
-            if file_type == "svg":
-                figure.savefig(path, format='svg', transparent=True)
-            elif file_type == "jpg":
-                figure.savefig(path, format='jpg', dpi=200, bbox_inches='tight')
-            path.seek(0)
-            figure.set_size_inches(size)
-            canvas.draw()
-            return path
+            return render_to_file(figure, size_figure, file_type)
 
         return save(self.figure, self.canvas, [6, 4], "svg")
 
@@ -1990,3 +1966,69 @@ class ModelTriaxialItemUI(TableVertical):
             "m": "Показатель степени жесткости"
         }
         super().__init__(fill_keys=fill_keys, size={"size": 100, "size_fixed_index": [1]})
+
+
+class ModelTriaxialDeviatorLoadingFigures:
+    """Графики девиаторного нагружения без виджетов Qt для пакетного сохранения протоколов.
+    Построение выполняется методами ModelTriaxialDeviatorLoadingUI на фигурах с холстом Agg."""
+    replot_deviator_axis = ModelTriaxialDeviatorLoadingUI.replot_deviator_axis
+    replot_volume_strain_axis = ModelTriaxialDeviatorLoadingUI.replot_volume_strain_axis
+    clear_split_axis = ModelTriaxialDeviatorLoadingUI.clear_split_axis
+    _plot_by_mode = ModelTriaxialDeviatorLoadingUI._plot_by_mode
+    _plot_E = ModelTriaxialDeviatorLoadingUI._plot_E
+    _plot_E_split = ModelTriaxialDeviatorLoadingUI._plot_E_split
+    _plot_E_E50 = ModelTriaxialDeviatorLoadingUI._plot_E_E50
+    _plot_E_E50_split = ModelTriaxialDeviatorLoadingUI._plot_E_E50_split
+    _plot_E50 = ModelTriaxialDeviatorLoadingUI._plot_E50
+    _plot_E50_split = ModelTriaxialDeviatorLoadingUI._plot_E50_split
+    _plot_Eur_E = ModelTriaxialDeviatorLoadingUI._plot_Eur_E
+    _plot_Eur_E_split = ModelTriaxialDeviatorLoadingUI._plot_Eur_E_split
+    _plot_Eur_E50 = ModelTriaxialDeviatorLoadingUI._plot_Eur_E50
+    _plot_Eur_E50_split = ModelTriaxialDeviatorLoadingUI._plot_Eur_E50_split
+    _plot_Eur = ModelTriaxialDeviatorLoadingUI._plot_Eur
+    _plot_Eur_split = ModelTriaxialDeviatorLoadingUI._plot_Eur_split
+    _plot_volume_strain = ModelTriaxialDeviatorLoadingUI._plot_volume_strain
+    save_canvas = ModelTriaxialDeviatorLoadingUI.save_canvas
+
+    def __init__(self):
+        self.plot_params = {"right": 0.98, "top": 0.98, "bottom": 0.14, "wspace": 0.12, "hspace": 0.07, "left": 0.12}
+        self._split_deviator = False
+
+        self.deviator_figure, self.deviator_canvas = create_offscreen_figure(**self.plot_params)
+        self.deviator_ax = self.deviator_figure.add_subplot(111)
+        self.deviator_ax.grid(axis='both', linewidth='0.4')
+        self.deviator_ax2 = self.deviator_figure.add_axes([0.62, 0.3, .35, .35])
+        self.deviator_plot = PersistentPlot(self.deviator_figure, self.deviator_canvas)
+
+        self.volume_strain_figure, self.volume_strain_canvas = create_offscreen_figure(**self.plot_params)
+        self.volume_strain_ax = self.volume_strain_figure.add_subplot(111)
+        self.volume_strain_ax.grid(axis='both', linewidth='0.4')
+        self.volume_strain_plot = PersistentPlot(self.volume_strain_figure, self.volume_strain_canvas)
+
+    def plot(self, plots, res, mode, with_dilatancy=False, plot_dots=False):
+        """Построение графиков опыта в режиме mode (аналог выбора в combo_box виджета)"""
+        self._split_deviator = bool(plots["is_split_deviator"])
+        self._plot_by_mode(mode, plots, res, plot_dots, with_dilatancy=with_dilatancy)
+
+    def _is_split_deviator(self):
+        return self._split_deviator
+
+
+class ModelTriaxialConsolidationFigures:
+    """Графики консолидации без виджетов Qt для пакетного сохранения протоколов"""
+    plot_sqrt = ModelTriaxialConsolidationUI.plot_sqrt
+    plot_log = ModelTriaxialConsolidationUI.plot_log
+    save_canvas = ModelTriaxialConsolidationUI.save_canvas
+
+    def __init__(self):
+        self.plot_params = {"right": 0.98, "top": 0.98, "bottom": 0.14, "wspace": 0.12, "hspace": 0.07, "left": 0.12}
+
+        self.sqrt_figure, self.sqrt_canvas = create_offscreen_figure(**self.plot_params)
+        self.sqrt_ax = self.sqrt_figure.add_subplot(111)
+        self.sqrt_ax.grid(axis='both', linewidth='0.4')
+        self.sqrt_plot = PersistentPlot(self.sqrt_figure, self.sqrt_canvas)
+
+        self.log_figure, self.log_canvas = create_offscreen_figure(**self.plot_params)
+        self.log_ax = self.log_figure.add_subplot(111)
+        self.log_ax.grid(axis='both', linewidth='0.4')
+        self.log_plot = PersistentPlot(self.log_figure, self.log_canvas)
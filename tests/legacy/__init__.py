@@ -0,0 +1,3 @@
+"""Прежние реализации оптимизированных функций и входные данные для сравнения с ними.
+
+Реализации заморожены: тесты проверяют по ним новые версии, модули benchmarks берут их отсюда для замеров."""
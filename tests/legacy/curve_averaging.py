@@ -0,0 +1,159 @@
+"""Прежнее осреднение кривых для PLAXIS: точки всех опытов собирались в список кортежей, сортировались по ключу
+и разбивались на сектора словарем в цикле. Синтетические опыты и модели осреднения для сравнения"""
+import numpy as np
+import scipy.ndimage as ndimage
+
+from plaxis_average.model.averaged_model import AveragedItemModel
+from static_loading.plaxis_averaged_model import AveragedModel
+
+
+def legacy_plaxis_average(self) -> (np.array, np.array):
+    param = self.approximate_param_poly if self.approximate_type == "poly" else self.approximate_param_sectors
+
+    points = []
+
+    if self.first_time:
+        max_strain = max([max(self.tests[test]["strain"]) for test in self.tests])
+        max_strain = 0.1 if max_strain < 0.1 else max_strain
+        self.approximate_param_max_deformation = max_strain
+    else:
+        max_strain = self.approximate_param_max_deformation
+
+    for test in self.tests:
+        if self.tests[test]["strain"][-1] <= max_strain:
+            i_max = np.argmax(self.tests[test]["deviator"])
+            points_count = int((max_strain - self.tests[test]["strain"][i_max]) * (1000 / 0.15))
+            strain_for_sum = np.hstack((self.tests[test]["strain"][:i_max],
+                                        np.linspace(self.tests[test]["strain"][i_max], max_strain, points_count)))
+            deviator_for_sum = np.hstack(
+                (self.tests[test]["deviator"][:i_max], np.full(points_count, self.tests[test]["deviator"][i_max])))
+
+        else:
+            i, = np.where(self.tests[test]["strain"] >= max_strain)
+            i = i[0]
+
+            strain_for_sum = self.tests[test]["strain"][:i]
+            deviator_for_sum = self.tests[test]["deviator"][:i]
+
+        for point in zip(strain_for_sum, deviator_for_sum):
+            points.append(point)
+
+    points.sort(key=lambda point: point[0])
+
+    strain = [point[0] for point in points]
+    deviator = [point[1] for point in points]
+
+    if self.approximate_type == "sectors":
+        step = max(strain) / param
+        step_points = {}
+        for i in range(len(strain)):
+            step_x = strain[i] // step
+            step_key = step_x * step
+            if step_points.get(step_key, None):
+                step_points[step_key].append(deviator[i])
+            else:
+                step_points[step_key] = [deviator[i]]
+
+        averange_strain = [0]
+        averange_deviator = [0]
+        for key in step_points.keys():
+            if len(step_points[key]):
+                averange_strain.append(key)
+                averange_deviator.append(sum(step_points[key]) / len(step_points[key]))
+
+        averange_deviator = ndimage.gaussian_filter(np.array(averange_deviator), 3, order=0)
+        averange_deviator[0] = 0
+
+        averange_strain, averange_deviator = np.array(averange_strain), np.array(averange_deviator)
+
+    elif self.approximate_type == "poly":
+        averange_strain = np.linspace(0, max(strain), 50)
+        averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
+        averange_deviator[0] = 0
+
+        averange_strain, averange_deviator = np.array(averange_strain), np.array(averange_deviator)
+
+    averange_deviator = ndimage.gaussian_filter(averange_deviator, 1, order=0)
+    averange_deviator[0] = 0
+    return averange_strain, averange_deviator
+
+
+def legacy_static_average(self, type="poly", param=8) -> (np.array, np.array):
+    points = []
+
+    max_strain = max([max(self.tests[test]["strain"]) for test in self.tests])
+
+    for test in self.tests:
+        if self.tests[test]["strain"][-1] <= max_strain:
+            points_count = int((max_strain - self.tests[test]["strain"][-1]) * (1000 / 0.15))
+            strain_for_sum = np.hstack((self.tests[test]["strain"],  np.linspace(self.tests[test]["strain"][-1], max_strain, points_count)))
+            deviator_for_sum = np.hstack((self.tests[test]["deviator"], np.full(points_count, np.max(self.tests[test]["deviator"][-1]))))
+        else:
+            strain_for_sum = self.tests[test]["strain"]
+            deviator_for_sum = self.tests[test]["deviator"]
+
+        for point in zip(strain_for_sum, deviator_for_sum):
+            points.append(point)
+
+    points.sort(key=lambda point: point[0])
+
+    strain = [point[0] for point in points]
+    deviator = [point[1] for point in points]
+
+    if type == "sectors":
+        step = max(strain) / param
+        step_points = {}
+        for i in range(len(strain)):
+            step_x = strain[i] // step
+            step_key = step_x * step
+            if step_points.get(step_key, None):
+                step_points[step_key].append(deviator[i])
+            else:
+                step_points[step_key] = [deviator[i]]
+
+        averange_strain = [0]
+        averange_deviator = [0]
+        for key in step_points.keys():
+            if len(step_points[key]):
+                averange_strain.append(key)
+                averange_deviator.append(sum(step_points[key]) / len(step_points[key]))
+
+        averange_deviator = ndimage.gaussian_filter(np.array(averange_deviator), 3, order=0)
+        averange_deviator[0] = 0
+
+        return np.array(averange_strain), np.array(averange_deviator)
+
+    elif type == "poly":
+        averange_strain = np.linspace(0, max(strain), 50)
+        averange_deviator = np.polyval(np.polyfit(strain, ndimage.gaussian_filter(deviator, 3, order=0), param), averange_strain)
+        averange_deviator[0] = 0
+
+        return np.array(averange_strain), np.array(averange_deviator)
+
+
+def synthetic_tests(count: int, points: int = 3000):
+    """Кривые девиаторного нагружения count опытов с разной предельной деформацией"""
+    rng = np.random.default_rng(0)
+    result = {}
+    for i in range(count):
+        strain = np.linspace(0, rng.uniform(0.08, 0.15), points)
+        qf = rng.uniform(300, 600)
+        deviator = qf * strain / (strain + rng.uniform(0.005, 0.02)) + rng.normal(0, 2, points)
+        result[f"{i}-1"] = {"strain": strain, "deviator": deviator}
+    return result
+
+
+def plaxis_model(test_set, approximate_type, param):
+    model = AveragedItemModel()
+    model.tests = test_set
+    model.first_time = False
+    model.approximate_param_max_deformation = 0.12
+    model.approximate_type = approximate_type
+    model.approximate_param_poly = model.approximate_param_sectors = param
+    return model
+
+
+def static_model(test_set):
+    model = AveragedModel.__new__(AveragedModel)
+    model.tests = test_set
+    return model
@@ -0,0 +1,189 @@
+"""Прежние реализации функций general_functions"""
+import numpy as np
+from scipy.interpolate import make_interp_spline, splev, splrep
+
+from general.general_functions import array_discreate_noise, create_deviation_curve, discrete_array
+
+
+def legacy_find_line_area(x, y, d, step, Uslovie = [0.8, 1]):
+    def findKoeff(x, y, d, step):
+        def distanse(x, y, A, B):
+            return (abs(A * x - y + B)) / ((A ** 2 + 1) ** 0.5)
+
+        arrayA = []
+        arrayB = []
+        arrayPointsCount = []
+
+        for i in range(step, len(x) - step):
+            xData = np.array(x[i - step: i + step])
+            yData = np.array(y[i - step: i + step])
+
+            p = np.polyfit(xData, yData, 1)
+            ya = np.polyval(p, xData)
+
+            A = (ya[-1] - ya[0]) / (xData[-1] - xData[0])
+            B = np.polyval(p, 0)
+
+            points = 0
+            iEnd = i
+
+            for g in range(len(x)):
+                if distanse(x[g], y[g], A, B) < d * distanse(x[i], y[i], A, B):
+                    if g <= iEnd + 10:
+                        iEnd = g
+                        points += 1
+
+            arrayA.append(A)
+            arrayB.append(B)
+            arrayPointsCount.append(points)
+
+        return np.array(arrayA), np.array(arrayB), np.array(arrayPointsCount)
+
+    A, B, Points = findKoeff(x, y, d, step)
+    M1 = []
+    A1 = []
+    B1 = []
+
+    for i in range(len(A)):
+        if abs(A[i]) >= Uslovie[0] * abs(min(A)) and abs(A[i]) <= Uslovie[1] * abs(min(A)):
+            M1.append(Points[i])
+            A1.append(A[i])
+            B1.append(B[i])
+
+    M = np.array(M1)
+    i = np.argmax(M)
+    A = A1[i]
+    B = B1[i]
+
+    return A, B
+
+
+def consolidation_cases(points: int, seed: int = 0):
+    """Вызовы find_line_area для кривой консолидации: (x, y, d, step, Uslovie)"""
+    rng = np.random.default_rng(seed)
+    time_ = np.linspace(0, 1440, points + 1)[1:]
+    volume_strain = -0.02 * (1 - np.exp(-time_ / 60)) - 0.001 * np.log1p(time_)
+    volume_strain += rng.normal(0, 2e-5, points)
+
+    sqrt_time = np.sqrt(time_)
+    log_time = np.log(time_)
+    cases = [(sqrt_time, volume_strain, *params) for params in [(0.3, 3, [0.95, 1]), (0.5, 10, [0.9, 1])]]
+    cases.append((log_time[:int(points * 0.8)], volume_strain[:int(points * 0.8)], 0.5, 3, [0.8, 1]))
+    cases.append((log_time[int(points * 0.75):], volume_strain[int(points * 0.75):], 1, 5, [0.3, 1]))
+    return cases
+
+
+def legacy_discrete_array(array, n_step):
+    current_val = (array[0]//n_step)*n_step
+    for i in range(1, len(array)):
+        count_step = (array[i]-current_val)//n_step
+        array[i] = current_val + count_step*n_step
+        current_val = array[i]
+    return array
+
+
+def legacy_array_discreate_noise(array, discreate_step, num_format, koef_noise_before=float(1), koef_noise_after=0.01):
+    measurement_error = koef_noise_before * discreate_step
+    noise_step = koef_noise_after * discreate_step
+
+    new_array = legacy_discrete_array(array + np.random.uniform(-measurement_error, measurement_error, len(array)),
+                                      discreate_step) + np.random.uniform(-noise_step, noise_step, len(array))
+    str_for_format = "{:." + str(num_format) + "f}"
+    new_array = [float(str_for_format.format(x)) for x in new_array]
+    return new_array
+
+
+def legacy_create_deviation_curve(x, amplitude, val = (1, 1), points = False, borders = False, one_side = False,
+                                  low_first_district = False):
+    def random_value_in_array(x):
+        return np.random.uniform(min(x), max(x))
+
+    def split_amplitude(amplitude, points_of_deviations_count, val, low_first_district):
+        x = np.linspace(0, points_of_deviations_count - 1, points_of_deviations_count)
+
+        if low_first_district:
+            return np.hstack((np.array([amplitude / 10 for _ in range(low_first_district)]), np.array(
+                [((i / x[-1]) * (val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude for i in
+                 x[low_first_district:]])))
+        else:
+            return np.array([((i / x[-1]) * (val[1] * amplitude - val[0] * amplitude)) + val[0] * amplitude for i in x])
+
+    def create_amplitude_array(amplitude, x, val):
+        return np.linspace(amplitude*val[0], amplitude*val[1], len(x))
+
+    if points:
+        points_of_deviations_count = int(points)
+    else:
+        points_of_deviations_count = int(np.random.uniform(5, 10))
+
+    if low_first_district:
+        if low_first_district > points - 1:
+            low_first_district = points - 1
+
+    def create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district):
+        if one_side:
+            y_points_of_deviations_array = np.hstack((0, np.array([np.random.uniform(amp/3, amp) for amp in split_amplitude(amplitude, points_of_deviations_count, val, low_first_district)]), 0))
+        else:
+            y_points_of_deviations_array = np.hstack((0, np.array(
+                [np.random.uniform(-amp, amp) for amp in split_amplitude(amplitude, points_of_deviations_count, val, low_first_district)]), 0))
+
+        x_points_of_deviations_array = np.hstack((x[0],
+                                                  np.array([random_value_in_array(i) for i in np.hsplit(x[:int(points_of_deviations_count*(len(x)//points_of_deviations_count))], points_of_deviations_count)]),
+                                                           x[-1]))
+        return x_points_of_deviations_array, y_points_of_deviations_array
+
+    x_points_of_deviations_array, y_points_of_deviations_array = create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
+
+    if borders == "zero_diff":
+        iterpolate_curve = make_interp_spline(x_points_of_deviations_array, y_points_of_deviations_array, k=3,
+                                              bc_type="clamped")
+        deviation_curve = iterpolate_curve(x)
+
+        if one_side:
+            while min(deviation_curve)<0:
+                x_points_of_deviations_array, y_points_of_deviations_array = \
+                    create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
+                iterpolate_curve = make_interp_spline(x_points_of_deviations_array, y_points_of_deviations_array, k=3,
+                                                      bc_type="clamped")
+                deviation_curve = iterpolate_curve(x)
+
+    else:
+        iterpolate_curve = splrep(x_points_of_deviations_array, y_points_of_deviations_array, k=3)
+        deviation_curve = np.array(splev(x, iterpolate_curve, der=0))
+
+        if one_side:
+            while min(deviation_curve)<0:
+                x_points_of_deviations_array, y_points_of_deviations_array = \
+                    create_deviations_array(amplitude, points_of_deviations_count, val, low_first_district)
+                iterpolate_curve = splrep(x_points_of_deviations_array, y_points_of_deviations_array, k=3)
+                deviation_curve = np.array(splev(x, iterpolate_curve, der=0))
+
+    if amplitude != 0:
+        amplitude_array = create_amplitude_array(amplitude, x, val)
+        imax = np.argmax((np.abs(deviation_curve) + min(np.abs(deviation_curve)/1000))/amplitude_array)
+        if deviation_curve[imax] != 0 and amplitude_array[imax]!=0:
+            deviation_curve /= deviation_curve[imax]/amplitude_array[imax]
+
+    return deviation_curve
+
+
+def noise_cases(points: int, seed: int = 0):
+    """Вызовы эмуляции датчиков: (имя, прежняя функция, новая функция, аргументы).
+    Аргументы - функция без параметров, чтобы каждый вызов получал свою копию массива"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, points)
+    deviator = 600 * (1 - np.exp(-8 * x)) + rng.normal(0, 0.3, points)
+    volume_strain = 0.02 * np.sin(5 * x) + rng.normal(0, 2e-5, points)
+    cycles = np.linspace(0, 100, points)
+    return [
+        ("discrete_array 0.5", legacy_discrete_array, discrete_array, lambda: (deviator.copy(), 0.5)),
+        ("discrete_array 0.0001", legacy_discrete_array, discrete_array, lambda: (volume_strain.copy(), 0.0001)),
+        ("array_discreate_noise", legacy_array_discreate_noise, array_discreate_noise,
+         lambda: (deviator.copy(), 0.5, 5)),
+        ("array_discreate_noise 8", legacy_array_discreate_noise, array_discreate_noise,
+         lambda: (volume_strain.copy(), 0.0001, 8, 0.1)),
+        ("create_deviation_curve", legacy_create_deviation_curve, create_deviation_curve,
+         lambda: (cycles, 0.01, (1, 0.1), 100)),
+        ("create_deviation_curve one_side", legacy_create_deviation_curve, create_deviation_curve,
+         lambda: (cycles, 5, (1, 1), 50, "zero_diff", True, 3)),
+    ]
@@ -0,0 +1,216 @@
+"""Прежнее наложение шумов на прямолинейный участок K0, где каждый вызов функции оптимизации выполнял полный
+define_k0, а ограничения строились списками, и синтетические кривые K0"""
+import copy
+
+import numpy as np
+from scipy.interpolate import make_interp_spline
+from scipy.optimize import Bounds, minimize
+
+from k0_test.triaxial_k0_model import ModelK0
+
+
+def legacy_lse_faker_mc(sigma_1_line: np.array, sigma_3_line: np.array, K0nc: float,
+                        is_hs_model: bool = False, noise: float = None):
+    """Прежний ModelK0SoilTest.lse_faker_mc: в каждом вызове функции оптимизации полный define_k0"""
+
+    # Точка начала прямолинейного участка должна быть зафиксирована,
+    #   так как происходят некорретные сдвиги по шумам
+    sigma_3_line_fixed = round(0, ModelK0.SIGMA_PREC)
+    '''точка начала прямолинейного участка'''
+
+    # Проверка числа узов
+    if len(sigma_3_line) < 2:
+        print('NO NOISE')
+        _sigma_1 = sigma_1_line
+        _sigma_3 = sigma_3_line
+        return _sigma_1, _sigma_3
+
+    # Если выбирать точку произвольно то
+    #   придется присать ограничения cons на расположения точек
+    #   после добавления шума
+    fixed_point_index = 1
+
+    if noise is None:
+        noise = max([abs(sigma_3_line[i+1]-sigma_3_line[i]) for i in range(len(sigma_3_line)-1)])*0.20
+
+    sigma_3_noise = copy.deepcopy(sigma_3_line)
+
+    # накладываем шумы на всю сигму
+    sigma_3_noise[fixed_point_index] -= noise
+    for i in range(fixed_point_index + 1, len(sigma_3_noise)):
+        sigma_3_noise[i] += np.random.choice([-noise, noise])
+        sigma_3_noise[i] += np.random.uniform(-0.15*noise, 0.15*noise)
+
+    sigma_3_noise[0] = sigma_3_line_fixed
+
+    def func(x):
+        """x - массив sigma_3 без зафиксированной точки"""
+        # возвращаем зафиксированную точку для подачи в МНК
+        x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
+        x[0] = sigma_3_line_fixed  # оставляем первую точку на месте
+
+        _K0_new, _sigma_p_new, _ = ModelK0.define_k0(sigma_1_line, x, is_hs_model=is_hs_model, no_round=True)
+
+        return abs(_K0_new - K0nc)**2
+
+    initial = np.delete(sigma_3_noise, fixed_point_index)
+    bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
+    '''Граничные условия типа a <= xi <= b'''
+
+    def constrains(x):
+        x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
+
+        # первое ограничение - каждая последующая сигма не меньше предыдущей
+        first = np.array([x[j + 1] - x[j] for j in range(len(x) - 1)])
+
+        # замыкаем последний на первый на всякий случай
+        second = np.array([x[-1] - x[0]])
+
+        third = np.array([0.035-abs(x[j]-sigma_3_line[j]) for j in range(len(x))])
+
+        res = np.hstack((first, second, third))
+        return res
+
+    cons = {'type': 'ineq',
+            'fun': constrains}
+    '''Нелинейные ограничения типа cj(x)>=0'''
+
+    res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-8})
+    res = res.x
+
+    # Результат:
+    sigma_3_noise = np.insert(res, fixed_point_index, sigma_3_noise[fixed_point_index])
+    sigma_3_noise[0] = sigma_3_line_fixed
+
+    # Соединение
+    _sigma_1 = sigma_1_line
+    _sigma_3 = sigma_3_noise
+
+    # Проверка:
+    K0_new, sigma_p_new, _ = ModelK0.define_k0(_sigma_1, _sigma_3, is_hs_model=is_hs_model)
+
+    return _sigma_1, _sigma_3
+
+
+def legacy_lse_faker_hs(sigma_1_line: np.array, sigma_3_line: np.array,
+                        sigma_1_spl: np.array, sigma_3_spl: np.array, K0nc: float,
+                        is_hs_model: bool = True, noise: float = None, loops: int = 0):
+    """Прежний ModelK0SoilTest.lse_faker_hs: в каждом вызове функции оптимизации полный define_k0"""
+
+    # Точка начала прямолинейного участка должна быть зафиксирована,
+    #   так как происходят некорретные сдвиги по шумам
+    sigma_3_line_fixed = round(sigma_3_line[0], ModelK0.SIGMA_PREC)
+    '''точка начала прямолинейного участка'''
+    sigma_1_line_fixed = round(sigma_1_line[0], ModelK0.SIGMA_PREC)
+    '''точка начала прямолинейного участка'''
+
+    # Проверка числа узов
+    if len(sigma_3_line) < 2:
+        print('NO NOISE')
+        _sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
+        _sigma_3 = np.hstack((sigma_3_spl[:-1], sigma_3_line))
+        return _sigma_1, _sigma_3
+
+    # Если выбирать точку произвольно то
+    #   придется присать ограничения cons на расположения точек
+    #   после добавления шума
+    fixed_point_index = 1
+
+    if noise is None:
+        noise = max([abs(sigma_3_line[i+1]-sigma_3_line[i]) for i in range(len(sigma_3_line)-1)])*0.12
+
+    sigma_3_noise = copy.deepcopy(sigma_3_line)
+
+    # накладываем шумы на всю сигму
+    for i in range(fixed_point_index, len(sigma_3_noise)):
+        sigma_3_noise[i] += np.random.choice([-noise*(1-i/100), noise*(1-i/100)])
+        sigma_3_noise[i] += np.random.uniform(-0.05*noise, 0.05*noise)
+
+    def func(x):
+        """x - массив sigma_3 без зафиксированной точки"""
+        # возвращаем зафиксированную точку для подачи в МНК
+        x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
+        x[0] = sigma_3_line_fixed  # оставляем первую точку на месте
+
+        x = np.hstack((sigma_3_spl[:-1], x))
+        __sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
+
+        _K0_new, _sigma_p_new, _ = ModelK0.define_k0(__sigma_1, x, is_hs_model=is_hs_model, no_round=True)
+
+        return abs(_K0_new - K0nc)
+
+    initial = np.delete(sigma_3_noise, fixed_point_index)
+    bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
+    '''Граничные условия типа a <= xi <= b'''
+
+    def constrains(x):
+        x = np.insert(x, fixed_point_index, sigma_3_noise[fixed_point_index])
+
+        # первое ограничение - каждая последующая сигма не меньше предыдущей
+        first = np.array([x[j + 1] - x[j] for j in range(len(x) - 1)])
+
+        # замыкаем последний на первый на всякий случай
+        second = np.array([x[-1] - x[0]])
+
+        third = np.array([0.035-abs(x[j]-sigma_3_line[j]) for j in range(len(x))])
+
+        res = np.hstack((first, second, third))
+        return res
+
+    cons = {'type': 'ineq',
+            'fun': constrains}
+    '''Нелинейные ограничения типа cj(x)>=0'''
+
+    res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-8})
+    res = res.x
+
+    # Результат:
+    sigma_3_noise = np.insert(res, fixed_point_index, sigma_3_noise[fixed_point_index])
+    sigma_3_noise[0] = sigma_3_line_fixed
+
+    # Соединение
+    _sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
+    _sigma_3 = np.hstack((sigma_3_spl[:-1], sigma_3_noise))
+
+    # Проверка:
+    K0_new, sigma_p_new, _ = ModelK0.define_k0(_sigma_1, _sigma_3, is_hs_model=is_hs_model)
+
+    if ((K0nc != K0_new) or (abs(sigma_p_new - sigma_1_line_fixed) > (_sigma_1[1] - _sigma_1[0]))) and loops < 100:
+        # print(loops, error)
+        loops = loops + 1
+        if loops % 10 == 0:
+            noise = noise * 0.995
+        _sigma_1, _sigma_3 = legacy_lse_faker_hs(sigma_1_line, sigma_3_line, sigma_1_spl, sigma_3_spl,
+                                               K0nc, is_hs_model=is_hs_model, noise=noise, loops=loops)
+
+    return _sigma_1, _sigma_3
+
+
+def k0_curve(is_hs_model: bool):
+    """Участки кривой K0 (МПа) как в ModelK0SoilTest._test_modeling и _step_mode_modeling:
+    для МК - прямая из начала координат, для HS - сплайн до точки перегиба и прямая после нее"""
+    K0nc = np.round(np.random.uniform(0.4, 0.8), 2)
+    sigma_1_step = 0.05 * np.random.randint(1, 5)
+    if not is_hs_model:
+        sigma_1 = np.linspace(0, sigma_1_step * np.random.randint(3, 6), np.random.randint(3, 6) + 1)
+        return K0nc, sigma_1, K0nc * sigma_1
+
+    sigma_p = sigma_1_step * np.random.randint(1, 4)
+    sigma_1_max = sigma_p + sigma_1_step * (ModelK0.MIN_LSE_PNTS + 2)
+    sigma_3_p = K0nc * sigma_p * np.random.uniform(0.6, 0.8)
+
+    sigma_1_synth = np.linspace(sigma_p, sigma_1_max, 50)
+    sigma_3_synth = K0nc * (sigma_1_synth - sigma_p) + sigma_3_p
+    spl = make_interp_spline([0, sigma_3_synth[0]], [0, sigma_1_synth[0]], k=3,
+                             bc_type=([(2, 0.0)], [(1, 1 / K0nc)]))
+    sigma_3_spl = np.linspace(0, sigma_3_synth[0], 50)
+    sigma_1_spl = spl(sigma_3_spl)
+    sigma_1_spl[0] = 0
+
+    spl = make_interp_spline(np.hstack((sigma_1_spl[:-1], sigma_1_synth)),
+                             np.hstack((sigma_3_spl[:-1], sigma_3_synth)), k=1)
+    mesh = np.linspace(0, sigma_1_max, int(round(sigma_1_max / sigma_1_step)) + 1)
+    index_sigma_p, = np.where(mesh >= sigma_p - 1e-9)
+    sigma_1_line = mesh[index_sigma_p[0]:]
+    sigma_1_spl = mesh[:index_sigma_p[0] + 1]
+    return K0nc, sigma_1_line, spl(sigma_1_line), sigma_1_spl, spl(sigma_1_spl)
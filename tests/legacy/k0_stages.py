@@ -0,0 +1,224 @@
+"""Прежнее формирование ступеней ступенчатого режима K0: каждая ступень строилась отдельными массивами
+и присоединялась к накопленным через np.hstack, действия хранились строками"""
+import random
+from random import choices
+
+import numpy as np
+
+from general.general_functions import exponent, mirrow_element
+from k0_test.triaxial_k0_model import ModelK0SoilTest, StepStages
+
+
+def legacy_form_step(sigma_1_i, sigma_1_i_prev, sigma_3_i, sigma_3_i_prev, sigma_1=np.asarray([]),
+                     sigma_3=np.asarray([]), action=np.asarray([]), time=np.asarray([]),
+                     sensor_s1=2.3088, stab_len: int = 365, reload: bool = False, action_type: 'str' = 'LoadStage'):
+
+    # в случае разгрузки участок стабилизации длинее
+    if reload:
+        stab_len *= 2
+
+    rnd = np.random.randint(6, 8)
+    '''число тиков нагрузки'''
+
+    _is_first_sigma_3 = len(sigma_3) == 0
+
+    sensor_s3 = 0.52143
+    '''шум датчика сигма3'''
+
+    num_s3_stabs_err = np.random.randint(30, 40)
+    '''число "опусканий" сигма3 на этапе стабилизации'''
+    if _is_first_sigma_3 and not reload:
+        num_s3_stabs_err = np.random.randint(10, 20)
+
+    _s3_exp_slant = 3
+    '''резкость экспоненты для убывания сигма3 во время стаблизации'''
+    if reload:
+        _s3_exp_slant = 5
+
+    time_load = [0, np.random.uniform(0.5, 1.0), np.random.uniform(1.0, 2.0), np.random.uniform(2.0, 3.0),
+                 np.random.uniform(5.0, 6.0), np.random.uniform(9.0, 11.0), np.random.uniform(20.0, 31.0),
+                 np.random.uniform(40.0, 46.0), np.random.uniform(49.0, 51.0)]
+    '''Временные тики во время этапов нагрузки и выхода на стабилизацию'''
+
+    # Первый блок : нагрузка до значения
+    exp_grid = np.linspace(0, rnd - 1, rnd)
+    sigma_1_step = exponent(exp_grid, sigma_1_i - sigma_1_i_prev, 10)
+    sigma_1_step = sigma_1_step + sigma_1_i_prev
+
+    sigma_3_overload = sigma_3_i+num_s3_stabs_err*sensor_s3
+    sigma_3_lim = sigma_3_overload - sigma_3_i_prev
+    sigma_3_step = exponent(exp_grid, sigma_3_lim, 10)
+    sigma_3_step = sigma_3_step + sigma_3_i_prev
+
+    #   Время во время нагрузки формируется исходя из "скоростей" нагрузок в time_load
+    time_i = np.asarray([time_load[i] for i in range(len(sigma_1_step))])
+    for i in range(1, len(time_i)):
+        time_i[i] += time_i[i-1]
+    if len(time) > 0:  # не забываем прибавить время с предыдущего участка
+        time_i += time[-1]
+
+    time = np.hstack((time, time_i))
+    sigma_1 = np.hstack((sigma_1, sigma_1_step))
+    action = np.hstack((action, np.full(len(sigma_1_step), action_type)))
+    sigma_3 = np.hstack((sigma_3, sigma_3_step))
+
+    # Второй блок : стабилизация
+    #   первая стаблизация повторяет последнюю нагрузку
+    action = np.hstack((action, ['Stabilization']))
+    time = np.hstack((time, np.asarray(time[-1])))
+    sigma_1 = np.hstack((sigma_1, np.asarray(sigma_1[-1])))
+    sigma_3 = np.hstack((sigma_3, np.asarray(sigma_3[-1])))
+
+    #       коррекция для соблюдения погрешностей датчика - при стаблизации значение "скачет" туда-сюда
+    # сигма1
+    correction = sensor_s1 - (sigma_1[-1] - sigma_1_i)
+    sigma_1_step = np.full(stab_len, sigma_1[-1]) + correction
+    rnd = choices([0, 1], weights=[0.8, 0.2], k=len(sigma_1_step))
+    sigma_1_step = np.asarray([sigma_1_i if rnd[i] else sigma_1_step[i] for i in range(len(sigma_1_step))])
+
+    # сигма3
+    #
+    exp_grid = np.linspace(0, stab_len - 1, stab_len)
+    sigma_3_step = exponent(exp_grid, abs(sigma_3_overload-sigma_3_i), slant=_s3_exp_slant)
+    sigma_3_step = sigma_3_step + sigma_3_overload
+    sigma_3_step = np.asarray([mirrow_element(elem, sigma_3_overload) for elem in sigma_3_step])
+
+    for i in range(1, len(sigma_3_step)):
+        if sigma_3_step[i]-sigma_3_step[i-1] <= -0.52143:
+            sigma_3_step[i] = sigma_3_step[i-1] - sensor_s3
+        elif sigma_3_step[i]-sigma_3_step[i-1] >= 0.52143:
+            sigma_3_step[i] = sigma_3_step[i - 1] + sensor_s3
+        else:
+            sigma_3_step[i] = sigma_3_step[i-1]
+
+    if reload:
+        for i in range(1, len(sigma_3_step)):
+            rnd = np.random.randint(0, 1)
+            if rnd:
+                sigma_3_step = np.asarray([sigma_3_step[:i], sigma_3_step[i:] - sensor_s3])
+
+    #   Время во время стаблизации состоит из двух подэтапов
+    #       сначала идет "разгон" до нужного времени, а потом тики по 60 секунд
+    time_i = [time[-1] + time_load[1]]
+    for i in range(1, len(sigma_1_step)):
+        if i <= 6:
+            time_i.append(time_i[-1] + time_load[i+1])
+        else:
+            time_i.append(time_i[-1] + 60)
+    time_i = np.asarray(time_i)
+
+    #
+    sigma_1 = np.hstack((sigma_1, sigma_1_step))
+    action = np.hstack((action, np.full(len(sigma_1_step), 'Stabilization')))
+    time = np.hstack((time, time_i))
+    sigma_3 = np.hstack((sigma_3, sigma_3_step))
+
+    #   последняя стабилизация дважды
+    sigma_1 = np.hstack((sigma_1, np.asarray(sigma_1_i)))
+    sigma_3 = np.hstack((sigma_3, np.asarray(sigma_3_i)))
+    action = np.hstack((action, ['Stabilization']))
+    time = np.hstack((time, np.asarray(time[-1])))
+
+    return sigma_1, action, time, sigma_3
+
+
+
+def legacy_form_step_data(sigma_1, sigma_3):
+    sigma_1_res = sigma_1 * 1000
+    sigma_3_res = sigma_3 * 1000
+    sigma_1_as_v_p = np.asarray([])
+    action = np.asarray([])
+    time = np.asarray([])
+    sigma_3_as_p_p = np.asarray([])
+
+    for i in range(1, len(sigma_1_res)):
+        sensor = np.random.uniform(ModelK0SoilTest.SENSOR_LIMITS[0], ModelK0SoilTest.SENSOR_LIMITS[1])
+
+        res = legacy_form_step(sigma_1_res[i], sigma_1_res[i - 1], sigma_3_res[i], sigma_3_res[i - 1],
+                               sigma_1_as_v_p, sigma_3_as_p_p,
+                               action, time, sensor)
+        sigma_1_as_v_p, action, time, sigma_3_as_p_p = res
+
+    return sigma_1_as_v_p, sigma_3_as_p_p, action, time
+
+
+def legacy_form_ur_data(sigma_1_ur, sigma_3_ur, time):
+    sigma_1_ur_res = sigma_1_ur * 1000
+    sigma_3_ur_res = sigma_3_ur * 1000
+    action_ur = np.asarray([])
+    time_ur = np.asarray([])
+
+    sigma_1_ur_as_v_p = np.asarray([])
+    sigma_3_ur_as_p_p = np.asarray([])
+
+    for i in range(1, len(sigma_1_ur_res)):
+        sensor = np.random.uniform(ModelK0SoilTest.SENSOR_LIMITS[0], ModelK0SoilTest.SENSOR_LIMITS[1])
+
+        #                                               ДО                          ОТ
+        res = legacy_form_step(sigma_1_ur_res[i - 1] + (sigma_1_ur_res[i - 1] - sigma_1_ur_res[i]),
+                               sigma_1_ur_res[i - 1],
+                               sigma_3_ur_res[i - 1] + (sigma_3_ur_res[i - 1] - sigma_3_ur_res[i]),
+                               sigma_3_ur_res[i - 1],
+                               np.asarray([]), np.asarray([]),
+                               np.asarray([]), np.asarray([]), sensor, action_type='Unload')
+        sigma_1_ur_as_v_p_step, action_ur_step, time_ur_step, sigma_3_ur_as_p_p_step = res
+        sigma_1_ur_as_v_p_step = np.asarray([mirrow_element(elem, sigma_1_ur_res[i - 1])
+                                             for elem in sigma_1_ur_as_v_p_step])
+        sigma_3_ur_as_p_p_step = np.asarray([mirrow_element(elem, sigma_3_ur_res[i - 1])
+                                             for elem in sigma_3_ur_as_p_p_step])
+        sigma_1_ur_as_v_p = np.hstack((sigma_1_ur_as_v_p, sigma_1_ur_as_v_p_step))
+        sigma_3_ur_as_p_p = np.hstack((sigma_3_ur_as_p_p, sigma_3_ur_as_p_p_step))
+
+        time_ur_step += time[-1] if len(time_ur) < 1 else time_ur[-1]
+        time_ur = np.hstack((time_ur, time_ur_step))
+
+        action_ur = np.hstack((action_ur, action_ur_step))
+
+    return sigma_1_ur_as_v_p, sigma_3_ur_as_p_p, action_ur, time_ur
+
+
+def k0_test(steps: int = 20, ur: bool = False):
+    """Точки опыта K0 (МПа): steps ступеней нагружения, при ur - steps ступеней разгрузки"""
+    sigma_1 = np.linspace(0, 0.05 * steps, steps + 1)
+    sigma_3 = 0.5 * sigma_1 + np.hstack((0, np.random.uniform(-0.002, 0.002, steps)))
+    if not ur:
+        return sigma_1, sigma_3, None, None
+    sigma_1_ur = np.flip(np.linspace(0.05, sigma_1[-1], steps + 1))
+    sigma_3_ur = 0.3 * sigma_1_ur + (sigma_3[-1] - 0.3 * sigma_1[-1])
+    return sigma_1, sigma_3, sigma_1_ur, sigma_3_ur
+
+
+def legacy_test(sigma_1, sigma_3, sigma_1_ur, sigma_3_ur):
+    sigma_1, sigma_3, action, time = legacy_form_step_data(sigma_1, sigma_3)
+    if sigma_1_ur is not None:
+        sigma_1_ur, sigma_3_ur, action_ur, time_ur = legacy_form_ur_data(sigma_1_ur, sigma_3_ur, time)
+        sigma_1 = np.hstack((sigma_1, sigma_1_ur))
+        sigma_3 = np.hstack((sigma_3, sigma_3_ur))
+        action = np.hstack((action, action_ur))
+        time = np.hstack((time, time_ur))
+    return sigma_1, sigma_3, action, time
+
+
+def new_test(sigma_1, sigma_3, sigma_1_ur, sigma_3_ur):
+    sigma_1, sigma_3, action, time = ModelK0SoilTest._form_step_data(sigma_1, sigma_3)
+    if sigma_1_ur is not None:
+        sigma_1_ur, sigma_3_ur, action_ur, time_ur = ModelK0SoilTest._form_ur_data(sigma_1_ur, sigma_3_ur, time)
+        sigma_1 = np.hstack((sigma_1, sigma_1_ur))
+        sigma_3 = np.hstack((sigma_3, sigma_3_ur))
+        action = np.hstack((action, action_ur))
+        time = np.hstack((time, time_ur))
+    return sigma_1, sigma_3, StepStages.names(action), time
+
+
+def compare(seed: int, ur: bool):
+    """Максимальные отклонения сигма1, сигма3 и времени при одном зерне, совпадение действий"""
+    np.random.seed(seed)
+    points = k0_test(ur=ur)
+    results = []
+    for func in [legacy_test, new_test]:
+        np.random.seed(seed)
+        random.seed(seed)
+        results.append(func(*points))
+    (s1, s3, action, time), (s1_new, s3_new, action_new, time_new) = results
+    return (np.max(np.abs(s1 - s1_new)), np.max(np.abs(s3 - s3_new)), np.max(np.abs(time - time_new)),
+            np.array_equal(action, action_new))
@@ -0,0 +1,116 @@
+"""Прежняя генерация шума кругов мора (SLSQP с численными производными, ограничения списками, пересчет c и fi
+через mohr_cf_stab) и синтетические наборы кругов"""
+import copy
+
+import numpy as np
+
+from general.general_functions import define_qf
+from static_loading.mohr_circles_test_model import ModelMohrCircles
+
+
+def legacy_new_noise_for_mohrs_circles(sigma3: list, sigma1: list, fi: float, c: float, loops: int = 0) -> list:
+    """ Генерация шума для кругов мора
+    Аргументы:
+        :param sigma3: массив sigma3 для количества кругов > 2
+        :param sigma1: массив sigma1 для количества кругов > 2
+        :param fi: угол внутреннего трения
+        :param c: сцепление
+        :param loops: число самозацикливаний
+        :return: значение девиатора с шумом"""
+
+    '''fi - в градусах, так что
+    tan(np.deg2rad(fi)) - тангенс угла наклона касательной'''
+    fi = np.tan(np.deg2rad(fi))
+
+    fixed_circle_index = 1  # circles_pos[np.random.randint(0, 1)]  # np.random.randint(0, len(sigma1) - 1)
+
+    # генерируем случайной значение
+    a = np.random.uniform(np.min(sigma1 - sigma3) / 5, np.min(sigma1 - sigma3) / 4) / 2
+
+    # создаем копию массива для зашумленных значений
+    sigma1_with_noise = copy.deepcopy(sigma1)
+
+    # добавляем шум к зафиксированной окружности
+    if np.random.randint(0, 2) == 0:
+        sigma1_with_noise[fixed_circle_index] -= a
+
+    else:
+        sigma1_with_noise[fixed_circle_index] += a
+
+    def func(x):
+        """x - массив sigma_1 без зафиксированной окружности"""
+        # возвращаем зафиксированную огружность для подачи в фукнцию mohr_cf_stab
+        x = np.insert(x, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
+        # определяем новые фи и с для измененной окружности
+        c_new, fi_new = ModelMohrCircles.mohr_cf_stab(sigma3, x)
+        # критерий минимизации - ошибка между fi и c для несмещенных кругов
+        return abs(abs(c_new - c) + abs(100 * (fi_new - fi)))
+
+    initial = np.delete(sigma1_with_noise, fixed_circle_index)
+    from scipy.optimize import Bounds, minimize
+    bnds = Bounds(np.zeros_like(initial), np.ones_like(initial) * np.inf)
+
+    def constrains(x):
+        """
+        Функция ограничений на икс, должна подаваться в cons.
+        Должна представлять собой массивы ограничений вида x1 - x2 >= 0
+        """
+
+        # икс для фукнции оптимизации это два круга, поэтому возвращаем в икс убранный круг
+        x = np.insert(x, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
+
+        # первое ограничение - каждая последующая сигма не меньше предыдущей
+        first = np.array([x[i + 1] - x[i] for i in range(len(x) - 1)])
+
+        # замыкаем последний на первый на всякий случай
+        second = np.array([x[-1] - x[0]])
+
+        # здесь считаем тау - каждый следующий тау не меньше предыдущего (- погреность)
+        EPS = 1
+        third = np.array([(x[i + 1] - sigma3[i+1])/2 - (x[i] - sigma3[i])/2 - EPS for i in range(len(x) - 1)])
+
+        res = np.hstack((first, second, third))
+        return res
+
+    cons = {'type': 'ineq',
+            'fun': constrains}
+
+    res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds, options={'ftol': 1e-9})
+    # res = minimize(func, initial, method='SLSQP', constraints=cons, bounds=bnds,
+    #                options={'ftol': 1e-9, 'maxiter': 50}) # отбойник на 50
+    error = res.fun
+    res = res.x
+    sigma1_with_noise = np.insert(res, fixed_circle_index, sigma1_with_noise[fixed_circle_index])
+
+    qf_with_noise = sigma1_with_noise - sigma3
+
+    if np.any(qf_with_noise[1:] < qf_with_noise[:-1]):
+        raise RuntimeWarning(f"Круги имеют ошибочные размеры : tau : {qf_with_noise / 2}")
+
+    assert sum([abs(sigma1[i] - sigma1_with_noise[i]) < 10 ** (-1) for i in range(len(sigma1))]) < 2, \
+        "Два круга не зашумлены!"
+
+    if error > 5 and loops < 100:
+        print(f'looping with error = {error}')
+        loops = loops + 1
+        qf_with_noise = legacy_new_noise_for_mohrs_circles(sigma3, sigma1, np.rad2deg(np.arctan(fi)), c, loops)
+
+    return np.round(qf_with_noise, 1)
+
+
+def synthetic_circles(count: int, seed: int = 0):
+    """Наборы из 3-5 кругов с заданными c (МПа) и fi (градусы)"""
+    rng = np.random.default_rng(seed)
+    result = []
+    for i in range(count):
+        sigma3 = np.round(np.linspace(rng.uniform(50, 150), rng.uniform(300, 800), 3 + i % 3), 0)
+        c, fi = rng.uniform(0.005, 0.08), rng.uniform(12, 38)
+        sigma1 = np.array([np.round(define_qf(sigma_3, c, fi) + sigma_3, 3) for sigma_3 in sigma3])
+        result.append((sigma3, sigma1, fi, c * 1000))
+    return result
+
+
+def deviation(sigma3, qf, fi, c):
+    """Отклонение c (кПа) и fi (градусы) по зашумленным кругам от заданных"""
+    c_new, fi_new = ModelMohrCircles.mohr_cf_stab(sigma3, qf + sigma3)
+    return abs(c_new - c), abs(np.rad2deg(np.arctan(fi_new)) - fi)
@@ -0,0 +1,39 @@
+"""Протоколы с рамкой main_frame, построенные с кэшем оформления и прежним порядком работы general.reports:
+шрифты регистрируются и qr код разбирается в каждом протоколе, рамка строится на каждой странице заново"""
+import datetime
+import os
+from io import BytesIO
+from unittest import mock
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from general import reports
+from general.general_functions import AttrDict
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                    "project_data") + "/"
+QR_CODE = PATH + "mdgt_qr_1.png"
+
+
+def data_customer():
+    return AttrDict({"end_date": datetime.date(2024, 1, 1), "accreditation": "АО", "accreditation_key": "новая"})
+
+
+def report(pages: int, qr_code=None, code=None) -> bytes:
+    """Протокол из pages страниц с рамкой main_frame. Без code защитный код случайный"""
+    reports.register_fonts(PATH)
+    file = BytesIO()
+    canvas = Canvas(file, pagesize=A4)
+    code = code or reports.SaveCode(1.1)
+    for page in range(pages):
+        reports.main_frame(canvas, PATH, data_customer(), code, f"{page + 1}/{pages}", qr_code=qr_code)
+        canvas.showPage()
+    canvas.save()
+    return file.getvalue()
+
+
+def legacy_report(pages: int, qr_code=None, code=None) -> bytes:
+    reports.clear_report_cache()
+    with mock.patch.object(reports, "static_form", lambda canvas, key, draw: draw()):
+        return report(pages, qr_code, code)
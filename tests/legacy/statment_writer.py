@@ -0,0 +1,74 @@
+"""Прежняя запись в ведомость по одной ячейке (загрузка и сохранение всей книги на каждую ячейку),
+запись сессией StatmentWriter и синтетическая ведомость для их сравнения"""
+import xlrd
+import xlutils.copy
+import xlwt
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from excel_statment.functions import statment_writer
+
+# Ячеек на пробу (как при сохранении циклического опыта)
+CELLS = 16
+
+
+def legacy_set_cell_data(path: str, cell: str, value, sheet: str="Лист1", color=None)->None:
+    if path.endswith("xlsx"):
+        wb = load_workbook(path)
+        wb[sheet][cell[0]] = value
+        if color:
+            cell = wb[sheet][cell[0]]
+            cell.font = Font(color=color)
+        wb.save(path)
+
+    elif path.endswith("xls"):
+        wb = xlrd.open_workbook(path, formatting_info=True)
+        out_wb = xlutils.copy.copy(wb)
+        sheet = out_wb.get_sheet(0)
+        if color:
+            xlwt.add_palette_colour("font_colour", 0x21)
+            out_wb.set_colour_RGB(0x21, *tuple(int(color[i:i+2], 16) for i in (0, 2, 4)))
+            style = xlwt.easyxf('font: colour font_colour')
+            sheet.write(cell[1][0] - 1, cell[1][1], value, style)
+        else:
+            sheet.write(cell[1][0] - 1, cell[1][1], value)
+        out_wb.save(path)
+
+
+def synthetic_statment(path: str, rows: int):
+    """Ведомость с rows пробами и заполненными 200 столбцами"""
+    if path.endswith("xlsx"):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Лист1"
+        for _ in range(6):
+            sheet.append(["-"])
+        for r in range(rows):
+            sheet.append([f"{r + 1}-1"] + [r * 0.5 + c for c in range(200)])
+        workbook.save(path)
+    else:
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet("Лист1")
+        for r in range(rows):
+            sheet.write(r + 6, 0, f"{r + 1}-1")
+            for c in range(200):
+                sheet.write(r + 6, c + 1, r * 0.5 + c)
+        workbook.save(path)
+
+
+def sample_cells(number: int):
+    return [dict(cell=(f"H{chr(ord('A') + i)}{number}", (number, 208 + i)), value=number + i / 8,
+                 color="FF6961" if i % 2 else None) for i in range(CELLS)]
+
+
+def legacy(path: str, samples):
+    for number in samples:
+        for cell in sample_cells(number):
+            legacy_set_cell_data(path, **cell)
+
+
+def session(path: str, samples):
+    writer = statment_writer(path)
+    for number in samples:
+        writer.set_cells(sample_cells(number))
+        writer.flush()
@@ -0,0 +1,42 @@
+"""Осреднение кривых для PLAXIS: совпадение с прежним расчетом, объединение точек опытов не пересчитывается"""
+import pickle
+
+import numpy as np
+
+from general.curve_averaging import sector_average, sorted_union
+from tests.legacy.curve_averaging import (legacy_plaxis_average, legacy_static_average, plaxis_model,
+                                          static_model, synthetic_tests)
+
+
+def test_sector_average():
+    strain, deviator = sorted_union([[0.3, 0.1, 0.2], [0.2, 0.0]], [[3, 1, 2], [5, 0]])
+    assert list(strain) == [0.0, 0.1, 0.2, 0.2, 0.3] and list(deviator) == [0, 1, 2, 5, 3]
+    keys, means = sector_average(strain, deviator, 2)
+    assert np.allclose(keys, [0, 0, 0.15, 0.3]) and np.allclose(means, [0, 0.5, 3.5, 3])
+
+
+def test_averaging_matches_legacy():
+    test_set = synthetic_tests(6, points=500)
+    for approximate_type, param in [("sectors", 100), ("sectors", 500), ("poly", 6)]:
+        model = plaxis_model(test_set, approximate_type, param)
+        for result, expected in zip(model.approximate_average(), legacy_plaxis_average(model)):
+            assert np.array_equal(result, expected)
+
+        model = static_model(test_set)
+        for result, expected in zip(model.approximate_average(approximate_type, param),
+                                    legacy_static_average(model, approximate_type, param)):
+            assert np.array_equal(result, expected)
+
+
+def test_sorted_points_cache():
+    model = plaxis_model(synthetic_tests(3, points=500), "sectors", 100)
+    model.approximate_average()
+    points = model.sorted_points(0.12)
+    model.approximate_type = "poly"
+    model.approximate_average()
+    assert model.sorted_points(0.12) is points
+    assert model.sorted_points(0.1) is not points
+
+    restored = pickle.loads(pickle.dumps(model))
+    assert "_points" not in restored.__dict__
+    assert all(np.array_equal(a, b) for a, b in zip(restored.approximate_average(), model.approximate_average()))
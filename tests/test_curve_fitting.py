@@ -0,0 +1,13 @@
+"""Аппроксимация кривых с начальным приближением по линеаризованным данным"""
+import numpy as np
+
+from general.curve_fitting import fit_hardin_drnevich, fit_log_creep, hardin_drnevich, log_creep
+
+
+def test_fits_recover_parameters():
+    gam = np.geomspace(1e-6, 5e-4, 30)
+    a, G0 = fit_hardin_drnevich(gam, hardin_drnevich(gam, 3000., 150.))
+    assert np.allclose([a, G0], [3000., 150.], rtol=1e-6)
+
+    t = np.linspace(100, 10000, 500)
+    assert np.allclose(fit_log_creep(t, log_creep(t, 5e-4, 2e-3)), [5e-4, 2e-3], rtol=1e-9)
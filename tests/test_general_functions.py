@@ -0,0 +1,34 @@
+"""Векторизованные функции general_functions совпадают с прежними реализациями"""
+import numpy as np
+
+from general.general_functions import array_discreate_noise, discrete_array, find_line_area
+from tests.legacy.general_functions import consolidation_cases, legacy_array_discreate_noise, legacy_discrete_array, \
+    legacy_find_line_area, noise_cases
+
+
+def test_find_line_area_matches_legacy():
+    rng = np.random.default_rng(3)
+    cases = consolidation_cases(400)
+    for _ in range(5):
+        x = np.sort(rng.uniform(0, 10, 200))
+        cases.append((x, np.cumsum(rng.normal(0, 1, 200)) - x, rng.uniform(0.2, 2), 4, [0.5, 1]))
+
+    for case in cases:
+        assert np.allclose(find_line_area(*case), legacy_find_line_area(*case), rtol=1e-9, atol=0)
+
+
+def test_instrument_emulation_matches_legacy_bitwise():
+    rng = np.random.default_rng(5)
+    cases = noise_cases(20000)
+    # Точки ровно на шаге датчика и половине последнего знака
+    steps = np.round(rng.uniform(-50, 50, 5000) * 2) / 2
+    cases.append(("steps", legacy_discrete_array, discrete_array, lambda: (steps.copy(), 0.5)))
+    cases.append(("halves", legacy_array_discreate_noise, array_discreate_noise,
+                  lambda: (steps / 1000 + 0.0005, 0.001, 3, 0, 0)))
+
+    for name, legacy, new, args in cases:
+        np.random.seed(11)
+        expected = np.asarray(legacy(*args()))
+        np.random.seed(11)
+        result = np.asarray(new(*args()))
+        assert np.array_equal(expected.view(np.uint64), result.view(np.uint64)), name
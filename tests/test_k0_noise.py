@@ -0,0 +1,39 @@
+"""Шум прямолинейного участка K0: оценка К0 по всем участкам сразу, подбор с аналитическим градиентом"""
+import numpy as np
+
+from k0_test.triaxial_k0_model import ModelK0, ModelK0SoilTest
+from tests.legacy.k0_noise import k0_curve
+
+
+def test_lse_tail_estimation():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        x = np.sort(rng.uniform(0, 2, rng.integers(6, 60)))
+        y = 0.5 * x + rng.normal(0, 0.02, len(x))
+        k, b, error = ModelK0.lse_tail_estimation(x, y)
+        expected = np.array([ModelK0.lse_linear_estimation(x[i:], y[i:]) for i in range(len(x))])
+        assert np.allclose(k, expected[:, 0]) and np.allclose(b, expected[:, 1])
+        assert np.allclose(error, expected[:, 2], atol=1e-6)
+
+
+def test_define_k0_hs_estimation():
+    np.random.seed(0)
+    for _ in range(10):
+        K0nc, sigma_1_line, sigma_3_line, sigma_1_spl, sigma_3_spl = k0_curve(True)
+        sigma_1 = np.hstack((sigma_1_spl[:-1], sigma_1_line))
+        sigma_3 = np.hstack((sigma_3_spl[:-1], sigma_3_line)) + np.random.uniform(-0.002, 0.002, len(sigma_1))
+        k0, sigma_p, b = ModelK0.define_k0_hs(sigma_1, sigma_3, no_round=True)
+        assert np.allclose(ModelK0.define_k0_hs_estimation(sigma_1, sigma_3)[:3], (k0, sigma_p, b))
+
+
+def test_lse_fakers():
+    np.random.seed(1)
+    for _ in range(10):
+        K0nc, sigma_1, sigma_3 = k0_curve(False)
+        sigma_1, sigma_3 = ModelK0SoilTest.lse_faker_mc(sigma_1, sigma_3, K0nc)
+        assert ModelK0.define_k0(sigma_1, sigma_3)[0] == K0nc
+        assert np.all(np.diff(sigma_3) >= -1e-9)
+
+        K0nc, *curve = k0_curve(True)
+        sigma_1, sigma_3 = ModelK0SoilTest.lse_faker_hs(*curve, K0nc)
+        assert ModelK0.define_k0(sigma_1, sigma_3, is_hs_model=True)[0] == K0nc
@@ -0,0 +1,45 @@
+"""Ступени ступенчатого режима K0: совпадение с прежним построением через np.hstack"""
+import random
+
+import numpy as np
+
+from k0_test.triaxial_k0_model import ModelK0SoilTest, StepStages
+from tests.legacy.k0_stages import compare, k0_test, legacy_form_step
+
+
+def test_steps_match_legacy():
+    for seed in range(5):
+        for ur in [False, True]:
+            s1, s3, time, action = compare(seed, ur)
+            assert s1 == 0 and s3 == 0 and action
+            assert time < 1e-6
+
+
+def test_reload_step_matches_legacy():
+    np.random.seed(3)
+    sigma_1, sigma_3, _, _ = k0_test()
+    sigma_1, sigma_3, action, time = ModelK0SoilTest._form_step_data(sigma_1, sigma_3)
+    assert len(sigma_1) == len(sigma_3) == len(action) == len(time)
+    assert set(StepStages.names(action)) == {"LoadStage", "Stabilization"}
+
+    results = []
+    for build in ["legacy", "new"]:
+        np.random.seed(1)
+        random.seed(1)
+        if build == "legacy":
+            s1, _, t, s3 = legacy_form_step(2 * sigma_1[-1], sigma_1[-1], 2 * sigma_3[-1] - 45, sigma_3[-1],
+                                            reload=True)
+            s1 = s1 - 2 * (s1 - sigma_1[-1])
+            s3 = s3 - 2 * (s3 - sigma_3[-1])
+            t = t + time[-1]
+        else:
+            stages = StepStages(1, reload=True, time=time[-1])
+            stages.add(2 * sigma_1[-1], sigma_1[-1], 2 * sigma_3[-1] - 45, sigma_3[-1], mirror=True)
+            s1, _, t, s3 = stages.result()
+        # следующие за ступенью случайные числа тоже совпадают: randint(0, 1) прежнего построения
+        #   разгрузки всегда возвращал 0 и не расходовал генератор
+        results.append((s1, s3, t, np.random.random()))
+    (s1, s3, t, next_random), (s1_new, s3_new, t_new, next_random_new) = results
+    assert np.array_equal(s1, s1_new) and np.array_equal(s3, s3_new)
+    assert next_random == next_random_new
+    assert np.allclose(t, t_new, rtol=0, atol=1e-6)
@@ -0,0 +1,125 @@
+"""Побайтовое сравнение general.log_writer с прежней построчной записью логов приборов"""
+import numpy as np
+import pytest
+
+from general.log_writer import write_log, wille_number_format, Constant
+from static_loading.triaxial_static_loading_test_model import ModelTriaxialStaticLoadSoilTest
+from k0_test.triaxial_k0_model import ModelK0SoilTest
+from shear_test.shear_dilatancy_test_model import ModelShearDilatancySoilTest
+
+GEOTEK_HEADER = "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + \
+                "SampleDiameter_mm" + '\t' + "Deviator_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + \
+                "CellPress_kPa" + '\t' + "CellVolume_mm3" + '\t' + "PorePress_kPa" + '\t' + "PoreVolume_mm3" + \
+                '\t' + "VerticalPress_kPa" + '\t' + "Trajectory" + '\n'
+
+SHEAR_HEADER = "Time" + '\t' + "Action" + '\t' + "Action_Changed" + '\t' + "SampleHeight_mm" + '\t' + \
+               "SampleDiameter_mm" + '\t' + "VerticalPress_kPa" + '\t' + "VerticalDeformation_mm" + '\t' + \
+               "ShearDeformation_mm" + '\t' + "ShearPress_kPa" + '\t' + "Stage" + '\n'
+
+
+def legacy_text_file(file_path, data, header):
+    def make_string(data, i):
+        s = ""
+        for key in data:
+            s += str(data[key][i]) + '\t'
+        s += '\n'
+        return (s)
+
+    with open(file_path, "w") as file:
+        file.write(header)
+        for i in range(len(data["Time"])):
+            file.write(make_string(data, i))
+
+
+def legacy_wille_file(file_path, data, header):
+    def wille_number_format(x):
+        x = "{:.6f}".format(x)
+        s = str(x)
+        if s == "-0.000000":
+            s = "0.000000"
+        return s
+
+    def make_string(data, i):
+        s = ""
+        for key in data:
+            try:
+                s += wille_number_format(data[key][i]) + '\t'
+            except ValueError:
+                s += data[key][i] + '\t'
+            except IndexError:
+                pass
+        s += '\n'
+        return (s)
+
+    with open(file_path, "w") as file:
+        file.write(header)
+        for i in range(len(data["Time"])):
+            file.write(make_string(data, i))
+
+
+def geotek_dict(columns, rows=300):
+    """Словарь в виде, который собирает addition_of_dictionaries: массивы чисел и строк вперемешку"""
+    rng = np.random.default_rng(0)
+    data = {}
+    for i, key in enumerate(columns):
+        if key in ["Action", "Trajectory", "Stage"]:
+            data[key] = np.append(np.full(rows // 2, "Start"), np.full(rows - rows // 2, "WaitLimit"))
+        elif key == "Action_Changed":
+            data[key] = np.append(np.full(rows - 3, ''), np.full(3, "True"))
+        elif i % 3 == 0:
+            data[key] = np.round(rng.normal(0, 100, rows), 4)
+        elif i % 3 == 1:
+            data[key] = rng.normal(0, 1e-5, rows) * 10.0 ** rng.integers(-3, 8, rows)
+        else:
+            data[key] = np.append(np.round(rng.normal(size=rows - 5), 3), np.full(5, '')).astype(str)
+    return data
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("text_file, header", [
+    (ModelTriaxialStaticLoadSoilTest.text_file, GEOTEK_HEADER),
+    (ModelTriaxialStaticLoadSoilTest.text_file_new, GEOTEK_HEADER),
+    (ModelK0SoilTest.text_file, GEOTEK_HEADER),
+    (ModelShearDilatancySoilTest.text_file, SHEAR_HEADER),
+], ids=["static", "static_new", "k0", "shear"])
+def test_geotek_log(tmp_path, text_file, header):
+    data = geotek_dict(header.strip().split("\t"))
+    legacy_text_file(tmp_path / "legacy.log", data, header)
+    text_file(tmp_path / "new.log", data)
+    assert read_bytes(tmp_path / "legacy.log") == read_bytes(tmp_path / "new.log")
+
+
+def test_wille_log(tmp_path):
+    rows = 500
+    rng = np.random.default_rng(1)
+    time = np.round(np.arange(rows) * 0.05 + 7200, 4)
+    strain = rng.normal(0, 1e-3, rows)
+    strain[:20] = rng.uniform(-4e-7, 0, 20)
+
+    legacy_data = {
+        "Time": time,
+        "point_number": range(1, rows + 1),
+        "Time2": time,
+        "External displacement": strain / 1.2,
+        "Cell volume change": ["0.000000" for _ in range(rows)],
+        "Sample height": [76.0 for _ in range(rows)],
+        "Cell pressure (Setpoint)": [np.mean(strain) for _ in range(rows)],
+        "Drainage valve": ["True" for _ in range(rows)],
+        "Diameter under isotropic conditions": rng.normal(38, 0.01, rows - 7),
+        "Deviator": -np.abs(rng.normal(0, 1e-7, rows)),
+    }
+    data = dict(legacy_data, **{
+        "Cell volume change": Constant("0.000000"),
+        "Sample height": Constant(76.0),
+        "Cell pressure (Setpoint)": Constant(np.mean(strain)),
+        "Drainage valve": Constant("True"),
+    })
+    header = "\t\tTime\tExternal displacement\n\t\ts\tmm\n"
+
+    legacy_wille_file(tmp_path / "legacy.txt", legacy_data, header)
+    write_log(tmp_path / "new.txt", data, header=header, rows=len(data["Time"]), cell_format=wille_number_format)
+    assert read_bytes(tmp_path / "legacy.txt") == read_bytes(tmp_path / "new.txt")
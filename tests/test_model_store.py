@@ -0,0 +1,139 @@
+"""Хранилище моделей: ленивая загрузка, запись только измененных опытов, дельта-копии"""
+import os
+import pickle
+
+import numpy as np
+
+from singletons.model_store import ModelStore, LazyTests, detach_stores
+from singletons.models import Models
+
+
+class ArrayModel:
+    def __init__(self, value):
+        self.value = value
+        self.curve = np.linspace(0, value, 1000)
+
+    def get_test_results(self):
+        return {"value": self.value}
+
+
+def make_models(count=4):
+    models = Models()
+    models.tests = {f"{i}-1": ArrayModel(float(i)) for i in range(count)}
+    return models
+
+
+def stored_blobs(path):
+    store = ModelStore(path)
+    try:
+        return dict(store._connection.execute("SELECT name, data IS NOT NULL FROM tests"))
+    finally:
+        store.close()
+
+
+def stored_digests(path):
+    store = ModelStore(path)
+    try:
+        return store.digests()
+    finally:
+        store.close()
+
+
+def test_roundtrip_and_incremental_write(tmp_path):
+    path = str(tmp_path / "models.pickle")
+    models = make_models()
+    models.dump(path, attach=True)
+    assert isinstance(models.tests, LazyTests)
+
+    loaded = Models()
+    loaded.load(path)
+    assert isinstance(loaded.tests, LazyTests)
+    assert list(loaded) == ["0-1", "1-1", "2-1", "3-1"]
+    assert loaded.tests.loaded() == {}
+    assert np.array_equal(loaded["2-1"].curve, np.linspace(0, 2, 1000))
+
+    loaded["2-1"].value = 20.0
+    digests = stored_digests(path)
+    loaded.dump(path)
+    new_digests = stored_digests(path)
+    assert [test for test in digests if digests[test] != new_digests[test]] == ["2-1"]
+
+    reloaded = Models()
+    reloaded.load(path)
+    assert reloaded["2-1"].value == 20.0
+    assert pickle.loads(pickle.dumps(reloaded.tests)).keys() == reloaded.tests.keys()
+
+
+def test_legacy_pickle_is_loaded(tmp_path):
+    path = str(tmp_path / "models.pickle")
+    models = make_models()
+    with open(path, "wb") as file:
+        pickle.dump({"tests": models.tests, "version": models.version}, file)
+
+    loaded = Models()
+    loaded.load(path)
+    assert loaded["3-1"].value == 3.0
+
+
+def test_delta_backup(tmp_path):
+    first, second = str(tmp_path / "1" / "models"), str(tmp_path / "2" / "models")
+    os.makedirs(os.path.dirname(first))
+    os.makedirs(os.path.dirname(second))
+
+    models = make_models()
+    models.dump(first, parent=None)
+    models["1-1"].value = 10.0
+    models.dump(second, parent=first)
+    # Резервные копии не связываются с моделями: копии удаляются, модели остаются в памяти
+    assert models._store is None and isinstance(models.tests, dict)
+
+    assert stored_blobs(second) == {"0-1": 0, "1-1": 1, "2-1": 0, "3-1": 0}
+
+    detach_stores(os.path.dirname(second))
+    os.remove(first)
+    assert stored_blobs(second) == {"0-1": 1, "1-1": 1, "2-1": 1, "3-1": 1}
+
+    restored = Models()
+    restored.load(second)
+    assert [restored[test].value for test in restored] == [0.0, 10.0, 2.0, 3.0]
+
+
+def test_lru_keeps_changed_models(tmp_path):
+    path = str(tmp_path / "models.pickle")
+    make_models(6).dump(path)
+
+    models = Models()
+    models.max_loaded_tests = 2
+    models.load(path)
+    assert models.get_test_results("5-1") == {"value": 5.0}
+    assert models.tests.loaded() == {}
+
+    models["0-1"].value = 100.0
+    for test in models:
+        models[test]
+    assert sorted(models.tests.loaded()) == ["0-1", "5-1"]
+
+    models.dump(path)
+    models["1-1"]
+    assert sorted(models.tests.loaded()) == ["1-1", "5-1"]
+    assert models.get_test_results("0-1") == {"value": 100.0}
+
+
+def test_backup_does_not_attach_store(tmp_path):
+    path, backup = str(tmp_path / "models.pickle"), str(tmp_path / "backup.pickle")
+    models = make_models()
+    models.dump(backup)
+    os.remove(backup)
+
+    models["1-1"].value = 10.0
+    models.dump(path, attach=True)
+    assert os.path.abspath(models._store.path) == os.path.abspath(path)
+
+    models.dump(backup)
+    os.remove(backup)
+    models["2-1"].value = 20.0
+    models.dump(path, attach=True)
+
+    loaded = Models()
+    loaded.load(path)
+    assert [loaded[test].value for test in loaded] == [0.0, 10.0, 20.0, 3.0]
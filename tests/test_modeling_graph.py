@@ -0,0 +1,55 @@
+"""Граф этапов моделирования: пересчет только измененных этапов и этапов после них"""
+from cyclic_loading.modeling_graph import ModelingGraph, Stage
+
+
+class Model:
+    graph = ModelingGraph([
+        Stage("cycles", (), "cycles_inputs", "compute_cycles"),
+        Stage("deviator", ("cycles",), "deviator_inputs", "compute_deviator"),
+        Stage("PPR", ("cycles",), "PPR_inputs", "compute_PPR"),
+        Stage("mean_effective_stress", ("deviator", "PPR"), "no_inputs", "compute_mean_effective_stress"),
+    ])
+
+    def __init__(self):
+        self.params = {"cycles": 10, "deviator": 1, "PPR": 0.5}
+        self.fingerprints = {}
+        self.computed = []
+
+    def cycles_inputs(self):
+        return self.params["cycles"],
+
+    def deviator_inputs(self):
+        return self.params["deviator"],
+
+    def PPR_inputs(self):
+        return self.params["PPR"],
+
+    def no_inputs(self):
+        return ()
+
+    def __getattr__(self, name):
+        if name.startswith("compute_"):
+            return lambda: self.computed.append(name[len("compute_"):])
+        raise AttributeError(name)
+
+    def run(self, stages=None):
+        self.computed = []
+        self.graph.run(self, self.fingerprints, stages)
+        return self.computed
+
+
+def test_only_changed_stages_are_recomputed():
+    model = Model()
+    assert model.run() == ["cycles", "deviator", "PPR", "mean_effective_stress"]
+    assert model.run() == []
+
+    model.params["PPR"] = 0.7
+    assert model.run() == ["PPR", "mean_effective_stress"]
+
+    model.params["cycles"] = 20
+    assert model.run(["PPR"]) == ["cycles", "PPR"]
+    # Этапы, не запрошенные при пересчете cycles, пересчитываются при следующем запуске
+    assert model.run() == ["deviator", "mean_effective_stress"]
+
+    model.graph.invalidate(model.fingerprints, ["deviator"])
+    assert model.run() == ["deviator", "mean_effective_stress"]
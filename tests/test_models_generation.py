@@ -0,0 +1,90 @@
+"""Воспроизводимость генерации моделей Models.generateTests при разном числе процессов"""
+import numpy as np
+
+from singletons.models import Models, statment
+
+
+class RandomModel:
+    """Модель, которая читает свойства текущего опыта из ведомости и использует генератор numpy"""
+    def __init__(self):
+        self.value = None
+
+    def set_test_params(self):
+        self.value = statment[statment.current_test] + np.random.uniform(size=5)
+
+
+class StatmentWritingModel(RandomModel):
+    """Модель, которая при генерации записывает в ведомость новые свойства текущего опыта"""
+    def set_test_params(self):
+        super().set_test_params()
+        statment.tests[statment.current_test] = statment[statment.current_test] + np.random.uniform()
+
+
+def generate(models=None, model_class=RandomModel, **kwargs):
+    models = Models() if models is None else models
+    models.setModelType(model_class)
+    models.generateTests(**kwargs)
+    return {test: models[test].value for test in models}
+
+
+def test_parallel_generation_is_reproducible():
+    state = dict(statment.__dict__)
+    statment.tests = {f"{i}-1": float(i) for i in range(6)}
+    try:
+        sequential = generate(seed=0)
+        one_worker = generate(parallel=True, max_workers=1, seed=0)
+        two_workers = generate(parallel=True, max_workers=2, seed=0)
+    finally:
+        statment.__dict__.clear()
+        statment.__dict__.update(state)
+
+    assert list(sequential) == list(two_workers) == [f"{i}-1" for i in range(6)]
+    for test in sequential:
+        assert np.array_equal(sequential[test], one_worker[test])
+        assert np.array_equal(sequential[test], two_workers[test])
+    assert not np.array_equal(sequential["0-1"] - 0, sequential["1-1"] - 1)
+
+
+def test_each_generation_draws_new_seed(tmp_path):
+    state = dict(statment.__dict__)
+    statment.tests = {f"{i}-1": float(i) for i in range(3)}
+    first_models, second_models = Models(), Models()
+    try:
+        first = generate(first_models, parallel=True, max_workers=2)
+        second = generate(second_models, parallel=True, max_workers=2)
+        repeated = generate(seed=first_models.seed)
+    finally:
+        statment.__dict__.clear()
+        statment.__dict__.update(state)
+
+    assert first_models.seed != second_models.seed
+    assert not np.array_equal(first["0-1"], second["0-1"])
+    for test in first:
+        assert np.array_equal(first[test], repeated[test])
+
+    path = str(tmp_path / "models.pickle")
+    first_models.dump(path)
+    loaded = Models()
+    loaded.load(path)
+    assert loaded.seed == first_models.seed
+
+
+def test_parallel_generation_keeps_statment_changes():
+    state = dict(statment.__dict__)
+    properties = {f"{i}-1": float(i) for i in range(4)}
+    results = []
+    try:
+        for kwargs in [{}, {"parallel": True, "max_workers": 2}]:
+            statment.tests = dict(properties)
+            models = generate(model_class=StatmentWritingModel, seed=0, **kwargs)
+            results.append((models, dict(statment.tests)))
+    finally:
+        statment.__dict__.clear()
+        statment.__dict__.update(state)
+
+    (sequential, sequential_statment), (parallel, parallel_statment) = results
+    assert sequential_statment == parallel_statment
+    assert list(parallel_statment) == list(properties)
+    assert all(parallel_statment[test] != properties[test] for test in properties)
+    for test in sequential:
+        assert np.array_equal(sequential[test], parallel[test])
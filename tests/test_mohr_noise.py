@@ -0,0 +1,32 @@
+"""Шум кругов мора: аналитический градиент, ограничения, независимость результата от числа потоков"""
+import numpy as np
+from scipy.optimize import approx_fprime
+
+from static_loading.mohr_circles_test_model import ModelMohrCirclesSoilTest, MohrNoiseProblem
+from tests.legacy.mohr_noise import deviation, synthetic_circles
+
+
+def test_gradient():
+    rng = np.random.default_rng(0)
+    for sigma3, sigma1, fi, c in synthetic_circles(20):
+        problem = MohrNoiseProblem(sigma3, sigma1, 1, np.tan(np.deg2rad(fi)), c)
+        point = sigma1 * rng.uniform(0.9, 1.1, len(sigma1))
+        numeric = approx_fprime(point, problem.error, 1e-6)
+        assert np.allclose(problem.gradient(point), numeric, rtol=1e-4, atol=1e-4)
+
+
+def test_noise():
+    for sigma3, sigma1, fi, c in synthetic_circles(30):
+        np.random.seed(1)
+        qf = ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles(sigma3, sigma1, fi, c)
+        assert np.all(np.diff(qf / 2) >= 1 - 0.1)
+        assert np.sum(np.abs(qf - (sigma1 - sigma3)) < 0.1) < 2
+        c_deviation, fi_deviation = deviation(sigma3, qf, fi, c)
+        assert c_deviation < 5 and fi_deviation < 1
+
+        results = []
+        for max_workers in [1, 3]:
+            np.random.seed(1)
+            results.append(ModelMohrCirclesSoilTest.new_noise_for_mohrs_circles(sigma3, sigma1, fi, c, starts=3,
+                                                                                 max_workers=max_workers))
+        assert np.array_equal(results[0], results[1])
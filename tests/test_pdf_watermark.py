@@ -0,0 +1,48 @@
+"""Ватермарки: обработка в пуле процессов совпадает с последовательной, ошибка файла не останавливает обработку"""
+import os
+import re
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen.canvas import Canvas
+
+from pdf_watermark import model
+from pdf_watermark.model import WaterMarks
+
+
+def make_reports(directory, count=4):
+    for i in range(count):
+        canvas = Canvas(os.path.join(directory, f"{i}.pdf"), pagesize=A4 if i % 2 else landscape(A4))
+        for page in range(1 + i % 2):
+            canvas.drawString(100, 100, f"Протокол {i}, страница {page + 1}")
+            canvas.showPage()
+        canvas.save()
+    with open(os.path.join(directory, "broken.pdf"), "wb") as file:
+        file.write(b"not a pdf")
+
+
+# PyPDF4 при объединении страниц переименовывает совпадающие ресурсы случайным uuid
+UUID = re.compile(rb"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def watermark_directory(directory, max_workers):
+    watermarks = WaterMarks(directory, port=0)
+    assert not watermarks.process(max_workers=max_workers)
+    modified = os.path.join(directory, "modified")
+    result = {}
+    for name in sorted(os.listdir(modified)):
+        with open(os.path.join(modified, name), "rb") as file:
+            result[name] = UUID.sub(b"uuid", file.read())
+    return result, watermarks.get_errors()
+
+
+def test_pool_matches_sequential(tmp_path, monkeypatch):
+    make_reports(str(tmp_path))
+    monkeypatch.setattr(model, "PARALLEL_MIN_FILES", 2)
+
+    sequential, sequential_errors = watermark_directory(str(tmp_path), max_workers=1)
+    pool, pool_errors = watermark_directory(str(tmp_path), max_workers=2)
+
+    assert sequential_errors == pool_errors == [os.path.join(str(tmp_path), "broken.pdf")]
+    assert sorted(name for name in pool if name != "broken.pdf") == [f"{i}.pdf" for i in range(4)]
+    for name in [f"{i}.pdf" for i in range(4)]:
+        assert pool[name] == sequential[name]
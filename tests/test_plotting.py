@@ -0,0 +1,89 @@
+"""Постоянные элементы графика: повторное использование линий, перерисовка только измененных элементов"""
+import numpy as np
+
+from general.batch_export import create_offscreen_figure
+from general.plotting import FigureCache, PersistentPlot, envelope_indices, render_to_file
+
+
+def update(plot, ax, k, label=True):
+    if plot.begin("main"):
+        ax.clear()
+        ax.set_xlabel("x")
+    x = np.linspace(0, 1, 100)
+    plot.line(ax, "main", x, k * x)
+    if label:
+        plot.label(ax, "k", f"k = {k}")
+    plot.legend(ax)
+    plot.finish()
+
+
+def test_persistent_plot():
+    figure, canvas = create_offscreen_figure()
+    ax = figure.add_subplot(111)
+    plot = PersistentPlot(figure, canvas)
+    draws = []
+    canvas.mpl_connect("draw_event", lambda event: draws.append(event))
+
+    update(plot, ax, 1)
+    line = ax.lines[0]
+    update(plot, ax, 1.0)
+    # Пределы не изменились - только blit, линия та же
+    assert len(draws) == 1
+    assert ax.lines[0] is line
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["k = 1.0"]
+
+    update(plot, ax, 2, label=False)
+    assert len(draws) == 2
+    assert len(ax.lines) == 1 and np.allclose(line.get_ydata()[-1], 2)
+
+    # Оси очищены другим методом построения - оформление строится заново
+    ax.clear()
+    update(plot, ax, 2)
+    assert ax.get_xlabel() == "x" and len(ax.lines) == 2
+
+    svg = render_to_file(figure, [3, 2], "svg").getvalue()
+    assert b"<svg" in svg and list(figure.get_size_inches()) != [3, 2]
+
+
+def test_envelope_indices():
+    rng = np.random.default_rng(0)
+    strain = np.cumsum(rng.normal(size=200000))
+    PPR = np.sin(np.linspace(0, 2000, 200000)) + rng.normal(0, 0.01, 200000)
+    PPR[123457] = 5
+
+    index = envelope_indices([strain, PPR], buckets=1000, keep=[150001])
+    assert len(index) <= 6 * 1000 + 1
+    assert np.all(np.diff(index) > 0) and index[0] == 0 and index[-1] == len(strain) - 1
+    assert 123457 in index and 150001 in index
+    for values in [strain, PPR]:
+        assert values[index].max() == values.max() and values[index].min() == values.min()
+        # Экстремумы каждого интервала сохраняются
+        blocks = values[:199800].reshape(-1, 200)
+        assert np.all(np.isin(blocks.argmax(axis=1) + np.arange(len(blocks)) * 200, index))
+
+    assert np.array_equal(envelope_indices([PPR[:100]]), np.arange(100))
+
+
+def test_render_to_file_cache(tmp_path):
+    def figure(ks):
+        figure, canvas = create_offscreen_figure()
+        ax = figure.add_subplot(111)
+        plot = PersistentPlot(figure, canvas)
+        for k in ks:
+            update(plot, ax, k)
+        return figure
+
+    cache = FigureCache(str(tmp_path))
+    first = render_to_file(figure([2]), [3, 2], "svg", cache=cache).getvalue()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Та же фигура, построенная после других данных, и новый процесс (пустой кэш в памяти) - файл из кэша
+    cache.clear()
+    again = figure([5, 3, 2])
+    assert render_to_file(again, [3, 2], "svg", cache=cache).getvalue() == first
+    assert len(list(tmp_path.iterdir())) == 1
+    assert list(again.get_size_inches()) == [6.4, 4.8]
+
+    render_to_file(figure([3]), [3, 2], "svg", cache=cache)
+    render_to_file(again, [3, 3], "svg", cache=cache)
+    assert len(list(tmp_path.iterdir())) == 3
@@ -0,0 +1,121 @@
+"""Фоновый пересчет моделей: объединение запросов и отбрасывание устаревших результатов"""
+import threading
+import time
+
+from PyQt5.QtCore import QCoreApplication
+
+from general.regeneration import ModelRegeneration, finish_all
+
+
+class SlowModel:
+    def __init__(self):
+        self.params = {}
+        self.calls = 0
+
+    def set_params(self, group, value, started=None, release=None):
+        if started is not None:
+            started.set()
+            release.wait(5)
+        self.params[group] = value
+        self.calls += 1
+
+
+def wait_ready(application, results, count=1, timeout=5):
+    start = time.perf_counter()
+    while len(results) < count and time.perf_counter() - start < timeout:
+        application.processEvents()
+        time.sleep(0.01)
+
+
+def test_requests_are_coalesced():
+    application = QCoreApplication.instance() or QCoreApplication([])
+    regeneration = ModelRegeneration()
+    results = []
+    regeneration.ready.connect(lambda key, model: results.append((key, model)))
+
+    model = SlowModel()
+    started, release = threading.Event(), threading.Event()
+    regeneration.submit("1-1", model, "strain", lambda m: m.set_params("strain", 0, started, release))
+    started.wait(5)
+    # Пока выполняется первый пересчет, запросы одной группы заменяют друг друга
+    for value in range(1, 10):
+        regeneration.submit("1-1", model, "strain", lambda m, value=value: m.set_params("strain", value))
+    regeneration.submit("1-1", model, "PPR", lambda m: m.set_params("PPR", 1))
+    release.set()
+
+    wait_ready(application, results)
+    regeneration.stop()
+
+    assert len(results) == 1
+    key, regenerated = results[0]
+    assert key == "1-1" and regenerated is not model
+    assert regenerated.params == {"strain": 9, "PPR": 1}
+    assert regenerated.calls == 3
+    assert model.params == {}
+
+
+def test_cancelled_result_is_dropped():
+    application = QCoreApplication.instance() or QCoreApplication([])
+    regeneration = ModelRegeneration()
+    results = []
+    regeneration.ready.connect(lambda key, model: results.append(model))
+
+    model = SlowModel()
+    started, release = threading.Event(), threading.Event()
+    regeneration.submit("1-1", model, "strain", lambda m: m.set_params("strain", 0, started, release))
+    started.wait(5)
+    regeneration.cancel("1-1")
+    release.set()
+    regeneration.submit("1-1", model, "PPR", lambda m: m.set_params("PPR", 2))
+
+    wait_ready(application, results)
+    regeneration.stop()
+
+    assert [m.params for m in results] == [{"PPR": 2}]
+
+
+def test_finish_delivers_result_before_direct_change():
+    application = QCoreApplication.instance() or QCoreApplication([])
+    regeneration = ModelRegeneration()
+    models = {"1-1": SlowModel()}
+    regeneration.ready.connect(lambda key, model: models.__setitem__(key, model))
+
+    started, release = threading.Event(), threading.Event()
+    regeneration.submit("1-1", models["1-1"], "strain", lambda m: m.set_params("strain", 1, started, release))
+    started.wait(5)
+    regeneration.submit("1-1", models["1-1"], "PPR", lambda m: m.set_params("PPR", 1))
+    threading.Timer(0.1, release.set).start()
+
+    # Прямое изменение модели после ожидания пересчета не затирается его результатом
+    finish_all()
+    assert models["1-1"].params == {"strain": 1, "PPR": 1}
+    models["1-1"].params["cut"] = True
+
+    replaced = []
+    regeneration.ready.connect(lambda key, model: replaced.append(model))
+    wait_ready(application, replaced, timeout=0.3)
+    regeneration.stop()
+
+    assert replaced == []
+    assert models["1-1"].params == {"strain": 1, "PPR": 1, "cut": True}
+
+
+def test_reset_drops_previous_generation():
+    application = QCoreApplication.instance() or QCoreApplication([])
+    regeneration = ModelRegeneration()
+    results = []
+    regeneration.ready.connect(lambda key, model: results.append((key, model)))
+
+    started, release = threading.Event(), threading.Event()
+    regeneration.submit("1-1", SlowModel(), "strain", lambda m: m.set_params("strain", 0, started, release))
+    started.wait(5)
+    regeneration.submit("1-2", SlowModel(), "strain", lambda m: m.set_params("strain", 0))
+    # Загрузка нового объекта: запросы прежнего поколения отбрасываются, в том числе выполняющийся
+    regeneration.reset()
+    release.set()
+    regeneration.submit("1-1", SlowModel(), "PPR", lambda m: m.set_params("PPR", 3))
+
+    wait_ready(application, results, count=2, timeout=1)
+    regeneration.stop()
+
+    assert [(key, model.params) for key, model in results] == [("1-1", {"PPR": 3})]
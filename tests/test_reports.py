@@ -0,0 +1,58 @@
+"""Шрифты и неизменяемые элементы рамки протоколов строятся один раз"""
+import re
+from io import BytesIO
+from unittest import mock
+
+from PyPDF4 import PdfFileReader
+from PyPDF4.pdf import ContentStream
+
+from general import reports
+from tests.legacy.reports import PATH, QR_CODE, legacy_report, report
+
+
+def test_fonts_registered_once():
+    reports.clear_report_cache()
+    with mock.patch.object(reports.pdfmetrics, "registerFont", wraps=reports.pdfmetrics.registerFont) as register:
+        reports.register_fonts(PATH)
+        reports.register_fonts(PATH)
+    assert register.call_count == 3
+
+
+def page_operations(pdf: bytes) -> list:
+    """Операторы страниц протокола, ссылки на рамку заменены операторами Form XObject.
+    Страница с рамкой: начало страницы, ссылка на рамку, изменяемые элементы. Рамка повторяет начало страницы
+    перед неизменяемыми элементами, поэтому вместо ссылки подставляются операторы рамки после этого начала"""
+    reader = PdfFileReader(BytesIO(pdf))
+    pages = []
+    for page in reader.pages:
+        operations = []
+        for operands, operator in ContentStream(page.getContents(), reader).operations:
+            if operator == b"Do" and operands[0].startswith("/FormXob.Static"):
+                form = page["/Resources"]["/XObject"][operands[0]].getObject()
+                form_operations = ContentStream(form, reader).operations
+                assert form_operations[:len(operations)] == operations
+                operations = form_operations
+            else:
+                operations.append((operands, operator))
+        pages.append(operations)
+    return pages
+
+
+def test_main_frame_form():
+    for qr_code in [None, QR_CODE]:
+        pdf = report(3, qr_code)
+        # Рамка - один Form XObject на документ, на каждой странице - ссылка на него
+        assert len(set(re.findall(rb"/FormXob\.Static\w+", pdf))) == 1
+        assert pdf.count(b"/Type /Page\n") + pdf.count(b"/Type /Page ") == 3
+        assert len(pdf) < len(legacy_report(3, qr_code))
+
+
+def test_main_frame_content():
+    # Страницы с рамкой из Form XObject рисуют то же, что и рамка, построенная на странице заново
+    for qr_code in [None, QR_CODE]:
+        pages = page_operations(report(2, qr_code, "1.1AB12-C345"))
+        legacy_pages = page_operations(legacy_report(2, qr_code, "1.1AB12-C345"))
+        assert len(pages) == len(legacy_pages) == 2
+        for operations, legacy_operations in zip(pages, legacy_pages):
+            assert len(operations) > 100
+            assert operations == legacy_operations
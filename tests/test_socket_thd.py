@@ -0,0 +1,84 @@
+"""Канал прогресса: одно соединение на процесс, объединение частых сообщений"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from thrd.socket_thd import ProgressServer, progress_channel, send_to_server
+
+
+def serve(server, messages):
+    def handler(message):
+        messages.append(message)
+        return message.get("break", False)
+
+    thread = threading.Thread(target=server.serve, args=(handler,))
+    thread.start()
+    return thread
+
+
+def send_progress(port, count):
+    send_to_server(port, {"label": "Обработка", "maximum": count})
+    for i in range(count):
+        send_to_server(port, {"value": i + 1})
+    progress_channel(port).flush()
+
+
+def send_progress_without_flush(port, count):
+    for i in range(count):
+        send_to_server(port, {"value": i + 1})
+
+
+def test_messages_are_coalesced():
+    server = ProgressServer(0)
+    messages = []
+    thread = serve(server, messages)
+
+    send_progress(server.port, 2000)
+    send_to_server(server.port, {"break": True})
+    thread.join(5)
+    server.close()
+
+    assert not thread.is_alive()
+    assert server.connections == 1 and len(messages) < 100
+    assert messages[0] == {"label": "Обработка", "maximum": 2000}
+    assert messages[-1].get("break") and (messages[-1].get("value") or messages[-2].get("value")) == 2000
+
+
+def test_reconnect_and_worker_processes():
+    server = ProgressServer(0)
+    messages = []
+    thread = serve(server, messages)
+    send_progress(server.port, 10)
+    send_to_server(server.port, {"break": True})
+    thread.join(5)
+    server.close()
+
+    # Окно прогресса открыто заново на том же порту - канал переподключается
+    server = ProgressServer(server.port)
+    messages = []
+    thread = serve(server, messages)
+    with ProcessPoolExecutor(2) as executor:
+        list(executor.map(send_progress, [server.port] * 2, [50] * 2))
+    send_to_server(server.port, {"value": 100, "break": True})
+    thread.join(5)
+    server.close()
+
+    assert not thread.is_alive()
+    # Главный процесс и не более одного соединения на процесс пула
+    assert 2 <= server.connections <= 3
+    assert messages[-1] == {"value": 100, "break": True}
+    assert sum(message.get("value") == 50 for message in messages) == 2
+
+
+def test_worker_exit_sends_pending_message():
+    server = ProgressServer(0)
+    messages = []
+    thread = serve(server, messages)
+    # Последнее сообщение задачи остается ожидающим: процесс пула должен отправить его при выходе
+    with ProcessPoolExecutor(1) as executor:
+        list(executor.map(send_progress_without_flush, [server.port], [500]))
+    send_to_server(server.port, {"break": True})
+    thread.join(5)
+    server.close()
+
+    assert not thread.is_alive()
+    assert any(message.get("value") == 500 for message in messages)
@@ -0,0 +1,57 @@
+"""Чтение ведомости: совпадение с pd.read_excel по используемым колонкам и кэш"""
+import datetime
+import json
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_statment.statment_reader import read_statment, statment_columns
+from general.general_functions import user_cache_directory
+
+
+def make_statment(path, rows=30):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Заказчик"])
+    sheet.append(["Объект"])
+    sheet.append(["Лаб. № пробы"] + [f"h{i}" if i % 5 else None for i in range(1, 256)])
+    for _ in range(3):
+        sheet.append(["-"] * 5)
+    values = [None, 1, 2.5, 0.125, "текст", "1,5", datetime.datetime(2021, 5, 3), 17]
+    for r in range(rows):
+        row = [values[(r * 7 + c * 3) % len(values)] for c in range(256)]
+        row[0] = f"{r + 1}-1" if r % 9 else None
+        sheet.append(row)
+    workbook.save(path)
+
+
+def test_read_statment_matches_read_excel(tmp_path):
+    path = str(tmp_path / "statment.xlsx")
+    make_statment(path)
+
+    expected = pd.read_excel(path, usecols="A:IV", skiprows=[0, 1, 3, 4, 5])
+    expected = expected[expected["Лаб. № пробы"].notna()]
+
+    cache = str(tmp_path / "cache")
+    first = read_statment(path, cache_directory=cache)
+    # Кэш - json со значениями ячеек, без pickle
+    [cache_file] = os.listdir(cache)
+    assert cache_file.endswith(".json")
+    with open(os.path.join(cache, cache_file), encoding="utf-8") as file:
+        assert json.load(file)["rows"]
+    # Время изменения другое, содержимое то же - значения берутся из кэша по хешу
+    os.utime(path, ns=(0, 0))
+    for data_frame in [first, read_statment(path, cache_directory=cache), read_statment(path, cache_directory=cache)]:
+        assert list(data_frame.columns) == list(expected.columns)
+        assert list(data_frame.index) == list(expected.index)
+        for column in statment_columns():
+            pd.testing.assert_series_equal(data_frame.iloc[:, column], expected.iloc[:, column])
+
+
+def test_cache_directory_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "local"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    directory = user_cache_directory("statment cache")
+    base = "local" if os.name == "nt" else "xdg"
+    assert directory == os.path.join(str(tmp_path / base), "DigitRock", "statment cache")
@@ -0,0 +1,89 @@
+"""Сессия записи в ведомость: совпадение с прежней записью по одной ячейке, индекс строк, внешние изменения"""
+import xlrd
+from openpyxl import load_workbook
+
+from excel_statment import functions
+from excel_statment.functions import StatmentWriter, close_statment_writers, set_cell_data, statment_writer, \
+    write_to_excel
+from tests.legacy.statment_writer import legacy, sample_cells, session, synthetic_statment
+
+
+def xlsx_cells(path):
+    sheet = load_workbook(path)["Лист1"]
+    return {cell.coordinate: (cell.value, cell.font.color.rgb if cell.font.color else None)
+            for row in sheet.iter_rows() for cell in row if cell.value is not None}
+
+
+def xls_cells(path):
+    book = xlrd.open_workbook(path, formatting_info=True)
+    sheet = book.sheet_by_index(0)
+
+    def colour(i, j):
+        font = book.font_list[book.xf_list[sheet.cell_xf_index(i, j)].font_index]
+        return book.colour_map.get(font.colour_index)
+
+    return {(i, j): (sheet.cell(i, j).value, colour(i, j))
+            for i in range(sheet.nrows) for j in range(sheet.row_len(i)) if sheet.cell(i, j).value != ""}
+
+
+def test_session_matches_legacy(tmp_path):
+    for extension, read in [("xlsx", xlsx_cells), ("xls", xls_cells)]:
+        result = []
+        for func in [legacy, session]:
+            path = str(tmp_path / f"{func.__name__}.{extension}")
+            synthetic_statment(path, 20)
+            func(path, [7, 12, 26])
+            result.append(read(path))
+        assert result[0] == result[1]
+
+
+def test_row_index_and_external_changes(tmp_path):
+    path = str(tmp_path / "statment.xlsx")
+    synthetic_statment(path, 20)
+
+    writer = StatmentWriter(path)
+    assert writer.row("5-1", "A") == 11 and writer.row("нет", "A") is None
+    writer.set_cell_data(("IG20", (20, 240)), "5-1")
+    assert writer.row("5-1", "IG") == 20
+    writer.flush()
+
+    # Запись в обход сессии - книга загружается заново
+    set_cell_data(path, ("B7", (7, 1)), "изменено")
+    writer.set_cells(sample_cells(8))
+    writer.flush()
+    cells = xlsx_cells(path)
+    assert cells["B7"][0] == "изменено" and cells["HA8"][0] == 8
+
+    # Номер пробы в столбце IG имеет приоритет над столбцом A
+    write_to_excel(path, "5-1", [1, 2])
+    cells = xlsx_cells(path)
+    assert cells["HW20"][0] == 1 and cells["HX20"][0] == 2 and "HW11" not in cells
+
+
+def test_row_index_overwrite(tmp_path):
+    for extension in ["xlsx", "xls"]:
+        path = str(tmp_path / f"statment.{extension}")
+        synthetic_statment(path, 20)
+        writer = StatmentWriter(path)
+        assert writer.row("5-1", "A") == 11
+        # Перезапись ячейки удаляет прежнее значение из индекса
+        writer.set_cell_data(("A11", (11, 0)), "25-1")
+        assert writer.row("5-1", "A") is None and writer.row("25-1", "A") == 11
+        writer.set_cell_data(("A9", (9, 0)), "25-1")
+        writer.set_cell_data(("A11", (11, 0)), "5-1")
+        assert writer.row("25-1", "A") == 9 and writer.row("5-1", "A") == 11
+        # Строка 9 ("3-1") перезаписана, заголовки выше 7 строки в индекс не попадают
+        writer.set_cell_data(("A5", (5, 0)), "3-1")
+        assert writer.row("3-1", "A") is None and writer.row("4-1", "A") == 10
+
+
+def test_close_statment_writers(tmp_path):
+    path = str(tmp_path / "statment.xlsx")
+    synthetic_statment(path, 5)
+    writer = statment_writer(path)
+    writer.set_cells(sample_cells(8))
+    close_statment_writers()
+    assert not functions._writers
+    assert xlsx_cells(path)["HA8"][0] == 8
+    assert statment_writer(path) is not writer
+    close_statment_writers()
@@ -0,0 +1,55 @@
+"""Параметры протокола трехосного сжатия: строка режима для всех видов испытания"""
+from types import SimpleNamespace
+
+import pytest
+
+from excel_statment.position_configs import c_fi_E_PropertyPosition
+from static_loading import triaxial_static_export
+from static_loading.triaxial_static_export import E_result_cells, define_test_parameter, mode_description
+
+
+class FakeStatment(dict):
+    def __init__(self, test_mode, waterfill):
+        super().__init__({"1": SimpleNamespace(
+            physical_properties=SimpleNamespace(sample_size=(38, 76), type_ground=5, sample_number=3),
+            mechanical_properties=SimpleNamespace(sigma_3=0.1, K0=0.5))})
+        self.general_parameters = SimpleNamespace(equipment="ЛИГА КЛ-1С", test_mode=test_mode, waterfill=waterfill)
+
+
+@pytest.mark.parametrize("test_mode, mode", [
+    ("Трёхосное сжатие КН", "KH, девиаторное нагружение в кинематическом режиме в водонасыщенном состоянии"),
+    ("Трёхосное сжатие НН", "НН, девиаторное нагружение в кинематическом режиме в водонасыщенном состоянии"),
+    ("Трёхосное сжатие (F, C)", "КД, девиаторное нагружение в кинематическом режиме в водонасыщенном состоянии"),
+])
+def test_define_test_parameter_mode(monkeypatch, test_mode, mode):
+    monkeypatch.setattr(triaxial_static_export, "statment", FakeStatment(test_mode, "Водонасыщенное состояние"))
+    test_parameter = define_test_parameter("1", "K0: Без K0", "state_standard")
+    assert test_parameter["mode"] == mode
+    assert test_parameter["K0"][1] == "-"
+
+
+def test_mode_description_waterfill():
+    assert mode_description("Трёхосное сжатие НН", "Природная влажность") == \
+           "НН, девиаторное нагружение в кинематическом режиме при природной влажности"
+    for waterfill in ["Не указывать", None]:
+        assert mode_description("Трёхосное сжатие КН", waterfill) == \
+               "KH, девиаторное нагружение в кинематическом режиме "
+
+
+@pytest.mark.parametrize("test_mode, report_type, position_mode, value", [
+    ("Трёхосное сжатие (E)", "standart_E", "Трёхосное сжатие (E)", 20),
+    ("Трёхосное сжатие (E)", "standart_E50", "Трёхосное сжатие (E)", 15),
+    ("Трёхосное сжатие с разгрузкой", "E_Eur", "Трёхосное сжатие с разгрузкой", 20),
+    ("Трёхосное сжатие с разгрузкой", "plaxis", "Трёхосное сжатие (E)", 15),
+    ("Трёхосное сжатие с разгрузкой (plaxis)", "E_Eur", "Трёхосное сжатие с разгрузкой (plaxis)", 15),
+])
+def test_E_result_cells(monkeypatch, test_mode, report_type, position_mode, value):
+    monkeypatch.setattr(triaxial_static_export, "statment", FakeStatment(test_mode, None))
+    cells = E_result_cells("1", {"E": [20, 0.2], "E50": 15, "Eur": 60}, report_type)
+    position = c_fi_E_PropertyPosition[position_mode]
+    assert cells[-1]["cell"] == (position[0][2] + "10", (10, position[1][2]))
+    assert cells[-1]["value"] == value
+    if test_mode == "Трёхосное сжатие (E)":
+        assert len(cells) == 1
+    else:
+        assert cells[0]["cell"] == ("GI10", (10, 190)) and cells[0]["value"] == 60
@@ -1,18 +1,217 @@
+"""Передача сообщений о ходе выполнения задач в окна прогресса.
+
+Окно прогресса (MyProgress, general.movie_label.Loader) слушает порт сервером ProgressServer. Потоки и процессы
+отправляют сообщения функцией send_to_server: в каждом процессе на порт открывается одно постоянное соединение
+ProgressChannel, по которому передаются кадры "длина + pickle". Частые сообщения объединяются: словари
+дополняют ожидающий словарь, остальные сообщения заменяют ожидающее. Ожидающее сообщение отправляется не чаще
+SEND_INTERVAL, завершающие сообщения ({"break": True}, None) - сразу вместе с ожидающим.
+
+atexit не вызывается при завершении процессов ProcessPoolExecutor, поэтому ожидающие сообщения процесса
+отправляются финализатором multiprocessing при выходе из процесса, а задачи пула вызывают flush_progress
+в конце каждой задачи.
+"""
+
 from PyQt5.QtWidgets import QApplication, QMainWindow, QProgressDialog, QPushButton
+import os
+import selectors
+import struct
 import threading
 import time
 import sys
 import socket
 import pickle
+from multiprocessing import util
+from typing import Any, Callable, Dict, Optional, Tuple
 
 BUFFER_SIZE = 4096
 
+# Минимальный интервал между отправками сообщений одного канала, с
+SEND_INTERVAL = 0.05
+# Время ожидания подключения к окну прогресса, с
+CONNECT_TIMEOUT = 1
+
+_HEADER = struct.Struct("!I")
+
+
+def _is_final(message) -> bool:
+    """Сообщение, после которого сервер прекращает прием"""
+    return not message or (isinstance(message, dict) and bool(message.get("break")))
+
+
+class ProgressChannel:
+    """Постоянное соединение процесса с сервером прогресса на порту port с объединением частых сообщений"""
+
+    def __init__(self, port: int, interval: float = SEND_INTERVAL):
+        self.port = port
+        self.interval = interval
+        self._lock = threading.RLock()
+        self._sock: Optional[socket.socket] = None
+        self._pending: Any = None
+        self._has_pending = False
+        self._sent = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    def send(self, message):
+        """Отправка сообщения. Промежуточные сообщения могут быть объединены со следующими"""
+        with self._lock:
+            if self._has_pending and isinstance(self._pending, dict) and isinstance(message, dict):
+                self._pending = {**self._pending, **message}
+            else:
+                self._pending = message
+            self._has_pending = True
+
+            wait = self._sent + self.interval - time.monotonic()
+            if wait <= 0 or _is_final(message):
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Немедленная отправка ожидающего сообщения"""
+        with self._lock:
+            if self._timer is not None:
+                if self._timer is not threading.current_thread():
+                    self._timer.cancel()
+                self._timer = None
+            if not self._has_pending:
+                return
+            message, self._pending, self._has_pending = self._pending, None, False
+            self._sent = time.monotonic()
+
+            data = pickle.dumps(message)
+            frame = _HEADER.pack(len(data)) + data
+            # Сервер мог закрыться (окно прогресса закрыто и открыто заново) - одна попытка переподключения
+            for _ in range(2):
+                sock = self._connection()
+                if sock is None:
+                    return
+                try:
+                    sock.sendall(frame)
+                    return
+                except OSError:
+                    self.close()
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                try:
+                    self._sock.close()
+                except OSError:
+                    pass
+                self._sock = None
+
+    def _connection(self) -> Optional[socket.socket]:
+        if self._sock is not None and not self._is_alive(self._sock):
+            self.close()
+        if self._sock is None:
+            sock = socket.socket()
+            sock.settimeout(CONNECT_TIMEOUT)
+            if sock.connect_ex(("localhost", self.port)) != 0:
+                sock.close()
+                return None
+            sock.settimeout(None)
+            self._sock = sock
+        return self._sock
+
+    @staticmethod
+    def _is_alive(sock: socket.socket) -> bool:
+        """Сервер не присылает данных, поэтому читаемый сокет означает закрытое соединение"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            return not selector.select(timeout=0)
+
+
+# Каналы текущего процесса {(pid, порт): канал}. После fork дочерний процесс открывает свои соединения
+_channels: Dict[Tuple[int, int], ProgressChannel] = {}
+_channels_lock = threading.Lock()
+
+
+def progress_channel(port: int) -> ProgressChannel:
+    """Канал текущего процесса к серверу прогресса на порту port"""
+    key = (os.getpid(), port)
+    with _channels_lock:
+        channel = _channels.get(key)
+        if channel is None:
+            channel = _channels[key] = ProgressChannel(port)
+            # Выполняется и при выходе из главного процесса (через atexit), и в процессах пула
+            util.Finalize(None, channel.flush, exitpriority=10)
+        return channel
+
+
+def flush_progress():
+    """Отправка ожидающих сообщений всех каналов текущего процесса. Вызывается в конце задачи процесса пула"""
+    for (pid, port), channel in list(_channels.items()):
+        if pid == os.getpid():
+            channel.flush()
+
+
 def send_to_server(port, data):
     if port:
-        sock = socket.socket()
-        sock.connect(('localhost', port))
-        sock.sendall(pickle.dumps(data))
-        sock.close()
+        progress_channel(port).send(data)
+
+
+class ProgressServer:
+    """Прием сообщений ProgressChannel. Порт занимается при создании, чтобы первые сообщения не терялись"""
+
+    def __init__(self, port: int):
+        self._sock = socket.socket()
+        if os.name != "nt":
+            # Соединения закрывает сервер, без флага порт занят после закрытия окна (TIME_WAIT)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("", port))
+        self._sock.listen(10)
+        self.port = self._sock.getsockname()[1]
+        # Число принятых соединений
+        self.connections = 0
+
+    def serve(self, handler: Callable[[Any], bool], running: Callable[[], bool] = lambda: True):
+        """Передача принятых сообщений в handler, пока handler не вернет True или running не вернет False"""
+        selector = selectors.DefaultSelector()
+        buffers = {}
+        try:
+            selector.register(self._sock, selectors.EVENT_READ)
+            while running():
+                for key, _ in selector.select(timeout=0.1):
+                    if key.fileobj is self._sock:
+                        conn, addr = self._sock.accept()
+                        self.connections += 1
+                        selector.register(conn, selectors.EVENT_READ)
+                        buffers[conn] = bytearray()
+                        continue
+
+                    conn = key.fileobj
+                    data = conn.recv(BUFFER_SIZE)
+                    if not data:
+                        selector.unregister(conn)
+                        conn.close()
+                        buffers.pop(conn)
+                        continue
+
+                    buffer = buffers[conn]
+                    buffer += data
+                    while len(buffer) >= _HEADER.size:
+                        size = _HEADER.unpack_from(buffer)[0]
+                        if len(buffer) < _HEADER.size + size:
+                            break
+                        message = pickle.loads(bytes(buffer[_HEADER.size:_HEADER.size + size]))
+                        del buffer[:_HEADER.size + size]
+                        if handler(message) or not running():
+                            return
+        except (OSError, ValueError):
+            # Сокет закрыт методом close из другого потока
+            pass
+        finally:
+            for conn in buffers:
+                conn.close()
+            selector.close()
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
 
 
 class MyProgress(QProgressDialog):
@@ -22,41 +221,31 @@ class MyProgress(QProgressDialog):
         self.setValue(0)
         self.port = port
         self.setGeometry(500, 400, 300, 80)
+        self._server = ProgressServer(self.port)
         threading.Thread(target=self.run, args=()).start()
         self.show()
 
     def run(self):
-        sock = socket.socket()
-        sock.bind(('', self.port))
-        sock.listen(10)
-        while True:
-            conn, addr = sock.accept()
-            all_data = bytearray()
-            while True:
-                data = conn.recv(BUFFER_SIZE)
-                if not data:
-                    break
-                all_data += data
-
-            data = pickle.loads(all_data)
-            if data.get("label", None):
-                self.setLabelText(data["label"])
-
-            if data.get("window_title", None):
-                pass
-
-            if data.get("maximum", None):
-                self.setMaximum(data["maximum"])
-
-            if data.get("value", None):
-                self.setValue(data["value"])
-
-            if data.get("break", None):
-                conn.close()
-                break
+        self._server.serve(self._set_data)
+        self._server.close()
         self.close()
         return
 
+    def _set_data(self, data) -> bool:
+        if data.get("label", None):
+            self.setLabelText(data["label"])
+
+        if data.get("window_title", None):
+            pass
+
+        if data.get("maximum", None):
+            self.setMaximum(data["maximum"])
+
+        if data.get("value", None):
+            self.setValue(data["value"])
+
+        return bool(data.get("break", None))
+
 
 class App(QMainWindow):  # Окно и виджеты на нем
 
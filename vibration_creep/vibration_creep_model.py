@@ -17,7 +17,7 @@ import sys
 import matplotlib.pyplot as plt
 import copy
 from scipy.optimize import curve_fit
-from scipy.optimize import differential_evolution
+from general.curve_fitting import fit_log_creep, log_creep
 import warnings
 
 from general.general_functions import point_to_xy, Point
@@ -387,31 +387,9 @@ class ModelVibrationCreep:
     @staticmethod
     def approximate_plastic_creep(time, strain):
         #time = np.log(time + 1)
-        approximate_func = lambda x, a, b: a * np.log(x) + b
+        approximate_func = log_creep
 
-        def sumOfSquaredError(parameterTuple):
-            warnings.filterwarnings("ignore")  # do not print warnings by genetic algorithm
-            val = approximate_func(time, *parameterTuple)
-            return np.sum((time - val) ** 2.0)
-
-        def generate_Initial_Parameters():
-            # min and max used for bounds
-            maxX = np.max(time)
-            minX = np.min(time)
-            maxY = np.max(strain)
-            minY = np.min(strain)
-
-            parameterBounds = []
-            parameterBounds.append([minX, maxX])  # search bounds for h
-            parameterBounds.append([minY, maxY])
-            result = differential_evolution(sumOfSquaredError, parameterBounds, seed=3)
-            return result.x
-
-        geneticParameters = generate_Initial_Parameters()
-
-        popt, pcov = curve_fit(approximate_func, time, strain, geneticParameters)
-
-        a, b = popt
+        a, b = fit_log_creep(time, strain)
         #time = np.e**time - 1
 
         SEC_IN_YEAR = 31536000
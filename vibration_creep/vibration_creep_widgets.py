@@ -411,12 +411,12 @@ class VibrationCreepSoilTestApp(AppMixin, QWidget):
             },
 
             result_table_params={
-            "Kd": lambda lab: "; ".join([str(i["Kd"]) for i in VC_models[lab].get_test_results()]),
-            "E50d": lambda lab: "; ".join([str(i["E50d"]) for i in VC_models[lab].get_test_results()]),
-            "E50": lambda lab: "; ".join([str(i["E50"]) for i in VC_models[lab].get_test_results()]),
+            "Kd": lambda lab: "; ".join([str(i["Kd"]) for i in VC_models.get_test_results(lab)]),
+            "E50d": lambda lab: "; ".join([str(i["E50d"]) for i in VC_models.get_test_results(lab)]),
+            "E50": lambda lab: "; ".join([str(i["E50"]) for i in VC_models.get_test_results(lab)]),
             },  qr={"state": True},
             result_table_condition_params={
-            "Kd": lambda lab:  sorted([i["Kd"] for i in VC_models[lab].get_test_results()])[::-1] != [i["Kd"] for i in VC_models[lab].get_test_results()],
+            "Kd": lambda lab:  sorted([i["Kd"] for i in VC_models.get_test_results(lab)])[::-1] != [i["Kd"] for i in VC_models.get_test_results(lab)],
             })
 
         self.tab_4.popIn.connect(self.addTab)
@@ -637,9 +637,9 @@ class VibrationCreepSoilTestApp(AppMixin, QWidget):
                           [f"VC_models{statment.general_data.get_shipment_number()}.pickle",
                            f"E_models{statment.general_data.get_shipment_number()}.pickle"])
             VC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             QMessageBox.about(self, "Сообщение", "Pickle успешно сохранен")
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
@@ -655,9 +655,9 @@ class VibrationCreepSoilTestApp(AppMixin, QWidget):
                           [f"VC_models{statment.general_data.get_shipment_number()}.pickle",
                            f"E_models{statment.general_data.get_shipment_number()}.pickle"])
             VC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             QMessageBox.critical(self, "Ошибка", f"Ошибка бекапа модели {str(err)}", QMessageBox.Ok)
 
@@ -709,9 +709,9 @@ class VibrationCreepSoilTestApp(AppMixin, QWidget):
                 dialog.get_data()
                 VC_models.generateTests()
                 VC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"VC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"VC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                           f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
                 app_logger.info("Новые параметры ведомости и модели сохранены")
 
     def general_statment(self):
@@ -739,9 +739,9 @@ class VibrationCreepSoilTestApp(AppMixin, QWidget):
                           [f"VC_models{statment.general_data.get_shipment_number()}.pickle",
                            f"E_models{statment.general_data.get_shipment_number()}.pickle"])
             VC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                        f"VC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
             E_models.dump(os.path.join(statment.save_dir.save_directory,
-                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"))
+                                       f"E_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
         except Exception as err:
             print(err)
         try:
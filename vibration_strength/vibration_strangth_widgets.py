@@ -172,10 +172,10 @@ class VibrationStrangthSoilTestApp(QWidget):
                             statment.save_dir.cvi_directory + "/" + f"{file_path_name} FC ЦВИ.xls")
 
                 FC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                            f"FC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
                 VibrationFC_models.dump(os.path.join(statment.save_dir.save_directory,
-                                                     f"VibrationFC_models{statment.general_data.get_shipment_number()}.pickle"))
+                                                     f"VibrationFC_models{statment.general_data.get_shipment_number()}.pickle"), attach=True)
 
                 test_result = {}
                 test_result["sigma_3_mohr"], test_result["sigma_1_mohr"] = FC_models[